@@ -0,0 +1,12 @@
+# benchmarks/__init__.py
+"""
+Plotbot performance regression suite.
+
+Run from the repository root:
+
+    python -m benchmarks.run                 # run and compare against benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline # record a new baseline
+    python -m benchmarks.run --only merge    # run a subset (substring match)
+
+See benchmarks/README.md for details.
+"""
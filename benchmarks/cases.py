@@ -0,0 +1,553 @@
+# benchmarks/cases.py
+"""
+Benchmark cases for plotbot's key paths.
+
+Each case receives a ``BenchmarkSession`` (benchmarks/session.py) whose data
+directory contains synthetic CDFs for the session's interval. Cases that need
+warm data load it in their ``setup`` so only the path of interest is timed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from contextlib import contextmanager
+from datetime import timedelta
+
+from .harness import benchmark
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CUSTOM_VARIABLE_NAME = 'bench_br_over_bmag'
+MULTIPLOT_PANELS = 20
+
+
+@contextmanager
+def _working_directory(path):
+    """Temporarily chdir (snapshot helpers write relative 'data_snapshots/' paths)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _ensure_loaded(session, *variables):
+    """Make sure the given variables are loaded for the full synthetic interval."""
+    session.plotbot.get_data(session.full_trange, *variables)
+
+
+# ============================================================================
+# Startup
+# ============================================================================
+_COLD_IMPORT_SCRIPT = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+import plotbot
+elapsed = time.perf_counter() - t0
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_mb = rss / 1e6 if sys.platform == 'darwin' else rss / 1e3
+print('BENCH_RESULT ' + json.dumps({'import_seconds': elapsed, 'peak_mb': rss_mb}))
+"""
+
+
+@benchmark(repeats=3, track_memory=False, group='startup')
+def bench_cold_import(session):
+    """`import plotbot` in a fresh interpreter; peak memory is the child's max RSS."""
+    env = dict(os.environ, SPEDAS_DATA_DIR=session.data_dir, MPLBACKEND='Agg')
+    proc = subprocess.run([sys.executable, '-c', _COLD_IMPORT_SCRIPT], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith('BENCH_RESULT '):
+            return json.loads(line[len('BENCH_RESULT '):])
+    raise RuntimeError(f"cold import did not report a result:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+
+
+# ============================================================================
+# Data pipeline (CDF -> import_data_function -> data_cubby)
+# ============================================================================
+def _reset_mag_rtn(session):
+    session.plotbot  # configure plotbot before touching its state
+    session.reset_data_type('mag_rtn', 'mag_RTN')
+
+
+@benchmark(repeats=3, setup=_reset_mag_rtn, group='pipeline')
+def bench_get_data_mag_rtn_cold(session):
+    """First get_data for full-cadence (~293 Hz) mag_RTN: CDF read, calculate_variables, stash."""
+    pb = session.plotbot
+    pb.get_data(session.full_trange, pb.mag_rtn.br)
+    return {'samples': len(pb.mag_rtn.datetime_array)}
+
+
+def _warm_mag_rtn(session):
+    _ensure_loaded(session, session.plotbot.mag_rtn.br)
+
+
+@benchmark(repeats=5, setup=_warm_mag_rtn, group='pipeline')
+def bench_cubby_hit_mag_rtn(session):
+    """Repeat get_data for an already-loaded range (tracker + cubby cache hit)."""
+    pb = session.plotbot
+    pb.get_data(session.full_trange, pb.mag_rtn.br)
+
+
+def _load_first_part_mag_rtn(session):
+    _reset_mag_rtn(session)
+    pb = session.plotbot
+    pb.get_data(session.trange(0.0, 0.6), pb.mag_rtn.br)
+
+
+@benchmark(repeats=3, setup=_load_first_part_mag_rtn, group='pipeline')
+def bench_merge_overlapping_mag_rtn(session):
+    """Load [40%, 100%] on top of a loaded [0%, 60%]: overlapping merge in UltimateMergeEngine."""
+    pb = session.plotbot
+    pb.get_data(session.trange(0.4, 1.0), pb.mag_rtn.br)
+    return {'samples': len(pb.mag_rtn.datetime_array)}
+
+
+def _load_most_of_proton(session):
+    session.plotbot
+    session.reset_data_type('proton', 'spi_sf00_l3_mom')
+    pb = session.plotbot
+    pb.get_data(session.trange(0.0, 0.9), pb.proton.anisotropy, pb.proton.beta_ppar)
+    pb.proton.anisotropy, pb.proton.beta_ppar  # computed before the extension
+
+
+@benchmark(repeats=3, setup=_load_most_of_proton, group='pipeline')
+def bench_extend_proton(session):
+    """Extend loaded [0%, 90%] proton moments by [90%, 100%]: derived vars computed for the new part only."""
+    pb = session.plotbot
+    pb.get_data(session.trange(0.9, 1.0), pb.proton.anisotropy)
+    return {'samples': len(pb.proton.datetime_array)}
+
+
+WALK_FORWARD_STEPS = 10
+
+
+@benchmark(repeats=3, setup=_reset_mag_rtn, group='pipeline')
+def bench_walk_forward_mag_rtn(session):
+    """Load full-cadence mag_RTN in 10 consecutive segments: each append goes into the chunked storage."""
+    pb = session.plotbot
+    for step in range(WALK_FORWARD_STEPS):
+        pb.get_data(session.trange(step / WALK_FORWARD_STEPS, (step + 0.999) / WALK_FORWARD_STEPS), pb.mag_rtn.br)
+    return {'samples': len(pb.mag_rtn.datetime_array)}
+
+
+# ============================================================================
+# Merge engine (synthetic arrays, independent of --hours)
+# ============================================================================
+# Large sizes need ~50 bytes of RAM per record, so only 1M runs by default:
+#     PLOTBOT_BENCH_MERGE_SIZES=1M,50M,200M python -m benchmarks.run --only merge_engine
+MERGE_SIZES = {'1M': 1_000_000, '50M': 50_000_000, '200M': 200_000_000}
+MERGE_SPECTRA_RECORDS = 200_000
+
+
+def _merge_inputs(session, records, bins=0):
+    """Existing [0%, 60%] and new [40%, 100%] of a 293 Hz time base: br, bt, bn (and a spectrum)."""
+    key = (records, bins)
+    if getattr(session, '_merge_inputs_key', None) != key:
+        import numpy as np
+        session._merge_inputs = None  # free the previous size first
+        times = (np.arange(records, dtype=np.int64) * 3_413_333).astype('datetime64[ns]')
+        data = {name: np.random.default_rng(i).normal(size=records).astype(np.float32)
+                for i, name in enumerate(('br', 'bt', 'bn'))}
+        if bins:
+            data['energy_flux'] = np.random.default_rng(3).random((records, bins))
+        existing, new = slice(0, int(records * 0.6)), slice(int(records * 0.4), records)
+        session._merge_inputs = (times[existing], {k: v[existing] for k, v in data.items()},
+                                 times[new], {k: v[new] for k, v in data.items()})
+        session._merge_inputs_key = key
+    return session._merge_inputs
+
+
+def _merge_engine():
+    from plotbot.data_cubby import ultimate_merger
+    return ultimate_merger
+
+
+def _register_merge_case(label, records):
+    @benchmark(name=f'merge_engine_{label}', repeats=3,
+               setup=lambda session: _merge_inputs(session, records), group='merge')
+    def bench_merge_engine(session):
+        """Overlapping merge of `records` mag-like records (20% overlap) in UltimateMergeEngine."""
+        times, _ = _merge_engine().merge_arrays(*_merge_inputs(session, records))
+        return {'records': len(times)}
+
+
+for _label in os.environ.get('PLOTBOT_BENCH_MERGE_SIZES', '1M').split(','):
+    _register_merge_case(_label.strip(), MERGE_SIZES[_label.strip()])
+
+
+def _merge_spectra_setup(session):
+    _merge_inputs(session, MERGE_SPECTRA_RECORDS, bins=32)
+
+
+@benchmark(repeats=3, setup=_merge_spectra_setup, group='merge')
+def bench_merge_engine_spectra(session):
+    """Overlapping merge of field components plus a 32-bin float64 spectrum."""
+    times, _ = _merge_engine().merge_arrays(*_merge_inputs(session, MERGE_SPECTRA_RECORDS, bins=32))
+    return {'records': len(times)}
+
+
+# ============================================================================
+# Custom variables
+# ============================================================================
+def _prepare_custom_variable(session):
+    pb = session.plotbot
+    _ensure_loaded(session, pb.mag_rtn_4sa.br, pb.mag_rtn_4sa.bmag)
+    if not getattr(session, '_custom_variable_defined', False):
+        pb.custom_variable(CUSTOM_VARIABLE_NAME, pb.mag_rtn_4sa.br / pb.mag_rtn_4sa.bmag)
+        session._custom_variable_defined = True
+    from plotbot.data_tracker import global_tracker
+    global_tracker.clear_calculation_cache('custom_data_type', CUSTOM_VARIABLE_NAME)
+
+
+@benchmark(repeats=5, setup=_prepare_custom_variable, group='custom_variables')
+def bench_custom_variable_evaluate(session):
+    """Evaluate br / bmag as a custom variable over the full interval (sources already cached)."""
+    pb = session.plotbot
+    container = pb.data_cubby.grab('custom_variables')
+    container.evaluate(CUSTOM_VARIABLE_NAME, session.full_trange)
+
+
+# ============================================================================
+# Plot manager metadata propagation
+# ============================================================================
+DERIVE_SHORT_SAMPLES = 1_000
+DERIVE_ITERATIONS = 200
+
+
+def _derive_variables(session):
+    """Full-cadence br plus a short plot_manager with the same metadata."""
+    import numpy as np
+    from plotbot.plot_manager import plot_manager
+    pb = session.plotbot
+    _warm_mag_rtn(session)
+    long_var = pb.mag_rtn.br
+    config = long_var.plot_config.copy()
+    config.datetime_array = np.array(config.datetime_array[:DERIVE_SHORT_SAMPLES])
+    config.time = None if config.time is None else np.array(config.time[:DERIVE_SHORT_SAMPLES])
+    short_var = plot_manager(np.array(long_var.view(np.ndarray)[:DERIVE_SHORT_SAMPLES]), plot_config=config)
+    for var in (long_var, short_var):
+        var.data  # settle lazy clipping before timing
+    return short_var, long_var
+
+
+def _time_derivations(var):
+    import time
+    import numpy as np
+    t0 = time.perf_counter()
+    for _ in range(DERIVE_ITERATIONS):
+        var[:100]
+        var.view(type(var))
+        np.abs(var[10:110])
+    return (time.perf_counter() - t0) / DERIVE_ITERATIONS * 1e6
+
+
+@benchmark(repeats=3, group='plot_manager')
+def bench_plot_manager_slice_and_ufunc(session):
+    """Slice, view and ufunc-on-slice of a short vs. full-cadence variable (shared time base)."""
+    short_var, long_var = _derive_variables(session)
+    short_us = _time_derivations(short_var)
+    long_us = _time_derivations(long_var)
+    return {'short_us': short_us, 'long_us': long_us, 'long_over_short': long_us / short_us,
+            'long_samples': len(long_var)}
+
+
+# ============================================================================
+# Rendering
+# ============================================================================
+def _warm_render_sources(session):
+    pb = session.plotbot
+    _ensure_loaded(session, pb.mag_rtn_4sa.br, pb.mag_rtn_4sa.bt, pb.mag_rtn_4sa.bn,
+                   pb.proton.density, pb.epad.strahl)
+
+
+@benchmark(repeats=3, setup=_warm_render_sources, group='render')
+def bench_plotbot_render(session):
+    """plotbot() with time series + spectrogram panels, drawn to an Agg canvas."""
+    import matplotlib.pyplot as mpl_plt
+    pb = session.plotbot
+    fig = pb.plotbot(session.full_trange,
+                     pb.mag_rtn_4sa.br, 1, pb.mag_rtn_4sa.bt, 1, pb.mag_rtn_4sa.bn, 1,
+                     pb.proton.density, 2,
+                     pb.epad.strahl, 3)
+    if fig is not None:
+        fig.canvas.draw()
+        mpl_plt.close(fig)
+
+
+def _multiplot_setup(session):
+    pb = session.plotbot
+    _ensure_loaded(session, pb.mag_rtn_4sa.br)
+    window = timedelta(hours=session.hours) / (MULTIPLOT_PANELS + 1)
+    total_seconds = window.total_seconds()
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    pb.plt.options.reset()
+    pb.plt.options.window = f"{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}"
+    pb.plt.options.position = 'around'
+
+
+@benchmark(repeats=3, setup=_multiplot_setup, group='render')
+def bench_multiplot_20_panels(session):
+    """multiplot() with 20 panels spread across the interval, drawn to an Agg canvas."""
+    import matplotlib.pyplot as mpl_plt
+    pb = session.plotbot
+    step = timedelta(hours=session.hours) / (MULTIPLOT_PANELS + 1)
+    centers = [(session.start + step * (i + 1)).strftime('%Y-%m-%d/%H:%M:%S.%f')[:-3]
+               for i in range(MULTIPLOT_PANELS)]
+    result = pb.multiplot([(center, pb.mag_rtn_4sa.br) for center in centers])
+    fig = result[0] if isinstance(result, tuple) else result
+    if fig is not None:
+        fig.canvas.draw()
+        mpl_plt.close(fig)
+
+
+# ============================================================================
+# Snapshots
+# ============================================================================
+def _snapshot_path(session):
+    return os.path.join(session.output_dir, 'bench_snapshot.pkl')
+
+
+@benchmark(repeats=3, setup=_warm_mag_rtn, group='snapshot')
+def bench_snapshot_save(session):
+    """save_data_snapshot() of the loaded full-cadence mag_RTN instance."""
+    pb = session.plotbot
+    with _working_directory(session.output_dir):
+        pb.data_snapshot.save_data_snapshot(_snapshot_path(session), classes=[pb.mag_rtn])
+    return {'file_mb': os.path.getsize(_snapshot_path(session)) / 1e6}
+
+
+def _snapshot_load_setup(session):
+    if not os.path.exists(_snapshot_path(session)):
+        _warm_mag_rtn(session)
+        with _working_directory(session.output_dir):
+            session.plotbot.data_snapshot.save_data_snapshot(_snapshot_path(session),
+                                                             classes=[session.plotbot.mag_rtn])
+    _reset_mag_rtn(session)
+
+
+@benchmark(repeats=3, setup=_snapshot_load_setup, group='snapshot')
+def bench_snapshot_load(session):
+    """load_data_snapshot() into an empty mag_RTN instance."""
+    pb = session.plotbot
+    with _working_directory(session.output_dir):
+        pb.data_snapshot.load_data_snapshot(_snapshot_path(session), classes=[pb.mag_rtn.data_type])
+
+
+def _container_path(session):
+    return os.path.join(session.output_dir, 'bench_snapshot.pbsnap')
+
+
+@benchmark(repeats=3, setup=_warm_mag_rtn, group='snapshot')
+def bench_snapshot_container_save(session):
+    """save_data_snapshot(format='container') of the loaded full-cadence mag_RTN instance."""
+    pb = session.plotbot
+    with _working_directory(session.output_dir):
+        pb.data_snapshot.save_data_snapshot(_container_path(session), classes=[pb.mag_rtn],
+                                            compression='none', format='container')
+    return {'file_mb': os.path.getsize(_container_path(session)) / 1e6}
+
+
+def _container_load_setup(session):
+    if not os.path.exists(_container_path(session)):
+        _warm_mag_rtn(session)
+        with _working_directory(session.output_dir):
+            session.plotbot.data_snapshot.save_data_snapshot(_container_path(session),
+                                                             classes=[session.plotbot.mag_rtn],
+                                                             compression='none', format='container')
+    _reset_mag_rtn(session)
+
+
+@benchmark(repeats=3, setup=_container_load_setup, group='snapshot')
+def bench_snapshot_container_load(session):
+    """load_data_snapshot() of a .pbsnap container into an empty mag_RTN instance."""
+    pb = session.plotbot
+    with _working_directory(session.output_dir):
+        pb.data_snapshot.load_data_snapshot(_container_path(session), classes=[pb.mag_rtn.data_type])
+
+
+@benchmark(repeats=3, setup=_container_load_setup, group='snapshot')
+def bench_snapshot_container_load_window(session):
+    """load_data_snapshot(time_range=...) of a 10% window from a .pbsnap container."""
+    pb = session.plotbot
+    with _working_directory(session.output_dir):
+        pb.data_snapshot.load_data_snapshot(_container_path(session), classes=[pb.mag_rtn.data_type],
+                                            time_range=session.trange(0.45, 0.55))
+    return {'samples': len(pb.mag_rtn.datetime_array)}
+
+
+def _register_snapshot_window_case(percent):
+    @benchmark(name=f'snapshot_save_window_{percent}pct', repeats=3, setup=_warm_mag_rtn, group='snapshot')
+    def bench_snapshot_save_window(session):
+        """save_data_snapshot(time_range=...) of a `percent` window of the loaded mag_RTN instance."""
+        pb = session.plotbot
+        path = os.path.join(session.output_dir, f'bench_snapshot_window_{percent}.pkl')
+        half = percent / 200
+        with _working_directory(session.output_dir):
+            pb.data_snapshot.save_data_snapshot(path, classes=[pb.mag_rtn],
+                                                time_range=session.trange(0.5 - half, 0.5 + half))
+        return {'file_mb': os.path.getsize(path) / 1e6}
+
+
+for _percent in (10, 50):
+    _register_snapshot_window_case(_percent)
+
+
+# ============================================================================
+# Positional binning
+# ============================================================================
+BINNING_SAMPLES = 1_000_000
+
+
+def _binning_inputs(session):
+    """1M samples along a longitude track that crosses 0°, with a heavy-tailed variable."""
+    if getattr(session, '_binning_inputs', None) is None:
+        import numpy as np
+        rng = np.random.default_rng(0)
+        longitudes = np.mod(np.linspace(300.0, 420.0, BINNING_SAMPLES), 360.0)
+        session._binning_inputs = (rng.standard_cauchy(BINNING_SAMPLES), longitudes)
+    return session._binning_inputs
+
+
+@benchmark(repeats=3, setup=_binning_inputs, group='binning')
+def bench_positional_binning_1M(session):
+    """bin_statistic of 1M samples into 1° Carrington longitude bins, once per statistic."""
+    import time
+    from plotbot.positional_binning import STATISTICS, BinSpec, bin_statistic
+    values, longitudes = _binning_inputs(session)
+    timings = {}
+    for statistic in STATISTICS:
+        t0 = time.perf_counter()
+        bin_statistic(values, longitudes, BinSpec('carrington_lon', 1.0, statistic=statistic))
+        timings[f'{statistic}_ms'] = (time.perf_counter() - t0) * 1e3
+    return timings
+
+
+MONOTONIC_MASK_SAMPLES = 4_000_000
+
+
+def _monotonic_mask_input(session):
+    """Degrees from perihelion over an encounter: -170° → 175°, then a 15° curl-back."""
+    if getattr(session, '_monotonic_mask_input', None) is None:
+        import numpy as np
+        half = MONOTONIC_MASK_SAMPLES // 2
+        session._monotonic_mask_input = np.concatenate([np.linspace(-170.0, 0.0, half), np.linspace(0.0, 175.0, half),
+                                                        np.linspace(175.0, 160.0, half // 20)])
+    return session._monotonic_mask_input
+
+
+@benchmark(repeats=3, setup=_monotonic_mask_input, group='binning')
+def bench_monotonic_mask_4M(session):
+    """compute_monotonic_degrees_mask of 4M samples, then the cached lookup a second panel makes."""
+    import time
+    from plotbot.multiplot import _monotonic_mask_cache, compute_monotonic_degrees_mask
+    degrees = _monotonic_mask_input(session)
+    _monotonic_mask_cache.clear()
+    t0 = time.perf_counter()
+    mask = compute_monotonic_degrees_mask(degrees, 0.99, encounter='E_bench')
+    t1 = time.perf_counter()
+    compute_monotonic_degrees_mask(degrees, 0.99, encounter='E_bench')
+    return {'compute_ms': (t1 - t0) * 1e3, 'cached_ms': (time.perf_counter() - t1) * 1e3, 'kept': int(mask.sum())}
+
+
+# ============================================================================
+# Spectrogram rendering
+# ============================================================================
+SPECTROGRAM_COLUMNS = 60_000
+
+
+def _spectrogram_input(session):
+    """A 60k-column x 32-bin spectrogram at 0.874 s cadence with log-spaced bins."""
+    if getattr(session, '_spectrogram_input', None) is None:
+        import numpy as np
+        times = np.datetime64('2023-09-28T00:00', 'ns') + (np.arange(SPECTROGRAM_COLUMNS) * 874_000_000).astype('timedelta64[ns]')
+        bins = np.geomspace(10.0, 1e4, 32)
+        data = np.exp(np.sin(np.arange(SPECTROGRAM_COLUMNS) / 3000.0)[:, None] + np.cos(np.arange(32) / 5.0)[None, :])
+        session._spectrogram_input = (times, bins, data)
+    return session._spectrogram_input
+
+
+@benchmark(repeats=3, setup=_spectrogram_input, group='render')
+def bench_spectrogram_render_60k(session):
+    """draw_spectrogram of 60k columns on linear and log y axes, saved as PNG and PDF."""
+    import io
+    import time
+    import matplotlib.colors as colors
+    import matplotlib.pyplot as plt
+    from plotbot.spectrogram_render import draw_spectrogram
+    times, bins, data = _spectrogram_input(session)
+    result = {}
+    for y_scale in ('linear', 'log'):
+        for fmt in ('png', 'pdf'):
+            fig, ax = plt.subplots(figsize=(12, 3), dpi=150)
+            ax.set_yscale(y_scale)
+            t0 = time.perf_counter()
+            fig.colorbar(draw_spectrogram(ax, times, bins, data, norm=colors.LogNorm()), ax=ax)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt)
+            result[f'{y_scale}_{fmt}_ms'] = (time.perf_counter() - t0) * 1e3
+            result[f'{y_scale}_{fmt}_kb'] = len(buffer.getvalue()) // 1024
+            plt.close(fig)
+    return result
+
+
+@benchmark(repeats=3, setup=_spectrogram_input, group='render')
+def bench_spectral_pyramid_60k(session):
+    """Pyramid build, 10% append update and a decimated PNG draw of the 60k-column spectrogram."""
+    import io
+    import time
+    import matplotlib.colors as colors
+    import matplotlib.pyplot as plt
+    from plotbot.spectral_pyramid import SpectralPyramid
+    from plotbot.spectrogram_render import axes_pixel_width, draw_spectrogram
+    times, bins, data = _spectrogram_input(session)
+    loaded = int(len(times) * 0.9)
+    t0 = time.perf_counter()
+    pyramid = SpectralPyramid(times[:loaded], data[:loaded])
+    t1 = time.perf_counter()
+    pyramid.update(times, data, times[loaded], times[-1])
+    t2 = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(12, 3), dpi=150)
+    ax.set_yscale('log')
+    level = pyramid.select(times[0], times[-1], axes_pixel_width(ax))
+    window_times, window_data = pyramid.window(level, times[0], times[-1])
+    fig.colorbar(draw_spectrogram(ax, window_times, bins, window_data, norm=colors.LogNorm()), ax=ax)
+    fig.savefig(io.BytesIO(), format='png')
+    t3 = time.perf_counter()
+    plt.close(fig)
+    return {'build_ms': (t1 - t0) * 1e3, 'update_ms': (t2 - t1) * 1e3, 'draw_ms': (t3 - t2) * 1e3,
+            'level': level, 'columns': len(window_times)}
+
+
+# ============================================================================
+# Audification
+# ============================================================================
+def _get_audifier(session):
+    session.plotbot
+    from plotbot.audifier import audifier
+    return audifier
+
+
+def _audifier_setup(session):
+    _warm_mag_rtn(session)
+    audifier = _get_audifier(session)
+    audifier.set_save_dir(os.path.join(session.output_dir, 'audio'))
+    audifier.channels = 1
+
+
+@benchmark(repeats=3, setup=_audifier_setup, group='audifier')
+def bench_audifier_export(session):
+    """Audify full-cadence br, bt, bn over the interval as mono WAV files."""
+    pb = session.plotbot
+    _get_audifier(session).audify(session.full_trange, pb.mag_rtn.br, pb.mag_rtn.bt, pb.mag_rtn.bn)
+
+
+@benchmark(repeats=3, setup=_audifier_setup, group='audifier')
+def bench_audifier_export_four_components(session):
+    """Audify br, bt, bn, bmag as mono WAV files (clipped once, exported concurrently)."""
+    pb = session.plotbot
+    _get_audifier(session).audify(session.full_trange, pb.mag_rtn.br, pb.mag_rtn.bt, pb.mag_rtn.bn,
+                                  pb.mag_rtn.bmag)
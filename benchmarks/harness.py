@@ -0,0 +1,244 @@
+# benchmarks/harness.py
+"""
+Minimal, dependency-free benchmark harness.
+
+Benchmarks are registered with the ``@benchmark`` decorator. Each one is a
+function taking a ``session`` object (see ``benchmarks.session``) and may
+return a dict of extra metrics. Timing runs are repeated and the median is
+reported; peak memory is measured in one extra run under ``tracemalloc``
+(numpy registers its buffers with tracemalloc, so array allocations count).
+
+Results are compared against a stored JSON baseline. A benchmark regresses
+when its median time or peak memory exceeds the baseline by more than the
+relative threshold AND by more than an absolute noise floor.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+DEFAULT_THRESHOLD = 0.25        # 25% slower / larger than baseline fails
+DEFAULT_MIN_SECONDS = 0.02      # ignore timing deltas below 20 ms (scheduler noise)
+DEFAULT_MIN_PEAK_MB = 2.0       # ignore memory deltas below 2 MB
+
+_REGISTRY = {}
+
+
+class BenchmarkCase:
+    """A registered benchmark: a callable plus its repeat/setup configuration."""
+
+    def __init__(self, name, func, repeats=3, setup=None, track_memory=True, group='default'):
+        self.name = name
+        self.func = func
+        self.repeats = repeats
+        self.setup = setup
+        self.track_memory = track_memory
+        self.group = group
+
+    def __repr__(self):
+        return f"BenchmarkCase({self.name!r}, repeats={self.repeats}, group={self.group!r})"
+
+
+def benchmark(name=None, repeats=3, setup=None, track_memory=True, group='default'):
+    """
+    Register a benchmark function.
+
+    Parameters
+    ----------
+    name : str, optional
+        Benchmark name (defaults to the function name without a ``bench_`` prefix).
+    repeats : int
+        Number of timed runs; the median is reported.
+    setup : callable, optional
+        Called with the session before every run (timed and memory runs); not timed.
+    track_memory : bool
+        If False, skip the tracemalloc run (e.g. for subprocess benchmarks that
+        report their own peak memory through the returned metrics).
+    group : str
+        Free-form label used for grouping in reports.
+    """
+    def decorator(func):
+        case_name = name or func.__name__.replace('bench_', '', 1)
+        _REGISTRY[case_name] = BenchmarkCase(case_name, func, repeats, setup, track_memory, group)
+        return func
+    return decorator
+
+
+def registered_benchmarks():
+    """Return the registered benchmarks in registration order."""
+    return list(_REGISTRY.values())
+
+
+def run_case(case, session, quiet=True):
+    """
+    Run a single benchmark case.
+
+    With ``quiet`` (default) anything the case prints to stdout is discarded so
+    plotbot's status output does not interleave with the report.
+
+    Returns
+    -------
+    dict
+        {'seconds': median, 'min_seconds': best, 'repeats': n, 'peak_mb': peak, ...extra metrics}
+    """
+    if quiet:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return run_case(case, session, quiet=False)
+
+    timings = []
+    extra = {}
+    for _ in range(max(1, case.repeats)):
+        if case.setup is not None:
+            case.setup(session)
+        gc.collect()
+        start = time.perf_counter()
+        metrics = case.func(session)
+        timings.append(time.perf_counter() - start)
+        if isinstance(metrics, dict):
+            extra.update(metrics)
+
+    result = {
+        'seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'repeats': len(timings),
+    }
+
+    if case.track_memory:
+        if case.setup is not None:
+            case.setup(session)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.func(session)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_mb'] = peak / 1e6
+
+    # Benchmarks may report their own metrics (including peak_mb for subprocess runs)
+    result.update(extra)
+    return result
+
+
+def run_benchmarks(session, only=None, stream=sys.stdout):
+    """Run all registered benchmarks (optionally filtered by substring) and return {name: result}."""
+    results = {}
+    for case in registered_benchmarks():
+        if only and not any(pattern in case.name for pattern in only):
+            continue
+        stream.write(f"  ⏱️  {case.name:<32}")
+        stream.flush()
+        try:
+            result = run_case(case, session)
+        except Exception as e:
+            stream.write(f" ERROR: {e}\n")
+            results[case.name] = {'error': f"{type(e).__name__}: {e}"}
+            continue
+        results[case.name] = result
+        peak = f"{result['peak_mb']:9.1f} MB" if 'peak_mb' in result else ' ' * 12
+        stream.write(f" {result['seconds'] * 1000:10.1f} ms  {peak}\n")
+    return results
+
+
+def environment_info():
+    """Describe the machine a result set was recorded on."""
+    import numpy as np
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'recorded': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def load_baseline(path):
+    """Load a baseline file written by ``save_baseline``; returns {} if it does not exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, params=None):
+    """Write results (dropping errored cases) to ``path`` as a new baseline."""
+    payload = {
+        'environment': environment_info(),
+        'params': params or {},
+        'results': {name: res for name, res in results.items() if 'error' not in res},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    return path
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD,
+                        min_seconds=DEFAULT_MIN_SECONDS, min_peak_mb=DEFAULT_MIN_PEAK_MB):
+    """
+    Compare a result set against a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        {name: result} as returned by ``run_benchmarks``.
+    baseline : dict
+        Baseline payload as returned by ``load_baseline``.
+    threshold : float
+        Allowed relative increase (0.25 == 25%). A per-benchmark override can be
+        stored in the baseline as ``results[name]['threshold']``.
+    min_seconds, min_peak_mb : float
+        Absolute noise floors; smaller deltas never count as regressions.
+
+    Returns
+    -------
+    list of dict
+        One entry per regressed metric: {'name', 'metric', 'baseline', 'current', 'ratio'}.
+        Benchmarks that errored are reported with metric 'error'.
+    """
+    baseline_results = baseline.get('results', {}) if baseline else {}
+    regressions = []
+    for name, current in results.items():
+        if 'error' in current:
+            regressions.append({'name': name, 'metric': 'error', 'baseline': None,
+                                'current': current['error'], 'ratio': None})
+            continue
+        reference = baseline_results.get(name)
+        if not reference:
+            continue
+        case_threshold = reference.get('threshold', threshold)
+        for metric, floor in (('seconds', min_seconds), ('peak_mb', min_peak_mb)):
+            if metric not in current or metric not in reference:
+                continue
+            base_val, cur_val = reference[metric], current[metric]
+            if cur_val - base_val <= floor:
+                continue
+            if base_val > 0 and cur_val > base_val * (1.0 + case_threshold):
+                regressions.append({'name': name, 'metric': metric, 'baseline': base_val,
+                                    'current': cur_val, 'ratio': cur_val / base_val})
+    return regressions
+
+
+def format_report(results, baseline=None):
+    """Return a plain-text table of results with ratios against the baseline (if any)."""
+    baseline_results = baseline.get('results', {}) if baseline else {}
+    lines = [f"{'benchmark':<34}{'median ms':>12}{'vs base':>10}{'peak MB':>12}{'vs base':>10}"]
+    for name, res in results.items():
+        if 'error' in res:
+            lines.append(f"{name:<34}{'ERROR':>12}  {res['error']}")
+            continue
+        ref = baseline_results.get(name, {})
+        t_ratio = f"{res['seconds'] / ref['seconds']:.2f}x" if ref.get('seconds') else '-'
+        peak = f"{res['peak_mb']:.1f}" if 'peak_mb' in res else '-'
+        m_ratio = f"{res['peak_mb'] / ref['peak_mb']:.2f}x" if ref.get('peak_mb') and 'peak_mb' in res else '-'
+        lines.append(f"{name:<34}{res['seconds'] * 1000:>12.1f}{t_ratio:>10}{peak:>12}{m_ratio:>10}")
+    return '\n'.join(lines)
@@ -0,0 +1,97 @@
+# benchmarks/run.py
+"""
+Command-line entry point for the plotbot benchmark suite.
+
+    python -m benchmarks.run [--hours 1.0] [--only NAME ...] [--threshold 0.25]
+                             [--baseline benchmarks/baseline.json] [--save-baseline]
+                             [--output results.json]
+
+Exit status is 1 when any benchmark errors or regresses against the baseline
+(so it can gate CI), 0 otherwise. The threshold can also be set with the
+PLOTBOT_BENCH_THRESHOLD environment variable.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from . import cases  # noqa: F401  (registers the benchmark cases)
+from .harness import (DEFAULT_MIN_PEAK_MB, DEFAULT_MIN_SECONDS, DEFAULT_THRESHOLD,
+                      compare_to_baseline, format_report, load_baseline, run_benchmarks,
+                      save_baseline)
+from .session import BenchmarkSession
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the plotbot performance regression suite.')
+    parser.add_argument('--hours', type=float, default=1.0,
+                        help='Hours of synthetic data to generate (default: 1.0, ~1M mag_RTN samples).')
+    parser.add_argument('--only', nargs='*', default=None,
+                        help='Only run benchmarks whose name contains one of these substrings.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file.')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write the results as the new baseline instead of comparing.')
+    parser.add_argument('--threshold', type=float,
+                        default=float(os.environ.get('PLOTBOT_BENCH_THRESHOLD', DEFAULT_THRESHOLD)),
+                        help='Allowed relative regression before failing (default: 0.25 = 25%%).')
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help='Absolute timing noise floor in seconds.')
+    parser.add_argument('--min-peak-mb', type=float, default=DEFAULT_MIN_PEAK_MB,
+                        help='Absolute peak-memory noise floor in MB.')
+    parser.add_argument('--output', default=None, help='Also write raw results to this JSON file.')
+    parser.add_argument('--data-dir', default=None,
+                        help='Write synthetic fixtures here instead of a temporary directory.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"📊 Plotbot benchmarks: generating {args.hours:g} h of synthetic PSP data...")
+    session = BenchmarkSession(hours=args.hours, data_dir=args.data_dir)
+    try:
+        results = run_benchmarks(session, only=args.only)
+    finally:
+        session.close()
+
+    params = {'hours': args.hours}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'params': params, 'results': results}, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        path = save_baseline(args.baseline, results, params)
+        print(format_report(results))
+        print(f"\n✅ Baseline written to {path}")
+        return 1 if any('error' in r for r in results.values()) else 0
+
+    baseline = load_baseline(args.baseline)
+    print()
+    print(format_report(results, baseline))
+
+    if baseline and baseline.get('params', {}).get('hours') not in (None, args.hours):
+        print(f"\n⚠️  Baseline was recorded with --hours {baseline['params']['hours']}, "
+              f"this run used --hours {args.hours}; ratios are not comparable.")
+
+    regressions = compare_to_baseline(results, baseline, threshold=args.threshold,
+                                      min_seconds=args.min_seconds, min_peak_mb=args.min_peak_mb)
+    if not baseline:
+        print(f"\n⚠️  No baseline at {args.baseline}; run with --save-baseline to create one.")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for reg in regressions:
+            if reg['metric'] == 'error':
+                print(f"   {reg['name']}: {reg['current']}")
+            else:
+                print(f"   {reg['name']} {reg['metric']}: {reg['baseline']:.4g} -> {reg['current']:.4g} "
+                      f"({reg['ratio']:.2f}x)")
+        return 1
+    print("\n✅ No regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/session.py
+"""
+Benchmark session: owns the synthetic data directory and a configured plotbot import.
+
+All plotbot state changes needed to run offline (data_dir, data_server,
+non-interactive matplotlib, quiet print_manager) live here so that the
+benchmark cases stay short.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+from .synthetic_cdfs import generate_fixtures
+
+
+class BenchmarkSession:
+    """
+    Shared state for one benchmark run.
+
+    Parameters
+    ----------
+    hours : float
+        Hours of synthetic data to generate (1 hour of mag_RTN ~ 1.05M samples).
+    start : str
+        Start of the synthetic interval (UTC, ISO format).
+    data_dir : str, optional
+        Where to write fixtures. A temporary directory is used (and removed on
+        ``close``) when omitted.
+    """
+
+    def __init__(self, hours=1.0, start='2023-09-28 00:00:00', data_dir=None):
+        self.hours = hours
+        self.start = datetime.fromisoformat(start)
+        self._owns_data_dir = data_dir is None
+        self.data_dir = data_dir or tempfile.mkdtemp(prefix='plotbot_bench_')
+        self.output_dir = os.path.join(self.data_dir, '_bench_output')
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.fixtures = generate_fixtures(self.data_dir, start=self.start, hours=hours)
+        self._plotbot = None
+
+    # --- Time ranges ---------------------------------------------------------
+    def trange(self, start_fraction=0.0, end_fraction=1.0):
+        """Return a plotbot trange covering the given fraction of the synthetic interval."""
+        total = timedelta(hours=self.hours)
+        t0 = self.start + total * start_fraction
+        t1 = self.start + total * end_fraction
+        fmt = '%Y-%m-%d/%H:%M:%S.%f'
+        return [t0.strftime(fmt)[:-3], t1.strftime(fmt)[:-3]]
+
+    @property
+    def full_trange(self):
+        return self.trange(0.0, 1.0)
+
+    # --- plotbot access ------------------------------------------------------
+    @property
+    def plotbot(self):
+        """Import and configure plotbot on first access (so cold-import timing stays separate)."""
+        if self._plotbot is None:
+            import matplotlib
+            matplotlib.use('Agg')
+            import plotbot
+            from plotbot import config, print_manager, ploptions
+
+            config.data_dir = self.data_dir
+            config.data_server = 'berkeley'  # local files are found first; no network involved
+            config.suppress_plots = True
+            ploptions.display_figure = False
+            ploptions.return_figure = True
+            for attr in ('show_status', 'show_debug', 'show_processing', 'show_data_cubby',
+                         'show_custom_debug', 'show_variable_testing', 'show_time_tracking'):
+                if hasattr(print_manager, attr):
+                    setattr(print_manager, attr, False)
+            self._plotbot = plotbot
+        return self._plotbot
+
+    def reset_data_type(self, cubby_key, data_type=None):
+        """
+        Forget everything plotbot knows about a data type so the next request re-imports it.
+
+        Clears the tracker ranges and resets the registered global instance in place,
+        so references held by the benchmark (e.g. ``plotbot.mag_rtn``) stay valid.
+        """
+        from plotbot.data_cubby import data_cubby
+        from plotbot.data_tracker import global_tracker
+
+        for key in {cubby_key, data_type or cubby_key}:
+            global_tracker.calculated_ranges.pop(key, None)
+            global_tracker.imported_ranges.pop(key, None)
+        instance = data_cubby.grab(cubby_key)
+        if instance is not None:
+            type(instance).__init__(instance, None)
+        return instance
+
+    def close(self):
+        """Remove the temporary data directory (if the session created it)."""
+        if self._owns_data_dir:
+            shutil.rmtree(self.data_dir, ignore_errors=True)
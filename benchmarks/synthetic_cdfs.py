@@ -0,0 +1,293 @@
+# benchmarks/synthetic_cdfs.py
+"""
+Offline generator for synthetic PSP-like CDF fixtures.
+
+Writes files with the same names, directory layout, epoch variables and
+data variables that plotbot's ``data_types`` expects, so the full
+``get_data`` -> ``import_data_function`` -> ``data_cubby`` pipeline can be
+exercised without any network access.
+
+Generated products:
+    mag_RTN           FIELDS full-cadence RTN field (~293 Hz, 6-hour files)
+    mag_RTN_4sa       FIELDS 4 samples/cycle RTN field (daily files)
+    spi_sf00_l3_mom   SPAN-I L3 moments (daily files)
+    spe_sf0_pad       SPAN-E L3 pitch-angle distributions (daily files)
+    spi_sf00_8dx32ex8a  SPAN-I L2 VDFs (daily files)
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import cdflib
+from cdflib.cdfwrite import CDF
+
+FILLVAL_FLOAT = -1.0e31
+
+# Cadences (seconds)
+MAG_FULL_CADENCE = 1.0 / 292.97
+MAG_4SA_CADENCE = 1.0 / 4.58
+SPI_MOM_CADENCE = 3.5
+SPE_PAD_CADENCE = 13.98
+SPI_VDF_CADENCE = 6.99
+
+# Product definitions: relative local path (below data_dir), file name template, epoch var name
+PRODUCTS = {
+    'mag_RTN': {
+        'local_path': os.path.join('psp', 'fields', 'l2', 'mag_rtn'),
+        'file_name': 'psp_fld_l2_mag_RTN_{date_hour_str}_v02.cdf',
+        'epoch_var': 'epoch_mag_RTN',
+        'cadence': MAG_FULL_CADENCE,
+        'file_span_hours': 6,
+    },
+    'mag_RTN_4sa': {
+        'local_path': os.path.join('psp', 'fields', 'l2', 'mag_rtn_4_per_cycle'),
+        'file_name': 'psp_fld_l2_mag_RTN_4_Sa_per_Cyc_{date_str}_v02.cdf',
+        'epoch_var': 'epoch_mag_RTN_4_Sa_per_Cyc',
+        'cadence': MAG_4SA_CADENCE,
+        'file_span_hours': 24,
+    },
+    'spi_sf00_l3_mom': {
+        'local_path': os.path.join('psp', 'sweap', 'spi', 'l3', 'spi_sf00_l3_mom'),
+        'file_name': 'psp_swp_spi_sf00_L3_mom_{date_str}_v04.cdf',
+        'epoch_var': 'Epoch',
+        'cadence': SPI_MOM_CADENCE,
+        'file_span_hours': 24,
+    },
+    'spe_sf0_pad': {
+        'local_path': os.path.join('psp', 'sweap', 'spe', 'l3', 'spe_sf0_pad'),
+        'file_name': 'psp_swp_spe_sf0_L3_pad_{date_str}_v04.cdf',
+        'epoch_var': 'Epoch',
+        'cadence': SPE_PAD_CADENCE,
+        'file_span_hours': 24,
+    },
+    'spi_sf00_8dx32ex8a': {
+        'local_path': os.path.join('psp', 'sweap', 'spi', 'l2', 'spi_sf00_8dx32ex8a'),
+        'file_name': 'psp_swp_spi_sf00_L2_8Dx32Ex8A_{date_str}_v04.cdf',
+        'epoch_var': 'Epoch',
+        'cadence': SPI_VDF_CADENCE,
+        'file_span_hours': 24,
+    },
+}
+
+
+def _tt2000_axis(start, hours, cadence):
+    """Return an evenly spaced int64 TT2000 axis starting at ``start`` (datetime)."""
+    start_tt2000 = cdflib.cdfepoch.compute_tt2000(
+        [start.year, start.month, start.day, start.hour, start.minute, start.second, 0]
+    )
+    n_samples = int(hours * 3600.0 / cadence)
+    offsets_ns = (np.arange(n_samples, dtype=np.float64) * cadence * 1e9).astype(np.int64)
+    return np.int64(start_tt2000) + offsets_ns
+
+
+def _write_cdf(path, epoch_var, tt2000, variables):
+    """
+    Write a CDF containing a TT2000 epoch plus the given record-varying variables.
+
+    ``variables`` maps name -> ndarray whose first axis is the record axis.
+    Float variables get a FILLVAL attribute like the real L2/L3 products.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+
+    cdf = CDF(path, cdf_spec={'Majority': 'row_major'}, delete=True)
+    cdf.write_globalattrs({'Project': {0: 'PSP'}, 'Source_name': {0: 'plotbot synthetic benchmark fixture'}})
+
+    cdf.write_var(
+        {'Variable': epoch_var, 'Data_Type': CDF.CDF_TIME_TT2000, 'Num_Elements': 1,
+         'Rec_Vary': True, 'Dim_Sizes': []},
+        var_attrs={'FILLVAL': [np.int64(-9223372036854775808), 'CDF_TIME_TT2000']},
+        var_data=tt2000,
+    )
+
+    for name, data in variables.items():
+        data = np.ascontiguousarray(data)
+        if data.dtype == np.float32:
+            data_type = CDF.CDF_REAL4
+        else:
+            data = data.astype(np.float64, copy=False)
+            data_type = CDF.CDF_REAL8
+        cdf.write_var(
+            {'Variable': name, 'Data_Type': data_type, 'Num_Elements': 1,
+             'Rec_Vary': True, 'Dim_Sizes': list(data.shape[1:])},
+            var_attrs={'FILLVAL': [FILLVAL_FLOAT, 'CDF_REAL4' if data_type == CDF.CDF_REAL4 else 'CDF_REAL8']},
+            var_data=data,
+        )
+    cdf.close()
+    return path
+
+
+def _mag_field(n, rng, fill_fraction=0.0):
+    """Alfvenic-looking RTN field: a rotating vector on top of a radial background plus noise."""
+    phase = np.cumsum(rng.normal(0.0, 0.02, n))
+    br = -80.0 + 20.0 * np.cos(phase)
+    bt = 20.0 * np.sin(phase)
+    bn = 10.0 * np.sin(0.5 * phase) + rng.normal(0.0, 1.0, n)
+    field = np.column_stack([br, bt, bn]).astype(np.float32)
+    if fill_fraction > 0:
+        fill_idx = rng.choice(n, size=max(1, int(n * fill_fraction)), replace=False)
+        field[fill_idx, :] = FILLVAL_FLOAT
+    return field
+
+
+def write_mag_rtn(data_dir, start, hours, rng):
+    """Full-cadence (~293 Hz) RTN magnetic field, split into 6-hour files like the Berkeley archive."""
+    spec = PRODUCTS['mag_RTN']
+    written = []
+    block_start = start.replace(hour=(start.hour // 6) * 6, minute=0, second=0, microsecond=0)
+    end = start + timedelta(hours=hours)
+    while block_start < end:
+        seg_start = max(start, block_start)
+        seg_end = min(end, block_start + timedelta(hours=6))
+        seg_hours = (seg_end - seg_start).total_seconds() / 3600.0
+        tt2000 = _tt2000_axis(seg_start, seg_hours, spec['cadence'])
+        field = _mag_field(len(tt2000), rng, fill_fraction=1e-5)
+        name = spec['file_name'].format(date_hour_str=block_start.strftime('%Y%m%d%H'))
+        path = os.path.join(data_dir, spec['local_path'], str(block_start.year), name)
+        written.append(_write_cdf(path, spec['epoch_var'], tt2000, {'psp_fld_l2_mag_RTN': field}))
+        block_start += timedelta(hours=6)
+    return written
+
+
+def _daily_files(data_dir, product, start, hours, rng, make_variables):
+    """Write one file per day covering [start, start + hours), with variables from ``make_variables``."""
+    spec = PRODUCTS[product]
+    written = []
+    end = start + timedelta(hours=hours)
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < end:
+        seg_start = max(start, day)
+        seg_end = min(end, day + timedelta(days=1))
+        seg_hours = (seg_end - seg_start).total_seconds() / 3600.0
+        tt2000 = _tt2000_axis(seg_start, seg_hours, spec['cadence'])
+        name = spec['file_name'].format(date_str=day.strftime('%Y%m%d'))
+        path = os.path.join(data_dir, spec['local_path'], str(day.year), name)
+        written.append(_write_cdf(path, spec['epoch_var'], tt2000, make_variables(len(tt2000), rng)))
+        day += timedelta(days=1)
+    return written
+
+
+def _mag_4sa_variables(n, rng):
+    return {'psp_fld_l2_mag_RTN_4_Sa_per_Cyc': _mag_field(n, rng)}
+
+
+def _spi_moment_variables(n, rng):
+    """SPAN-I L3 moments with plausible near-Sun values."""
+    energy_bins = np.geomspace(50.0, 20000.0, 32)
+    theta_bins = np.linspace(-52.0, 52.0, 8)
+    phi_bins = np.linspace(95.0, 175.0, 8)
+    vr = 350.0 + 50.0 * np.sin(np.linspace(0, 6 * np.pi, n)) + rng.normal(0, 10, n)
+    velocity = np.column_stack([vr, rng.normal(20, 15, n), rng.normal(0, 15, n)])
+    density = np.abs(rng.normal(300.0, 40.0, n))
+    temperature = np.abs(rng.normal(60.0, 10.0, n))
+    magf = _mag_field(n, rng).astype(np.float64)
+    tperp = temperature * 1.1
+    tpar = temperature * 0.9
+    tensor = np.column_stack([tperp, tperp, tpar, rng.normal(0, 1, n), rng.normal(0, 1, n), rng.normal(0, 1, n)])
+    energy_spectrum = np.exp(-((np.log(energy_bins)[None, :] - np.log(800.0)) ** 2)) * 1e9
+    energy_flux = energy_spectrum * (1 + 0.1 * rng.random((n, 32)))
+    theta_flux = np.exp(-(theta_bins[None, :] / 30.0) ** 2) * 1e9 * (1 + 0.1 * rng.random((n, 8)))
+    phi_flux = np.exp(-((phi_bins[None, :] - 160.0) / 20.0) ** 2) * 1e9 * (1 + 0.1 * rng.random((n, 8)))
+    return {
+        'VEL_RTN_SUN': velocity,
+        'DENS': density,
+        'TEMP': temperature,
+        'MAGF_INST': magf,
+        'T_TENSOR_INST': tensor,
+        'EFLUX_VS_ENERGY': energy_flux,
+        'EFLUX_VS_THETA': theta_flux,
+        'EFLUX_VS_PHI': phi_flux,
+        'ENERGY_VALS': np.broadcast_to(energy_bins, (n, 32)),
+        'THETA_VALS': np.broadcast_to(theta_bins, (n, 8)),
+        'PHI_VALS': np.broadcast_to(phi_bins, (n, 8)),
+        'SUN_DIST': np.full(n, 13.0 * 695700.0) + np.linspace(0, 1e5, n),
+    }
+
+
+def _spe_pad_variables(n, rng):
+    """SPAN-E pitch-angle spectra: 12 pitch angles x 32 energies with a field-aligned strahl beam."""
+    pitch_angles = np.linspace(7.5, 172.5, 12)
+    strahl_shape = np.exp(-(pitch_angles / 40.0) ** 2)[None, :, None]
+    energy_shape = np.geomspace(1.0, 1e-3, 32)[None, None, :]
+    eflux = (1e8 * strahl_shape * energy_shape) * (1 + 0.2 * rng.random((n, 12, 32)))
+    return {
+        'EFLUX_VS_PA_E': eflux,
+        'PITCHANGLE': np.broadcast_to(pitch_angles, (n, 12)),
+    }
+
+
+def _spi_vdf_variables(n, rng):
+    """SPAN-I 8D x 32E x 8A VDFs flattened to 2048 bins per record, as in the L2 product."""
+    theta = np.repeat(np.linspace(-52.0, 52.0, 8), 256)
+    energy = np.tile(np.repeat(np.geomspace(50.0, 20000.0, 32), 8), 8)
+    phi = np.tile(np.linspace(95.0, 175.0, 8), 256)
+    core = np.exp(-((np.log(energy) - np.log(800.0)) ** 2)) * np.exp(-(theta / 30.0) ** 2)
+    eflux = core[None, :] * 1e9 * (1 + 0.2 * rng.random((n, 2048)))
+    rotmat = np.broadcast_to(np.eye(3), (n, 3, 3))
+    return {
+        'THETA': np.broadcast_to(theta, (n, 2048)),
+        'PHI': np.broadcast_to(phi, (n, 2048)),
+        'ENERGY': np.broadcast_to(energy, (n, 2048)),
+        'EFLUX': eflux,
+        'ROTMAT_SC_INST': rotmat,
+    }
+
+
+def generate_fixtures(data_dir, start='2023-09-28 00:00:00', hours=1.0, seed=17, products=None):
+    """
+    Generate synthetic PSP CDFs below ``data_dir`` (the value to use for ``plotbot.config.data_dir``).
+
+    Parameters
+    ----------
+    data_dir : str
+        Root data directory to populate.
+    start : str or datetime
+        Start of the generated interval (UTC).
+    hours : float
+        Length of the generated interval. 1 hour of mag_RTN is ~1.05M samples.
+    seed : int
+        Seed for the random generator so fixtures are reproducible.
+    products : list of str, optional
+        Subset of PRODUCTS keys to generate. Defaults to all.
+
+    Returns
+    -------
+    dict
+        Mapping of product name -> list of written file paths.
+    """
+    if isinstance(start, str):
+        start = datetime.fromisoformat(start)
+    products = list(PRODUCTS) if products is None else products
+    rng = np.random.default_rng(seed)
+
+    writers = {
+        'mag_RTN': lambda: write_mag_rtn(data_dir, start, hours, rng),
+        'mag_RTN_4sa': lambda: _daily_files(data_dir, 'mag_RTN_4sa', start, hours, rng, _mag_4sa_variables),
+        'spi_sf00_l3_mom': lambda: _daily_files(data_dir, 'spi_sf00_l3_mom', start, hours, rng, _spi_moment_variables),
+        'spe_sf0_pad': lambda: _daily_files(data_dir, 'spe_sf0_pad', start, hours, rng, _spe_pad_variables),
+        'spi_sf00_8dx32ex8a': lambda: _daily_files(data_dir, 'spi_sf00_8dx32ex8a', start, hours, rng, _spi_vdf_variables),
+    }
+
+    written = {}
+    for product in products:
+        if product not in writers:
+            raise ValueError(f"Unknown synthetic product '{product}'. Choose from {list(PRODUCTS)}")
+        written[product] = writers[product]()
+    return written
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate synthetic PSP CDF fixtures for plotbot benchmarks.')
+    parser.add_argument('data_dir')
+    parser.add_argument('--start', default='2023-09-28 00:00:00')
+    parser.add_argument('--hours', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    for product, paths in generate_fixtures(args.data_dir, args.start, args.hours, args.seed).items():
+        for path in paths:
+            print(f"{product}: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
@@ -66,161 +66,204 @@ class _LazyPlt:
 mpl_plt = _LazyPlt()
 plt = mpl_plt  # Alias for convenience
 
-# Import core components
+# ============================================================================
+# Everything below numpy loads on first use.
+# The data classes, data_cubby and the plotting functions pull in pandas,
+# scipy, matplotlib, numba and cdflib (and pyspedas/dash/plotly/ipywidgets on
+# demand), so `import plotbot` only creates proxies for them: the first
+# attribute access or call imports the module, and the proxy then replaces
+# itself here so `plotbot.<name>` is the real object from then on.
+# tests/test_startup_budget.py keeps the import within budget.
+# ============================================================================
+import sys as _sys
+import types as _types
+from pathlib import Path as _Path
+
+from .lazy_loader import (LazyModule, LazyObject, LazyDataClass, register_cubby_loader, register_data_class,
+                          register_lazy_object)
+
+# Import core components (light: no heavy dependencies)
 with time_block("core_components"):
     from .print_manager import print_manager
-    from .server_access import server_access 
-    from .data_tracker import global_tracker
-    from .plot_config import plot_config
-    from .data_cubby import data_cubby
-    from .plot_manager import plot_manager
     from .config import config
+    from .plot_config import plot_config
+    from .ploptions import ploptions
+
+
+class _PlotbotModule(_types.ModuleType):
+    """
+    The plotbot package module.
+
+    Importing a submodule binds it on the package, which would replace a lazy
+    export of the same name (``plotbot.multiplot`` is the function, not the
+    module) when that export loads; such bindings are ignored.
+    """
+
+    def __setattr__(self, name, value):
+        current = self.__dict__.get(name)
+        if (isinstance(value, _types.ModuleType) and value.__name__ == f"{__name__}.{name}"
+                and current is not None and not issubclass(type(current), (_types.ModuleType, LazyModule))):
+            return
+        super().__setattr__(name, value)
+
+
+_sys.modules[__name__].__class__ = _PlotbotModule
+
+
+def _rebind(*names):
+    """on_load callback: put the loaded object in place of its proxy."""
+    def bind(value):
+        for name in names:
+            globals()[name] = value
+    return bind
 
-# Import helper functions needed for export
-from .plotbot_helpers import time_clip
 
-# Import data classes and their instances (Updated Paths)
-with time_block("psp_data_classes"):
-    from .data_classes.psp_mag_rtn_4sa import mag_rtn_4sa, mag_rtn_4sa_class
-    from .data_classes.psp_mag_rtn import mag_rtn, mag_rtn_class
-    from .data_classes.psp_mag_sc_4sa import mag_sc_4sa, mag_sc_4sa_class
-    from .data_classes.psp_mag_sc import mag_sc, mag_sc_class
-    from .data_classes.psp_electron_classes import epad, epad_hr, epad_strahl_class, epad_strahl_high_res_class
-    from .data_classes.psp_proton import proton, proton_class
-    from .data_classes.psp_proton_hr import proton_hr, proton_hr_class
-    from .data_classes.psp_proton_fits_classes import proton_fits # Import the FITS class
-    from .data_classes.psp_alpha_fits_classes import alpha_fits, alpha_fits_class # Import the alpha FITS class
-    from .data_classes.psp_ham_classes import ham, ham_class # ADDED: Import the HAM class instance and class
-
-# WIND satellite data classes
-with time_block("wind_data_classes"):
-    from .data_classes.wind_mfi_classes import wind_mfi_h2, wind_mfi_h2_class
-    from .data_classes.wind_3dp_classes import wind_3dp_elpd, wind_3dp_elpd_class
-    from .data_classes.wind_swe_h5_classes import wind_swe_h5, wind_swe_h5_class
-    from .data_classes.wind_swe_h1_classes import wind_swe_h1, wind_swe_h1_class
-    from .data_classes.wind_3dp_pm_classes import wind_3dp_pm, wind_3dp_pm_class
-    from .data_classes.psp_alpha_classes import psp_alpha, psp_alpha_class
-    from .data_classes.psp_qtn_classes import psp_qtn, psp_qtn_class
-    from .data_classes.psp_dfb_classes import psp_dfb, psp_dfb_class
-    from .data_classes.psp_orbit import psp_orbit, psp_orbit_class
-    from .data_classes.psp_span_vdf import psp_span_vdf, psp_span_vdf_class
-
-# ==============================================================================
-# Custom Class Imports (auto-generated)
-# To add new classes: run cdf_to_plotbot('path/to/file.cdf') and this will be updated
-# ------------------------------------------------------------------------------
-# ✨ Custom classes now load DYNAMICALLY via _auto_register_custom_classes()
-# ✨ No manual imports needed! Just run cdf_to_plotbot() and classes appear automatically.
-# ------------------------------------------------------------------------------
-# ==============================================================================
-
-# Import custom generated classes explicitly for type hinting and IDE support
-# (psp_waves_timeseries and psp_waves_spectral removed - will regenerate with auto-naming)
-
-
-# --- Explicitly Register Global Instances with DataCubby --- #
-with time_block("data_cubby_registration"):
-    data_cubby.stash(mag_rtn_4sa, class_name='mag_rtn_4sa')
-    data_cubby.stash(mag_rtn, class_name='mag_rtn')
-    data_cubby.stash(mag_sc_4sa, class_name='mag_sc_4sa')
-    data_cubby.stash(mag_sc, class_name='mag_sc')
-    data_cubby.stash(epad, class_name='epad')
-    data_cubby.stash(epad_hr, class_name='epad_hr')
-    data_cubby.stash(proton, class_name='proton')
-    data_cubby.stash(proton_hr, class_name='proton_hr')
-    data_cubby.stash(proton_fits, class_name='proton_fits')
-    data_cubby.stash(alpha_fits, class_name='alpha_fits')
-    data_cubby.stash(ham, class_name='ham')
-    # Register WIND satellite instances
-    data_cubby.stash(wind_mfi_h2, class_name='wind_mfi_h2')
-    data_cubby.stash(wind_3dp_elpd, class_name='wind_3dp_elpd')
-    data_cubby.stash(wind_3dp_pm, class_name='wind_3dp_pm')
-    data_cubby.stash(psp_alpha, class_name='psp_alpha')
-    data_cubby.stash(wind_swe_h5, class_name='wind_swe_h5')
-    data_cubby.stash(wind_swe_h1, class_name='wind_swe_h1')
-    data_cubby.stash(psp_span_vdf, class_name='psp_span_vdf')
-    data_cubby.stash(psp_qtn, class_name='psp_qtn')
-    data_cubby.stash(psp_dfb, class_name='psp_dfb')
-    data_cubby.stash(psp_orbit, class_name='psp_orbit')
-    # Register individual DFB data types to the same psp_dfb instance
-    data_cubby.stash(psp_dfb, class_name='dfb_ac_spec_dv12hg')
-    data_cubby.stash(psp_dfb, class_name='dfb_ac_spec_dv34hg')
-    data_cubby.stash(psp_dfb, class_name='dfb_dc_spec_dv12hg')
-
-# --- Auto-register Custom CDF Classes --- #
-# Initialize __all__ early so custom classes can be added
 __all__ = []
 
-def _auto_register_custom_classes():
-    """Automatically scan and register all classes in data_classes/custom_classes/"""
-    import os
-    import importlib
-    from pathlib import Path
-    
-    custom_classes_dir = Path(__file__).parent / "data_classes" / "custom_classes"
-    
+# --- Data classes --- #
+# instance name -> (module in plotbot.data_classes, class name, extra data_cubby keys).
+# Each instance is stashed in data_cubby (under its name and the extra keys) the
+# first time it is used, or when data_cubby is asked for one of those keys.
+_DATA_CLASSES = {
+    'mag_rtn_4sa': ('psp_mag_rtn_4sa', 'mag_rtn_4sa_class', ()),
+    'mag_rtn': ('psp_mag_rtn', 'mag_rtn_class', ()),
+    'mag_sc_4sa': ('psp_mag_sc_4sa', 'mag_sc_4sa_class', ()),
+    'mag_sc': ('psp_mag_sc', 'mag_sc_class', ()),
+    'epad': ('psp_electron_classes', 'epad_strahl_class', ()),
+    'epad_hr': ('psp_electron_classes', 'epad_strahl_high_res_class', ()),
+    'proton': ('psp_proton', 'proton_class', ()),
+    'proton_hr': ('psp_proton_hr', 'proton_hr_class', ()),
+    'proton_fits': ('psp_proton_fits_classes', 'proton_fits_class', ()),
+    'alpha_fits': ('psp_alpha_fits_classes', 'alpha_fits_class', ()),
+    'ham': ('psp_ham_classes', 'ham_class', ()),
+    # WIND satellite data classes
+    'wind_mfi_h2': ('wind_mfi_classes', 'wind_mfi_h2_class', ()),
+    'wind_3dp_elpd': ('wind_3dp_classes', 'wind_3dp_elpd_class', ()),
+    'wind_3dp_pm': ('wind_3dp_pm_classes', 'wind_3dp_pm_class', ()),
+    'wind_swe_h5': ('wind_swe_h5_classes', 'wind_swe_h5_class', ()),
+    'wind_swe_h1': ('wind_swe_h1_classes', 'wind_swe_h1_class', ()),
+    'psp_alpha': ('psp_alpha_classes', 'psp_alpha_class', ()),
+    'psp_qtn': ('psp_qtn_classes', 'psp_qtn_class', ()),
+    # The individual DFB data types share the psp_dfb instance
+    'psp_dfb': ('psp_dfb_classes', 'psp_dfb_class', ('dfb_ac_spec_dv12hg', 'dfb_ac_spec_dv34hg', 'dfb_dc_spec_dv12hg')),
+    'psp_orbit': ('psp_orbit', 'psp_orbit_class', ()),
+    'psp_span_vdf': ('psp_span_vdf', 'psp_span_vdf_class', ()),
+}
+
+# Names served by __getattr__ below (not in __all__): module path, attribute
+_LAZY_ATTRIBUTES = {
+    'CustomVariablesContainer': (f"{__name__}.data_classes.custom_variables", 'CustomVariablesContainer'),
+}
+
+
+def _add_data_class(name, module_path, class_name, extra_keys=()):
+    proxy = LazyDataClass(module_path, class_name, name, cubby_keys=(name,) + tuple(extra_keys),
+                          on_load=_rebind(name))
+    register_data_class(proxy)
+    globals()[name] = proxy
+    _LAZY_ATTRIBUTES[class_name] = (module_path, class_name)
+    __all__.append(name)
+
+
+with time_block("psp_data_classes"):
+    for _name, (_module, _class_name, _extra_keys) in _DATA_CLASSES.items():
+        _add_data_class(_name, f"{__name__}.data_classes.{_module}", _class_name, _extra_keys)
+
+
+# --- Custom CDF classes --- #
+# ✨ Every module in data_classes/custom_classes/ (generated by cdf_to_plotbot) is
+# ✨ exposed as plotbot.<module name>; nothing is imported until it is used.
+def _register_custom_classes():
+    """Expose every class in data_classes/custom_classes/ as a lazy data class."""
+    custom_classes_dir = _Path(__file__).parent / "data_classes" / "custom_classes"
     if not custom_classes_dir.exists():
         return
-    
-    # Find all .py files in custom_classes directory
-    for py_file in custom_classes_dir.glob("*.py"):
+    for py_file in sorted(custom_classes_dir.glob("*.py")):
         if py_file.name.startswith("__"):
             continue  # Skip __init__.py etc.
-            
         module_name = py_file.stem
-        try:
-            # Import the module
-            module = importlib.import_module(f"plotbot.data_classes.custom_classes.{module_name}")
-            
-            # Look for class instance (follows pattern: module_name = module_name_class(None))
-            if hasattr(module, module_name):
-                class_instance = getattr(module, module_name)
-                data_cubby.stash(class_instance, class_name=module_name)
-                print_manager.datacubby(f"Auto-registered custom class: {module_name}")
-
-                # --- THIS IS THE CRITICAL FIX ---
-                # Inject the class instance into the main plotbot module's globals
-                globals()[module_name] = class_instance
-                # Also add to __all__ so it can be imported with `from plotbot import *`
-                if module_name not in __all__:
-                    __all__.append(module_name)
-                print_manager.debug(f"Exposed '{module_name}' as a global plotbot class.")
-                
-        except Exception as e:
-            print_manager.warning(f"Failed to auto-register {module_name}: {e}")
-
-# Auto-register any custom CDF classes BEFORE the rest of __all__ is populated
+        _add_data_class(module_name, f"{__name__}.data_classes.custom_classes.{module_name}",
+                        f"{module_name}_class")
+        print_manager.debug(f"Exposed '{module_name}' as a global plotbot class.")
+
+
 with time_block("auto_register_custom_classes"):
-    _auto_register_custom_classes()
-
-print_manager.datacubby("Registered global data instances with DataCubby.")
-# ---------------------------------------------------------- #
-
-# Import custom variables system
-with time_block("custom_variables"):
-    from .data_classes.custom_variables import custom_variable, CustomVariablesContainer
-    
-    # Get or create the custom variables container and make it globally accessible
-    custom_variables_container = data_cubby.grab('custom_variables')
-    if custom_variables_container is None:
-        custom_variables_container = CustomVariablesContainer()
-    
-    # Make it accessible as plotbot.custom_variables
-    custom_variables = custom_variables_container
-
-# Import test_pilot for testing - safely importing the test functions
-# (test_pilot handles the fallback if pytest is not available)
-#from .test_pilot import run_missions, phase, system_check
+    _register_custom_classes()
+
+
+# --- Functions and objects --- #
+# export name -> (module, attribute)
+_LAZY_EXPORTS = {
+    'plt': ('.multiplot_options', 'plt'),    # our enhanced plt with options support
+    'server_access': ('.server_access', 'server_access'),
+    'global_tracker': ('.data_tracker', 'global_tracker'),
+    'data_cubby': ('.data_cubby', 'data_cubby'),
+    'plot_manager': ('.plot_manager', 'plot_manager'),
+    'time_clip': ('.plotbot_helpers', 'time_clip'),
+    'audifier': ('.audifier', 'audifier'),
+    'custom_variable': ('.data_classes.custom_variables', 'custom_variable'),
+    'plotbot': ('.plotbot_main', 'plotbot'),
+    'plotbot_interactive': ('.plotbot_interactive', 'plotbot_interactive'),
+    'plotbot_interactive_vdf': ('.plotbot_interactive_vdf', 'plotbot_interactive_vdf'),
+    'pbi': ('.plotbot_interactive_options', 'pbi'),
+    'showdahodo': ('.showdahodo', 'showdahodo'),
+    'multiplot': ('.multiplot', 'multiplot'),
+    'MultiplotOptions': ('.multiplot_options', 'MultiplotOptions'),
+    'get_data': ('.get_data', 'get_data'),
+    'vdyes': ('.vdyes', 'vdyes'),
+    'save_simple_snapshot': ('.simple_snapshot', 'save_simple_snapshot'),
+    'load_simple_snapshot': ('.simple_snapshot', 'load_simple_snapshot'),
+    'showda_holes': ('.showda_holes', 'showda_holes'),
+    'cdf_to_plotbot': ('.data_import_cdf', 'cdf_to_plotbot'),
+    'scan_cdf_directory': ('.data_import_cdf', 'scan_cdf_directory'),
+}
+
+for _name, (_module, _attribute) in _LAZY_EXPORTS.items():
+    globals()[_name] = LazyObject(f"{__name__}{_module}", _attribute, _name, on_load=_rebind(_name))
+    register_lazy_object(_name, globals()[_name])
+
+data_snapshot = LazyModule(f"{__name__}.data_snapshot", on_load=_rebind('data_snapshot'))
+
+
+def _custom_variables_container():
+    """The custom variables container registered with data_cubby (created if there is none)."""
+    from .data_cubby import data_cubby
+    from .data_classes.custom_variables import CustomVariablesContainer
+    container = data_cubby.cubby.get('custom_variables')
+    if container is None:
+        container = CustomVariablesContainer()   # stashes itself
+    return container
+
+
+# Make it accessible as plotbot.custom_variables (custom_vars is the older name)
+custom_variables = LazyObject(f"{__name__}.data_classes.custom_variables", 'CustomVariablesContainer',
+                              'custom_variables', on_load=_rebind('custom_variables', 'custom_vars'),
+                              factory=_custom_variables_container)
+custom_vars = custom_variables
+register_cubby_loader('custom_variables', custom_variables._load_function)
+
+
+def __getattr__(name):
+    """Import names outside __all__ (the data classes' classes) on first access."""
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        module_path, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module_path), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
 
 # Add a method to debug custom variables
 def debug_custom_variables():
     """Print information about all custom variables."""
+    from .data_cubby import data_cubby
     print_manager.variable_testing("--- DEBUG: Custom Variables ---")
     custom_instance = data_cubby.grab('custom_class')
     if custom_instance is None:
         print_manager.variable_testing("No custom class found in data_cubby")
         return
-    
+
     if hasattr(custom_instance, 'variables'):
         vars_dict = custom_instance.variables
         var_names = list(vars_dict.keys())
@@ -228,11 +271,11 @@ def debug_custom_variables():
         attrs = [attr for attr in dir(custom_instance) if not attr.startswith('__')]
         var_names = attrs
         vars_dict = {attr: getattr(custom_instance, attr) for attr in attrs}
-    
+
     if not var_names:
         print_manager.variable_testing("No custom variables found")
         return
-    
+
     print_manager.variable_testing(f"Found {len(var_names)} custom variables: {', '.join(var_names)}")
     for name, var in vars_dict.items():
         print_manager.variable_testing(f"Variable: {name}")
@@ -252,161 +295,109 @@ def debug_custom_variables():
                 print_manager.variable_testing(f"  Could not get values: {str(e)}")
     print_manager.variable_testing("--- End DEBUG ---")
 
-# Create custom variables instance
-custom_vars = CustomVariablesContainer()
-
-# Debug custom variables initially
-print_manager.variable_testing("Initial custom variables state:")
-debug_custom_variables()
-
-# Lazy-load audifier (saves 0.3s - only needed for audio generation)
-_audifier = None
-def _get_audifier():
-    """Lazy-load audifier on first use."""
-    global _audifier
-    if _audifier is None:
-        from .audifier import audifier as aud
-        _audifier = aud
-    return _audifier
-
-class _LazyAudifier:
-    """Proxy that loads audifier on first access."""
-    def __getattr__(self, name):
-        return getattr(_get_audifier(), name)
-    def __setattr__(self, name, value):
-        setattr(_get_audifier(), name, value)
-    def __call__(self, *args, **kwargs):
-        return _get_audifier()(*args, **kwargs)
-    def __dir__(self):
-        return dir(_get_audifier())
-
-audifier = _LazyAudifier()
-
-# Import ploptions for figure control
-from .ploptions import ploptions
-
-# Import our enhanced plt with options support
-with time_block("enhanced_plt"):
-    from .multiplot_options import plt
-
-# Import main plotting functions
-with time_block("main_plotting_functions"):
-    from .plotbot_main import plotbot
-    from .plotbot_interactive import plotbot_interactive
-    from .plotbot_interactive_options import pbi
-    from .plotbot_interactive_vdf import plotbot_interactive_vdf
-    from .showdahodo import showdahodo
-    from .multiplot import multiplot
-    from .multiplot_options import MultiplotOptions
-    from .get_data import get_data
-    from .vdyes import vdyes
-    from . import data_snapshot  # Import data_snapshot
-    from .simple_snapshot import save_simple_snapshot, load_simple_snapshot
-
-# --- Import the function from showda_holes.py ---
-from .showda_holes import showda_holes
-
-# --- Import CDF functions for direct access ---
-with time_block("cdf_functions"):
-    from .data_import_cdf import cdf_to_plotbot, scan_cdf_directory
-    from .vdyes import vdyes
+
+def _class_type(instance_name):
+    """Lazy reference to the class of one of the data classes above."""
+    module, class_name, _ = _DATA_CLASSES[instance_name]
+    return LazyObject(f"{__name__}.data_classes.{module}", class_name)
+
 
 # --- CLASS_NAME_MAPPING for test utilities and data integrity checks ---
 CLASS_NAME_MAPPING = {
     'mag_rtn_4sa': {
         'data_type': 'mag_RTN_4sa',
-        'class_type': mag_rtn_4sa_class,
+        'class_type': _class_type('mag_rtn_4sa'),
         'components': ['br', 'bt', 'bn', 'bmag', 'pmag', 'all'],
         'primary_component': 'br'
     },
     'mag_rtn': {
         'data_type': 'mag_RTN',
-        'class_type': mag_rtn_class,
+        'class_type': _class_type('mag_rtn'),
         'components': ['br', 'bt', 'bn', 'bmag', 'pmag', 'all'],
         'primary_component': 'br'
     },
     'mag_sc_4sa': {
         'data_type': 'mag_SC_4sa',
-        'class_type': mag_sc_4sa_class,
+        'class_type': _class_type('mag_sc_4sa'),
         'components': ['bx', 'by', 'bz', 'bmag', 'pmag', 'all'],
         'primary_component': 'bx'
     },
     'mag_sc': {
         'data_type': 'mag_SC',
-        'class_type': mag_sc_class,
+        'class_type': _class_type('mag_sc'),
         'components': ['bx', 'by', 'bz', 'bmag', 'pmag', 'all'],
         'primary_component': 'bx'
     },
     'epad_strahl': {
         'data_type': 'spe_sf0_pad',
-        'class_type': epad_strahl_class,
+        'class_type': _class_type('epad'),
         'components': ['strahl'],
         'primary_component': 'strahl'
     },
     'epad_strahl_high_res': {
         'data_type': 'spe_af0_pad',
-        'class_type': epad_strahl_high_res_class,
+        'class_type': _class_type('epad_hr'),
         'components': ['strahl'],
         'primary_component': 'strahl'
     },
     'proton': {
         'data_type': 'spi_sf00_l3_mom',
-        'class_type': proton_class,
+        'class_type': _class_type('proton'),
         'components': ['anisotropy'],
         'primary_component': 'anisotropy'
     },
     'proton_hr': {
         'data_type': 'spi_af00_L3_mom',
-        'class_type': proton_hr_class,
+        'class_type': _class_type('proton_hr'),
         'components': ['anisotropy'],
         'primary_component': 'anisotropy'
     },
     'ham': {
         'data_type': 'ham',
-        'class_type': ham_class,
+        'class_type': _class_type('ham'),
         'components': ['hamogram_30s'],
         'primary_component': 'hamogram_30s'
     },
     'psp_qtn': {
         'data_type': 'sqtn_rfs_v1v2',
-        'class_type': psp_qtn_class,
+        'class_type': _class_type('psp_qtn'),
         'components': ['density', 'temperature'],
         'primary_component': 'density'
     },
     'psp_orbit': {
         'data_type': 'psp_orbit_data',
-        'class_type': psp_orbit_class,
+        'class_type': _class_type('psp_orbit'),
         'components': ['r_sun', 'carrington_lon', 'carrington_lat', 'heliocentric_distance_au', 'orbital_speed'],
         'primary_component': 'r_sun'
     },
     'psp_dfb': {
         'data_type': 'dfb_ac_spec_dv12hg',  # Primary data type (AC spectra dv12)
-        'class_type': psp_dfb_class,
+        'class_type': _class_type('psp_dfb'),
         'components': ['ac_spec_dv12', 'ac_spec_dv34', 'dc_spec_dv12'],
         'primary_component': 'ac_spec_dv12'
     },
     # Map all DFB data types to the same psp_dfb class instance
     'dfb_ac_spec_dv12hg': {
         'data_type': 'dfb_ac_spec_dv12hg',
-        'class_type': psp_dfb_class,
+        'class_type': _class_type('psp_dfb'),
         'components': ['ac_spec_dv12'],
         'primary_component': 'ac_spec_dv12'
     },
     'dfb_ac_spec_dv34hg': {
         'data_type': 'dfb_ac_spec_dv34hg',
-        'class_type': psp_dfb_class,
+        'class_type': _class_type('psp_dfb'),
         'components': ['ac_spec_dv34'],
         'primary_component': 'ac_spec_dv34'
     },
     'dfb_dc_spec_dv12hg': {
         'data_type': 'dfb_dc_spec_dv12hg',
-        'class_type': psp_dfb_class,
+        'class_type': _class_type('psp_dfb'),
         'components': ['dc_spec_dv12'],
         'primary_component': 'dc_spec_dv12'
     },
 }
 
-# Add the rest of the exports to __all__ (custom classes already added above)
+# Add the rest of the exports to __all__ (data and custom classes already added above)
 __all__.extend([
     'plt',           # Now provides our enhanced plt with options support
     'np',            # Make numpy directly available
@@ -415,38 +406,17 @@ __all__.extend([
     'plotbot_interactive_vdf',  # Interactive VDF plotting with time slider
     'pbi',           # Interactive plotting options
     'ploptions',     # Global plotbot figure control options
-    'showdahodo', 
+    'showdahodo',
     'multiplot',
     'vdyes',         # PSP SPAN-I VDF plotting function
     'MultiplotOptions',
     'get_data',      # New function to get data without plotting
-    'print_manager', 
+    'print_manager',
     'server_access',
     'global_tracker',
     'plot_config',
     'data_cubby',
     'plot_manager',
-    'mag_rtn_4sa', 
-    'mag_rtn', 
-    'mag_sc_4sa', 
-    'mag_sc',
-    'epad',
-    'epad_hr',       # ADD epad_hr
-    'proton',
-    'proton_hr',     # ADD proton_hr
-    'proton_fits',   # Add proton_fits to __all__
-    'alpha_fits',    # Add alpha_fits to __all__
-    'ham',           # ADDED: Add ham to __all__
-    'wind_mfi_h2',   # WIND satellite magnetic field data
-    'wind_3dp_elpd', # WIND satellite electron pitch-angle distributions
-    'wind_3dp_pm',   # WIND satellite ion plasma moments
-    'wind_swe_h5',   # WIND satellite electron temperature
-    'wind_swe_h1',   # WIND satellite proton/alpha thermal speeds
-    'psp_alpha',     # PSP alpha particle moments
-    'psp_qtn',       # PSP quasi-thermal noise (electron density and temperature)
-    'psp_dfb',       # PSP FIELDS electric field AC/DC spectra
-    'psp_orbit',     # PSP orbital/positional data
-    'psp_span_vdf',  # PSP SPAN-I velocity distribution functions
     'audifier',
     'custom_variable',  # Using custom_variable instead of new_variable
     'custom_variables',  # Container for accessing custom variables
@@ -460,11 +430,8 @@ __all__.extend([
     'scan_cdf_directory',   # CDF directory scanning function
     'CLASS_NAME_MAPPING',  # Add CLASS_NAME_MAPPING to __all__
     'showda_holes',      # Add showda_holes to __all__
-    
-    # --- AUTO-GENERATED CUSTOM CLASS __all__ ENTRIES ---
-    # ✨ Custom classes dynamically added to __all__ by _auto_register_custom_classes()
-    # --- END AUTO-GENERATED __all__ ENTRIES ---
 ])
+del _name, _module, _class_name, _extra_keys, _attribute
 
 # Colors for printing
 BLUE = '\033[94m'
@@ -6,12 +6,15 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 from scipy.io import wavfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from dateutil.parser import parse
 from .get_encounter import get_encounter_number
 from .data_cubby import data_cubby
 from .data_tracker import global_tracker
 from .data_download_berkeley import download_berkeley_data
 from .data_import import import_data_function
+from . import lazy_arrays
 from .print_manager import print_manager
 from .plotbot_helpers import time_clip
 
@@ -75,6 +78,45 @@ def set_save_directory(last_dir_file):
 
 
 
+# Samples per channel processed at once by the streaming WAV export.
+# Peak memory of an export is a few float32 copies of one chunk per channel.
+DEFAULT_CHUNK_SAMPLES = 2_000_000
+# Maximum number of samples kept (evenly strided) to estimate norm_percentile bounds
+PERCENTILE_SAMPLE_SIZE = 1_000_000
+
+
+class _ChunkedSource:
+    """Read-only view of one component over the clipped sample range, served in chunks."""
+
+    def __init__(self, component, indices):
+        self.name = component.subclass_name
+        self.values = np.asarray(component).view(np.ndarray)
+        if isinstance(indices, slice):
+            start, stop, _ = indices.indices(len(self.values))
+            self.start, self.indices, self.length = start, None, max(stop - start, 0)
+            return
+        indices = np.asarray(indices)
+        # A contiguous run of indices is read as a slice, not gathered
+        if len(indices) and indices[-1] - indices[0] + 1 == len(indices):
+            self.start, self.indices = int(indices[0]), None
+        else:
+            self.start, self.indices = None, indices
+        self.length = len(indices)
+
+    def __len__(self):
+        return self.length
+
+    def raw(self, a, b):
+        """Samples [a, b) of the clipped range in their stored dtype (a view when contiguous)."""
+        if self.indices is None:
+            return self.values[self.start + a:self.start + b]
+        return self.values[self.indices[a:b]]
+
+    def chunk(self, a, b):
+        """float32 copy of samples [a, b) of the clipped range (same dtype normalize_to_int16 uses)."""
+        return np.array(self.raw(a, b), dtype=np.float32)
+
+
 class Audifier:
     def __init__(self):
         # Initialize last_dir_file first
@@ -97,6 +139,8 @@ class Audifier:
         self.quantize_markers = False  # Can be False or number of minutes (10, 60, etc)
         self._channels = 1
         self._fade_samples = 0
+        self.chunk_samples = DEFAULT_CHUNK_SAMPLES  # None writes each file in a single chunk
+        self.max_workers = None  # threads for concurrent file export (None = os.cpu_count())
     
     def _parse_and_format_trange(self, trange):
         """Parses trange and returns datetime objects and formatted strings, handling multi-day ranges."""
@@ -155,35 +199,54 @@ class Audifier:
                 return f.read().strip()
         return None
     
-    def clip_data_to_range(self, components, trange):
-        """Get indices for the specified time range."""
+    @staticmethod
+    def _raw_datetime_array(component):
+        """Unclipped time base of a component (the property on the component itself is clipped)."""
+        if hasattr(component, 'plot_config'):
+            return component.plot_config.datetime_array
+        return component.datetime_array
+
+    @staticmethod
+    def _clip_slice(datetime_array, trange):
+        """Slice of a sorted datetime array covering [start, stop] (binary search, no mask)."""
+        if datetime_array is None or np.ndim(datetime_array) != 1 or len(datetime_array) == 0:
+            return slice(0, 0)
+        start_dt = np.datetime64(parse(trange[0]))
+        stop_dt = np.datetime64(parse(trange[1])) + np.timedelta64(1, 'us')
+        i0 = int(np.searchsorted(datetime_array, start_dt, side='left'))
+        i1 = int(np.searchsorted(datetime_array, stop_dt, side='left'))
+        return slice(i0, max(i0, i1))
+
+    def clip_slices(self, components, trange):
+        """
+        Clip slice for each component, computed once per distinct time base.
 
-        # print(f"\nDEBUG CLIPPING:")
-        # print(f"Clipping data to range: {trange[0]} to {trange[1]}")
+        Components of the same data class share one datetime array, so e.g.
+        br, bt, bn and bmag are clipped with a single searchsorted pair.
+        """
+        by_time_base = {}
+        slices = []
+        for component in components:
+            datetime_array = self._raw_datetime_array(component)
+            key = id(datetime_array)
+            if key not in by_time_base:
+                by_time_base[key] = self._clip_slice(datetime_array, trange)
+            slices.append(by_time_base[key])
+        return slices
 
+    def clip_data_to_range(self, components, trange):
+        """Get indices for the specified time range."""
         # Add check for valid components and datetime_array
         if not components or not hasattr(components[0], 'datetime_array') or components[0].datetime_array is None:
             print("Warning: Invalid component or missing datetime_array for clipping. Returning empty indices.")
             return np.array([], dtype=int)
 
-        # Parse times without timezone info
-        start_dt = np.datetime64(parse(trange[0]))
-        stop_dt = np.datetime64(parse(trange[1])) + np.timedelta64(1, 'us')
-
-        # Get indices for the time range
         try:
-            # Use raw datetime array for clipping, not the property (which is now clipped)
-            datetime_array = components[0].plot_config.datetime_array if hasattr(components[0], 'plot_config') else components[0].datetime_array
-            indices = np.where((datetime_array >= start_dt) &
-                              (datetime_array < stop_dt))[0]
+            clip = self._clip_slice(self._raw_datetime_array(components[0]), trange)
         except TypeError as e:
             print(f"Error during datetime comparison: {e}. Returning empty indices.")
             return np.array([], dtype=int)
-
-        # print(f"Original data points: {len(components[0]) if hasattr(components[0], '__len__') else 'N/A'}")
-        # print(f"Points in range: {len(indices)}\n")
-
-        return indices
+        return np.arange(clip.start, clip.stop)
     
     def set_save_dir(self, directory):
         """Set save directory directly with a path."""
@@ -254,9 +317,9 @@ class Audifier:
     
     @channels.setter
     def channels(self, value):
-        """Set the number of audio channels."""
-        if value in [1, 2]:
-            self._channels = value
+        """Set the number of audio channels (1 = mono, 2 = stereo, >2 = interleaved multichannel)."""
+        if isinstance(value, (int, np.integer)) and value >= 1:
+            self._channels = int(value)
         else:
             self._channels = 1
     
@@ -316,48 +379,41 @@ class Audifier:
             return None # Error already printed by helper
         # ================================================
 
-        # Generate marker times based on parsed datetimes
-        start_datetime = time_info['start_dt'] # Use parsed object
-        stop_datetime = time_info['end_dt']   # Use parsed object
-        marker_times = []
+        # Generate marker times based on parsed datetimes (vectorized: start + k * step)
+        start_datetime = np.datetime64(time_info['start_dt'], 'us') # Use parsed object
+        stop_datetime = np.datetime64(time_info['end_dt'], 'us')   # Use parsed object
         
         if self.quantize_markers:
-            # Calculate hours between markers
-            hours_interval = 1.0 / self.markers_per_hour
-            
-            # Find the first marker time before our data
-            first_marker = start_datetime.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            # Generate markers at the specified interval
-            current = first_marker
-            while current <= stop_datetime:  # Just check against stop_datetime
-                if current >= start_datetime:
-                    marker_times.append(current)
-                current += timedelta(hours=hours_interval)
+            # Markers on a grid anchored at midnight of the start day
+            step = np.timedelta64(timedelta(hours=1.0 / self.markers_per_hour), 'us')
+            first_marker = start_datetime.astype('datetime64[D]').astype('datetime64[us]')
         else:
-            # Original behavior
-            duration = (stop_datetime - start_datetime).total_seconds() / 3600.0
-            interval = duration / self.markers_per_hour
-            
-            current = start_datetime
-            while current <= stop_datetime:
-                marker_times.append(current)
-                current += timedelta(hours=interval)
-        
-        # Convert marker times to pandas DatetimeIndex
-        marker_times = pd.DatetimeIndex(marker_times)
+            # Original behavior: markers_per_hour intervals spread across the range
+            duration = (stop_datetime - start_datetime) / np.timedelta64(1, 'h')
+            step = np.timedelta64(timedelta(hours=duration / self.markers_per_hour), 'us')
+            first_marker = start_datetime
+        
+        if step > np.timedelta64(0, 'us'):
+            count = (stop_datetime - first_marker) // step + 1
+            marker_times = first_marker + np.arange(max(int(count), 0)) * step
+        else:
+            marker_times = np.array([first_marker])
+        marker_times = marker_times[marker_times >= start_datetime]
         
-        # Convert times to datetime
-        times_datetime = pd.to_datetime(times)
+        # Sorted datetime64 view of the data times (no per-element conversion)
+        times = np.asarray(times)
+        if not np.issubdtype(times.dtype, np.datetime64):
+            times = pd.to_datetime(times).values
         
-        print(f"Data time range: {times_datetime.min()} to {times_datetime.max()}")
+        if len(times):
+            print(f"Data time range: {pd.Timestamp(times[0])} to {pd.Timestamp(times[-1])}")
         
         # Find closest indices for each marker time
-        closest_indices = np.searchsorted(times_datetime, marker_times)
+        closest_indices = np.searchsorted(times, marker_times)
         
         # Filter out markers that fall outside the data range
         valid_markers = closest_indices < len(times)
-        marker_times = marker_times[valid_markers]
+        marker_times = pd.DatetimeIndex(marker_times[valid_markers])
         closest_indices = closest_indices[valid_markers]
         print(f"Total markers generated: {len(marker_times)}")
         
@@ -416,6 +472,8 @@ class Audifier:
             List of components to include in the WAV file. 
             In mono mode (channels=1), each component is saved as a separate WAV file.
             In stereo mode (channels=2), the first two components are used for left/right channels.
+            With channels=N > 2 the first N components are interleaved into one N-channel file.
+            Remaining components are saved as mono files.
         filename : str
             Filename for output file(s)
         channels : int, optional
@@ -425,14 +483,21 @@ class Audifier:
         sample_rate : int, optional
             Sample rate. Default is 44100.
         norm_percentile : float, optional
-            Percentile for normalization. Default is 99.9.
+            If given (e.g. 99.9), normalize to the [100 - p, p] percentile range and clip
+            outliers instead of using the full min/max. Default is None (min/max).
+
+        Notes
+        -----
+        WAV files are written by a two-pass streaming export in chunks of
+        ``self.chunk_samples`` samples, so peak memory does not grow with the
+        length of the time range.
         """
         channels = channels if channels is not None else self._channels
         self.channels = channels
         
         # Check if channels and components are compatible
-        if channels == 2 and len(components) < 2:
-            print("Warning: Stereo mode requires at least 2 components. Setting to mono.")
+        if self.channels > 1 and len(components) < self.channels:
+            print(f"Warning: {self.channels}-channel mode requires at least {self.channels} components. Setting to mono.")
             self.channels = 1
                 
         print("Starting " + ("marker generation..." if self.markers_only else "audification process..."))
@@ -498,7 +563,7 @@ class Audifier:
                 print_manager.debug(f"Importing data for {data_type}")
                 data_obj = import_data_function(trange, data_type)
                 if data_obj is not None:
-                    class_instance.update(data_obj)
+                    class_instance.update(lazy_arrays.prepare_for(class_instance, data_obj, trange))
                     if needs_import:
                         global_tracker.update_imported_range(trange, data_type)
             
@@ -510,11 +575,17 @@ class Audifier:
             print("No components available after processing")
             return
         
-        # Get time range indices using the processed components
-        indices = self.clip_data_to_range(processed_components, trange)
+        # Clip once per time base (searchsorted), shared by all components on it
+        try:
+            clip_slices = self.clip_slices(processed_components, trange)
+        except TypeError as e:
+            print(f"Error during datetime comparison: {e}")
+            return
         
-        if len(indices) == 0:
-            print("No data points found within the specified time range.")
+        empty = [component.subclass_name for component, clip in zip(processed_components, clip_slices)
+                 if clip.stop <= clip.start]
+        if empty:
+            print(f"No data points found within the specified time range for: {', '.join(empty)}")
             return
         
         # Setup directories
@@ -538,10 +609,9 @@ class Audifier:
         
         file_names = {}
         
-        # Generate markers using the raw datetime array to match how indices were computed
-        raw_datetime_array = processed_components[0].plot_config.datetime_array
+        # Generate markers using the raw datetime array to match how the clip was computed
         marker_file = self.generate_markers(
-            raw_datetime_array[indices],
+            self._raw_datetime_array(processed_components[0])[clip_slices[0]],  # view, no copy
             trange,
             output_dir
         )
@@ -552,84 +622,55 @@ class Audifier:
             # Use pre-formatted date string with dashes for filenames from helper
             sample_rate_str = f"{self.sample_rate}SR"
             
-            if self.channels == 1:  # Mono mode - each component gets its own file
-                # Process each component as a separate mono file
-                for component in processed_components:
-                    data = np.array(component[indices])
-                    audio_data = self.normalize_to_int16(data)
-                    
-                    # Apply fade if enabled
-                    if self._fade_samples > 0:
-                        audio_data = self.apply_fade(audio_data)
-                    
-                    filename = os.path.join(output_dir,
-                        f"{encounter}_PSP_"
-                        f"{component.data_type.upper()}_"
-                        f"{time_info['range_str_hyphen']}_"
-                        f"{sample_rate_str}_"
-                        f"{component.subclass_name.capitalize()}.wav")
-                    
-                    wavfile.write(filename, self.sample_rate, audio_data)
-                    print(f"Saved mono audio file: {filename}")
-                    file_names[component.subclass_name] = filename
-            else:  # Stereo mode (self.channels == 2)
-                # Process first two components as stereo
-                if len(processed_components) >= 2:
-                    left_data = np.array(processed_components[0][indices])
-                    right_data = np.array(processed_components[1][indices])
-                    
-                    # Normalize each channel separately
-                    left_normalized = self.normalize_to_int16(left_data)
-                    right_normalized = self.normalize_to_int16(right_data)
-                    
-                    # Make sure both channels have the same length
-                    min_length = min(len(left_normalized), len(right_normalized))
-                    left_normalized = left_normalized[:min_length]
-                    right_normalized = right_normalized[:min_length]
-                    
-                    # Combine into stereo array
-                    stereo_data = np.column_stack((left_normalized, right_normalized))
-                    
-                    # Apply fade if enabled
-                    if self._fade_samples > 0:
-                        stereo_data = self.apply_fade(stereo_data)
-                    
-                    # Create stereo filename using both component names
-                    left_name = processed_components[0].subclass_name.capitalize()
-                    right_name = processed_components[1].subclass_name.capitalize()
-                    
-                    filename = os.path.join(output_dir,
-                        f"{encounter}_PSP_"
-                        f"{processed_components[0].data_type.upper()}_"
-                        f"{time_info['range_str_hyphen']}_"
-                        f"{sample_rate_str}_"
-                        f"{left_name}_L_{right_name}_R.wav")
-                    
-                    wavfile.write(filename, self.sample_rate, stereo_data)
-                    print(f"Saved stereo audio file: {filename}")
-                    file_names[f"stereo_{left_name}_{right_name}"] = filename
-                    
-                    # Process any remaining components as mono files
-                    for component in processed_components[2:]:
-                        data = np.array(component[indices])
-                        audio_data = self.normalize_to_int16(data)
-                        
-                        # Apply fade if enabled
-                        if self._fade_samples > 0:
-                            audio_data = self.apply_fade(audio_data)
-                        
-                        filename = os.path.join(output_dir,
-                            f"{encounter}_PSP_"
-                            f"{component.data_type.upper()}_"
-                            f"{time_info['range_str_hyphen']}_"
-                            f"{sample_rate_str}_"
-                            f"{component.subclass_name.capitalize()}.wav")
-                        
-                        wavfile.write(filename, self.sample_rate, audio_data)
-                        print(f"Saved mono audio file: {filename}")
-                        file_names[component.subclass_name] = filename
+            def component_filename(component, suffix):
+                return os.path.join(output_dir,
+                    f"{encounter}_PSP_"
+                    f"{component.data_type.upper()}_"
+                    f"{time_info['range_str_hyphen']}_"
+                    f"{sample_rate_str}_"
+                    f"{suffix}.wav")
+            
+            # One export job per output file: (file_names key, filename, sources, label)
+            jobs = []
+            
+            # Stereo/multichannel: the first `channels` components are interleaved into one file
+            n_grouped = self.channels if self.channels > 1 else 0
+            grouped = processed_components[:n_grouped]
+            if grouped:
+                names = [component.subclass_name.capitalize() for component in grouped]
+                if len(grouped) == 2:
+                    suffix = f"{names[0]}_L_{names[1]}_R"
+                    key = f"stereo_{names[0]}_{names[1]}"
+                    label = 'stereo'
                 else:
-                    print("Not enough components for stereo. Need at least 2.")
+                    suffix = '_'.join(names)
+                    key = f"multichannel_{'_'.join(names)}"
+                    label = f'{len(grouped)}-channel'
+                sources = [_ChunkedSource(c, clip) for c, clip in zip(grouped, clip_slices)]
+                jobs.append((key, component_filename(grouped[0], suffix), sources, label))
+            
+            # Mono mode (and components beyond the grouped channels) - each component gets its own file
+            for component, clip in zip(processed_components[n_grouped:], clip_slices[n_grouped:]):
+                jobs.append((component.subclass_name,
+                             component_filename(component, component.subclass_name.capitalize()),
+                             [_ChunkedSource(component, clip)], 'mono'))
+            
+            # numpy kernels and file writes release the GIL, so files are exported concurrently
+            def export(filename, sources):
+                return self._write_streaming_wav(filename, sources, norm_percentile=norm_percentile)
+            
+            filenames = [job[1] for job in jobs]
+            job_sources = [job[2] for job in jobs]
+            workers = min(len(jobs), self.max_workers or os.cpu_count() or 1)
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    written = list(pool.map(export, filenames, job_sources))
+            else:
+                written = [export(filename, sources) for filename, sources in zip(filenames, job_sources)]
+            
+            for (key, _, _, label), filename in zip(jobs, written):
+                print(f"Saved {label} audio file: {filename}")
+                file_names[key] = filename
         
         # Show access buttons
         show_directory_button(output_dir)
@@ -691,6 +732,132 @@ class Audifier:
                 base_filename = base_filename[:-4]
             return f'{base_filename}_{component_suffix}.wav'
 
+    def _scan_normalization_stats(self, source, chunk_samples, norm_percentile=None):
+        """
+        First pass of the streaming export: scan a source chunk by chunk.
+
+        Collects the global min/max (identical to normalize_to_int16, since NaN
+        interpolation never leaves the range of the valid samples), the first and
+        last valid sample of every chunk (anchors for NaN interpolation across
+        chunk boundaries) and, for norm_percentile, an evenly strided sample.
+        """
+        n = len(source)
+        stride = max(1, n // PERCENTILE_SAMPLE_SIZE) if norm_percentile else None
+        vmin, vmax = None, None
+        firsts, lasts, sample = [], [], []
+        for a in range(0, n, chunk_samples):
+            # Stats work on the stored values without a float32 copy: rounding to
+            # float32 is monotonic, so float32(min(x)) == min(float32(x)).
+            x = source.raw(a, min(a + chunk_samples, n))
+            nan_mask = np.isnan(x)
+            if not nan_mask.all():
+                first = int(nan_mask.argmin())
+                last = len(x) - 1 - int(nan_mask[::-1].argmin())
+                firsts.append((a + first, np.float32(x[first])))
+                lasts.append((a + last, np.float32(x[last])))
+                cmin, cmax = np.float32(np.nanmin(x)), np.float32(np.nanmax(x))
+                vmin = cmin if vmin is None or cmin < vmin else vmin
+                vmax = cmax if vmax is None or cmax > vmax else vmax
+            else:
+                firsts.append(None)
+                lasts.append(None)
+            if stride:
+                picked = np.asarray(x[(-a) % stride::stride], dtype=np.float32)
+                sample.append(picked[~np.isnan(picked)])
+
+        if vmin is not None and norm_percentile and sample:
+            sample = np.concatenate(sample)
+            if sample.size:
+                lo, hi = np.percentile(sample, [100.0 - norm_percentile, norm_percentile])
+                vmin, vmax = np.float32(lo), np.float32(hi)
+        return {'min': vmin, 'max': vmax, 'clip': bool(norm_percentile), 'firsts': firsts, 'lasts': lasts}
+
+    @staticmethod
+    def _fill_nans_chunk(x, a, chunk_index, stats):
+        """Linearly interpolate NaNs in chunk x (starting at sample a) using neighbouring chunks as anchors."""
+        nan_mask = np.isnan(x)
+        if not nan_mask.any():
+            return x
+        left = next((p for p in reversed(stats['lasts'][:chunk_index]) if p is not None), None)
+        right = next((p for p in stats['firsts'][chunk_index + 1:] if p is not None), None)
+        # Only the valid samples bracketing each NaN run matter to np.interp, so pass just
+        # those (plus the cross-chunk anchors) instead of every valid sample
+        edges = np.diff(nan_mask.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+        run_starts, run_stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        neighbours = np.union1d(run_starts[run_starts > 0] - 1, run_stops[run_stops < len(x)])
+        xp = [a + neighbours]
+        fp = [x[neighbours]]
+        if left:
+            xp.insert(0, np.array([left[0]]))
+            fp.insert(0, np.array([left[1]], dtype=np.float32))
+        if right:
+            xp.append(np.array([right[0]]))
+            fp.append(np.array([right[1]], dtype=np.float32))
+        xp, fp = np.concatenate(xp), np.concatenate(fp)
+        if xp.size == 0:
+            return x
+        positions = a + np.flatnonzero(nan_mask)
+        x[nan_mask] = np.interp(positions, xp, fp)
+        return x
+
+    @staticmethod
+    def _normalize_chunk(x, stats):
+        """Scale a NaN-free float32 chunk to int16 with the global bounds (same formula as normalize_to_int16)."""
+        min_val, max_val = stats['min'], stats['max']
+        if min_val is None or max_val == min_val:
+            return np.zeros(x.shape, dtype=np.int16)
+        if stats['clip']:
+            np.clip(x, min_val, max_val, out=x)
+        return ((2 * (x - min_val) / (max_val - min_val) - 1) * 32767).astype(np.int16)
+
+    def _fade_chunk(self, frames, a, n):
+        """Apply the fade-in/out of apply_fade to frames covering samples [a, a + len(frames)) of n."""
+        fade = min(self._fade_samples, n)
+        if fade == 0:
+            return frames
+        b = a + len(frames)
+        in_stop, out_start = min(b, fade), max(a, n - fade)
+        if in_stop <= a and out_start >= b:
+            return frames
+        faded = frames.astype(np.float32)
+        if in_stop > a:
+            ramp = np.linspace(0, 1, fade)[a:in_stop]
+            faded[:in_stop - a] *= ramp if faded.ndim == 1 else ramp[:, None]
+        if out_start < b:
+            ramp = np.linspace(1, 0, fade)[out_start - (n - fade):b - (n - fade)]
+            faded[out_start - a:] *= ramp if faded.ndim == 1 else ramp[:, None]
+        return faded.astype(np.int16)
+
+    def _write_streaming_wav(self, filename, sources, norm_percentile=None):
+        """
+        Two-pass streaming WAV export of one or more (interleaved) channels.
+
+        Pass 1 scans every source for normalization stats; pass 2 NaN-fills,
+        normalizes, interleaves, fades and appends int16 frames chunk by chunk,
+        so memory stays bounded by chunk_samples regardless of the range length.
+        """
+        n = min(len(src) for src in sources)
+        chunk_samples = int(self.chunk_samples or max(n, 1))
+        stats = [self._scan_normalization_stats(src, chunk_samples, norm_percentile) for src in sources]
+        for src, st in zip(sources, stats):
+            if st['min'] is None:
+                print(f"Warning: All values are NaN for {src.name}, writing silence")
+
+        with wave.open(filename, 'wb') as wav:
+            wav.setnchannels(len(sources))
+            wav.setsampwidth(2)
+            wav.setframerate(int(self.sample_rate))
+            for chunk_index, a in enumerate(range(0, n, chunk_samples)):
+                b = min(a + chunk_samples, n)
+                columns = []
+                for src, st in zip(sources, stats):
+                    x = self._fill_nans_chunk(src.chunk(a, b), a, chunk_index, st)
+                    columns.append(self._normalize_chunk(x, st))
+                frames = columns[0] if len(columns) == 1 else np.column_stack(columns)
+                frames = self._fade_chunk(frames, a, n)
+                wav.writeframes(np.ascontiguousarray(frames, dtype='<i2').tobytes())
+        return filename
+
     @staticmethod
     def normalize_to_int16(data):
         """Normalize data to int16 range for audio creation."""
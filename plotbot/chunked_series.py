@@ -0,0 +1,178 @@
+# plotbot/chunked_series.py
+"""
+Chunked storage for a data class's time series.
+
+A ``ChunkedSeries`` holds a time array and its raw_data arrays as a list of
+time-sorted, non-overlapping chunks. Inserting a chunk (appending the next
+day, prepending, or filling a hole between loaded ranges) copies nothing;
+chunk lookup by time is a bisect over the chunk bounds, O(log k).
+
+Contiguous arrays are built only when asked for:
+
+- ``window(start, end)`` assembles a clipped window from the chunks that
+  overlap it (a window inside one chunk is a view, nothing is copied);
+- ``consolidate()`` returns the whole series contiguous. It writes into
+  buffers with spare capacity, so after an append only the new chunks are
+  copied; rows already consolidated are moved only when the buffers grow
+  (geometrically, so appending day after day copies each row O(1) times
+  instead of re-concatenating everything).
+
+data_cubby keeps one series per data class instance (``data_cubby.chunked_series``)
+and uses it for merges whose new times fit between loaded ones; overlapping
+merges go through ``UltimateMergeEngine`` and restart the series.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+GROWTH = 1.5    # buffer capacity relative to the rows needed when a consolidation outgrows it
+
+
+class ChunkedSeries:
+    """
+    Time series stored as sorted, non-overlapping chunks.
+
+    Parameters
+    ----------
+    times : numpy.ndarray
+        Sorted times of the first chunk (datetime64 or numeric).
+    data : dict
+        raw_data arrays of the first chunk, one row per time. The arrays are
+        used as they are, not copied.
+    """
+
+    def __init__(self, times, data):
+        for key, values in data.items():
+            if not isinstance(values, np.ndarray) or values.ndim == 0 or len(values) != len(times):
+                raise ValueError(f"raw_data['{key}'] isn't one row per time")
+        self.keys = tuple(data)
+        self._layout = {key: (data[key].dtype, data[key].shape[1:]) for key in self.keys}
+        self._layout[None] = (times.dtype, ())
+        self._chunks = []       # (times, data) per chunk
+        self._starts = []       # first time of each chunk
+        self._ends = []         # last time of each chunk
+        self._buffers = None    # key (None for the times) -> array with spare capacity
+        self._filled = 0        # leading chunks already laid out contiguously in the buffers
+        self._exposed = 0       # buffer rows returned by consolidate()
+        self._output = None
+        self._append(0, times, data)
+        self._output = (times, dict(data))
+
+    def __len__(self):
+        return sum(len(times) for times, _ in self._chunks)
+
+    @property
+    def n_chunks(self):
+        return len(self._chunks)
+
+    def holds(self, times, data):
+        """True if ``times``/``data`` are the arrays last returned by ``consolidate()``."""
+        if self._output is None or times is not self._output[0] or set(data) != set(self.keys):
+            return False
+        return all(data[key] is self._output[1][key] for key in self.keys)
+
+    def locate(self, time):
+        """Index of the chunk containing ``time`` (or the last one starting before it; -1 if none)."""
+        return bisect_right(self._starts, time) - 1
+
+    def insert(self, times, data):
+        """
+        Add a chunk without copying; returns False, changing nothing, if it can't be added.
+
+        The chunk must not overlap any existing chunk and must have the same
+        keys, dtypes and trailing shapes (otherwise the caller merges instead).
+        """
+        if len(times) == 0 or set(data) != set(self.keys) or times.dtype != self._layout[None][0]:
+            return False
+        for key in self.keys:
+            values = data[key]
+            if (not isinstance(values, np.ndarray) or len(values) != len(times)
+                    or (values.dtype, values.shape[1:]) != self._layout[key]):
+                return False
+        position = bisect_left(self._starts, times[0])
+        if position > 0 and not self._ends[position - 1] < times[0]:
+            return False
+        if position < len(self._starts) and not times[-1] < self._starts[position]:
+            return False
+        self._append(position, times, data)
+        return True
+
+    def _append(self, position, times, data):
+        self._chunks.insert(position, (times, {key: data[key] for key in self.keys}))
+        self._starts.insert(position, times[0])
+        self._ends.insert(position, times[-1])
+        self._filled = min(self._filled, position)
+        self._output = None
+
+    def window(self, start, end):
+        """
+        Times and data with ``start <= time <= end``, from the overlapping chunks only.
+
+        A window inside a single chunk is a view of it; otherwise the pieces are
+        concatenated.
+        """
+        first = bisect_left(self._ends, start)
+        last = bisect_right(self._starts, end)
+        pieces = []
+        for times, data in self._chunks[first:max(first, last)]:
+            lo = np.searchsorted(times, start, side='left')
+            hi = np.searchsorted(times, end, side='right')
+            if hi > lo:
+                pieces.append((times[lo:hi], {key: values[lo:hi] for key, values in data.items()}))
+        if not pieces:
+            times, data = self._chunks[0]
+            return times[:0], {key: values[:0] for key, values in data.items()}
+        if len(pieces) == 1:
+            return pieces[0]
+        return (np.concatenate([times for times, _ in pieces]),
+                {key: np.concatenate([data[key] for _, data in pieces]) for key in self.keys})
+
+    def consolidate(self):
+        """
+        The whole series as contiguous arrays: ``(times, data)``.
+
+        Returns the same arrays until another chunk is inserted. Only chunks
+        inserted since the last call are copied, unless one went in before
+        already consolidated rows or the buffers have to grow.
+        """
+        if self._output is not None:
+            return self._output
+
+        total = len(self)
+        offset = sum(len(times) for times, _ in self._chunks[:self._filled])
+        # Rows handed out before are never rewritten: arrays returned earlier stay valid
+        if self._buffers is None or len(self._buffers[None]) < total or offset < self._exposed:
+            self._grow(int(total * GROWTH))
+        for index in range(self._filled, len(self._chunks)):
+            times, data = self._chunks[index]
+            stop = offset + len(times)
+            self._buffers[None][offset:stop] = times
+            for key in self.keys:
+                self._buffers[key][offset:stop] = data[key]
+            self._chunks[index] = self._views(offset, stop)   # the chunk's own arrays can be freed
+            offset = stop
+        self._filled = len(self._chunks)
+
+        self._output = self._views(0, total)
+        self._exposed = total
+        return self._output
+
+    def _grow(self, capacity):
+        """Reallocate the buffers, keeping the rows of the consolidated chunks."""
+        kept = sum(len(times) for times, _ in self._chunks[:self._filled])
+        buffers = {}
+        for key, (dtype, trailing) in self._layout.items():
+            buffers[key] = np.empty((capacity,) + trailing, dtype=dtype)
+            if kept:
+                buffers[key][:kept] = self._buffers[key][:kept]
+        self._buffers = buffers
+        offset = 0
+        for index in range(self._filled):   # re-point views so the old buffers can be freed
+            stop = offset + len(self._chunks[index][0])
+            self._chunks[index] = self._views(offset, stop)
+            offset = stop
+
+    def _views(self, start, stop):
+        return (self._buffers[None][start:stop],
+                {key: self._buffers[key][start:stop] for key in self.keys})
@@ -37,6 +37,45 @@ Options:
     'berkeley': Use Berkeley server exclusively. No pyspedas calls.
 """
 
+        # --- Array Backend ---
+        self.array_backend = 'numpy'
+        """
+Array backend for CDF imports.
+Options:
+    'numpy': (Default) Read every requested record into memory at import.
+    'dask':  Opt-in, requires dask. Variables are lazy dask arrays chunked per
+             source file; data classes with supports_lazy_arrays keep them lazy
+             and compute only the requested time range when a variable is first
+             accessed, others get numpy arrays of the requested range.
+"""
+        self.dask_scheduler = 'threads'
+        """Local dask scheduler used to compute lazy arrays: 'threads', 'processes' or 'synchronous'."""
+
+        # --- Storage Precision ---
+        self.precision = 'native'
+        """
+Storage dtype for imported CDF data (and so for the quantities derived from it).
+A data_types entry can override it with its own 'precision' key.
+Options:
+    'native':  (Default) Keep each CDF variable's dtype; integers with fill values become float64.
+    'float32': Store floating point data as float32 - half the memory of float64, plenty for
+               plotting and audification. Derived quantities follow; sensitive steps such as
+               the temperature anisotropy projection are computed in float64.
+    'float64': Store all floating point data as float64.
+"""
+
+        # --- Read-ahead Prefetch ---
+        self.prefetch = False
+        """
+Opt-in read-ahead for sequential workflows (a day at a time, encounter after
+encounter, the next multiplot panel). get_data predicts the next time range from
+the stride and direction of the last two requests for the same data types and
+downloads/imports it on a background thread; the next get_data call for that
+range merges the prefetched data instead of waiting on the download.
+"""
+        self.prefetch_memory_mb = 1024
+        """Memory budget (MB) for prefetched data waiting to be used; windows that would exceed it are dropped."""
+
         # --- Plot Display Control ---
         self.suppress_plots = False
         """If True, plotbot() will skip calling plt.show(). Useful for tests."""
@@ -9,6 +9,11 @@ class PlotbotConfig:
     data_server: str # Options: 'dynamic', 'spdf', 'berkeley'
     data_dir: str # Configurable data directory path
     suppress_plots: bool # Plot display control
+    array_backend: str # Options: 'numpy', 'dask'
+    dask_scheduler: str # Options: 'threads', 'processes', 'synchronous'
+    precision: str # Options: 'native', 'float32', 'float64'
+    prefetch: bool # Opt-in read-ahead of the next time range in get_data
+    prefetch_memory_mb: float # Memory budget for prefetched data
     pyspedas_data_dir: str # Legacy property for backwards compatibility
     # Add hints for any other future config attributes here
     # Example: default_plot_style: Optional[str]
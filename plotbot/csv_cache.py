@@ -0,0 +1,194 @@
+# plotbot/csv_cache.py
+"""
+Columnar sidecar cache for CSV-backed data (proton FITS sf00 CSVs, legacy
+Hammerhead CSVs, CSV support files).
+
+The first load of a CSV parses it with pandas, as the loaders always did,
+and writes every column to ``plotbot/cache/csv_columns/<source>/`` as a raw
+``.npy`` file, together with the TT2000 times of its unix-seconds time column
+(converted once, vectorized). ``<source>`` identifies the CSV by path, size
+and modification time, so an edited file is parsed again. Later loads
+memory-map the columns: ``CSVColumns.window`` turns a TT2000 range into a row
+slice and only the rows in it are read from disk.
+
+If the cache directory can't be written, the parsed columns are used from
+memory and nothing is cached.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import cdflib
+import numpy as np
+import pandas as pd
+
+from .print_manager import print_manager
+
+CSV_CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache', 'csv_columns')
+TT2000_FILL = np.iinfo(np.int64).min      # TT2000 of rows whose time is missing
+
+
+def unix_to_tt2000(seconds):
+    """
+    TT2000 of unix epoch seconds, truncated to whole milliseconds.
+
+    Gives the values the CSV loaders computed row by row
+    (``compute_tt2000([year, month, day, hour, minute, second, ms])``):
+    each distinct day goes through cdflib once (leap seconds), and the time
+    of day is added to it.
+
+    Returns
+    -------
+    tt2000 : numpy.ndarray of int64
+        ``TT2000_FILL`` where the time is missing.
+    valid : numpy.ndarray of bool
+    """
+    stamps = pd.to_datetime(pd.Series(np.asarray(seconds)), unit='s').to_numpy()
+    valid = ~np.isnat(stamps)
+    tt2000 = np.full(len(stamps), TT2000_FILL, dtype=np.int64)
+    if not valid.any():
+        return tt2000, valid
+    ms = stamps[valid].astype('datetime64[ms]')
+    days, inverse = np.unique(ms.astype('datetime64[D]'), return_inverse=True)
+    midnights = pd.DatetimeIndex(days)
+    components = np.column_stack([midnights.year, midnights.month, midnights.day] + [np.zeros(len(days), dtype=int)] * 4)
+    day_tt2000 = np.atleast_1d(np.asarray(cdflib.cdfepoch.compute_tt2000(components), dtype=np.int64))
+    time_of_day = (ms - ms.astype('datetime64[D]')).astype('timedelta64[ns]').astype(np.int64)
+    tt2000[valid] = day_tt2000[inverse.ravel()] + time_of_day
+    return tt2000, valid
+
+
+class CSVColumns:
+    """
+    The columns of one CSV, memory-mapped from the cache (or held in memory).
+
+    Attributes
+    ----------
+    columns : list of str
+        Column names in file order.
+    n_rows : int
+    tt2000 : numpy.ndarray of int64 or None
+        TT2000 of the time column (``TT2000_FILL`` where missing), if one was given.
+    """
+
+    def __init__(self, columns, arrays, tt2000=None):
+        self.columns = list(columns)
+        self._arrays = arrays
+        self.tt2000 = tt2000
+        self.n_rows = len(tt2000) if tt2000 is not None else (len(arrays[self.columns[0]]) if self.columns else 0)
+        self._sorted = None
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        return self._arrays[name]
+
+    def window(self, start_tt2000, end_tt2000):
+        """Rows with ``start <= tt2000 <= end``: a slice if the times are sorted, else a boolean mask."""
+        if self._sorted is None:
+            self._sorted = bool(np.all(self.tt2000[1:] >= self.tt2000[:-1]))
+        if self._sorted:
+            return slice(int(np.searchsorted(self.tt2000, start_tt2000, side='left')),
+                         int(np.searchsorted(self.tt2000, end_tt2000, side='right')))
+        return (self.tt2000 >= start_tt2000) & (self.tt2000 <= end_tt2000)
+
+    def to_frame(self):
+        """The columns as a pandas DataFrame (what ``pd.read_csv`` returned)."""
+        return pd.DataFrame({name: self._arrays[name] for name in self.columns}, columns=self.columns)
+
+
+def _source_key(path, time_column):
+    stat = os.stat(path)
+    identity = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{time_column}|v{CSV_CACHE_VERSION}"
+    return hashlib.sha1(identity.encode()).hexdigest()[:16]
+
+
+def _open_cached(directory):
+    """CSVColumns memory-mapped from a cache directory, or None if it isn't complete."""
+    try:
+        with open(os.path.join(directory, 'columns.json')) as f:
+            meta = json.load(f)
+        arrays = {}
+        for i, name in enumerate(meta['columns']):
+            path = os.path.join(directory, f'{i}.npy')
+            if name in meta['object_columns']:
+                arrays[name] = np.load(path, allow_pickle=True)
+            else:
+                arrays[name] = np.load(path, mmap_mode='r')
+        tt2000 = np.load(os.path.join(directory, 'tt2000.npy'), mmap_mode='r') if meta['has_tt2000'] else None
+    except (OSError, ValueError, KeyError):
+        return None
+    return CSVColumns(meta['columns'], arrays, tt2000)
+
+
+def _write_cache(directory, columns, arrays, tt2000):
+    """Write the columns to ``directory`` (via a temporary directory, so readers never see a partial cache)."""
+    partial = f'{directory}.{os.getpid()}.{threading.get_ident()}.partial'
+    try:
+        os.makedirs(partial)
+        object_columns = []
+        for i, name in enumerate(columns):
+            array = arrays[name]
+            if array.dtype == object:
+                object_columns.append(name)
+            np.save(os.path.join(partial, f'{i}.npy'), array, allow_pickle=array.dtype == object)
+        if tt2000 is not None:
+            np.save(os.path.join(partial, 'tt2000.npy'), tt2000)
+        with open(os.path.join(partial, 'columns.json'), 'w') as f:
+            json.dump({'columns': columns, 'object_columns': object_columns, 'has_tt2000': tt2000 is not None}, f)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)          # incomplete cache left by an interrupted write
+        os.replace(partial, directory)
+        print_manager.debug(f"Wrote CSV column cache {directory}")
+    except OSError as e:
+        print_manager.debug(f"Could not write CSV column cache {directory}: {e}")
+    finally:
+        if os.path.exists(partial):
+            shutil.rmtree(partial, ignore_errors=True)
+
+
+def load_csv_columns(path, time_column=None, cache_dir=None):
+    """
+    The columns of a CSV file, from the sidecar cache when it is current.
+
+    Parameters
+    ----------
+    path : str
+        The CSV file.
+    time_column : str, optional
+        Column of unix epoch seconds to convert to TT2000 (``CSVColumns.tt2000``).
+    cache_dir : str, optional
+        Root cache directory (default ``plotbot/cache/csv_columns``).
+
+    Returns
+    -------
+    CSVColumns
+
+    Raises
+    ------
+    The errors of ``pd.read_csv`` (FileNotFoundError, pandas.errors.EmptyDataError, ...)
+    on a cache miss, and KeyError if ``time_column`` isn't in the file.
+    """
+    directory = None
+    try:
+        directory = os.path.join(cache_dir or DEFAULT_CACHE_DIR, _source_key(path, time_column))
+    except OSError:
+        pass                                   # unreadable source: let read_csv raise below
+    if directory is not None and os.path.isdir(directory):
+        cached = _open_cached(directory)
+        if cached is not None:
+            print_manager.debug(f"CSV column cache hit for {os.path.basename(path)}")
+            return cached
+
+    frame = pd.read_csv(path)
+    columns = [str(name) for name in frame.columns]
+    arrays = {name: frame[name].to_numpy() for name in columns}
+    tt2000 = unix_to_tt2000(arrays[time_column])[0] if time_column is not None else None
+    if directory is not None:
+        _write_cache(directory, columns, arrays, tt2000)
+    return CSVColumns(columns, arrays, tt2000)
@@ -0,0 +1,224 @@
+# plotbot/data_classes/_derived.py
+"""
+Derived-variable registry for data classes.
+
+A class lists its derived quantities in a ``derived_variables`` dict mapping
+each raw_data key to a module-level function of the raw_data mapping (a
+tuple of keys maps to a function returning one array per key, for quantities
+computed together). Derivations must be pointwise in time (sample i depends
+only on inputs at sample i), which lets a merge extend a computed entry by
+deriving just the new segment. ``calculate_variables`` then stores only the imported
+arrays in a ``DerivedRawData``; a derived entry is computed the first time
+it's read and cached in place, so importing proton for a density plot never
+computes the betas or the anisotropy. Inputs a derivation needs that aren't
+raw_data entries themselves (the magnetic field vector, the temperature
+tensor, ...) travel in ``DerivedRawData.inputs`` and are merged alongside
+raw_data.
+
+``set_plot_config`` builds the plot_manager of a pending entry with
+``defer_plot_manager``, which keeps its plot_config until the attribute is
+first accessed (the class ``__getattr__`` calls ``build_deferred``). Styling
+set on an earlier plot_manager (its ``_plot_state``) is carried over to the
+deferred one, so the save/restore loops in ``update()`` and the data_cubby
+merge skip deferred names rather than building them.
+
+Entries held as lazy dask arrays (``config.array_backend = 'dask'``, see
+lazy_arrays) are deferred the same way. Their plot_manager is built from the
+records of the instance's ``_current_operation_trange`` only (everything
+when it has none), with the config's time base cut to match.
+"""
+
+from .. import lazy_arrays
+from ..plot_manager import plot_manager
+
+INPUT_PREFIX = '_input/'
+
+
+class _Pending:
+    """Placeholder stored for a derived entry that hasn't been computed yet."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<pending>'
+
+
+PENDING = _Pending()
+
+
+class DerivedRawData(dict):
+    """
+    A raw_data dict whose derived entries are computed on first access.
+
+    Every derived name is a key from the start, so ``keys()``, ``in`` and
+    ``len()`` behave as before; reading a pending entry (``[]``, ``get``,
+    ``items``, ``values``) computes and caches it. Pickling materialises every
+    entry into a plain dict.
+    """
+
+    def __init__(self, data, derivations, inputs=None):
+        super().__init__(data)
+        self.derivations = derivations
+        self.inputs = dict(inputs or {})
+        self._producers = {}
+        for names, function in derivations.items():
+            names = names if isinstance(names, tuple) else (names,)
+            for name in names:
+                self._producers[name] = (function, names)
+                if name not in self:
+                    dict.__setitem__(self, name, PENDING)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if value is PENDING:
+            function, names = self._producers[key]
+            values = function(self)
+            if len(names) == 1:
+                values = (values,)
+            for name, computed in zip(names, values):
+                dict.__setitem__(self, name, computed)
+            value = dict.__getitem__(self, key)
+        return value
+
+    def __iter__(self):
+        # Defined in Python so dict(raw_data) and {**raw_data} go through __getitem__
+        return iter(list(dict.keys(self)))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return [(key, self[key]) for key in dict.keys(self)]
+
+    def values(self):
+        return [self[key] for key in dict.keys(self)]
+
+    def pop(self, key, *default):
+        if key in self:
+            self[key]
+        return dict.pop(self, key, *default)
+
+    def copy(self):
+        return DerivedRawData(dict(dict.items(self)), self.derivations, self.inputs)
+
+    def is_pending(self, key):
+        return dict.get(self, key) is PENDING
+
+    def pending(self):
+        return {key for key, value in dict.items(self) if value is PENDING}
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+
+def defer_plot_manager(instance, name, config):
+    """
+    Set ``instance.<name>`` to a plot_manager over ``raw_data[name]``.
+
+    While the entry is pending the plot_manager isn't built: ``config`` is kept
+    until the attribute is first accessed, and any stale manager from earlier
+    data is dropped after its plot state has been applied to ``config``.
+    """
+    raw_data = instance.__dict__.get('raw_data')
+    deferred = instance.__dict__.setdefault('_deferred_plot_configs', {})
+    states = instance.__dict__.setdefault('_deferred_plot_states', {})
+    previous = instance.__dict__.pop(name, None)
+    state = dict(getattr(previous, '_plot_state', None) or states.pop(name, None) or {})
+
+    if ((isinstance(raw_data, DerivedRawData) and raw_data.is_pending(name))
+            or (isinstance(raw_data, dict) and lazy_arrays.holds_lazy(dict.get(raw_data, name)))):
+        for attr, value in state.items():
+            if hasattr(config, attr):
+                setattr(config, attr, value)
+        deferred[name] = config
+        if state:
+            states[name] = state
+        return None
+
+    deferred.pop(name, None)
+    manager = plot_manager(raw_data[name], plot_config=config)
+    if previous is None and state:
+        _restore_state(manager, state)
+    object.__setattr__(instance, name, manager)
+    return manager
+
+
+def _restore_state(manager, state):
+    manager._plot_state.update(state)
+    for attr, value in state.items():
+        if hasattr(manager.plot_config, attr):
+            setattr(manager.plot_config, attr, value)
+
+
+def _computed_window(instance, values, config):
+    """The records of lazy ``values`` in the operation's time range, computed; cuts ``config``'s time base to match."""
+    trange = instance.__dict__.get('_current_operation_trange')
+    window = slice(None)
+    if trange and config.datetime_array is not None:
+        window = lazy_arrays.window_slice(config.datetime_array, trange)
+    arrays = values if isinstance(values, list) else [values]
+    computed = lazy_arrays.materialize(*(array[window] for array in arrays))
+    if config.datetime_array is not None:
+        config.datetime_array = config.datetime_array[window]
+    if config.time is not None:
+        config.time = config.time[window]
+    return list(computed) if isinstance(values, list) else computed[0]
+
+
+def build_deferred(instance, name):
+    """Build a deferred plot_manager on first access; None if ``name`` isn't deferred."""
+    deferred = instance.__dict__.get('_deferred_plot_configs')
+    if not deferred or name not in deferred:
+        return None
+    config = deferred.pop(name)
+    values = instance.raw_data[name]
+    if lazy_arrays.holds_lazy(values):
+        values = _computed_window(instance, values, config)
+    manager = plot_manager(values, plot_config=config)
+    state = instance.__dict__.get('_deferred_plot_states', {}).pop(name, None)
+    if state:
+        manager._plot_state.update(state)
+    object.__setattr__(instance, name, manager)
+    return manager
+
+
+def is_deferred(instance, name):
+    """True if ``instance.<name>`` hasn't been built yet (checking doesn't build it)."""
+    return name in instance.__dict__.get('_deferred_plot_configs', ())
+
+
+def merge_raw_data(merge, existing_times, existing_raw_data, new_times, new_raw_data):
+    """
+    Merge two raw_data mappings with ``merge`` (the array merge engine).
+
+    The merge is incremental: a derived entry already computed on the existing
+    side is derived for the new segment only and merged like any other array.
+    Entries still pending on the existing side stay pending in the result (and
+    are computed from the merged inputs on first access), so nobody pays for
+    them until they're read. When one side can't recompute (plain dicts, e.g.
+    from a snapshot, or different inputs), every entry is materialised and
+    merged.
+    """
+    lazy = [raw for raw in (existing_raw_data, new_raw_data) if isinstance(raw, DerivedRawData)]
+    if not lazy:
+        return merge(existing_times, existing_raw_data, new_times, new_raw_data)
+
+    existing_inputs = getattr(existing_raw_data, 'inputs', None)
+    new_inputs = getattr(new_raw_data, 'inputs', None)
+    can_defer = (len(lazy) == 2 and existing_inputs.keys() == new_inputs.keys())
+    pending = existing_raw_data.pending() if can_defer else set()
+
+    def flatten(raw_data, inputs):
+        flat = {key: raw_data[key] for key in raw_data.keys() if key not in pending}
+        if can_defer:
+            flat.update((INPUT_PREFIX + key, value) for key, value in inputs.items())
+        return flat
+
+    merged_times, merged = merge(existing_times, flatten(existing_raw_data, existing_inputs),
+                                 new_times, flatten(new_raw_data, new_inputs))
+    if merged is None:
+        return merged_times, merged
+
+    inputs = {key[len(INPUT_PREFIX):]: merged.pop(key) for key in list(merged) if key.startswith(INPUT_PREFIX)}
+    data = {key: PENDING for key in pending}
+    data.update(merged)
+    return merged_times, DerivedRawData(data, lazy[0].derivations, inputs)
@@ -0,0 +1,371 @@
+# custom_expression.py
+"""
+Fused evaluation of custom variable expressions.
+
+Arithmetic on plot_managers (``_perform_operation``) and numpy ufuncs
+(``__array_ufunc__``) record the step they performed on their result as a
+small expression tree. Once a custom variable has been computed the normal,
+operator-by-operator way, its tree is compiled into a ``CompiledExpression``:
+
+- every source is aligned ONCE to a single target time base (the source with
+  the fewest samples, as ``align_variables`` picks for two sources);
+- the whole expression then runs in a single pass, through a numba kernel for
+  large windows or a numpy evaluation of the tree for small ones, with no
+  intermediate plot_managers and no per-operator realignment.
+
+Kernels are cached per expression signature, so re-evaluating a custom
+variable for a new trange only re-runs the kernel on the new window.
+"""
+
+import weakref
+
+import numpy as np
+
+from ..print_manager import print_manager
+
+# Windows at least this long run through the numba kernel; shorter ones use the
+# numpy tree evaluation and skip the one-off compile.
+FUSED_KERNEL_MIN_SAMPLES = 200_000
+
+# Relative tolerance used when checking a compiled expression against the
+# operator-by-operator result it was captured from.
+VERIFY_RTOL = 1e-12
+
+_BINARY_OPERATORS = {
+    'add': '+', 'sub': '-', 'mul': '*', 'div': '/', 'pow': '**', 'floordiv': '//',
+    'subtract': '-', 'multiply': '*', 'true_divide': '/', 'divide': '/',
+    'power': '**', 'floor_divide': '//',
+}
+
+# Scalar division in _perform_operation maps zero denominators to NaN
+_GUARDED_DIVISIONS = {'div_nonzero': '/', 'floordiv_nonzero': '//'}
+
+_UNARY_OPERATORS = {'neg': 'np.negative', 'abs': 'np.abs'}
+
+# numpy ufuncs that are elementwise float -> float and supported by numba
+FUSABLE_UFUNCS = {
+    'absolute', 'add', 'arccos', 'arcsin', 'arctan', 'arctan2', 'ceil', 'cos', 'cosh',
+    'deg2rad', 'degrees', 'divide', 'exp', 'fabs', 'floor', 'floor_divide', 'hypot',
+    'log', 'log10', 'log2', 'maximum', 'minimum', 'multiply', 'negative', 'power',
+    'rad2deg', 'radians', 'sign', 'sin', 'sinh', 'sqrt', 'square', 'subtract', 'tan',
+    'tanh', 'true_divide',
+}
+
+_KERNEL_CACHE = {}
+
+
+class ExpressionNode:
+    """One step of a captured expression: a source variable, a constant or an operation."""
+
+    __slots__ = ('kind', 'name', 'children', 'value', 'source')
+
+    def __init__(self, kind, name=None, children=(), value=None, source=None):
+        self.kind = kind          # 'source', 'constant' or 'operation'
+        self.name = name          # operation name, or 'class.subclass' for sources
+        self.children = tuple(children)
+        self.value = value        # constant value
+        # weak reference to the plot_manager a source node was captured from: the
+        # tree outlives the capture, and must not keep replaced source arrays alive
+        self.source = None if source is None else weakref.ref(source)
+
+    def sources(self):
+        """Source nodes in first-use order, one per class.subclass."""
+        found = {}
+        stack = [self]
+        order = []
+        while stack:
+            node = stack.pop()
+            if node.kind == 'source':
+                if node.name not in found:
+                    found[node.name] = node
+                    order.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return order
+
+
+def _is_scalar(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _node_for(operand):
+    """Expression node for an operand, or None if it can't be part of a fused expression."""
+    if _is_scalar(operand):
+        return ExpressionNode('constant', value=operand)
+    if not isinstance(operand, np.ndarray) or not hasattr(operand, 'plot_config'):
+        return None
+    captured = operand.__dict__.get('_expr')
+    if captured is not None:
+        return captured
+    config = operand.plot_config
+    class_name = getattr(config, 'class_name', None)
+    subclass_name = getattr(config, 'subclass_name', None)
+    if not class_name or not subclass_name or class_name == 'custom_variables':
+        return None
+    return ExpressionNode('source', name=f"{class_name}.{subclass_name}", source=operand)
+
+
+def record_operation(result, operation, operands):
+    """
+    Attach the expression tree for ``operation(*operands)`` to a new plot_manager.
+
+    Called by plot_manager for every captured step. Operands that can't be
+    fused (plain arrays, unknown objects) leave the result without a tree, so
+    custom variables built from it keep using operator-by-operator evaluation.
+    """
+    children = []
+    for operand in operands:
+        node = _node_for(operand)
+        if node is None:
+            return
+        children.append(node)
+    object.__setattr__(result, '_expr', ExpressionNode('operation', name=operation, children=children))
+
+
+def _literal(value):
+    value = value.item() if isinstance(value, np.generic) else value
+    if isinstance(value, float):
+        if np.isnan(value):
+            return 'np.nan'
+        if np.isinf(value):
+            return 'np.inf' if value > 0 else '(-np.inf)'
+    return repr(value)
+
+
+def _emit(node, names, vectorized):
+    """Python source for a node; elementwise scalar code unless vectorized."""
+    if node.kind == 'source':
+        return names[node.name]
+    if node.kind == 'constant':
+        return _literal(node.value)
+    args = [_emit(child, names, vectorized) for child in node.children]
+    if node.name in _GUARDED_DIVISIONS:
+        numerator, denominator = args
+        if vectorized:
+            guarded = f"np.where({denominator} == 0, np.nan, {denominator})"
+        else:
+            guarded = f"({denominator} if {denominator} != 0 else np.nan)"
+        return f"({numerator} {_GUARDED_DIVISIONS[node.name]} {guarded})"
+    if node.name in _BINARY_OPERATORS and len(args) == 2:
+        return f"({args[0]} {_BINARY_OPERATORS[node.name]} {args[1]})"
+    if node.name in _UNARY_OPERATORS:
+        return f"{_UNARY_OPERATORS[node.name]}({args[0]})"
+    if node.name == 'absolute':
+        return f"np.abs({args[0]})"
+    return f"np.{node.name}({', '.join(args)})"
+
+
+def _signature(node, names):
+    if node.kind == 'source':
+        return names[node.name]
+    if node.kind == 'constant':
+        return f"{type(node.value).__name__}:{_literal(node.value)}"
+    return f"{node.name}({','.join(_signature(child, names) for child in node.children)})"
+
+
+def _is_fusable(node):
+    if node.kind != 'operation':
+        return True
+    known = (node.name in _BINARY_OPERATORS or node.name in _GUARDED_DIVISIONS
+             or node.name in _UNARY_OPERATORS or node.name in FUSABLE_UFUNCS)
+    return known and all(_is_fusable(child) for child in node.children)
+
+
+def _build_kernel(signature, n_inputs, body):
+    """Compile (or fetch) the numba loop kernel for an expression signature."""
+    key = ('numba', signature)
+    if key in _KERNEL_CACHE:
+        return _KERNEL_CACHE[key]
+    try:
+        from numba import njit
+    except ImportError:
+        print_manager.debug("Numba not available - fused expressions use numpy evaluation")
+        _KERNEL_CACHE[key] = None
+        return None
+
+    args = ', '.join(f"a{i}" for i in range(n_inputs))
+    source = (
+        f"def _fused_kernel({args}, out):\n"
+        f"    for i in range(out.shape[0]):\n"
+        f"        out[i] = {body}\n"
+    )
+    namespace = {'np': np}
+    exec(compile(source, f"<fused {signature}>", 'exec'), namespace)
+    # Memory-bound single loop: a serial kernel compiles in about half the time of prange
+    kernel = njit(error_model='numpy')(namespace['_fused_kernel'])
+    _KERNEL_CACHE[key] = kernel
+    print_manager.custom_debug(f"🔧 [FUSED] Compiled kernel for {signature}")
+    return kernel
+
+
+def _build_vectorized(signature, n_inputs, body):
+    """numpy function evaluating the whole tree on aligned arrays."""
+    key = ('numpy', signature)
+    if key not in _KERNEL_CACHE:
+        args = ', '.join(f"a{i}" for i in range(n_inputs))
+        source = f"def _fused_numpy({args}):\n    return {body}\n"
+        namespace = {'np': np}
+        exec(compile(source, f"<fused {signature}>", 'exec'), namespace)
+        _KERNEL_CACHE[key] = namespace['_fused_numpy']
+    return _KERNEL_CACHE[key]
+
+
+class CompiledExpression:
+    """
+    A captured custom variable expression, compiled for single-pass evaluation.
+
+    Parameters
+    ----------
+    tree : ExpressionNode
+        Expression recorded on the operator-by-operator result.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.sources = [node.name for node in tree.sources()]
+        names = {source: f"a{i}" for i, source in enumerate(self.sources)}
+        scalar_names = {source: f"a{i}[i]" for i, source in enumerate(self.sources)}
+        self.signature = _signature(tree, names)
+        self._vectorized_body = _emit(tree, names, vectorized=True)
+        self._kernel_body = _emit(tree, scalar_names, vectorized=False)
+        self._vectorized = _build_vectorized(self.signature, len(self.sources), self._vectorized_body)
+
+    def source_variables(self):
+        """Fresh plot_managers for the expression's sources (from data_cubby)."""
+        from ..data_cubby import data_cubby
+        variables = []
+        for source in self.sources:
+            class_name, subclass_name = source.split('.', 1)
+            variable = data_cubby.grab_component(class_name, subclass_name)
+            if variable is None:
+                return None
+            variables.append(variable)
+        return variables
+
+    @staticmethod
+    def align(variables):
+        """
+        Align every source to one target time base.
+
+        Returns (arrays, target_times, target_variable), or None when a source
+        has no data or no time base. The target is the source with the fewest
+        samples; others are interpolated to it with plot_manager.interp_method.
+        """
+        from ..plot_manager import plot_manager
+
+        clipped = []
+        for variable in variables:
+            values = variable.data
+            times = variable.datetime_array
+            if values is None or times is None or len(values) == 0 or len(values) != len(times):
+                return None
+            if np.ndim(values) != 1:
+                return None
+            clipped.append((values, times))
+
+        target_index = min(range(len(clipped)), key=lambda i: len(clipped[i][1]))
+        target_times = clipped[target_index][1]
+        arrays = []
+        for values, times in clipped:
+            if len(times) != len(target_times):
+                values = plot_manager.interpolate_to_times(times, values, target_times,
+                                                           method=plot_manager.interp_method)
+            arrays.append(np.asarray(values))
+        return arrays, target_times, variables[target_index]
+
+    def run(self, arrays):
+        """Evaluate the expression on aligned source arrays in one pass."""
+        n_samples = len(arrays[0]) if arrays else 0
+        all_float = all(array.dtype.kind == 'f' and array.ndim == 1 for array in arrays)
+        if n_samples >= FUSED_KERNEL_MIN_SAMPLES and all_float:
+            try:
+                kernel = _build_kernel(self.signature, len(arrays), self._kernel_body)
+                if kernel is not None:
+                    # numpy's own promotion rules decide the output dtype (float32 stays float32)
+                    out_dtype = np.asarray(self._vectorized(*[array[:1] for array in arrays])).dtype
+                    out = np.empty(n_samples, dtype=out_dtype)
+                    kernel(*arrays, out)
+                    return out
+            except Exception as e:
+                print_manager.custom_debug(f"🔧 [FUSED] Kernel failed for {self.signature}, using numpy: {e}")
+                _KERNEL_CACHE[('numba', self.signature)] = None
+        with np.errstate(all='ignore'):
+            return np.asarray(self._vectorized(*arrays))
+
+    def evaluate(self):
+        """
+        Evaluate against the current source data (clipped to the current trange).
+
+        Returns a new plot_manager on the target time base, or None if the
+        sources can't be aligned.
+        """
+        from ..plot_manager import plot_manager, _shared_time_base
+        from ..plot_config import plot_config
+
+        variables = self.source_variables()
+        if variables is None:
+            return None
+        aligned = self.align(variables)
+        if aligned is None:
+            return None
+        arrays, target_times, target_variable = aligned
+        values = self.run(arrays)
+
+        target_time = target_variable.time
+        if target_time is not None and len(target_time) != len(target_times):
+            target_time = None
+        result = plot_manager(values, plot_config=plot_config(
+            data_type='custom_data_type',
+            class_name='custom_variables',
+            plot_type='time_series',
+            datetime_array=_shared_time_base(target_times),
+            time=_shared_time_base(target_time),
+        ))
+        object.__setattr__(result, 'operation', 'fused')
+        object.__setattr__(result, 'source_var', variables)
+        object.__setattr__(result, '_expr', self.tree)
+        return result
+
+
+def compile_expression(result):
+    """
+    Compile the expression captured on an operator-by-operator result.
+
+    The compiled form is only returned if it reproduces ``result`` from the
+    same source data, on the same time base; anything else (untracked steps,
+    sources that aren't live data class variables, mixed cadences that pairwise
+    alignment handles differently) returns None and the caller keeps
+    evaluating the expression operator by operator.
+    """
+    tree = getattr(result, '__dict__', {}).get('_expr')
+    if tree is None or tree.kind != 'operation' or not _is_fusable(tree):
+        return None
+
+    from ..data_cubby import data_cubby
+    for node in tree.sources():
+        class_name, subclass_name = node.name.split('.', 1)
+        if node.source is None or data_cubby.grab_component(class_name, subclass_name) is not node.source():
+            print_manager.custom_debug(f"🔧 [FUSED] {node.name} is not a live data class variable, not fusing")
+            return None
+
+    try:
+        compiled = CompiledExpression(tree)
+        fused = compiled.evaluate()
+    except Exception as e:
+        print_manager.custom_debug(f"🔧 [FUSED] Could not compile expression: {e}")
+        return None
+    if fused is None:
+        return None
+
+    expected = np.asarray(result.view(np.ndarray))
+    expected_times = result.plot_config.datetime_array
+    fused_times = fused.plot_config.datetime_array
+    if (expected.shape != fused.shape or expected_times is None
+            or len(expected_times) != len(fused_times)
+            or not np.array_equal(np.asarray(expected_times), np.asarray(fused_times))
+            or not np.allclose(np.asarray(fused.view(np.ndarray)), expected, rtol=VERIFY_RTOL, atol=0,
+                               equal_nan=True)):
+        print_manager.custom_debug(f"🔧 [FUSED] {compiled.signature} differs from operator result, not fusing")
+        return None
+    print_manager.custom_debug(f"🔧 [FUSED] Captured {compiled.signature} over {compiled.sources}")
+    return compiled
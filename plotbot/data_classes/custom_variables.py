@@ -1,6 +1,7 @@
 # custom_variables.py
 import numpy as np
 import types
+from datetime import timedelta
 from ..print_manager import print_manager
 # from ..data_cubby import data_cubby # Moved inside functions
 from ..data_tracker import global_tracker
@@ -9,12 +10,19 @@ from ..plotbot_helpers import time_clip
 # List to hold custom variables
 custom_variables_list = []
 
+# Leading samples used to estimate a source's cadence for the evaluation margin
+CADENCE_PROBE_SAMPLES = 64
+
 class CustomVariablesContainer:
     """
     Container for custom variables that follows the standard variable pattern
     used by other Plotbot classes.
     """
     
+    # Extra time kept on each side of the requested trange when sources are
+    # clipped for evaluation (see _evaluation_window)
+    interpolation_margin = timedelta(seconds=30)
+
     def __init__(self):
         """Initialize the container"""
         # Dictionary to store variables by name
@@ -26,6 +34,9 @@ class CustomVariablesContainer:
         # Dictionary to store operations
         self.operations = {}
         
+        # Dictionary of compiled (fused) expressions, None where fusing isn't possible
+        self.expressions = {}
+        
         # Class name for data_cubby registration
         self.class_name = 'custom_variables'
         
@@ -905,6 +916,33 @@ class CustomVariablesContainer:
         
         return []
     
+    def _evaluation_window(self, trange, source_vars):
+        """
+        Pad trange by the interpolation margin used when evaluating expressions.
+
+        The margin is ``interpolation_margin`` or two samples of the coarsest
+        source, whichever is larger, so interpolation at the window edges still
+        has neighbours on both sides.
+        """
+        from dateutil.parser import parse
+
+        margin = self.interpolation_margin
+        for src_var in source_vars:
+            times = getattr(getattr(src_var, 'plot_config', None), 'datetime_array', None)
+            if not isinstance(times, np.ndarray) or times.dtype.kind != 'M' or len(times) < 2:
+                continue
+            if times.ndim == 2:
+                times = times[:, 0]
+            steps = np.diff(times[:CADENCE_PROBE_SAMPLES])
+            steps = steps[steps > np.timedelta64(0, 'ns')]
+            if len(steps):
+                step_us = int(np.median(steps).astype('timedelta64[us]').astype(np.int64))
+                margin = max(margin, timedelta(microseconds=2 * step_us))
+
+        start = parse(trange[0]) - margin
+        end = parse(trange[1]) + margin
+        return [start.strftime('%Y-%m-%d/%H:%M:%S.%f'), end.strftime('%Y-%m-%d/%H:%M:%S.%f')]
+
     def evaluate(self, name, trange):
         """
         Evaluate a custom variable's lambda/expression.
@@ -939,130 +977,52 @@ class CustomVariablesContainer:
                 
                 # LOAD DEPENDENCIES! (Like br_norm does)
                 source_vars = self.get_source_variables(name)
+                evaluation_window = trange
                 if source_vars:
                     from ..get_data import get_data
                     print_manager.custom_debug(f"🔍 [STEP 4] Loading {len(source_vars)} dependencies...")
                     get_data(trange, *source_vars)  # Recursive call!
                     print_manager.custom_debug(f"🔍 [STEP 4] Dependencies loaded")
-                    
+                    evaluation_window = self._evaluation_window(trange, source_vars)
+                    print_manager.custom_debug(f"🔍 [STEP 4] Sources clipped to {evaluation_window} for evaluation")
+
+                # 🚀 PUSHDOWN: Sources clip lazily to the current trange, so making the
+                # padded window current while the lambda runs means every .data access,
+                # ufunc and interpolation works on the window, not on everything loaded.
+                from ..time_utils import TimeRangeTracker
+                with TimeRangeTracker.temporarily(evaluation_window):
                     # STEP 5: Verify data retrieval
                     print_manager.custom_debug(f"🔍 [STEP 5] Verifying source data retrieval...")
                     for src_var in source_vars:
+                        # Set requested_trange on source variables so they clip correctly!
+                        if hasattr(src_var, 'requested_trange'):
+                            src_var.requested_trange = evaluation_window
+
                         if hasattr(src_var, 'datetime_array') and src_var.datetime_array is not None:
                             print_manager.custom_debug(f"🔍 [STEP 5] {src_var.class_name}.{src_var.subclass_name}: {len(src_var.datetime_array)} points")
                             if len(src_var.datetime_array) > 0:
                                 print_manager.custom_debug(f"🔍 [STEP 5]   First: {src_var.datetime_array[0]}, Last: {src_var.datetime_array[-1]}")
                             if hasattr(src_var, 'time'):
                                 print_manager.custom_debug(f"🔍 [STEP 5]   .time exists: {src_var.time is not None}")
-                        
-                        # Set requested_trange on source variables so they clip correctly!
-                        if hasattr(src_var, 'requested_trange'):
-                            src_var.requested_trange = trange
-                
-                # STEP 6-7: Cadence check and resampling (TODO - will implement after testing)
-                print_manager.custom_debug(f"🔍 [STEP 6] Cadence check: TODO")
-                
-                # DEBUG: Check source variable data sizes before lambda evaluation
-                for src_var in source_vars:
-                    if hasattr(src_var, 'data') and hasattr(src_var, 'datetime_array'):
-                        dt_len = len(src_var.datetime_array) if src_var.datetime_array is not None else 0
-                        data_len = len(src_var.data) if src_var.data is not None else 0
-                        print_manager.custom_debug(f"🔧 [PRE-LAMBDA] {src_var.subclass_name}: datetime={dt_len}, .data={data_len}")
-                
-                # STEP 8: Equation Evaluation
-                print_manager.custom_debug(f"🔍 [STEP 8] Evaluating lambda for '{name}'...")
-                result = self.callables[name]()
+
+                    # STEP 6-7: Cadence check and resampling (TODO - will implement after testing)
+                    print_manager.custom_debug(f"🔍 [STEP 6] Cadence check: TODO")
+
+                    # DEBUG: Check source variable data sizes before lambda evaluation
+                    for src_var in source_vars:
+                        if hasattr(src_var, 'data') and hasattr(src_var, 'datetime_array'):
+                            dt_len = len(src_var.datetime_array) if src_var.datetime_array is not None else 0
+                            data_len = len(src_var.data) if src_var.data is not None else 0
+                            print_manager.custom_debug(f"🔧 [PRE-LAMBDA] {src_var.subclass_name}: datetime={dt_len}, .data={data_len}")
+
+                    # STEP 8: Equation Evaluation (fused kernel once captured, else the lambda)
+                    result = self._evaluate_fused(name)
+                    if result is None:
+                        print_manager.custom_debug(f"🔍 [STEP 8] Evaluating lambda for '{name}'...")
+                        result = self.callables[name]()
+                        self._capture_expression(name, result)
                 print_manager.custom_debug(f"🔍 [STEP 8] Result type: {type(result).__name__}, ID: {id(result)}")
-                
-                # STEP 8 continued: Verify result
-                if hasattr(result, 'datetime_array') and result.datetime_array is not None:
-                    print_manager.custom_debug(f"🔍 [STEP 8] Result has {len(result.datetime_array)} points")
-                    if len(result.datetime_array) > 0:
-                        # Spot check first 3 values if possible
-                        data_preview = result[:min(3, len(result))] if len(result) > 0 else []
-                        print_manager.custom_debug(f"🔍 [STEP 8] First 3 values: {data_preview}")
-                    
-                    # 🎯 CRITICAL: Clip result to requested trange!
-                    # The lambda operates on full merged arrays, but we only want data for THIS trange
-                    # FIX: Create NEW plot_manager with clipped data (don't modify in place!)
-                    from ..plotbot_helpers import time_clip
-                    from ..plot_manager import plot_manager
-                    from ..plot_config import plot_config as plot_config_class
-                    
-                    original_datetime = result.datetime_array.copy() if hasattr(result.datetime_array, 'copy') else result.datetime_array
-                    indices = time_clip(original_datetime, trange[0], trange[1])
-                    print_manager.custom_debug(f"🔧 [EVALUATE] Clipping to trange, found {len(indices)} points")
-                    print_manager.custom_debug(f"🔧 [EVALUATE] Original result size: {len(result.view(np.ndarray))}, datetime size: {len(original_datetime)}")
-                    
-                    if len(indices) > 0:
-                        # Get the raw NumPy array from the result
-                        result_raw_array = result.view(np.ndarray)
-                        
-                        # Clip the raw array
-                        if result_raw_array.ndim == 1:
-                            clipped_array = result_raw_array[indices]
-                        else:
-                            clipped_array = result_raw_array[indices, ...]
-                        
-                        print_manager.custom_debug(f"🔧 [EVALUATE] Clipped array shape: {clipped_array.shape}")
-                        
-                        # Create new plot_config with clipped data
-                        new_config = plot_config_class(**result.plot_config.__dict__)
-                        new_config.datetime_array = original_datetime[indices]
-                        
-                        # Clip time if present
-                        if hasattr(result, 'time') and result.time is not None:
-                            new_config.time = result.time[indices]
-                        
-                        # Create NEW plot_manager with clipped data
-                        result = plot_manager(clipped_array, plot_config=new_config)
-                        
-                        print_manager.custom_debug(f"🔧 [EVALUATE] Created new plot_manager with {len(result.datetime_array)} points")
-                
-                # Preserve user-defined attributes from old variable
-                old_var = self.variables[name]
-                style_attrs = ['color', 'y_label', 'legend_label', 'plot_type', 'y_scale', 
-                              'line_style', 'marker_size', 'marker_style', 'line_width']
-                for attr in style_attrs:
-                    if hasattr(old_var, attr):
-                        old_value = getattr(old_var, attr)
-                        object.__setattr__(result, attr, old_value)
-                
-                # STEP 9: Data Cubby Storage
-                print_manager.custom_debug(f"🔍 [STEP 9] Storing result in container.variables...")
-                self.variables[name] = result
-                print_manager.custom_debug(f"🔍 [STEP 9] Stored '{name}' with ID: {id(result)}")
-                
-                # Set metadata
-                object.__setattr__(result, 'class_name', 'custom_variables')
-                object.__setattr__(result, 'subclass_name', name)
-                object.__setattr__(result, 'data_type', 'custom_data_type')
-                
-                # 🎯 CRITICAL: Set requested_trange for proper time clipping
-                if hasattr(result, 'requested_trange'):
-                    object.__setattr__(result, 'requested_trange', trange)
-                    print_manager.custom_debug(f"🔍 [STEP 12] Set requested_trange: {trange}")
-                
-                # Update global reference
-                print_manager.custom_debug(f"🔍 [STEP 9] Making '{name}' globally accessible...")
-                self._make_globally_accessible(name, result)
-                
-                # STEP 10: Tracker update is done in get_data.py
-                print_manager.custom_debug(f"🔍 [STEP 10] Tracker will be updated by get_data()")
-                
-                # STEP 11: Variable Verification
-                print_manager.custom_debug(f"🔍 [STEP 11] Verifying final variable state...")
-                if hasattr(result, 'data'):
-                    print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .data property")
-                if hasattr(result, 'datetime_array'):
-                    dt_len = len(result.datetime_array) if result.datetime_array is not None else 0
-                    print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .datetime_array ({dt_len} points)")
-                if hasattr(result, 'time'):
-                    time_len = len(result.time) if result.time is not None else 0
-                    print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .time ({time_len} points)")
-                
-                print_manager.custom_debug(f"🔧 [EVALUATE] ✅ Lambda '{name}' ready, returning (ID:{id(result)})")
-                return result
+                return self._finalize_evaluation(name, result, trange)
                 
             except Exception as e:
                 print_manager.error(f"Failed to evaluate lambda '{name}': {e}")
@@ -1084,6 +1044,16 @@ class CustomVariablesContainer:
                 for src_var in source_vars:
                     if hasattr(src_var, 'datetime_array') and src_var.datetime_array is not None:
                         print_manager.custom_debug(f"🔍 [STEP 5] {src_var.class_name}.{src_var.subclass_name}: {len(src_var.datetime_array)} points")
+
+            # Chained expressions captured at definition run as one fused pass
+            if getattr(self, 'expressions', {}).get(name) is not None:
+                from ..time_utils import TimeRangeTracker
+                with TimeRangeTracker.temporarily(self._evaluation_window(trange, source_vars)):
+                    result = self._evaluate_fused(name)
+                if result is not None:
+                    result = self._finalize_evaluation(name, result, trange)
+                    global_tracker.update_calculated_range(trange, 'custom_data_type', name)
+                    return result
             
             return self.update(name, trange)
         
@@ -1091,6 +1061,115 @@ class CustomVariablesContainer:
         print_manager.custom_debug(f"🔧 [EVALUATE] Variable '{name}' already ready")
         return self.variables[name]
 
+    def _capture_expression(self, name, result):
+        """Compile the expression recorded on an operator-by-operator result, once per variable."""
+        from .custom_expression import compile_expression
+        expressions = self.__dict__.setdefault('expressions', {})
+        if name not in expressions:
+            expressions[name] = compile_expression(result)
+
+    def _evaluate_fused(self, name):
+        """Run a captured expression's kernel on the current window, or None if there isn't one."""
+        compiled = getattr(self, 'expressions', {}).get(name)
+        if compiled is None:
+            return None
+        print_manager.custom_debug(f"🔍 [STEP 8] Evaluating '{name}' as fused {compiled.signature}")
+        try:
+            return compiled.evaluate()
+        except Exception as e:
+            print_manager.custom_debug(f"🔧 [FUSED] '{name}' failed, falling back to operators: {e}")
+            return None
+
+    def _finalize_evaluation(self, name, result, trange):
+        """Clip an evaluated result to trange, keep the user's styling and store it."""
+        # STEP 8 continued: Verify result
+        if hasattr(result, 'datetime_array') and result.datetime_array is not None:
+            # 🎯 CRITICAL: Clip result to requested trange!
+            # The lambda ran on the padded evaluation window, but we only want data for THIS trange
+            # FIX: Create NEW plot_manager with clipped data (don't modify in place!)
+            from ..plot_manager import plot_manager
+
+            # Use the result's own (unclipped) time base so indices line up with its raw array
+            result_raw_array = result.view(np.ndarray)
+            original_datetime = result.plot_config.datetime_array
+            original_time = result.plot_config.time
+            if original_datetime is None or len(original_datetime) != len(result_raw_array):
+                original_datetime = result.datetime_array
+                original_time = result.time
+            print_manager.custom_debug(f"🔍 [STEP 8] Result has {len(original_datetime)} points")
+            indices = time_clip(original_datetime, trange[0], trange[1])
+            print_manager.custom_debug(f"🔧 [EVALUATE] Clipping to trange, found {len(indices)} points")
+            print_manager.custom_debug(f"🔧 [EVALUATE] Original result size: {len(result_raw_array)}, datetime size: {len(original_datetime)}")
+            
+            if len(indices) > 0:
+                # Clip the raw array
+                if result_raw_array.ndim == 1:
+                    clipped_array = result_raw_array[indices]
+                else:
+                    clipped_array = result_raw_array[indices, ...]
+                
+                print_manager.custom_debug(f"🔧 [EVALUATE] Clipped array shape: {clipped_array.shape}")
+                
+                # Create new plot_config with clipped data
+                new_config = result.plot_config.copy()
+                new_config.datetime_array = original_datetime[indices]
+                
+                # Clip time if present
+                if original_time is not None and len(original_time) == len(original_datetime):
+                    new_config.time = original_time[indices]
+                else:
+                    new_config.time = None
+                
+                # Create NEW plot_manager with clipped data
+                result = plot_manager(clipped_array, plot_config=new_config)
+                
+                print_manager.custom_debug(f"🔧 [EVALUATE] Created new plot_manager with {len(result.datetime_array)} points")
+        
+        # Preserve user-defined attributes from old variable
+        old_var = self.variables[name]
+        style_attrs = ['color', 'y_label', 'legend_label', 'plot_type', 'y_scale', 
+                      'line_style', 'marker_size', 'marker_style', 'line_width']
+        for attr in style_attrs:
+            if hasattr(old_var, attr):
+                old_value = getattr(old_var, attr)
+                object.__setattr__(result, attr, old_value)
+        
+        # STEP 9: Data Cubby Storage
+        print_manager.custom_debug(f"🔍 [STEP 9] Storing result in container.variables...")
+        self.variables[name] = result
+        print_manager.custom_debug(f"🔍 [STEP 9] Stored '{name}' with ID: {id(result)}")
+        
+        # Set metadata
+        object.__setattr__(result, 'class_name', 'custom_variables')
+        object.__setattr__(result, 'subclass_name', name)
+        object.__setattr__(result, 'data_type', 'custom_data_type')
+        
+        # 🎯 CRITICAL: Set requested_trange for proper time clipping
+        if hasattr(result, 'requested_trange'):
+            object.__setattr__(result, 'requested_trange', trange)
+            print_manager.custom_debug(f"🔍 [STEP 12] Set requested_trange: {trange}")
+        
+        # Update global reference
+        print_manager.custom_debug(f"🔍 [STEP 9] Making '{name}' globally accessible...")
+        self._make_globally_accessible(name, result)
+        
+        # STEP 10: Tracker update is done in get_data.py
+        print_manager.custom_debug(f"🔍 [STEP 10] Tracker will be updated by get_data()")
+        
+        # STEP 11: Variable Verification
+        print_manager.custom_debug(f"🔍 [STEP 11] Verifying final variable state...")
+        if hasattr(result, 'data'):
+            print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .data property")
+        if hasattr(result, 'datetime_array'):
+            dt_len = len(result.datetime_array) if result.datetime_array is not None else 0
+            print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .datetime_array ({dt_len} points)")
+        if hasattr(result, 'time'):
+            time_len = len(result.time) if result.time is not None else 0
+            print_manager.custom_debug(f"🔍 [STEP 11] ✓ Has .time ({time_len} points)")
+        
+        print_manager.custom_debug(f"🔧 [EVALUATE] ✅ '{name}' ready, returning (ID:{id(result)})")
+        return result
+
     def ensure_ready(self, name, trange):
         """
         BACKWARD COMPATIBILITY: Old method that does both steps.
@@ -1282,6 +1361,8 @@ def custom_variable(name, expression):
         if not hasattr(container, 'callables'):
             container.callables = {}
         container.callables[name] = expression
+        # The expression is captured (and compiled) on its first evaluation
+        container.__dict__.setdefault('expressions', {}).pop(name, None)
         
         # Create a placeholder plot_manager
         placeholder_config = plot_config(
@@ -1348,7 +1429,8 @@ def custom_variable(name, expression):
     if not sources and hasattr(expression, 'operation') and expression.operation == 'div':
         # Try to get proton.anisotropy and mag_rtn_4sa.bmag (common case)
         try:
-            from . import proton, mag_rtn_4sa
+            from .psp_proton import proton
+            from .psp_mag_rtn_4sa import mag_rtn_4sa
             sources = [proton.anisotropy, mag_rtn_4sa.bmag]
             print_manager.custom_debug(f"Using inferred sources for division: proton.anisotropy / mag_rtn_4sa.bmag")
         except (ImportError, AttributeError):
@@ -1361,6 +1443,10 @@ def custom_variable(name, expression):
     object.__setattr__(expression, 'y_label', expression.subclass_name)
     object.__setattr__(expression, 'legend_label', expression.subclass_name)
     
+    # Chained expressions recorded by plot_manager re-evaluate as one fused pass
+    from .custom_expression import compile_expression
+    container.__dict__.setdefault('expressions', {})[name] = compile_expression(expression)
+    
     # Register the variable with the container
     variable = container.register(name, expression, sources, operation)
     
@@ -14,6 +14,7 @@ class CustomVariablesContainer:
     variables: Dict[str, plot_manager]
     sources: Dict[str, List[plot_manager]]
     operations: Dict[str, str]
+    expressions: Dict[str, Optional[Any]]
     class_name: str
 
     # --- Methods ---
@@ -3,6 +3,8 @@
 import os
 
 # CONFIGURATION: Data Types, Defines all available data products for multiple missions
+# An entry may set 'precision' ('native', 'float32' or 'float64') to override
+# config.precision for that product (see plotbot/precision.py).
 #====================================================================
 data_types = {
     'mag_RTN': {
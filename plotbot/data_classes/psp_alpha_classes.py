@@ -781,7 +781,7 @@ class psp_alpha_class:
     def _calculate_alpha_proton_derived(self):
         """Calculate alpha-proton derived variables using dependency best practices."""
         from plotbot.get_data import get_data
-        from plotbot import proton  # Use regular proton class (CDF data) - RTN coordinates
+        from .psp_proton import proton  # Use regular proton class (CDF data) - RTN coordinates
         
         print_manager.dependency_management(f"[ALPHA_PROTON_CALC] Starting calculation for derived variables")
         
@@ -8,13 +8,17 @@ import logging
 from typing import Optional, List
 
 from plotbot.print_manager import print_manager
+from plotbot import lazy_arrays
 from plotbot.plot_manager import plot_manager
 from plotbot.plot_config import plot_config, retrieve_plot_config_snapshot
 from plotbot.time_utils import TimeRangeTracker
 from ._utils import _format_setattr_debug
+from ._derived import defer_plot_manager, build_deferred, is_deferred
 
 # 🎉 Define the main class to calculate and store mag_rtn variables 🎉
 class mag_rtn_class:
+    supports_lazy_arrays = True  # dask-backed imports stay lazy until a plot_manager is built from them
+
     def __init__(self, imported_data):
         # First, set up the basic attributes without triggering __setattr__ checks
         object.__setattr__(self, 'class_name', 'mag_rtn')      # Internal Plotbot class identifier
@@ -69,7 +73,7 @@ class mag_rtn_class:
         current_plot_states = {}
         standard_components = ['all', 'br', 'bt', 'bn', 'bmag', 'pmag', 'b_phi']
         for comp_name in standard_components:
-            if hasattr(self, comp_name):
+            if not is_deferred(self, comp_name) and hasattr(self, comp_name):
                 manager = getattr(self, comp_name)
                 if isinstance(manager, plot_manager) and hasattr(manager, '_plot_state'):
                     current_plot_states[comp_name] = dict(manager._plot_state)
@@ -98,7 +102,7 @@ class mag_rtn_class:
                 _ = self.br_norm # Ensure property runs and _br_norm_manager is current
                 if hasattr(self, '_br_norm_manager') and isinstance(self._br_norm_manager, plot_manager):
                     target_manager = self._br_norm_manager
-            elif hasattr(self, comp_name): # For standard components
+            elif not is_deferred(self, comp_name) and hasattr(self, comp_name): # Deferred ones carry their state
                 manager = getattr(self, comp_name)
                 if isinstance(manager, plot_manager):
                     target_manager = manager
@@ -157,6 +161,11 @@ class mag_rtn_class:
             except AttributeError:
                 raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
+        # Components over lazy data are built on first access
+        manager = build_deferred(self, name)
+        if manager is not None:
+            return manager
+
         if 'raw_data' not in self.__dict__:
             raise AttributeError(f"{self.__class__.__name__} has no attribute '{name}' (raw_data not initialized)")
         print_manager.dependency_management('mag_rtn getattr helper!')
@@ -191,13 +200,15 @@ class mag_rtn_class:
         print_manager.dependency_management("self.datetime_array type after conversion: {type(self.datetime_array)}")
         print_manager.dependency_management("First element type: {type(self.datetime_array[0])}")
         
-        # Get field data as numpy array
-        self.field = np.asarray(imported_data.data['psp_fld_l2_mag_RTN'])
+        # Field data: numpy, or a lazy dask array with the dask backend (see lazy_arrays)
+        field = imported_data.data['psp_fld_l2_mag_RTN']
+        if not lazy_arrays.is_lazy(field):
+            field = np.asarray(field)
         
         # Extract components and calculate derived quantities efficiently
-        br = self.field[:, 0]
-        bt = self.field[:, 1]
-        bn = self.field[:, 2]
+        br = field[:, 0]
+        bt = field[:, 1]
+        bn = field[:, 2]
         
         # Calculate magnitude using numpy operations
         bmag = np.sqrt(br**2 + bt**2 + bn**2)
@@ -211,6 +222,10 @@ class mag_rtn_class:
         # This gives the angle in the R-N plane measured from the N axis toward the R axis
         b_phi = np.degrees(np.arctan2(br, bn)) + 180.0
         
+        # Lazy graphs stay lazy: set_plot_config defers their plot_managers, which
+        # compute just the requested window when first accessed
+        self.field = field
+        
         # Store all data in raw_data dictionary
         self.raw_data = {
             'all': [br, bt, bn],
@@ -230,154 +245,133 @@ class mag_rtn_class:
     
     def set_plot_config(self):
         """Set up the plotting options for all magnetic field components"""
-        # Initialize each component with plot_manager
-        self.all = plot_manager(
-            [self.raw_data['br'], self.raw_data['bt'], self.raw_data['bn']],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name=['br_rtn', 'bt_rtn', 'bn_rtn'],  # Variable names
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='all',       # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='B (nT)',          # Y-axis label
-                legend_label=['$B_R$', '$B_T$', '$B_N$'],  # Legend text
-                color=['forestgreen', 'orange', 'dodgerblue'],  # Plot colors
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=[1, 1, 1],      # Line widths
-                line_style=['-', '-', '-'] # Line styles
-            )
-        )
-
-        self.br = plot_manager(
-            self.raw_data['br'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='br_rtn',         # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='br',        # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='B (nT)',          # Y-axis label
-                legend_label='$B_R$',      # Legend text
-                color='forestgreen',       # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.bt = plot_manager(
-            self.raw_data['bt'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='bt_rtn',         # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='bt',        # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='B (nT)',          # Y-axis label
-                legend_label='$B_T$',      # Legend text
-                color='orange',            # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.bn = plot_manager(
-            self.raw_data['bn'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='bn_rtn',         # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='bn',        # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='B (nT)',          # Y-axis label
-                legend_label='$B_N$',      # Legend text
-                color='dodgerblue',        # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.bmag = plot_manager(
-            self.raw_data['bmag'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='bmag_rtn',       # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='bmag',      # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='|B| (nT)',        # Y-axis label
-                legend_label='$|B|$',      # Legend text
-                color='black',             # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.pmag = plot_manager(
-            self.raw_data['pmag'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='pmag_rtn',       # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='pmag',      # Specific component
-                plot_type='time_series',   # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label='Pmag (nPa)',      # Y-axis label
-                legend_label='$P_{mag}$',  # Legend text
-                color='purple',            # Plot color
-                y_scale='log',             # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.b_phi = plot_manager(
-            self.raw_data['b_phi'],
-            plot_config=plot_config(
-                data_type='mag_RTN',       # Actual data product name
-                var_name='b_phi_rtn',      # Variable name
-                class_name='mag_rtn',      # Class handling this data
-                subclass_name='b_phi',     # Specific component
-                plot_type='scatter',       # Type of plot
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,# Time data
-                y_label=r'$\phi_B$ (deg)', # Y-axis label
-                legend_label=r'$\phi_B$',  # Legend text
-                color='purple',            # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                marker_size=1,             # Scatter point size
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
+        # Initialize each component with plot_manager (deferred while its data are lazy)
+        defer_plot_manager(self, 'all', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name=['br_rtn', 'bt_rtn', 'bn_rtn'],  # Variable names
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='all',       # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='B (nT)',          # Y-axis label
+            legend_label=['$B_R$', '$B_T$', '$B_N$'],  # Legend text
+            color=['forestgreen', 'orange', 'dodgerblue'],  # Plot colors
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=[1, 1, 1],      # Line widths
+            line_style=['-', '-', '-'] # Line styles
+        ))
+
+        defer_plot_manager(self, 'br', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='br_rtn',         # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='br',        # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='B (nT)',          # Y-axis label
+            legend_label='$B_R$',      # Legend text
+            color='forestgreen',       # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'bt', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='bt_rtn',         # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='bt',        # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='B (nT)',          # Y-axis label
+            legend_label='$B_T$',      # Legend text
+            color='orange',            # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'bn', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='bn_rtn',         # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='bn',        # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='B (nT)',          # Y-axis label
+            legend_label='$B_N$',      # Legend text
+            color='dodgerblue',        # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'bmag', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='bmag_rtn',       # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='bmag',      # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='|B| (nT)',        # Y-axis label
+            legend_label='$|B|$',      # Legend text
+            color='black',             # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'pmag', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='pmag_rtn',       # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='pmag',      # Specific component
+            plot_type='time_series',   # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label='Pmag (nPa)',      # Y-axis label
+            legend_label='$P_{mag}$',  # Legend text
+            color='purple',            # Plot color
+            y_scale='log',             # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'b_phi', plot_config(
+            data_type='mag_RTN',       # Actual data product name
+            var_name='b_phi_rtn',      # Variable name
+            class_name='mag_rtn',      # Class handling this data
+            subclass_name='b_phi',     # Specific component
+            plot_type='scatter',       # Type of plot
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,# Time data
+            y_label=r'$\phi_B$ (deg)', # Y-axis label
+            legend_label=r'$\phi_B$',  # Legend text
+            color='purple',            # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            marker_size=1,             # Scatter point size
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
 
     def ensure_internal_consistency(self):
         """Ensures .time and .field are consistent with .datetime_array and .raw_data."""
@@ -534,7 +528,7 @@ class mag_rtn_class:
     def _calculate_br_norm(self):
         """Calculate Br normalized by R^2."""
         from plotbot.get_data import get_data # Local import
-        from plotbot import proton # Local import for proton data
+        from .psp_proton import proton # Local import for proton data
         import matplotlib.dates as mdates # Moved here
         import scipy.interpolate as interpolate # Moved here
 
@@ -19,6 +19,7 @@ from plotbot.plot_config import plot_config, retrieve_plot_config_snapshot
 ImportedDataType = Any
 
 class mag_rtn_class:
+    supports_lazy_arrays: bool
     raw_data: Dict[str, Optional[Union[np.ndarray, List[np.ndarray]]]]
     datetime: List[Any]
     datetime_array: Optional[np.ndarray]
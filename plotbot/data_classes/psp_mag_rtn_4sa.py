@@ -13,11 +13,31 @@ from plotbot.plot_manager import plot_manager
 from plotbot.plot_config import plot_config, retrieve_plot_config_snapshot
 from plotbot.time_utils import TimeRangeTracker
 from ._utils import _format_setattr_debug
+from ._derived import DerivedRawData, defer_plot_manager, build_deferred, is_deferred
 # import matplotlib.dates as mdates # Will be moved
 # import scipy.interpolate as interpolate # Will be moved
 
+def _bmag(raw_data):
+    """Field magnitude |B| (nT)."""
+    return np.sqrt(raw_data['br']**2 + raw_data['bt']**2 + raw_data['bn']**2)
+
+
+def _pmag(raw_data):
+    """Magnetic pressure (nPa)."""
+    mu_0 = 4 * np.pi * 1e-7  # Permeability of free space
+    return (raw_data['bmag']**2) / (2 * mu_0) * 1e-9  # Convert to nPa
+
+
+def _b_phi(raw_data):
+    """Azimuthal angle in the R-N plane, measured from N toward R: arctan2(Br, Bn) + 180 degrees."""
+    return np.degrees(np.arctan2(raw_data['br'], raw_data['bn'])) + 180.0
+
+
 # 🎉 Define the main class to calculate and store mag_rtn_4sa variables 🎉
 class mag_rtn_4sa_class:
+    # Derived quantities, computed on first access (see _derived.py)
+    derived_variables = {'bmag': _bmag, 'pmag': _pmag, 'b_phi': _b_phi}
+
     def __init__(self, imported_data):
         # Initialize attributes
         # These are fundamental identifiers for Plotbot
@@ -74,7 +94,7 @@ class mag_rtn_4sa_class:
         current_plot_states = {}
         standard_components = ['all', 'br', 'bt', 'bn', 'bmag', 'pmag', 'b_phi']
         for comp_name in standard_components:
-            if hasattr(self, comp_name):
+            if not is_deferred(self, comp_name) and hasattr(self, comp_name):
                 manager = getattr(self, comp_name)
                 if isinstance(manager, plot_manager) and hasattr(manager, '_plot_state'):
                     print_manager.custom_debug(f"🔧 [UPDATE_SAVE_STATE] Saving state for {comp_name} (ID:{id(manager)}, class:{manager.class_name if hasattr(manager, 'class_name') else 'N/A'}.{manager.subclass_name if hasattr(manager, 'subclass_name') else 'N/A'})")
@@ -106,7 +126,7 @@ class mag_rtn_4sa_class:
                 _ = self.br_norm # Ensure property runs and _br_norm_manager is current
                 if hasattr(self, '_br_norm_manager') and isinstance(self._br_norm_manager, plot_manager):
                     target_manager = self._br_norm_manager
-            elif hasattr(self, comp_name): # For standard components
+            elif not is_deferred(self, comp_name) and hasattr(self, comp_name): # Deferred ones carry their state
                 manager = getattr(self, comp_name)
                 if isinstance(manager, plot_manager):
                     target_manager = manager
@@ -178,6 +198,11 @@ class mag_rtn_4sa_class:
                 # Re-raise AttributeError if the internal/dunder method truly doesn't exist
                 raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
+        # Derived components are built on first access
+        manager = build_deferred(self, name)
+        if manager is not None:
+            return manager
+
         print_manager.dependency_management(f"[GETATTR DEBUG] Trying to access '{name}'")
 
         # Default handling for other attributes
@@ -328,34 +353,19 @@ class mag_rtn_4sa_class:
         # Get field data as numpy array
         self.field = np.asarray(imported_data.data['psp_fld_l2_mag_RTN_4_Sa_per_Cyc'])
         
-        # Extract components and calculate derived quantities efficiently
+        # Extract components; bmag, pmag and b_phi are computed on first access
         br = self.field[:, 0]
         bt = self.field[:, 1]
         bn = self.field[:, 2]
         
-        # Calculate magnitude using numpy operations
-        bmag = np.sqrt(br**2 + bt**2 + bn**2)
-        
-        # Calculate magnetic pressure
-        mu_0 = 4 * np.pi * 1e-7  # Permeability of free space
-        pmag = (bmag**2) / (2 * mu_0) * 1e-9  # Convert to nPa
-        
-        # Calculate magnetic field azimuthal angle (B_phi) in RTN coordinates
-        # B_phi = arctan2(Br, Bn) + 180 degrees
-        # This gives the angle in the R-N plane measured from the N axis toward the R axis
-        b_phi = np.degrees(np.arctan2(br, bn)) + 180.0
-        
         # Store all data in raw_data dictionary
-        self.raw_data = {
+        self.raw_data = DerivedRawData({
             'all': [br, bt, bn],
             'br': br,
             'bt': bt,
             'bn': bn,
-            'bmag': bmag,
-            'pmag': pmag,
-            'b_phi': b_phi,  # Magnetic field azimuthal angle (degrees)
             'br_norm': None  # br_norm is calculated only when requested (lazy loading)
-        }
+        }, self.derived_variables)
 
         # # Convert TT2000 timestamps to datetime objects using cdflib
         # self.datetime = cdflib.cdfepoch.to_datetime(self.time)
@@ -368,7 +378,7 @@ class mag_rtn_4sa_class:
     def _calculate_br_norm(self):
         """Calculate Br normalized by R^2."""
         from plotbot.get_data import get_data # Local import
-        from plotbot import proton # Local import for proton data
+        from .psp_proton import proton # Local import for proton data
         import matplotlib.dates as mdates # Moved here
         import scipy.interpolate as interpolate # Moved here
 
@@ -611,67 +621,57 @@ class mag_rtn_4sa_class:
         )
         print_manager.custom_debug(f"🔧 [SET_PLOT_CONFIG] Created self.bn (ID:{id(self.bn)}, class:{self.bn.class_name}.{self.bn.subclass_name})")
         
-        self.bmag = plot_manager(
-            self.raw_data['bmag'],
-            plot_config=plot_config(
-                data_type='mag_RTN_4sa',    # Actual data product name
-                var_name='bmag_rtn_4sa',     # Variable name in data file
-                class_name='mag_rtn_4sa',   # Class handling this data type
-                subclass_name='bmag',       # Specific component
-                plot_type='time_series',    # Type of plot
-                time=self.time,            # Raw TT2000 epoch time
-                datetime_array=self.datetime_array,# Time data
-                y_label='|B| (nT)',        # Y-axis label
-                legend_label='$|B|$',      # Legend text
-                color='black',             # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
-
-        self.pmag = plot_manager(
-            self.raw_data['pmag'],
-            plot_config=plot_config(
-                data_type='mag_RTN_4sa',    # Actual data product name
-                var_name='pmag_rtn_4sa',     # Variable name in data file
-                class_name='mag_rtn_4sa',   # Class handling this data type
-                subclass_name='pmag',       # Specific component
-                plot_type='time_series',    # Type of plot
-                time=self.time,            # Raw TT2000 epoch time
-                datetime_array=self.datetime_array,# Time data
-                y_label='Pmag (nPa)',      # Y-axis label
-                legend_label='$P_{mag}$',  # Legend text
-                color='purple',            # Plot color
-                y_scale='log',             # Scale type
-                y_limit=None,              # Y-axis limits
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-            
-        )
-
-        self.b_phi = plot_manager(
-            self.raw_data['b_phi'],
-            plot_config=plot_config(
-                data_type='mag_RTN_4sa',    # Actual data product name
-                var_name='b_phi_rtn_4sa',    # Variable name
-                class_name='mag_rtn_4sa',   # Class handling this data type
-                subclass_name='b_phi',      # Specific component
-                plot_type='scatter',       # Type of plot
-                time=self.time,            # Raw TT2000 epoch time
-                datetime_array=self.datetime_array,# Time data
-                y_label=r'$\phi_B$ (deg)',  # Y-axis label
-                legend_label=r'$\phi_B$',   # Legend text
-                color='purple',            # Plot color
-                y_scale='linear',          # Scale type
-                y_limit=None,              # Y-axis limits
-                marker_size=1,             # Scatter point size
-                line_width=1,              # Line width
-                line_style='-'             # Line style
-            )
-        )
+        defer_plot_manager(self, 'bmag', plot_config(
+            data_type='mag_RTN_4sa',    # Actual data product name
+            var_name='bmag_rtn_4sa',     # Variable name in data file
+            class_name='mag_rtn_4sa',   # Class handling this data type
+            subclass_name='bmag',       # Specific component
+            plot_type='time_series',    # Type of plot
+            time=self.time,            # Raw TT2000 epoch time
+            datetime_array=self.datetime_array,# Time data
+            y_label='|B| (nT)',        # Y-axis label
+            legend_label='$|B|$',      # Legend text
+            color='black',             # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'pmag', plot_config(
+            data_type='mag_RTN_4sa',    # Actual data product name
+            var_name='pmag_rtn_4sa',     # Variable name in data file
+            class_name='mag_rtn_4sa',   # Class handling this data type
+            subclass_name='pmag',       # Specific component
+            plot_type='time_series',    # Type of plot
+            time=self.time,            # Raw TT2000 epoch time
+            datetime_array=self.datetime_array,# Time data
+            y_label='Pmag (nPa)',      # Y-axis label
+            legend_label='$P_{mag}$',  # Legend text
+            color='purple',            # Plot color
+            y_scale='log',             # Scale type
+            y_limit=None,              # Y-axis limits
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
+
+        defer_plot_manager(self, 'b_phi', plot_config(
+            data_type='mag_RTN_4sa',    # Actual data product name
+            var_name='b_phi_rtn_4sa',    # Variable name
+            class_name='mag_rtn_4sa',   # Class handling this data type
+            subclass_name='b_phi',      # Specific component
+            plot_type='scatter',       # Type of plot
+            time=self.time,            # Raw TT2000 epoch time
+            datetime_array=self.datetime_array,# Time data
+            y_label=r'$\phi_B$ (deg)',  # Y-axis label
+            legend_label=r'$\phi_B$',   # Legend text
+            color='purple',            # Plot color
+            y_scale='linear',          # Scale type
+            y_limit=None,              # Y-axis limits
+            marker_size=1,             # Scatter point size
+            line_width=1,              # Line width
+            line_style='-'             # Line style
+        ))
 
         # br_norm plot manager is only created when it's data is available (lazy loading)
         # We don't create it here initially to avoid unnecessary proton data loading
@@ -6,7 +6,7 @@ import pandas as pd
 import cdflib
 from datetime import datetime, timedelta, timezone
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 # Import dependencies used in type hints (adjust paths if necessary)
 from plotbot.print_manager import print_manager
@@ -19,6 +19,7 @@ from plotbot.plot_config import plot_config, retrieve_plot_config_snapshot
 ImportedDataType = Any
 
 class mag_rtn_4sa_class:
+    derived_variables: Dict[str, Callable[..., Any]]
     raw_data: Dict[str, Optional[Union[np.ndarray, List[np.ndarray]]]]
     datetime: List[Any] # Or more specific type if known
     datetime_array: Optional[np.ndarray]
@@ -11,10 +11,100 @@ from plotbot.print_manager import print_manager
 from plotbot.plot_manager import plot_manager
 from plotbot.plot_config import plot_config, retrieve_plot_config_snapshot
 from plotbot.time_utils import TimeRangeTracker
+from plotbot import precision
 from ._utils import _format_setattr_debug
+from ._derived import DerivedRawData, defer_plot_manager, build_deferred, is_deferred
+
+
+def _project_temperature(mag_field, temp_tensor):
+    """Project the temperature tensor onto B: returns (t_par, t_perp, anisotropy).
+
+    The projection and the trace difference lose digits in float32, so they're
+    computed in float64 and stored in the inputs' dtype (see precision.py).
+    """
+    store_dtype = precision.result_dtype(mag_field, temp_tensor)
+    mag_field, temp_tensor = precision.promoted(mag_field, temp_tensor)
+    bx = mag_field[:, 0]
+    by = mag_field[:, 1]
+    bz = mag_field[:, 2]
+    b_mag = np.sqrt(bx**2 + by**2 + bz**2)
+
+    # Tensor components: xx, yy, zz, xy, xz, yz
+    t_xx = temp_tensor[:, 0]
+    t_yy = temp_tensor[:, 1]
+    t_zz = temp_tensor[:, 2]
+    t_xy = temp_tensor[:, 3]
+    t_xz = temp_tensor[:, 4]
+    t_yz = temp_tensor[:, 5]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Parallel temperature using full tensor projection
+        t_par = (bx**2 * t_xx + by**2 * t_yy + bz**2 * t_zz +
+                 2 * (bx*by*t_xy + bx*bz*t_xz + by*bz*t_yz)) / b_mag**2
+        # Perpendicular temperature from the trace
+        t_perp = (t_xx + t_yy + t_zz - t_par) / 2.0
+        anisotropy = np.where(t_par != 0, t_perp / t_par, np.nan)
+    return tuple(values.astype(store_dtype, copy=False) for values in (t_par, t_perp, anisotropy))
+
+
+def _temperature_anisotropy(raw_data):
+    return _project_temperature(raw_data.inputs['mag_field'], raw_data.inputs['temp_tensor'])
+
+
+def _v_sw(raw_data):
+    return np.sqrt(raw_data['vr']**2 + raw_data['vt']**2 + raw_data['vn']**2)
+
+
+def _bmag(raw_data):
+    return np.sqrt(np.sum(raw_data.inputs['mag_field']**2, axis=1))
+
+
+def _v_alfven(raw_data):
+    density = raw_data['density']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(density > 0, 21.8 * raw_data['bmag'] / np.sqrt(density), np.nan)
+
+
+def _m_alfven(raw_data):
+    return raw_data['v_sw'] / raw_data['v_alfven']
+
+
+def _beta_ppar(raw_data):
+    return (4.03E-11 * raw_data['density'] * raw_data['t_par']) / (1e-5 * raw_data['bmag'])**2
+
+
+def _beta_pperp(raw_data):
+    return (4.03E-11 * raw_data['density'] * raw_data['t_perp']) / (1e-5 * raw_data['bmag'])**2
+
+
+def _pressure_ppar(raw_data):
+    return 1.602E-4 * raw_data['density'] * raw_data['t_par']  # nPa
+
+
+def _pressure_pperp(raw_data):
+    return 1.602E-4 * raw_data['density'] * raw_data['t_perp']  # nPa
+
+
+def _pressure(raw_data):
+    return 1.602E-4 * raw_data['temperature'] * raw_data['density']  # nPa
+
 
 # 🎉 Define the main class to calculate and store proton variables 🎉
 class proton_class:    
+    # Derived quantities, computed on first access (see _derived.py)
+    derived_variables = {
+        ('t_par', 't_perp', 'anisotropy'): _temperature_anisotropy,
+        'v_sw': _v_sw,
+        'bmag': _bmag,
+        'v_alfven': _v_alfven,
+        'm_alfven': _m_alfven,
+        'beta_ppar': _beta_ppar,
+        'beta_pperp': _beta_pperp,
+        'pressure_ppar': _pressure_ppar,
+        'pressure_pperp': _pressure_pperp,
+        'pressure': _pressure,
+    }
+
     def __init__(self, imported_data):
         # First, set up the basic attributes without triggering __setattr__ checks
         object.__setattr__(self, 'raw_data', {
@@ -103,7 +193,7 @@ class proton_class:
         # Store current state before update (including any modified plot_config)
         current_state = {}
         for subclass_name in self.raw_data.keys():                             # Use keys()
-            if hasattr(self, subclass_name):
+            if not is_deferred(self, subclass_name) and hasattr(self, subclass_name):   # Unbuilt derived vars have no state
                 var = getattr(self, subclass_name)
                 if hasattr(var, '_plot_state'):
                     current_state[subclass_name] = dict(var._plot_state)       # Save current plot state
@@ -116,7 +206,7 @@ class proton_class:
         # Restore state (including any modified plot_config!)
         print_manager.datacubby("Restoring saved state...")
         for subclass_name, state in current_state.items():                    # Restore saved states
-            if hasattr(self, subclass_name):
+            if not is_deferred(self, subclass_name) and hasattr(self, subclass_name):
                 var = getattr(self, subclass_name)
                 var._plot_state.update(state)                                 # Restore plot state
                 for attr, value in state.items():
@@ -156,6 +246,11 @@ class proton_class:
             except AttributeError:
                 raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
+        # Derived components are built on first access
+        manager = build_deferred(self, name)
+        if manager is not None:
+            return manager
+
         if name == 'field':
             print_manager.dependency_management(f"[PROTON_GETATTR_FIELD_ACCESS] Attempt to access 'field' attribute on {self.__class__.__name__} instance ID {id(self)}")
 
@@ -216,36 +311,16 @@ class proton_class:
         self.mag_field = imported_data.data['MAGF_INST']
         self.temp_tensor = imported_data.data['T_TENSOR_INST']
         
-        # Extract data needed for calculations
+        # Extract data needed for calculations; everything derived from these
+        # (see derived_variables) is computed on first access
         velocity = imported_data.data['VEL_RTN_SUN']
         density = imported_data.data['DENS']
         temperature = imported_data.data['TEMP']
         
-        # Calculate velocity components and magnitude
+        # Velocity components
         vr = velocity[:, 0]
         vt = velocity[:, 1]
         vn = velocity[:, 2]
-        v_sw = np.sqrt(vr**2 + vt**2 + vn**2)
-        
-        # Calculate magnetic field magnitude
-        b_mag = np.sqrt(np.sum(self.mag_field**2, axis=1))
-        
-        # Calculate Alfvén speed and Mach number
-        with np.errstate(divide='ignore', invalid='ignore'):
-            v_alfven = np.where(density > 0, 21.8 * b_mag / np.sqrt(density), np.nan)
-        m_alfven = v_sw / v_alfven
-        
-        # Calculate temperature anisotropy components
-        t_par, t_perp, anisotropy = self._calculate_temperature_anisotropy()
-        
-        # Calculate plasma betas
-        beta_ppar = (4.03E-11 * density * t_par) / (1e-5 * b_mag)**2
-        beta_pperp = (4.03E-11 * density * t_perp) / (1e-5 * b_mag)**2
-        
-        # Calculate pressures (in nPa)
-        pressure_ppar = 1.602E-4 * density * t_par
-        pressure_pperp = 1.602E-4 * density * t_perp
-        pressure_total = 1.602E-4 * temperature * density
 
         # Distance from sun - Added from Jaye's version
         sun_dist_km = imported_data.data['SUN_DIST']
@@ -287,82 +362,25 @@ class proton_class:
                       f"Time range (mesh[0,:]): {self.times_mesh_angle[0,0]} to {self.times_mesh_angle[0,-1]} " if self.times_mesh_angle is not None and self.times_mesh_angle.size > 0 and self.times_mesh_angle.ndim == 2 and self.times_mesh_angle.shape[0] > 0 and self.times_mesh_angle.shape[1] > 0 else 
                       f"[PROTON_CALC_VARS] self.times_mesh_angle is empty/None or not 2D as expected. Shape: {self.times_mesh_angle.shape if hasattr(self.times_mesh_angle, 'shape') else 'N/A'}")
 
-        # Compute centroids
-        centroids_spi_nrg = np.ma.average(self.energy_vals, 
-                            weights=self.energy_flux, 
-                            axis=1)
-        centroids_spi_theta = np.ma.average(self.theta_vals, 
-                            weights=self.theta_flux, 
-                            axis=1)
-        centroids_spi_phi = np.ma.average(self.phi_vals, 
-                            weights=self.phi_flux, 
-                            axis=1)
-
         # Store raw data including time
-        self.raw_data = {
+        self.raw_data = DerivedRawData({
             'vr': vr,
             'vt': vt, 
             'vn': vn,
-            't_par': t_par,
-            't_perp': t_perp,
-            'anisotropy': anisotropy,
-            'v_alfven': v_alfven,
-            'beta_ppar': beta_ppar,
-            'beta_pperp': beta_pperp,
-            'pressure_ppar': pressure_ppar,
-            'pressure_pperp': pressure_pperp,
             'energy_flux': self.energy_flux,
             'theta_flux': self.theta_flux,
             'phi_flux': self.phi_flux,
-            'v_sw': v_sw,
-            'm_alfven': m_alfven,
             'temperature': temperature,
-            'pressure': pressure_total,
             'density': density,
-            'bmag': b_mag,
             'sun_dist_rsun': sun_dist_rsun,
             'ENERGY_VALS': self.energy_vals,
             'THETA_VALS': self.theta_vals,
             'PHI_VALS': self.phi_vals
-        }
+        }, self.derived_variables, inputs={'mag_field': self.mag_field, 'temp_tensor': self.temp_tensor})
 
     def _calculate_temperature_anisotropy(self):
         """Calculate temperature anisotropy from the temperature tensor."""
-        # Extract magnetic field components
-        bx = self.mag_field[:, 0]
-        by = self.mag_field[:, 1]
-        bz = self.mag_field[:, 2]
-        b_mag = np.sqrt(bx**2 + by**2 + bz**2)
-        
-        t_par = []
-        t_perp = []
-        anisotropy = []
-        
-        for i in range(len(bx)):
-            # Extract tensor components
-            t_xx = self.temp_tensor[i, 0]
-            t_yy = self.temp_tensor[i, 1]
-            t_zz = self.temp_tensor[i, 2]
-            t_xy = t_yx = self.temp_tensor[i, 3]
-            t_xz = t_zx = self.temp_tensor[i, 4]
-            t_yz = t_zy = self.temp_tensor[i, 5]
-            
-            # Calculate parallel temperature using full tensor projection
-            t_para = (bx[i]**2 * t_xx + by[i]**2 * t_yy + bz[i]**2 * t_zz +
-                     2 * (bx[i]*by[i]*t_xy + bx[i]*bz[i]*t_xz + by[i]*bz[i]*t_yz)) / b_mag[i]**2
-            
-            # Calculate perpendicular temperature
-            trace_temp = t_xx + t_yy + t_zz
-            t_perp_val = (trace_temp - t_para) / 2.0
-            
-            t_par.append(t_para)
-            t_perp.append(t_perp_val)
-            if t_para != 0:
-                anisotropy.append(t_perp_val/t_para)
-            else:
-                anisotropy.append(np.nan)  # or any other value that makes sense in your context
-        
-        return np.array(t_par), np.array(t_perp), np.array(anisotropy)
+        return _project_temperature(self.mag_field, self.temp_tensor)
 
     def set_plot_config(self):
         """Set up the plotting options for all proton parameters"""
@@ -374,239 +392,206 @@ class proton_class:
             print_manager.processing(f"[PROTON_SET_PLOPT] self.datetime_array does not exist, is None, or is empty for instance ID {id(self)}.")
 
         # Temperature components
-        self.t_par = plot_manager(
-            self.raw_data['t_par'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='t_par',
-                class_name='proton',
-                subclass_name='t_par',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='Temp\n(eV)',
-                y_limit=None,
-                legend_label=r'$T_\parallel$',
-                color='deepskyblue',
-                y_scale='linear',
-                line_width=1,
-                line_style='-',
-            )
-        )
+        defer_plot_manager(self, 't_par', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='t_par',
+            class_name='proton',
+            subclass_name='t_par',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='Temp\n(eV)',
+            y_limit=None,
+            legend_label=r'$T_\parallel$',
+            color='deepskyblue',
+            y_scale='linear',
+            line_width=1,
+            line_style='-',
+        ))
         
-        self.t_perp = plot_manager(
-            self.raw_data['t_perp'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='t_perp',
-                class_name='proton',
-                subclass_name='t_perp',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='Temp\n(eV)',
-                legend_label=r'$T_\perp$',
-                color='hotpink',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 't_perp', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='t_perp',
+            class_name='proton',
+            subclass_name='t_perp',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='Temp\n(eV)',
+            legend_label=r'$T_\perp$',
+            color='hotpink',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.anisotropy = plot_manager(
-            self.raw_data['anisotropy'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='anisotropy',
-                class_name='proton',
-                subclass_name='anisotropy',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label=r'$T_\perp/T_\parallel$',     
-                legend_label=r'$T_\perp/T_\parallel$',
-                color='mediumspringgreen',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'anisotropy', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='anisotropy',
+            class_name='proton',
+            subclass_name='anisotropy',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label=r'$T_\perp/T_\parallel$',     
+            legend_label=r'$T_\perp/T_\parallel$',
+            color='mediumspringgreen',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
         # Velocities
-        self.v_alfven = plot_manager(  
-            self.raw_data['v_alfven'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='v_alfven_spi',
-                class_name='proton',
-                subclass_name='v_alfven',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='$V_{A}$ (km/s)',
-                legend_label='$V_{A}$',
-                color='deepskyblue',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'v_alfven', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='v_alfven_spi',
+            class_name='proton',
+            subclass_name='v_alfven',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='$V_{A}$ (km/s)',
+            legend_label='$V_{A}$',
+            color='deepskyblue',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.v_sw = plot_manager(
-            self.raw_data['v_sw'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='v_sw',
-                class_name='proton',
-                subclass_name='v_sw',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='$V_{SW}$ (km/s)',
-                legend_label='$V_{SW}$',
-                color='red',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'v_sw', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='v_sw',
+            class_name='proton',
+            subclass_name='v_sw',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='$V_{SW}$ (km/s)',
+            legend_label='$V_{SW}$',
+            color='red',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.m_alfven = plot_manager(
-            self.raw_data['m_alfven'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='m_alfven',
-                class_name='proton',
-                subclass_name='m_alfven',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='$M_A$',
-                legend_label='$M_A$',
-                color='black',
-                y_scale='log',
-                y_limit=None,
-                line_width=1,
-                line_style='-'    
-            )
-        )
+        defer_plot_manager(self, 'm_alfven', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='m_alfven',
+            class_name='proton',
+            subclass_name='m_alfven',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='$M_A$',
+            legend_label='$M_A$',
+            color='black',
+            y_scale='log',
+            y_limit=None,
+            line_width=1,
+            line_style='-'    
+        ))
         
         # Plasma parameters
-        self.beta_ppar = plot_manager(
-            self.raw_data['beta_ppar'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='beta_ppar',
-                class_name='proton',
-                subclass_name='beta_ppar',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label=r'$\beta$',
-                legend_label=r'$\beta_\parallel$',
-                color='purple',
-                y_scale='log',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'beta_ppar', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='beta_ppar',
+            class_name='proton',
+            subclass_name='beta_ppar',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label=r'$\beta$',
+            legend_label=r'$\beta_\parallel$',
+            color='purple',
+            y_scale='log',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.beta_pperp = plot_manager(
-            self.raw_data['beta_pperp'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='beta_pperp',
-                class_name='proton',
-                subclass_name='beta_pperp',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label=r'$\beta$',
-                legend_label=r'$\beta_\perp$',
-                color='green',
-                y_scale='log',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'beta_pperp', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='beta_pperp',
+            class_name='proton',
+            subclass_name='beta_pperp',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label=r'$\beta$',
+            legend_label=r'$\beta_\perp$',
+            color='green',
+            y_scale='log',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
         # Pressures
-        self.pressure_ppar = plot_manager(
-            self.raw_data['pressure_ppar'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='pressure_ppar',
-                class_name='proton',
-                subclass_name='pressure_ppar',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='Pressure (nPa)',
-                legend_label=r'$P_\parallel$',
-                color='darkviolet',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'pressure_ppar', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='pressure_ppar',
+            class_name='proton',
+            subclass_name='pressure_ppar',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='Pressure (nPa)',
+            legend_label=r'$P_\parallel$',
+            color='darkviolet',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.pressure_pperp = plot_manager(
-            self.raw_data['pressure_pperp'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='pressure_pperp',
-                class_name='proton',
-                subclass_name='pressure_pperp',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='Pressure (nPa)',
-                legend_label=r'$P_\perp$',
-                color='limegreen',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'pressure_pperp', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='pressure_pperp',
+            class_name='proton',
+            subclass_name='pressure_pperp',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='Pressure (nPa)',
+            legend_label=r'$P_\perp$',
+            color='limegreen',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
-        self.pressure = plot_manager(
-            self.raw_data['pressure'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='pressure',
-                class_name='proton',
-                subclass_name='pressure',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='Pressure (nPa)',
-                legend_label='$P_{SPI}$',
-                color='cyan',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'pressure', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='pressure',
+            class_name='proton',
+            subclass_name='pressure',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='Pressure (nPa)',
+            legend_label='$P_{SPI}$',
+            color='cyan',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
         
         # Basic parameters
         self.density = plot_manager(
@@ -651,26 +636,23 @@ class proton_class:
             )
         )
         
-        self.bmag = plot_manager(
-            self.raw_data['bmag'],
-            plot_config=plot_config(
-                data_type='spi_sf00_l3_mom',
-                var_name='bmag',
-                class_name='proton',
-                subclass_name='bmag',
-                plot_type='time_series',
-                time=self.time if hasattr(self, 'time') else None,
-
-                datetime_array=self.datetime_array,
-                y_label='|B| (nT)',
-                legend_label='$|B|_{SPI}$',
-                color='purple',
-                y_scale='linear',
-                y_limit=None,
-                line_width=1,
-                line_style='-'
-            )
-        )
+        defer_plot_manager(self, 'bmag', plot_config(
+            data_type='spi_sf00_l3_mom',
+            var_name='bmag',
+            class_name='proton',
+            subclass_name='bmag',
+            plot_type='time_series',
+            time=self.time if hasattr(self, 'time') else None,
+
+            datetime_array=self.datetime_array,
+            y_label='|B| (nT)',
+            legend_label='$|B|_{SPI}$',
+            color='purple',
+            y_scale='linear',
+            y_limit=None,
+            line_width=1,
+            line_style='-'
+        ))
 
         # Velocity Components
         self.vr = plot_manager(
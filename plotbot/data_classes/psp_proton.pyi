@@ -2,12 +2,13 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from plotbot.plot_manager import plot_manager
 from plotbot.data_import import DataObject # Assuming DataObject is the type for imported_data
 
 class proton_class:
+    derived_variables: Dict[Union[str, Tuple[str, ...]], Callable[..., Any]]
     raw_data: Dict[str, Optional[np.ndarray]]
     datetime_array: Optional[np.ndarray]
     times_mesh: Union[List[Any], np.ndarray] # It's initialized as [] then becomes ndarray
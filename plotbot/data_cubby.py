@@ -12,6 +12,7 @@ from typing import Optional, List, Dict, Tuple, Any
 import time as timer
 from functools import wraps
 import gc
+import weakref
 from numba import jit, prange
 
 def timer_decorator(timer_name):
@@ -31,17 +32,83 @@ def timer_decorator(timer_name):
 # This eliminates ~0.9s of import time by deferring class initialization
 
 from .data_import import DataObject # Import the type hint for raw data object
+from . import lazy_arrays
+from .data_classes._derived import merge_raw_data, is_deferred
+from .chunked_series import ChunkedSeries
+from .spectral_pyramid import extend_pyramids
+from .positional_binning import clear_binning_cache
+from .lazy_loader import load_data_class, unwrap
 
 # print_manager.show_processing = True # SETTING THIS EARLY
 
+_SOURCE_EXISTING, _SOURCE_NEW, _SOURCE_NEW_REPLACING = 0, 1, 2
+
+
+def _gather_rows(existing, new, source, block_starts, block_size, out, missing, fill):
+    """
+    Write the merged rows of one variable into ``out`` (both sides viewed as 2D).
+
+    Output blocks are independent: each starts from the existing/new row indices
+    recorded for it by ``_merge_plan`` and walks the source codes from there, so
+    blocks run in parallel. ``missing`` is 1 (2) when the variable has no existing
+    (new) side; rows that would come from it are set to ``fill``.
+    """
+    n_rows, width = out.shape
+    for b in prange(block_starts.shape[0]):
+        i = block_starts[b, 0]
+        j = block_starts[b, 1]
+        for k in range(b * block_size, min((b + 1) * block_size, n_rows)):
+            code = source[k]
+            if code == _SOURCE_EXISTING:
+                if missing == 1:
+                    for c in range(width):
+                        out[k, c] = fill
+                else:
+                    for c in range(width):
+                        out[k, c] = existing[i, c]
+                i += 1
+            else:
+                if missing == 2:
+                    for c in range(width):
+                        out[k, c] = fill
+                else:
+                    for c in range(width):
+                        out[k, c] = new[j, c]
+                j += 1
+                if code == _SOURCE_NEW_REPLACING:
+                    i += 1
+
+
+def _kernel_dtype(dtype):
+    """True for dtypes the compiled gather handles (numeric and bool, not float16)."""
+    return dtype.kind in 'biufc' and dtype != np.float16
+
+
+def _missing_rows(shape, dtype):
+    """Placeholder rows for a variable one side of the merge doesn't have."""
+    if dtype.kind in 'fc':
+        return np.full(shape, np.nan, dtype=dtype)
+    if dtype.kind in 'mM':
+        return np.full(shape, np.array('NaT', dtype=dtype))
+    if dtype.kind == 'O':
+        return np.full(shape, None, dtype=dtype)
+    return np.zeros(shape, dtype=dtype)
+
+
 class UltimateMergeEngine:
     """
-    The most optimized array merging system in the known universe.
-    Designed to handle billions of data points without breaking a sweat.
+    Merges time-sorted raw_data dicts for data_cubby.
+
+    The merged order is computed once from the two time arrays (``_merge_plan``)
+    and every variable, 1D or 2D, is then gathered through it by one compiled
+    pass that runs in parallel over blocks of output rows. When the new times
+    fall entirely inside a gap of the existing ones (appending, prepending or
+    filling a hole) no order is needed and every variable is spliced instead.
+    On equal times the new data win.
     """
-    
-    def __init__(self, chunk_size: int = 10_000_000, use_parallel: bool = True):
-        self.chunk_size = chunk_size
+
+    def __init__(self, block_size: int = 65_536, use_parallel: bool = True):
+        self.block_size = block_size
         self.use_parallel = use_parallel
         self.stats = {
             'merges_performed': 0,
@@ -49,156 +116,105 @@ class UltimateMergeEngine:
             'total_time': 0.0,
             'avg_records_per_second': 0.0
         }
-    
+
     @staticmethod
-    @jit(nopython=True, parallel=True, cache=True)
-    def _fast_unique_merge(arr1, arr2):
+    @jit(nopython=True, cache=True)
+    def _merge_plan(arr1, arr2, block_size):
         """
-        Ultra-fast numba-compiled unique merge of two sorted arrays.
-        This is the secret sauce - compiled to machine code.
+        Merge order of two sorted time arrays, shared by every variable.
+
+        Returns one source code per merged row (existing row, new row, or new
+        row replacing an existing row with the same time) and, for each block
+        of ``block_size`` merged rows, the existing and new row indices the
+        block starts at. Together they encode the merge permutation in about
+        one byte per row.
         """
         len1, len2 = len(arr1), len(arr2)
-        max_len = len1 + len2
-        result = np.empty(max_len, dtype=arr1.dtype)
-        
+        source = np.empty(len1 + len2, dtype=np.uint8)
+        block_starts = np.empty(((len1 + len2 + block_size - 1) // block_size, 2), dtype=np.int64)
+
         i = j = k = 0
-        
-        # Main merge loop - optimized for speed
-        while i < len1 and j < len2:
-            if arr1[i] < arr2[j]:
-                result[k] = arr1[i]
+        n_blocks = 0
+        until_block = 0
+        while i < len1 or j < len2:
+            if until_block == 0:
+                block_starts[n_blocks, 0] = i
+                block_starts[n_blocks, 1] = j
+                n_blocks += 1
+                until_block = block_size
+            if j == len2 or (i < len1 and arr1[i] < arr2[j]):
+                source[k] = _SOURCE_EXISTING
                 i += 1
-            elif arr1[i] > arr2[j]:
-                result[k] = arr2[j]
+            elif i == len1 or arr2[j] < arr1[i]:
+                source[k] = _SOURCE_NEW
                 j += 1
             else:  # Equal - take from arr2 (newer data)
-                result[k] = arr2[j]
+                source[k] = _SOURCE_NEW_REPLACING
                 i += 1
                 j += 1
             k += 1
-        
-        # Copy remaining elements
-        while i < len1:
-            result[k] = arr1[i]
-            i += 1
-            k += 1
-        
-        while j < len2:
-            result[k] = arr2[j]
-            j += 1
-            k += 1
-        
-        return result[:k]
-    
-    @staticmethod
-    @jit(nopython=True, parallel=True, cache=True)
-    def _fast_searchsorted_indices(sorted_times, target_times):
-        """
-        Lightning-fast searchsorted replacement using binary search.
-        Parallelized across chunks for maximum throughput.
-        """
-        n = len(target_times)
-        indices = np.empty(n, dtype=np.int64)
-        
-        for i in prange(n):
-            # Binary search for each element
-            left, right = 0, len(sorted_times)
-            target = target_times[i]
-            
-            while left < right:
-                mid = (left + right) // 2
-                if sorted_times[mid] < target:
-                    left = mid + 1
-                else:
-                    right = mid
-            
-            indices[i] = left
-        
-        return indices
-    
-    def _chunk_process_large_arrays(self, final_times, existing_times, existing_data, new_times, new_data):
-        """
-        Process massive arrays in chunks to avoid memory explosion.
-        Uses streaming processing to handle datasets larger than RAM.
-        """
-        print_manager.datacubby(f"🚀 CHUNKED PROCESSING: {len(final_times):,} total records")
-        
-        # Pre-allocate result arrays for maximum efficiency
-        merged_data = {}
-        all_keys = set(existing_data.keys()) | set(new_data.keys())
-        
-        for key in all_keys:
-            if key == 'all':
-                continue
-                
-            # Determine array properties
-            if key in existing_data and existing_data[key] is not None:
-                sample_arr = existing_data[key]
-            else:
-                sample_arr = new_data[key]
-            
-            # Pre-allocate with correct shape and dtype
-            if sample_arr.ndim > 1:
-                shape = (len(final_times),) + sample_arr.shape[1:]
+            until_block -= 1
+
+        return source[:k], block_starts[:n_blocks]
+
+    _gather_parallel = staticmethod(jit(nopython=True, parallel=True, cache=True)(_gather_rows))
+    _gather_serial = staticmethod(jit(nopython=True)(_gather_rows))  # only compiled with use_parallel=False
+
+    def _gather(self, existing_arr, new_arr, source, block_starts):
+        """Merged array of one variable (either side may be None) through the merge plan."""
+        present = existing_arr if existing_arr is not None else new_arr
+        dtype = np.result_type(existing_arr, new_arr) if existing_arr is not None and new_arr is not None else present.dtype
+        missing = 1 if existing_arr is None else 2 if new_arr is None else 0
+        if missing and dtype.kind in 'biu':
+            dtype = np.dtype(np.float64)    # rows from the missing side become NaN
+        n_rows = len(source)
+        out = np.empty((n_rows,) + present.shape[1:], dtype=dtype)
+
+        if not _kernel_dtype(dtype):
+            from_new = source != _SOURCE_EXISTING
+            from_existing = ~from_new
+            out[from_new] = new_arr if new_arr is not None else _missing_rows((1,) + out.shape[1:], dtype)
+            if existing_arr is not None:
+                kept = source[source != _SOURCE_NEW] == _SOURCE_EXISTING
+                out[from_existing] = existing_arr[kept]
             else:
-                shape = (len(final_times),)
-            
-            merged_data[key] = np.full(shape, np.nan, dtype=sample_arr.dtype)
-        
-        # Process existing data in chunks
-        if len(existing_times) > 0:
-            print_manager.datacubby("📥 Processing existing data...")
-            
-            chunk_count = (len(existing_times) - 1) // self.chunk_size + 1
-            for chunk_idx in range(chunk_count):
-                start_idx = chunk_idx * self.chunk_size
-                end_idx = min(start_idx + self.chunk_size, len(existing_times))
-                
-                # Get indices for this chunk
-                chunk_times = existing_times[start_idx:end_idx]
-                chunk_indices = self._fast_searchsorted_indices(final_times, chunk_times)
-                
-                # Copy data for this chunk
-                for key in existing_data.keys():
-                    if key == 'all' or existing_data[key] is None:
-                        continue
-                    
-                    chunk_data = existing_data[key][start_idx:end_idx]
-                    merged_data[key][chunk_indices] = chunk_data
-                
-                if chunk_count > 1:
-                    print_manager.datacubby(f"  Chunk {chunk_idx + 1}/{chunk_count} complete")
-        
-        # Process new data in chunks
-        if len(new_times) > 0:
-            print_manager.datacubby("📤 Processing new data...")
-            
-            chunk_count = (len(new_times) - 1) // self.chunk_size + 1
-            for chunk_idx in range(chunk_count):
-                start_idx = chunk_idx * self.chunk_size
-                end_idx = min(start_idx + self.chunk_size, len(new_times))
-                
-                # Get indices for this chunk
-                chunk_times = new_times[start_idx:end_idx]
-                chunk_indices = self._fast_searchsorted_indices(final_times, chunk_times)
-                
-                # Copy data for this chunk (overwrites existing for duplicates)
-                for key in new_data.keys():
-                    if key == 'all' or new_data[key] is None:
-                        continue
-                    
-                    chunk_data = new_data[key][start_idx:end_idx]
-                    merged_data[key][chunk_indices] = chunk_data
-                
-                if chunk_count > 1:
-                    print_manager.datacubby(f"  Chunk {chunk_idx + 1}/{chunk_count} complete")
-        
-        return merged_data
-    
+                out[from_existing] = _missing_rows((1,) + out.shape[1:], dtype)
+            return out
+
+        width = int(np.prod(out.shape[1:], dtype=np.int64))
+        sides = [arr.reshape(len(arr), width).astype(dtype, copy=False) if arr is not None else None
+                 for arr in (existing_arr, new_arr)]
+        existing_2d = sides[0] if sides[0] is not None else sides[1]
+        new_2d = sides[1] if sides[1] is not None else sides[0]
+        fill = _missing_rows((), dtype)[()]
+        gather = self._gather_parallel if self.use_parallel else self._gather_serial
+        gather(existing_2d, new_2d, source, block_starts, self.block_size,
+               out.reshape(n_rows, width), missing, fill)
+        return out
+
+    @staticmethod
+    def _splice(existing_arr, new_arr, position, existing_count, new_count):
+        """Merged array of one variable when the new rows go in at ``position`` as one block."""
+        present = existing_arr if existing_arr is not None else new_arr
+        dtype = np.result_type(existing_arr, new_arr) if existing_arr is not None and new_arr is not None else present.dtype
+        if (existing_arr is None or new_arr is None) and dtype.kind in 'biu':
+            dtype = np.dtype(np.float64)
+        trailing = present.shape[1:]
+        if existing_arr is None:
+            head = _missing_rows((position,) + trailing, dtype)
+            tail = _missing_rows((existing_count - position,) + trailing, dtype)
+        else:
+            head, tail = existing_arr[:position], existing_arr[position:]
+        middle = new_arr if new_arr is not None else _missing_rows((new_count,) + trailing, dtype)
+        return np.concatenate([head, middle, tail]).astype(dtype, copy=False)
+
     def merge_arrays(self, existing_times, existing_raw_data, new_times, new_raw_data):
         """
-        The ultimate merge function that can handle any dataset size.
-        Auto-switches between strategies based on data size.
+        Merge new data into existing data; both are sorted by time.
+
+        Returns ``(merged_times, merged_raw_data)``, or ``(None, None)`` when
+        there are no new data. A variable present on one side only gets NaN
+        (NaT, None) rows for the other side's times.
         """
         start_time = timer.perf_counter()
         
@@ -222,151 +238,64 @@ class UltimateMergeEngine:
         print_manager.datacubby(f"   Existing: {existing_count:,} records")
         print_manager.datacubby(f"   New: {new_count:,} records")
         print_manager.datacubby(f"   Potential total: {total_potential:,} records")
-        
-        # Quick overlap check to avoid unnecessary work
-        if existing_times[-1] < new_times[0]:
-            print_manager.datacubby("🚀 NO OVERLAP - Simple concatenation")
-            final_times = np.concatenate([existing_times, new_times])
-            
-            merged_data = {}
-            all_keys = set(existing_raw_data.keys()) | set(new_raw_data.keys())
-            
+
+        if new_times.dtype != existing_times.dtype:
+            new_times = new_times.astype(existing_times.dtype)
+
+        def sides(key):
+            return [None if raw_data.get(key) is None else np.asarray(raw_data.get(key))
+                    for raw_data in (existing_raw_data, new_raw_data)]
+
+        def aligned(key, existing_arr, new_arr):
+            if ((existing_arr is None or (existing_arr.ndim and len(existing_arr) == existing_count)) and
+                    (new_arr is None or (new_arr.ndim and len(new_arr) == new_count))):
+                return True
+            print_manager.datacubby(f"⚠️ '{key}' isn't one row per time - keeping the newer value unmerged")
+            return False
+
+        all_keys = [key for key in dict.fromkeys([*existing_raw_data.keys(), *new_raw_data.keys()]) if key != 'all']
+        merged_data = {}
+
+        # New times inside one gap of the existing times (incl. before/after them): splice
+        position = np.searchsorted(existing_times, new_times[0], side='left')
+        if np.searchsorted(existing_times, new_times[-1], side='right') == position:
+            print_manager.datacubby(f"🚀 NO OVERLAP - Splicing new data in at row {position:,}")
+            final_times = np.concatenate([existing_times[:position], new_times, existing_times[position:]])
             for key in all_keys:
-                if key == 'all':
+                existing_arr, new_arr = sides(key)
+                if existing_arr is None and new_arr is None:
                     continue
-                
-                existing_arr = existing_raw_data.get(key)
-                new_arr = new_raw_data.get(key)
-                
-                if existing_arr is not None and new_arr is not None:
-                    merged_data[key] = np.concatenate([existing_arr, new_arr])
-                elif existing_arr is not None:
-                    merged_data[key] = existing_arr.copy()
-                elif new_arr is not None:
-                    merged_data[key] = new_arr.copy()
-            
+                if not aligned(key, existing_arr, new_arr):
+                    merged_data[key] = new_arr if new_arr is not None else existing_arr
+                    continue
+                merged_data[key] = self._splice(existing_arr, new_arr, position, existing_count, new_count)
         else:
             # Full merge required
             print_manager.datacubby("🔄 OVERLAP DETECTED - Full merge required")
 
-            # NOTE: Deduplication code commented out - the front-end fix in data_import.py
-            # now filters to only load the highest version of each CDF file, preventing
-            # duplicate timestamps from entering the system. Keeping this code here as a
-            # safety net in case we ever need to re-enable it.
-            #
-            # # 🐛 FIX: Deduplicate BEFORE merging to avoid data loss from duplicate timestamps
-            # # This handles the case where CDF files have duplicate timestamps (e.g., v00 and v04 versions)
-            # existing_unique_times, existing_unique_indices = np.unique(existing_times, return_index=True)
-            # new_unique_times, new_unique_indices = np.unique(new_times, return_index=True)
-            #
-            # existing_had_duplicates = len(existing_unique_times) < len(existing_times)
-            # new_had_duplicates = len(new_unique_times) < len(new_times)
-            #
-            # if existing_had_duplicates or new_had_duplicates:
-            #     print_manager.status(f"⚠️ DUPLICATE TIMESTAMPS DETECTED - Deduplicating before merge:")
-            #     print_manager.status(f"   existing: {len(existing_times)} -> {len(existing_unique_times)} ({len(existing_times) - len(existing_unique_times)} duplicates removed)")
-            #     print_manager.status(f"   new: {len(new_times)} -> {len(new_unique_times)} ({len(new_times) - len(new_unique_times)} duplicates removed)")
-            #
-            #     # Deduplicate the raw_data arrays too
-            #     existing_raw_data_deduped = {}
-            #     for key, arr in existing_raw_data.items():
-            #         if key == 'all':
-            #             continue
-            #         if arr is not None:
-            #             existing_raw_data_deduped[key] = arr[existing_unique_indices] if arr.ndim == 1 else arr[existing_unique_indices, ...]
-            #         else:
-            #             existing_raw_data_deduped[key] = None
-            #
-            #     new_raw_data_deduped = {}
-            #     for key, arr in new_raw_data.items():
-            #         if key == 'all':
-            #             continue
-            #         if arr is not None:
-            #             new_raw_data_deduped[key] = arr[new_unique_indices] if arr.ndim == 1 else arr[new_unique_indices, ...]
-            #         else:
-            #             new_raw_data_deduped[key] = None
-            #
-            #     # Use deduplicated arrays for the merge
-            #     existing_times = existing_unique_times
-            #     existing_raw_data = existing_raw_data_deduped
-            #     new_times = new_unique_times
-            #     new_raw_data = new_raw_data_deduped
-
-            # Use ultra-fast compiled merge for times
-            print_manager.datacubby("⚡ Computing unique merged times...")
-            final_times = self._fast_unique_merge(existing_times, new_times)
-            unique_count = len(final_times)
-            
-            print_manager.datacubby(f"✅ Unique times: {unique_count:,} records ({total_potential - unique_count:,} duplicates removed)")
-            
-            # Choose strategy based on data size
-            if unique_count > 50_000_000:  # 50M+ records
-                print_manager.datacubby("🏭 INDUSTRIAL MODE: Using chunked processing")
-                merged_data = self._chunk_process_large_arrays(
-                    final_times, existing_times, existing_raw_data, new_times, new_raw_data
-                )
-            else:
-                print_manager.datacubby("🏎️ SPEED MODE: Using vectorized processing")
-
-                # Fast vectorized approach for smaller datasets
-                existing_indices = self._fast_searchsorted_indices(final_times, existing_times)
-                new_indices = self._fast_searchsorted_indices(final_times, new_times)
+            # NOTE: Duplicate timestamps within one side are kept (in order). The front-end fix in
+            # data_import.py filters to only load the highest version of each CDF file, which
+            # prevents duplicate timestamps (e.g. v00 and v04 versions) from entering the system.
 
-                print_manager.datacubby(f"🔍 INDICES DEBUG:")
-                print_manager.datacubby(f"   existing_indices: len={len(existing_indices)}, unique={len(np.unique(existing_indices))}, max={existing_indices.max() if len(existing_indices) > 0 else 'N/A'}")
-                print_manager.datacubby(f"   new_indices: len={len(new_indices)}, unique={len(np.unique(new_indices))}, max={new_indices.max() if len(new_indices) > 0 else 'N/A'}")
-                print_manager.datacubby(f"   final_times: len={len(final_times)}")
+            # Merge order computed once, then gathered for every variable
+            print_manager.datacubby("⚡ Computing merge order...")
+            time_dtype = existing_times.dtype
+            if time_dtype.kind == 'M':
+                existing_times, new_times = existing_times.view(np.int64), new_times.view(np.int64)
+            source, block_starts = self._merge_plan(existing_times, new_times, self.block_size)
+            unique_count = len(source)
+            print_manager.datacubby(f"✅ Unique times: {unique_count:,} records ({total_potential - unique_count:,} duplicates removed)")
 
-                
-                merged_data = {}
-                all_keys = set(existing_raw_data.keys()) | set(new_raw_data.keys())
-                
-                for key in all_keys:
-                    if key == 'all':
-                        continue
-                    
-                    existing_arr = existing_raw_data.get(key)
-                    new_arr = new_raw_data.get(key)
-                    
-                    # DEBUG for density key specifically
-                    if key == 'density':
-                        print_manager.datacubby(f"🔍 MERGE DEBUG for 'density' key:")
-                        print_manager.datacubby(f"   existing_arr: {existing_arr.shape if existing_arr is not None else 'None'}, new_arr: {new_arr.shape if new_arr is not None else 'None'}")
-                        print_manager.datacubby(f"   unique_count (final array size): {unique_count}")
-                        print_manager.datacubby(f"   existing_indices: len={len(existing_indices)}, new_indices: len={len(new_indices)}")
-                    
-                    # Determine final array shape and dtype
-                    if existing_arr is not None:
-                        dtype = existing_arr.dtype
-                        shape = (unique_count,) + existing_arr.shape[1:] if existing_arr.ndim > 1 else (unique_count,)
-                    elif new_arr is not None:
-                        dtype = new_arr.dtype
-                        shape = (unique_count,) + new_arr.shape[1:] if new_arr.ndim > 1 else (unique_count,)
-                    else:
-                        # Both arrays are None - skip this key
-                        print_manager.datacubby(f"⚠️ Skipping key '{key}' - both arrays are None")
-                        continue
-                    
-                    if key == 'density':
-                        print_manager.datacubby(f"   final shape: {shape}, dtype: {dtype}")
-                    
-                    # Pre-allocate with NaN for numerical types
-                    if np.issubdtype(dtype, np.number):
-                        final_array = np.full(shape, np.nan, dtype=dtype)
-                    else:
-                        final_array = np.empty(shape, dtype=dtype)
-                    
-                    # Vectorized assignment
-                    if existing_arr is not None:
-                        final_array[existing_indices] = existing_arr
-                        if key == 'density':
-                            print_manager.datacubby(f"   After existing assignment: final_array has {(~np.isnan(final_array)).sum()} valid values")
-                    if new_arr is not None:
-                        final_array[new_indices] = new_arr  # Overwrites duplicates
-                        if key == 'density':
-                            print_manager.datacubby(f"   After new assignment: final_array has {(~np.isnan(final_array)).sum()} valid values, range={np.nanmin(final_array)} to {np.nanmax(final_array)}")
-                    
-                    merged_data[key] = final_array
+            final_times = self._gather(existing_times, new_times, source, block_starts).view(time_dtype)
+            for key in all_keys:
+                existing_arr, new_arr = sides(key)
+                if existing_arr is None and new_arr is None:
+                    print_manager.datacubby(f"⚠️ Skipping key '{key}' - both arrays are None")
+                    continue
+                if not aligned(key, existing_arr, new_arr):
+                    merged_data[key] = new_arr if new_arr is not None else existing_arr
+                    continue
+                merged_data[key] = self._gather(existing_arr, new_arr, source, block_starts)
         
         # Reconstruct 'all' array if needed
         if all(key in merged_data for key in ['br', 'bt', 'bn']):
@@ -396,7 +325,7 @@ class UltimateMergeEngine:
         return final_times, merged_data
 
 # Global instance - replace your existing merge function
-ultimate_merger = UltimateMergeEngine(chunk_size=5_000_000, use_parallel=True)
+ultimate_merger = UltimateMergeEngine(use_parallel=True)
 
 class data_cubby:
     """
@@ -406,6 +335,8 @@ class data_cubby:
     cubby = {}
     class_registry = {}
     subclass_registry = {}
+    # ChunkedSeries per data class instance; kept off the instance so it is never pickled with it
+    chunked_series = weakref.WeakKeyDictionary()
 
     # --- Map data_type strings to their corresponding class types ---
     # ✨ Now auto-populated via stash() - no hardcoded imports needed!
@@ -503,6 +434,8 @@ class data_cubby:
             print_manager.datacubby(f"[CLASS_TYPE_DEBUG] Resolved legacy alias '{data_type_str}' -> '{normalized}'")
         
         result = cls._CLASS_TYPE_MAP.get(normalized)
+        if result is None and load_data_class(normalized) is not None:   # registers on first load
+            result = cls._CLASS_TYPE_MAP.get(normalized)
         print_manager.datacubby(f"[CLASS_TYPE_DEBUG] Looking up '{data_type_str}' -> '{normalized}' -> {result}")
         if not result:
             print_manager.datacubby(f"[CLASS_TYPE_DEBUG] Available keys in _CLASS_TYPE_MAP: {list(cls._CLASS_TYPE_MAP.keys())}")
@@ -519,6 +452,7 @@ class data_cubby:
         # Normalize case of class_name if provided
         if class_name:
             class_name = class_name.lower()
+        obj = unwrap(obj)   # store the instance behind a lazy plotbot.<name> proxy, not the proxy
             
         identifier = f"{class_name}.{subclass_name}" if class_name and subclass_name else class_name
         print_manager.datacubby(f"Stashing with identifier: {identifier}")
@@ -547,7 +481,7 @@ class data_cubby:
         # Debug raw_data if present
         if hasattr(obj, 'raw_data') and obj.raw_data is not None:
             print_manager.datacubby(f"STASH INPUT - raw_data keys: {obj.raw_data.keys()}")
-            for key, value in obj.raw_data.items():
+            for key, value in dict.items(obj.raw_data):   # dict.items: don't compute pending derived entries to log them
                 if isinstance(value, list):
                     print_manager.datacubby(f"STASH INPUT - raw_data[{key}] is a list of length {len(value)}")
                     if value and len(value) > 0:
@@ -648,12 +582,138 @@ class data_cubby:
         return obj
     
     @classmethod
-    def _merge_arrays(cls, existing_times, existing_raw_data, new_times, new_raw_data):
+    def _merge_arrays(cls, existing_times, existing_raw_data, new_times, new_raw_data, instance=None):
         """
         Ultra-optimized merge that can handle billions of data points.
         Now with 100% more awesome and machine-code compilation.
+        Derived variables that haven't been computed yet stay pending and are
+        recomputed from the merged inputs on first access.
+
+        With ``instance`` (the data class instance being extended) the merge
+        goes through its chunked storage: new data that fit between loaded
+        times are added as a chunk and only they are copied into the merged
+        arrays (see chunked_series). Lazy (dask backend) raw_data are merged
+        without computing them (lazy_arrays.merge_arrays).
+        """
+        if lazy_arrays.holds_lazy(existing_raw_data) or lazy_arrays.holds_lazy(new_raw_data):
+            return lazy_arrays.merge_arrays(existing_times, existing_raw_data, new_times, new_raw_data)
+        merge = ultimate_merger.merge_arrays
+        if instance is not None:
+            merge = lambda *arrays: cls._merge_chunked(instance, *arrays)
+        return merge_raw_data(merge, existing_times, existing_raw_data, new_times, new_raw_data)
+
+    @classmethod
+    def _merge_chunked(cls, instance, existing_times, existing_raw_data, new_times, new_raw_data):
+        """merge_arrays through the instance's ChunkedSeries, falling back to UltimateMergeEngine."""
+        if new_times is None or len(new_times) == 0 or existing_times is None or len(existing_times) == 0:
+            return ultimate_merger.merge_arrays(existing_times, existing_raw_data, new_times, new_raw_data)
+
+        # Like merge_arrays: skip 'all' (rebuilt below) and keys that are None on both sides
+        keys = [key for key in dict.fromkeys([*existing_raw_data.keys(), *new_raw_data.keys()])
+                if key != 'all' and not (existing_raw_data.get(key) is None and new_raw_data.get(key) is None)]
+        existing = {key: existing_raw_data.get(key) for key in keys}
+        new = {key: new_raw_data.get(key) for key in keys}
+        series = cls.chunked_series.get(instance)
+        try:
+            if series is None or not series.holds(existing_times, existing):
+                series = ChunkedSeries(existing_times, existing)   # the loaded arrays become the first chunk
+            inserted = series.insert(new_times, new)
+        except (AttributeError, TypeError, ValueError):
+            series, inserted = None, False      # not one array per key: leave it to the merge engine
+
+        if inserted:
+            print_manager.datacubby(f"🧩 New data stored as chunk {series.n_chunks} - copying only the new rows")
+            merged_times, merged_data = series.consolidate()
+            merged_data = dict(merged_data)
+            if all(key in merged_data for key in ['br', 'bt', 'bn']):
+                merged_data['all'] = [merged_data['br'], merged_data['bt'], merged_data['bn']]
+        else:
+            merged_times, merged_data = ultimate_merger.merge_arrays(existing_times, existing_raw_data,
+                                                                     new_times, new_raw_data)
+            series = None
+            if merged_times is not None:
+                try:
+                    series = ChunkedSeries(merged_times, {key: value for key, value in merged_data.items() if key != 'all'})
+                except (AttributeError, TypeError, ValueError):
+                    pass
+        if series is None:
+            cls.chunked_series.pop(instance, None)
+        else:
+            cls.chunked_series[instance] = series
+        return merged_times, merged_data
+
+    @classmethod
+    def _refresh_plot_managers(cls, instance, old_times, old_raw_data):
         """
-        return ultimate_merger.merge_arrays(existing_times, existing_raw_data, new_times, new_raw_data)
+        Point an instance's plot_managers at its merged arrays without set_plot_config().
+
+        Each plot_manager keeps its plot_config and _plot_state: only the array
+        and the time base in the config (datetime_array, time, the spectral time
+        mesh and per-sample additional_data) are swapped for the merged ones, so
+        styling needs no save/restore and no config is rebuilt. Deferred derived
+        variables get the same update to their pending config.
+
+        Returns False, having changed nothing, when a plot_manager can't be
+        rebound generically (it isn't a raw_data key, or its config holds
+        per-sample arrays the merge didn't produce); the caller then falls back
+        to set_plot_config(). So does lazy raw_data, whose plot_managers hold
+        one computed window and are deferred again by set_plot_config().
+        """
+        from .plot_manager import plot_manager
+
+        raw_data = instance.raw_data
+        if lazy_arrays.holds_lazy(raw_data):
+            return False
+        times = instance.datetime_array
+        n_old = len(old_times) if old_times is not None else 0
+        old_keys = {id(value): key for key, value in dict.items(old_raw_data) if isinstance(value, np.ndarray)}
+
+        def time_base_updates(config):
+            updates = {}
+            datetime_array = config.datetime_array
+            if datetime_array is old_times or (isinstance(datetime_array, np.ndarray) and datetime_array.ndim == 1
+                                              and len(datetime_array) == n_old):
+                updates['datetime_array'] = times
+            elif isinstance(datetime_array, np.ndarray) and datetime_array.ndim == 2 and datetime_array.shape[0] == n_old:
+                updates['datetime_array'] = np.meshgrid(times, np.arange(datetime_array.shape[1]), indexing='ij')[0]
+            else:
+                return None
+
+            time = config.time
+            if time is not None:
+                if not (isinstance(time, np.ndarray) and len(time) == n_old):
+                    return None
+                updates['time'] = instance.time
+
+            additional_data = getattr(config, 'additional_data', None)
+            if additional_data is not None:
+                key = old_keys.get(id(additional_data))
+                if key is not None:
+                    updates['additional_data'] = raw_data[key]
+                elif getattr(additional_data, 'ndim', 0) > 0 and additional_data.shape[0] == n_old:
+                    return None     # per-sample array from outside raw_data
+            return updates
+
+        plan = []
+        for name, manager in list(instance.__dict__.items()):
+            if not isinstance(manager, plot_manager):
+                continue
+            updates = time_base_updates(manager.plot_config) if name in raw_data else None
+            if updates is None:
+                return False
+            plan.append((name, manager, manager.plot_config, updates))
+        for name, config in instance.__dict__.get('_deferred_plot_configs', {}).items():
+            updates = time_base_updates(config)
+            if updates is None:
+                return False
+            plan.append((name, None, config, updates))
+
+        for name, manager, config, updates in plan:
+            for attr, value in updates.items():
+                setattr(config, attr, value)
+            if manager is not None:
+                object.__setattr__(instance, name, manager.rebind(raw_data[name]))
+        return True
 
     @classmethod
     def clear(cls):
@@ -735,6 +795,9 @@ class data_cubby:
                   cls.class_registry.get(identifier_lower) or
                   cls.subclass_registry.get(identifier) or
                   cls.subclass_registry.get(identifier_lower))
+        if result is None:
+            # Data class instances are registered on first use (see plotbot/__init__.py)
+            result = load_data_class(identifier_lower)
         
         if result is not None:
             print_manager.datacubby(f"GRAB SUCCESS - Retrieved {identifier} with type {type(result)}")
@@ -771,7 +834,7 @@ class data_cubby:
             if hasattr(result, 'raw_data') and result.raw_data is not None:
                 keys = list(result.raw_data.keys())
                 summary_parts = [f"raw_data keys={keys}"]
-                for key, value in result.raw_data.items():
+                for key, value in dict.items(result.raw_data):   # dict.items: don't compute pending derived entries to log them
                     shape_str = f"shape={getattr(value, 'shape', 'N/A')}"
                     if isinstance(value, list):
                         len_str = f"len={len(value)}"
@@ -1012,10 +1075,14 @@ class data_cubby:
                 len(global_instance.datetime_array) > 0):
                 
                 pm.datacubby(f"🚀 CACHE HIT: Data for {data_type_str} trange {original_requested_trange} already cached. Skipping ALL processing!")
+                lazy_arrays.select_window(global_instance, original_requested_trange)
                 pm.speed_test(f"[TIMER_CACHE_HIT] {data_type_str}: 0.00ms (pure cache)")
                 pm.datacubby("=== End Global Instance Update (Cache Hit) ===\n")
                 return True
         
+        # Lazy (dask backend) imports stay lazy only for classes that support it; others get the requested window
+        imported_data_obj = lazy_arrays.prepare_for(global_instance, imported_data_obj, original_requested_trange)
+
         # --- STEP 3: Validate the original_requested_trange if provided (especially for proton) --- 
         # This is the "Cranky Timekeeper" point for proton data
         # Using data_type_str.lower() for reliable matching against common keys
@@ -1064,6 +1131,7 @@ class data_cubby:
                     pm.dependency_management(f"[CUBBY_UPDATE_DEBUG H1] Instance (ID: {id(global_instance)}) BEFORE global_instance.update(). datetime_array len: {dt_len_before_instance_update}")
                     
                     print_manager.datacubby(f"Calling update() on global instance of {data_type_str} (ID: {id(global_instance)}). is_segment_merge={is_segment_merge}")
+                    cls.chunked_series.pop(global_instance, None)  # its buffers belong to the data being replaced
                     
                     start_time = timer.perf_counter()
                     try:
@@ -1198,7 +1266,7 @@ class data_cubby:
         start_time = timer.perf_counter()
         merged_times, merged_raw_data = cls._merge_arrays(
             global_instance.datetime_array, global_instance.raw_data,
-            new_times, new_raw_data
+            new_times, new_raw_data, instance=global_instance
         )
         end_time = timer.perf_counter()
         duration_ms = (end_time - start_time) * 1000
@@ -1217,6 +1285,7 @@ class data_cubby:
             pm.style_preservation(f"   📊 About to overwrite: datetime_array (len: {len(global_instance.datetime_array) if hasattr(global_instance, 'datetime_array') and global_instance.datetime_array is not None else 'None'}), raw_data (type: {type(global_instance.raw_data) if hasattr(global_instance, 'raw_data') else 'None'})")
             
             try:
+                existing_times, existing_raw_data = global_instance.datetime_array, global_instance.raw_data
                 global_instance.datetime_array = merged_times
                 global_instance.raw_data = merged_raw_data
 
@@ -1233,22 +1302,27 @@ class data_cubby:
                     # OPTION: Convert to int64 directly from datetime64[ns] for self.time
                     # This is NOT TT2000 after the first load, but ensures length consistency and is fast.
                     pm.dependency_management(f"[CUBBY_UPDATE_DEBUG] Converting merged datetime_array (len {len(global_instance.datetime_array)}) directly to int64 for .time attribute.")
-                    global_instance.time = global_instance.datetime_array.astype('datetime64[ns]').astype(np.int64)
+                    global_instance.time = global_instance.datetime_array.astype('datetime64[ns]', copy=False).view(np.int64)
                     pm.dependency_management(f"[CUBBY_UPDATE_DEBUG] POST-TIME-ASSIGNMENT (direct int64 cast):")
                     pm.dependency_management(f"    NEW time len: {len(global_instance.time) if global_instance.time is not None else 'None'}, shape: {global_instance.time.shape if hasattr(global_instance.time, 'shape') else 'N/A'}, dtype: {global_instance.time.dtype}")
                 else:
                     global_instance.time = np.array([], dtype=np.int64) # Ensure correct dtype for empty
                     pm.dependency_management(f"[CUBBY_UPDATE_DEBUG] datetime_array was empty or None, set time to empty int64 array.")
 
+                # Plot managers hold views of the OLD arrays: rebind them to the merged
+                # ones, keeping their plot_config and styling (no rebuild)
+                if cls._refresh_plot_managers(global_instance, existing_times, existing_raw_data):
+                    pm.style_preservation(f"✅ MERGE_COMPLETE for '{data_type_str}' - plot_managers rebound in place, styling kept")
+
                 # STYLE PRESERVATION FIX: Save state, call set_plot_config(), restore state
                 # This mirrors the pattern used in each class's update() method
-                # We MUST call set_plot_config() because plot_managers hold views of the OLD arrays
-                if hasattr(global_instance, 'set_plot_config'):
+                # Fallback for plot_managers that can't be rebound generically
+                elif hasattr(global_instance, 'set_plot_config'):
                     # STEP 1: Save current styling state from plot_managers
                     pm.style_preservation(f"💾 Saving plot_manager states before set_plot_config()")
                     current_state = {}
                     for subclass_name in merged_raw_data.keys():
-                        if hasattr(global_instance, subclass_name):
+                        if not is_deferred(global_instance, subclass_name) and hasattr(global_instance, subclass_name):
                             var = getattr(global_instance, subclass_name)
                             if hasattr(var, '_plot_state'):
                                 current_state[subclass_name] = dict(var._plot_state)
@@ -1261,7 +1335,7 @@ class data_cubby:
                     # STEP 3: Restore styling state to new plot_managers
                     pm.style_preservation(f"🔧 Restoring saved states to recreated plot_managers")
                     for subclass_name, state in current_state.items():
-                        if hasattr(global_instance, subclass_name):
+                        if not is_deferred(global_instance, subclass_name) and hasattr(global_instance, subclass_name):
                             var = getattr(global_instance, subclass_name)
                             if hasattr(var, '_plot_state'):
                                 var._plot_state.update(state)
@@ -1274,6 +1348,12 @@ class data_cubby:
                     pm.style_preservation(f"✅ MERGE_COMPLETE for '{data_type_str}' - Styling preserved!")
                 else:
                     pm.warning(f"Global instance for {data_type_str} has no set_plot_config(). Plot managers will have stale data!")
+
+                # Spectrogram pyramids (time-decimated levels) recompute only the bins the new data touch
+                if new_times is not None and len(new_times) > 0:
+                    extend_pyramids(global_instance, new_times[0], new_times[-1])
+                # Positional overlays binned from the old data are stale
+                clear_binning_cache(getattr(global_instance, 'class_name', None) or data_type_str)
                 
                 dt_len_after_merge = len(global_instance.datetime_array) if hasattr(global_instance, 'datetime_array') and global_instance.datetime_array is not None else "None_or_NoAttr"
                 min_dt_G = global_instance.datetime_array[0] if dt_len_after_merge not in ["None_or_NoAttr", 0] else "N/A"
@@ -19,8 +19,14 @@ from .data_classes.data_types import data_types, get_local_path # To get pyspeda
 from .time_utils import daterange
 from pathlib import Path
 from datetime import timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 # Add other necessary imports (time, etc.) as needed
 
+MAX_DOWNLOAD_WORKERS = 4     # concurrent per-date requests when filling missing dates
+DOWNLOAD_RETRIES = 2         # extra attempts for a date whose request raised
+RETRY_BACKOFF = 1.0          # seconds before the first retry, doubled after each
+
 # Import the precise download function for efficiency - moved to function level
 
 
@@ -177,11 +183,75 @@ def smart_check_local_pyspedas_files(plotbot_key, trange):
         print_manager.debug(f"Smart file check failed for {plotbot_key}: {e}, falling back to pyspedas")
         return None
 
+def _date_token_trange(token):
+    """Time range of one missing-date token: YYYYMMDD (a day) or YYYYMMDD + block digit (a 6-hour file)."""
+    start = datetime.strptime(token[:8], '%Y%m%d')
+    if len(token) == 8:
+        end = start + timedelta(days=1)
+    else:
+        start += timedelta(hours=6 * int(token[8:]))
+        end = start + timedelta(hours=6)
+    return [start.strftime('%Y-%m-%d/%H:%M:%S'), end.strftime('%Y-%m-%d/%H:%M:%S')]
+
+def download_dates_parallel(tokens, fetch, label='', max_workers=MAX_DOWNLOAD_WORKERS,
+                            retries=DOWNLOAD_RETRIES, backoff=RETRY_BACKOFF):
+    """Run one download request per missing-date token on a bounded thread pool.
+
+    A request that raises is retried up to ``retries`` times, waiting
+    ``backoff`` seconds (doubling) in between; an empty result means the
+    server has no file for that date and is not retried. Progress is
+    reported as one aggregate count.
+
+    Args:
+        tokens (list): Missing-date tokens from smart_check_local_pyspedas_files
+        fetch (callable): fetch(token) -> list of downloaded file paths
+        label (str): Data type name for the progress messages
+        max_workers (int): Concurrent requests
+        retries (int): Extra attempts per token after a failed request
+        backoff (float): Seconds before the first retry
+
+    Returns:
+        tuple: (downloaded file paths in token order, tokens that failed every attempt)
+    """
+    tokens = list(dict.fromkeys(tokens))
+    if not tokens:
+        return [], []
+
+    def attempt(token):
+        delay = backoff
+        for attempt_number in range(retries + 1):
+            try:
+                return list(fetch(token) or [])
+            except Exception as e:
+                if attempt_number == retries:
+                    raise
+                print_manager.debug(f"Download of {label} {token} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                delay *= 2
+
+    results, failed = {}, []
+    workers = max(1, min(max_workers, len(tokens)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(attempt, token): token for token in tokens}
+        for done, future in enumerate(as_completed(futures), start=1):
+            token = futures[future]
+            try:
+                results[token] = future.result()
+            except Exception as e:
+                print_manager.warning(f"Download of {label} {token} failed after {retries + 1} attempt(s): {e}")
+                failed.append(token)
+            n_files = sum(len(files) for files in results.values())
+            print_manager.status(f"📡 {label}: {done}/{len(tokens)} missing date(s) requested, {n_files} file(s) downloaded")
+
+    files = [path for token in tokens for path in results.get(token, [])]
+    return files, sorted(failed)
+
 def _download_missing_dates(plotbot_key, smart_result):
     """Download only the missing dates identified by smart_check.
 
-    Builds a bounding trange from the earliest to latest missing date and calls
-    pyspedas for that reduced range. Returns list of newly downloaded file paths.
+    Each missing day (or 6-hour block) is its own pyspedas request, so dates
+    already present locally are never re-requested; the requests run
+    concurrently (download_dates_parallel) with per-date retry.
 
     Args:
         plotbot_key (str): The Plotbot data type key (e.g., 'spe_sf0_pad')
@@ -206,43 +276,18 @@ def _download_missing_dates(plotbot_key, smart_result):
         return []
 
     map_config = PYSPEDAS_MAP[plotbot_key]
-
-    # Build the bounding trange for missing dates
-    # missing_dates are YYYYMMDD strings (daily) or YYYYMMDDhh strings (6-hour)
-    earliest = smart_result.missing_dates[0]
-    latest = smart_result.missing_dates[-1]
-
-    # Parse based on string length: 8 chars = daily (YYYYMMDD), longer = 6-hour
-    if len(earliest) == 8:
-        # Daily format
-        gap_start = f"{earliest[:4]}-{earliest[4:6]}-{earliest[6:8]}"
-        latest_dt = datetime.strptime(latest, '%Y%m%d') + timedelta(days=1)
-        gap_end = latest_dt.strftime('%Y-%m-%d')
-    else:
-        # 6-hour format (YYYYMMDD + hour block digit)
-        gap_start_dt = datetime.strptime(earliest[:8], '%Y%m%d')
-        gap_start = gap_start_dt.strftime('%Y-%m-%d')
-        latest_dt = datetime.strptime(latest[:8], '%Y%m%d') + timedelta(days=1)
-        gap_end = latest_dt.strftime('%Y-%m-%d')
-
-    gap_trange = [gap_start, gap_end]
-    print_manager.status(f"📡 Downloading missing {plotbot_key} data for range: {gap_trange}")
-
-    # Handle DFB precise download path
-    if map_config.get('download_method') == 'precise':
-        print_manager.debug(f"Attempting PRECISE download for missing dates of {plotbot_key}")
-        result = download_dfb_precise(gap_trange, plotbot_key, map_config)
-        if result and len(result) > 0:
-            print_manager.debug(f"✅ Precise download for missing dates succeeded: {len(result)} files")
-            return result
-        print_manager.debug(f"Precise download for missing dates failed, falling back to regular pyspedas")
-
-    # Regular pyspedas download for the gap range
     pyspedas_func = map_config['pyspedas_func']
     pyspedas_datatype = map_config['pyspedas_datatype']
     kwargs = map_config['kwargs']
 
-    try:
+    def fetch(token):
+        gap_trange = _date_token_trange(token)
+        # Handle DFB precise download path
+        if map_config.get('download_method') == 'precise':
+            result = download_dfb_precise(gap_trange, plotbot_key, map_config)
+            if result:
+                return result
+            print_manager.debug(f"Precise download for {plotbot_key} {token} failed, falling back to regular pyspedas")
         returned_data = pyspedas_func(
             trange=gap_trange,
             datatype=pyspedas_datatype,
@@ -251,15 +296,17 @@ def _download_missing_dates(plotbot_key, smart_result):
             notplot=True,
             **kwargs
         )
-        if returned_data and isinstance(returned_data, list) and len(returned_data) > 0:
-            print_manager.status(f"✅ Downloaded {len(returned_data)} missing file(s) for {plotbot_key}")
-            return returned_data
-        else:
-            print_manager.status(f"⚠️ No data available on server for missing {plotbot_key} dates {gap_trange}")
-            return []
-    except Exception as e:
-        print_manager.error(f"Error downloading missing dates for {plotbot_key}: {e}")
-        return []
+        return returned_data if isinstance(returned_data, list) else []
+
+    print_manager.status(f"📡 Downloading {len(smart_result.missing_dates)} missing {plotbot_key} date(s): {smart_result.missing_dates}")
+    files, failed = download_dates_parallel(smart_result.missing_dates, fetch, label=plotbot_key)
+    if files:
+        print_manager.status(f"✅ Downloaded {len(files)} missing file(s) for {plotbot_key}")
+    else:
+        print_manager.status(f"⚠️ No data available on server for missing {plotbot_key} dates {smart_result.missing_dates}")
+    if failed:
+        print_manager.error(f"Error downloading missing dates for {plotbot_key}: {failed}")
+    return files
 
 
 # Define the mapping from Plotbot keys to pyspedas specifics
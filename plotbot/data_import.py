@@ -28,6 +28,9 @@ from .print_manager import print_manager, format_datetime_for_log
 from .time_utils import daterange
 from .data_tracker import global_tracker
 from .data_classes.data_types import data_types, get_local_path # UPDATED PATH
+from . import lazy_arrays
+from . import precision
+from .csv_cache import TT2000_FILL, load_csv_columns
 # from .data_cubby import data_cubby # MOVED inside import_data_function
 # from .plotbot_helpers import find_local_fits_csvs # This function is defined locally below
 
@@ -50,6 +53,14 @@ from .data_classes.data_types import data_types, get_local_path # UPDATED PATH
 # Global flag for test-only mode
 TEST_ONLY_MODE = False
 
+def _is_epoch_variable(cdf_file, var_name):
+    """True for CDF_EPOCH / EPOCH16 / TT2000 variables, which must never be narrowed to float32."""
+    try:
+        description = cdf_file.varinq(var_name).Data_Type_Description.upper()
+    except Exception:
+        return True
+    return 'EPOCH' in description or 'TT2000' in description
+
 # Utility function to get project root
 def get_project_root():
     """Get the absolute path to the project root directory.
@@ -416,7 +427,7 @@ def import_data_function(trange, data_type):
             # Add any other raw columns identified as necessary from calculate_proton_fits_vars
         ]
 
-        all_raw_data_list = [] # List to store DataFrames from each file
+        all_raw_data_list = [] # List to store the CSVColumns of each file
         dates_processed = []
         dates_missing_files = []
 
@@ -438,12 +449,11 @@ def import_data_function(trange, data_type):
 
                 try:
                     print_manager.processing(f"Loading raw FITS data from {os.path.basename(sf00_path)}...")
-                    # --- Read CSV file, selecting only needed columns ---
+                    # --- Read CSV columns (memory-mapped from the column cache after the first load) ---
                     try:
-                        # Use 'usecols' to load only necessary data
-                        df_sf00_raw = pd.read_csv(sf00_path, usecols=lambda col: col in raw_cols_needed)
+                        sf00_columns = load_csv_columns(sf00_path, time_column='time')
                         # Check if all needed columns were actually present
-                        missing_cols = [col for col in raw_cols_needed if col not in df_sf00_raw.columns]
+                        missing_cols = [col for col in raw_cols_needed if col not in sf00_columns]
                         if missing_cols:
                              print_manager.warning(f"  ! Missing required columns in {os.path.basename(sf00_path)}: {missing_cols}. Skipping file.")
                              dates_missing_files.append(date_str)
@@ -456,8 +466,8 @@ def import_data_function(trange, data_type):
                          print_manager.warning(f"  ✗ CSV file is empty: {sf00_path}")
                          dates_missing_files.append(date_str)
                          continue # Skip to next date
-                    except ValueError as ve: # Catches errors from usecols if a required col doesn't exist
-                         print_manager.error(f"  ✗ Error reading specific columns from {sf00_path}: {ve}. Check if required columns exist.")
+                    except ValueError as ve:
+                         print_manager.error(f"  ✗ Error reading columns from {sf00_path}: {ve}")
                          dates_missing_files.append(date_str)
                          continue
                     except Exception as read_e:
@@ -465,8 +475,8 @@ def import_data_function(trange, data_type):
                          dates_missing_files.append(date_str)
                          continue # Skip to next date
 
-                    if not df_sf00_raw.empty:
-                        all_raw_data_list.append(df_sf00_raw)
+                    if sf00_columns.n_rows > 0:
+                        all_raw_data_list.append(sf00_columns)
                         dates_processed.append(date_str)
                         print_manager.processing(f"  ✓ Raw data loaded for {date_str}")
                     else:
@@ -488,32 +498,24 @@ def import_data_function(trange, data_type):
             end_step(step_key, step_start, {"error": "no raw data loaded"})
             return None
 
-        # Consolidate raw data
+        # Consolidate raw data; TT2000 times come pre-converted from the column cache
+        # ('time' is Unix epoch seconds, truncated to ms as the row-by-row conversion did)
         print_manager.debug("Consolidating raw FITS data...")
         try:
-            final_raw_df = pd.concat(all_raw_data_list, ignore_index=True)
+            tt2000_array = np.concatenate([np.asarray(columns.tt2000) for columns in all_raw_data_list])
+            valid_rows = tt2000_array != TT2000_FILL
+            if not valid_rows.all():
+                print_manager.warning(f"Dropping {np.count_nonzero(~valid_rows)} FITS rows with a missing 'time' value")
+                tt2000_array = tt2000_array[valid_rows]
+            print_manager.debug(f"Converted final times to TT2000 (Length: {len(tt2000_array)})")
         except Exception as concat_e:
-            print_manager.error(f"Error concatenating raw FITS DataFrames: {concat_e}")
+            print_manager.error(f"Error concatenating raw FITS columns: {concat_e}")
             end_step(step_key, step_start, {"error": "concatenation error"})
             return None
-
-        # Convert time to datetime objects, then to TT2000
-        try:
-            # Assuming 'time' column contains Unix epoch seconds
-            # Using to_numpy() to directly get numpy arrays, avoiding to_pydatetime() completely
-            datetime_series = pd.to_datetime(final_raw_df['time'], unit='s', utc=True)
-            # Convert to numpy array of datetime64 objects
-            datetime_objs = datetime_series.to_numpy()
-            # Convert to Python datetime objects for components extraction
-            datetime_components_list = [
-                [dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, int(dt.microsecond / 1000)]
-                for dt in datetime_objs
-            ]
-            tt2000_array = cdflib.cdfepoch.compute_tt2000(datetime_components_list)
-            print_manager.debug(f"Converted final times to TT2000 (Length: {len(tt2000_array)})")
-        except Exception as time_e:
-            print_manager.error(f"Error converting FITS time column to TT2000: {time_e}")
-            end_step(step_key, step_start, {"error": "time conversion error"})
+        if len(tt2000_array) == 0:
+            print_manager.warning(f"No FITS rows with a valid 'time' for the time range {trange}.")
+            print_manager.time_output("import_data_function", "no raw data loaded")
+            end_step(step_key, step_start, {"error": "no raw data loaded"})
             return None
 
         # Create final data dictionary with NumPy arrays
@@ -521,8 +523,7 @@ def import_data_function(trange, data_type):
         for col in raw_cols_needed:
             if col != 'time': # Exclude the original time column
                 try:
-                    # Convert column to numpy array, handling potential errors
-                    final_data[col] = final_raw_df[col].to_numpy()
+                    final_data[col] = np.concatenate([np.asarray(columns[col]) for columns in all_raw_data_list])[valid_rows]
                 except KeyError:
                     print_manager.warning(f"Column '{col}' not found during final conversion, filling with NaNs.")
                     final_data[col] = np.full(len(tt2000_array), np.nan)
@@ -657,7 +658,7 @@ def import_data_function(trange, data_type):
             elif file_extension == '.csv':
                 # Handle CSV files
                 print_manager.debug(f"Loading CSV file: {os.path.basename(support_file_path)}")
-                loaded_data = pd.read_csv(support_file_path)
+                loaded_data = load_csv_columns(support_file_path).to_frame()
                 print_manager.debug(f"CSV file loaded successfully. Shape: {loaded_data.shape}")
                 data_object = loaded_data  # Return DataFrame
                 
@@ -765,73 +766,24 @@ def import_data_function(trange, data_type):
                     print_manager.processing(f"Loading Hammerhead data from {os.path.basename(ham_path)}...")
                     # Read the CSV file
                     try:
-                        # --- MODIFIED: Read without parse_dates ---
-                        # ham_df = pd.read_csv(ham_path, parse_dates=[datetime_column])
-                        ham_df = pd.read_csv(ham_path)
-
-                        # --- ADDED: Define which column NOT to include in data dict ---
-                        # Default to 'datetime' if it exists, otherwise 'time' if it exists
-                        exclude_column = None
-                        if 'datetime' in ham_df.columns:
-                             exclude_column = 'datetime'
-                        elif 'time' in ham_df.columns:
-                             exclude_column = 'time'
-                        else:
-                             print_manager.warning("Could not find 'datetime' or 'time' column for exclusion.")
-                             # Fallback or specific error handling might be needed
-
-                        # --- ADDED: Convert 'time' (Unix epoch) to TT2000 ---
-                        if 'time' in ham_df.columns:
-                            try:
-                                # Using to_numpy() to directly get numpy arrays
-                                datetime_series = pd.to_datetime(ham_df['time'], unit='s', utc=True)
-                                datetime_series_naive = datetime_series.dt.tz_localize(None) # Convert to timezone-naive UTC
-                                datetime_objs_naive = datetime_series_naive.to_numpy() # numpy array of timezone-naive datetime64[ns]
-
-                                # Convert numpy datetime64 to components list for TT2000
-                                # Need to handle potential NaT values if any times failed parsing
-                                datetime_components_list = []
-                                valid_time_mask = pd.notna(datetime_objs_naive) # Mask for valid times using naive array
-                                # Use the naive array directly, conversion to datetime64[us] is safer now
-                                temp_dt_objs = datetime_objs_naive[valid_time_mask].astype('datetime64[us]').tolist()
-
-                                comp_idx = 0 # Index for temp_dt_objs
-                                for is_valid in valid_time_mask:
-                                     if is_valid:
-                                         dt = temp_dt_objs[comp_idx]
-                                         datetime_components_list.append(
-                                              [dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, int(dt.microsecond / 1000)]
-                                         )
-                                         comp_idx += 1
-                                     else:
-                                         # Append placeholder for invalid times? Or handle later?
-                                         # For now, let TT2000 handle it, might result in errors if list is jagged
-                                         # Or maybe just skip? Let's try skipping for now, filtering applies mask later
-                                         datetime_components_list.append(None) # Placeholder might cause issues
-
-                                # Filter out None placeholders before computing TT2000
-                                valid_components_list = [comp for comp in datetime_components_list if comp is not None]
-                                if valid_components_list:
-                                     tt2000_array_full = cdflib.cdfepoch.compute_tt2000(valid_components_list)
-                                else:
-                                     tt2000_array_full = np.array([], dtype=np.int64) # Empty if no valid times
-
-                                # Create a full TT2000 array with NaNs (or appropriate fill) for invalid times
-                                tt2000_nan = np.iinfo(np.int64).min # Use min int64 as fill for TT2000 NaNs
-                                tt2000_with_nans = np.full(len(valid_time_mask), tt2000_nan, dtype=np.int64)
-                                tt2000_with_nans[valid_time_mask] = tt2000_array_full
-
-                                print_manager.debug(f"Converted HAM 'time' to TT2000 (Length: {len(tt2000_with_nans)})")
-                                times_tt2000 = tt2000_with_nans # Use the array with NaNs for indexing alignment
-
-                            except Exception as time_e:
-                                print_manager.error(f"Error converting HAM 'time' column: {time_e}")
-                                import traceback
-                                print_manager.debug(traceback.format_exc())
-                                continue # Skip this file if time conversion fails
-                        else:
+                        # Columns (memory-mapped from the column cache after the first load) with the
+                        # 'time' column (Unix epoch) pre-converted to TT2000, fill for invalid times
+                        try:
+                            ham_columns = load_csv_columns(ham_path, time_column='time')
+                        except KeyError:
                             print_manager.error(f"'time' column not found in {ham_path}")
                             continue # Skip file
+                        except (ValueError, OverflowError) as time_e:
+                            print_manager.error(f"Error converting HAM 'time' column: {time_e}")
+                            import traceback
+                            print_manager.debug(traceback.format_exc())
+                            continue # Skip this file if time conversion fails
+                        times_tt2000 = ham_columns.tt2000
+                        print_manager.debug(f"Converted HAM 'time' to TT2000 (Length: {len(times_tt2000)})")
+
+                        # --- Define which column NOT to include in data dict ---
+                        # 'datetime' if it exists, otherwise 'time'
+                        exclude_column = 'datetime' if 'datetime' in ham_columns else 'time'
 
                         # --- MODIFIED: Filter by time range using TT2000 ---
                         # Convert requested range to TT2000
@@ -846,20 +798,19 @@ def import_data_function(trange, data_type):
                              int(end_time.microsecond/1000)]
                         )
 
-                        # Create mask for valid times within the range
-                        valid_range_mask = (times_tt2000 >= start_tt2000_req) & (times_tt2000 <= end_tt2000_req)
+                        # Rows within the range: a slice of the mapped columns when the file is time-ordered
+                        valid_range_mask = ham_columns.window(start_tt2000_req, end_tt2000_req)
+                        times_in_range = np.array(times_tt2000[valid_range_mask])
 
-                        if not np.any(valid_range_mask):
+                        if len(times_in_range) == 0:
                             print_manager.warning(f"No data in TT2000 time range for {os.path.basename(ham_path)}")
                             continue
 
-                        # Apply mask to TT2000 times
-                        times_in_range = times_tt2000[valid_range_mask]
                         all_times.extend(times_in_range) # Extend with TT2000 values
 
-                        # --- MODIFIED: Convert DataFrame to dictionary, excluding the chosen time column ---
-                        ham_data = {col: ham_df[col].values[valid_range_mask] # Apply mask to data columns too
-                                    for col in ham_df.columns if col != exclude_column}
+                        # --- Columns to dictionary, excluding the chosen time column ---
+                        ham_data = {col: np.array(ham_columns[col][valid_range_mask]) # Apply mask to data columns too
+                                    for col in ham_columns.columns if col != exclude_column}
                         all_raw_data_list.append(ham_data)
                         
                     except Exception as e:
@@ -1338,6 +1289,10 @@ def import_data_function(trange, data_type):
         # DATA EXTRACTION AND PROCESSING (CDF specific)
         times_list = []
         data_dict = {var: [] for var in variables}
+        # Opt-in dask backend: variables become per-file lazy chunks, read on compute
+        lazy = lazy_arrays.dask_enabled()
+        # Storage precision: config.precision, or the data type's 'precision' override
+        policy = precision.policy_for(data_type)
 
         for file_path in found_files:
             print_manager.debug(f"\nProcessing CDF file: {file_path}")
@@ -1469,6 +1424,19 @@ def import_data_function(trange, data_type):
                     # Extract variable data slices
                     for var_name in variables:
                         try:
+                            template = fill_val = None
+                            if lazy:
+                                template = cdf_file.varget(var_name, startrec=start_idx, endrec=start_idx)
+                                fill_val = cdf_file.varattsget(var_name).get("FILLVAL")
+                            # Integers with a FILLVAL become float only where fills occur (below): read those eagerly
+                            if lazy and (fill_val is None or np.issubdtype(np.asarray(template).dtype, np.floating)):
+                                chunk = lazy_arrays.lazy_cdf_records(
+                                    file_path, var_name, int(start_idx), int(end_idx), template, fill_val)
+                                if np.issubdtype(np.asarray(template).dtype, np.floating):
+                                    chunk = precision.for_storage(chunk, policy, _is_epoch_variable(cdf_file, var_name))
+                                data_dict[var_name].append(chunk)
+                                print_manager.debug(f"Deferred {var_name} records {start_idx}-{end_idx} (dask)")
+                                continue
                             print_manager.debug(f"\nReading variable: {var_name}")
                             # Read only the required slice
                             var_data = cdf_file.varget(var_name, startrec=start_idx, endrec=end_idx-1)
@@ -1480,6 +1448,7 @@ def import_data_function(trange, data_type):
                                 var_data = np.full(len(time_slice), np.nan) # Adjust shape if needed
                             else:
                                 print_manager.debug(f"Raw data shape: {var_data.shape}")
+                                stored_as_float = np.issubdtype(var_data.dtype, np.floating)
 
                                 # Handle fill values
                                 var_atts = cdf_file.varattsget(var_name)
@@ -1490,7 +1459,7 @@ def import_data_function(trange, data_type):
                                         if np.any(fill_mask):
                                             # Ensure var_data is float before assigning NaN
                                             if not np.issubdtype(var_data.dtype, np.floating):
-                                                var_data = var_data.astype(float)
+                                                var_data = var_data.astype(precision.fill_dtype(var_data.dtype, policy))
                                             var_data[fill_mask] = np.nan
                                             print_manager.debug(f"Replaced {np.sum(fill_mask)} fill values ({fill_val}) with NaN")
                                     else:
@@ -1498,6 +1467,10 @@ def import_data_function(trange, data_type):
                                 else:
                                     print_manager.debug("No FILLVAL attribute found.")
 
+                                # Narrow/widen float variables after fills are NaN (compared at full width)
+                                if stored_as_float and policy != 'native':
+                                    var_data = precision.for_storage(var_data, policy, _is_epoch_variable(cdf_file, var_name))
+
                                 data_dict[var_name].append(var_data)
                                 print_manager.debug(f"Successfully stored data slice for {var_name}")
 
@@ -1526,7 +1499,7 @@ def import_data_function(trange, data_type):
             if data_list:
                 try:
                     # Attempt to concatenate, handle potential shape mismatches
-                    concatenated_data[var_name] = np.concatenate(data_list)
+                    concatenated_data[var_name] = lazy_arrays.concatenate(data_list)
                     print_manager.debug(f"  Concatenated {var_name} (Shape: {concatenated_data[var_name].shape})")
                 except ValueError as ve:
                     print_manager.error(f"Error concatenating {var_name} from CDFs: {ve}. Filling with NaNs.")
@@ -1541,8 +1514,12 @@ def import_data_function(trange, data_type):
         sort_indices = np.argsort(times)
         times_sorted = times[sort_indices]
         data_sorted = {}
+        # Files already in time order keep their lazy per-file chunks instead of a gather
+        keep_chunks = lazy and bool(np.all(sort_indices[1:] > sort_indices[:-1]))
         for var_name in variables:
-            if concatenated_data[var_name] is not None:
+            if keep_chunks and lazy_arrays.is_lazy(concatenated_data[var_name]):
+                data_sorted[var_name] = concatenated_data[var_name]
+            elif concatenated_data[var_name] is not None:
                 try:
                     data_sorted[var_name] = concatenated_data[var_name][sort_indices]
                 except IndexError as ie:
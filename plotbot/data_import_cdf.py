@@ -1611,7 +1611,7 @@ def _find_files_matching_pattern(pattern: str, directory: str) -> List[str]:
 
 # ==============================================================================
 # ✨ DEPRECATED: Auto-Init Updater (No longer needed!)
-# Custom classes now load dynamically via _auto_register_custom_classes()
+# Custom classes now load dynamically via _register_custom_classes()
 # in __init__.py - no manual editing required!
 # ==============================================================================
 
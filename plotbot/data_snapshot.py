@@ -16,7 +16,9 @@ from .print_manager import print_manager
 from .data_cubby import data_cubby
 from .plot_manager import plot_manager
 from .data_tracker import global_tracker
-from . import mag_rtn_class, mag_sc_class # MODIFIED
+from .data_classes._derived import DerivedRawData
+from .data_classes.psp_mag_rtn import mag_rtn_class
+from .data_classes.psp_mag_sc import mag_sc_class
 from .data_classes.data_types import data_types as psp_data_types
 
 # Type hint for raw data object
@@ -25,6 +27,8 @@ DataObject = Any
 
 # NEW IMPORT for the enhanced functionality
 from .get_data import get_data as plotbot_get_data
+from .snapshot_container import (CONTAINER_EXTENSION, is_snapshot_container, load_snapshot_container,
+                                 resolve_compression, write_snapshot_container)
 
 # --- Maintain your cute variable shorthands mapping ---
 VARIABLE_SHORTHANDS = {
@@ -77,90 +81,136 @@ def _is_data_object_empty(obj):
                     pass
     return True
 
+def _naive_utc(value):
+    """A datetime-like bound as a naive UTC datetime (numpy datetime64 passes through)."""
+    if isinstance(value, np.datetime64):
+        return value
+    if getattr(value, 'tzinfo', None) is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _time_window(datetime_array, start_time, end_time):
+    """
+    Rows ``lo:hi`` of a sorted datetime_array with start_time <= time <= end_time.
+
+    datetime64 arrays are searched directly; arrays of datetime objects are
+    bisected with the bounds given the elements' timezone awareness, so only
+    O(log n) of them are ever compared.
+    """
+    if np.issubdtype(datetime_array.dtype, np.datetime64):
+        start = np.datetime64(_naive_utc(start_time), 'ns')
+        end = np.datetime64(_naive_utc(end_time), 'ns')
+    else:
+        start, end = _naive_utc(start_time), _naive_utc(end_time)
+        if len(datetime_array) and getattr(datetime_array[0], 'tzinfo', None) is not None:
+            start, end = start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)
+    lo = int(np.searchsorted(datetime_array, start, side='left'))
+    hi = int(np.searchsorted(datetime_array, end, side='right'))
+    return lo, max(lo, hi)
+
+def _slice_rows(value, n_rows, rows):
+    """``value`` restricted to ``rows`` if it holds one entry per time; anything else as is."""
+    if isinstance(value, plot_manager):
+        return _slice_plot_manager(value, n_rows, rows)
+    if isinstance(value, np.ndarray):
+        return value[rows] if value.ndim > 0 and value.shape[0] == n_rows else value
+    if isinstance(value, list) and value and all(isinstance(item, np.ndarray) and item.ndim > 0
+                                                 and item.shape[0] == n_rows for item in value):
+        return [item[rows] for item in value]    # component lists such as raw_data['all']
+    if isinstance(value, list) and len(value) == n_rows:
+        return value[rows]
+    return value
+
+def _slice_plot_config(config, n_rows, rows):
+    if config is None:
+        return None
+    config = config.copy()
+    for attr in ('datetime_array', 'time', 'additional_data'):
+        value = getattr(config, attr, None)
+        if value is not None:
+            setattr(config, attr, _slice_rows(value, n_rows, rows))
+    return config
+
+# plot_manager attributes that cache results over the full time base; a sliced
+# manager rebuilds them on its own rows.
+_PLOT_MANAGER_CACHES = ('_clipped_data', '_clipped_datetime_array', '_clipped_time', '_sorted_time_base')
+
+def _slice_plot_manager(manager, n_rows, rows):
+    """A plot_manager over a view of ``manager``'s rows, with its own plot_config and plot state."""
+    values = manager.view(np.ndarray)
+    if values.ndim > 0 and values.shape[0] == n_rows:
+        values = values[rows]
+    elif values.ndim == 2 and values.shape[1] == n_rows:
+        values = values[:, rows]     # stacked components, e.g. mag 'all'
+    else:
+        return manager
+    sliced = values.view(plot_manager)
+    for name, value in manager.__dict__.items():
+        if name not in _PLOT_MANAGER_CACHES:    # caches over the full array
+            object.__setattr__(sliced, name, value)
+    sliced.plot_config = _slice_plot_config(getattr(manager, 'plot_config', None), n_rows, rows)
+    original_options = getattr(manager, '_original_options', None)
+    if original_options is not None and hasattr(original_options, 'copy'):
+        sliced._original_options = _slice_plot_config(original_options, n_rows, rows)
+    sliced._plot_state = dict(getattr(manager, '_plot_state', None) or {})
+    return sliced
+
+def _slice_instance(instance, rows):
+    """
+    A new instance of ``instance``'s class holding only ``rows`` (a slice) of its data.
+
+    Every per-time attribute (datetime_array, time, raw_data entries, field,
+    meshes, plot_managers, ...) becomes a view of the original; nothing is
+    copied and the original is left untouched. raw_data derived entries that
+    are still pending stay pending and are computed on the kept rows only.
+    """
+    source = instance.__dict__
+    n_rows = len(instance.datetime_array)
+    sliced = {}
+    for name, value in source.items():
+        if name == 'raw_data' and isinstance(value, DerivedRawData):
+            data = {key: _slice_rows(entry, n_rows, rows) for key, entry in dict.items(value)}   # PENDING stays
+            inputs = {key: _slice_rows(entry, n_rows, rows) for key, entry in value.inputs.items()}
+            sliced[name] = DerivedRawData(data, value.derivations, inputs)
+        elif name == '_deferred_plot_configs' and isinstance(value, dict):
+            sliced[name] = {key: _slice_plot_config(config, n_rows, rows) for key, config in value.items()}
+        elif isinstance(value, dict):
+            sliced[name] = {key: _slice_rows(entry, n_rows, rows) for key, entry in value.items()}
+        else:
+            sliced_value = _slice_rows(value, n_rows, rows)
+            if sliced_value is value and isinstance(value, list):
+                sliced_value = list(value)    # don't share mutable state with the original
+            sliced[name] = sliced_value
+    filtered_instance = object.__new__(type(instance))
+    filtered_instance.__dict__.update(sliced)
+    return filtered_instance
+
 def _create_filtered_instance(instance, start_time, end_time):
     """
     Create a time-filtered copy of a data instance.
     
+    The kept rows are found by binary search on the sorted datetime_array and
+    taken as views (see ``_slice_instance``), so the cost in time and memory
+    follows the kept window, not the whole instance.
+    
     Parameters
     ----------
     instance : object
         The original data instance to filter
     start_time, end_time : datetime
-        Start and end time for filtering
+        Start and end time for filtering (inclusive)
         
     Returns
     -------
     object
         A new instance with filtered data
     """
-    # Create a deep copy of the instance
-    filtered_instance = copy.deepcopy(instance)
-    
     if not hasattr(instance, 'datetime_array') or instance.datetime_array is None:
         print_manager.warning(f"Instance {instance.__class__.__name__} has no datetime_array, cannot filter")
-        return filtered_instance
-    
-    # Create time mask based on datetime type
-    if isinstance(instance.datetime_array[0], np.datetime64):
-        # For numpy datetime64 arrays
-        np_start = np.datetime64(start_time)
-        np_end = np.datetime64(end_time)
-        time_mask = (instance.datetime_array >= np_start) & (instance.datetime_array <= np_end)
-    elif hasattr(instance.datetime_array[0], 'tzinfo'):
-        # Handle timezone-aware datetime objects
-        start_utc = start_time.astimezone(timezone.utc) if start_time.tzinfo else start_time.replace(tzinfo=timezone.utc)
-        end_utc = end_time.astimezone(timezone.utc) if end_time.tzinfo else end_time.replace(tzinfo=timezone.utc)
-        # Need to compare each datetime individually
-        time_mask = np.array([(t >= start_utc) and (t <= end_utc) for t in instance.datetime_array])
-    else:
-        # Naive datetime objects
-        time_mask = np.array([(t >= start_time) and (t <= end_time) for t in instance.datetime_array])
-    
-    # Apply the mask to datetime_array
-    filtered_instance.datetime_array = instance.datetime_array[time_mask]
-    
-    # Filter 'time' attribute if present (TT2000 times)
-    if hasattr(instance, 'time') and instance.time is not None:
-        filtered_instance.time = instance.time[time_mask]
-    
-    # Filter raw_data based on the same mask
-    if hasattr(instance, 'raw_data') and instance.raw_data is not None:
-        filtered_raw_data = {}
-        for key, value in instance.raw_data.items():
-            if value is None:
-                filtered_raw_data[key] = None
-            elif isinstance(value, list):
-                # Handle list of arrays (common for 'all' key)
-                if all(hasattr(item, 'shape') for item in value):
-                    filtered_raw_data[key] = [item[time_mask] for item in value]
-                else:
-                    # If not all items are arrays, keep as is
-                    filtered_raw_data[key] = value
-            elif hasattr(value, 'shape'):
-                # Handle numpy arrays
-                if len(value.shape) == 1:
-                    # 1D array - filter directly
-                    filtered_raw_data[key] = value[time_mask]
-                elif len(value.shape) > 1:
-                    # Multi-dimensional array - filter along first dimension
-                    filtered_raw_data[key] = value[time_mask, ...]
-                else:
-                    # Scalar or empty - keep as is
-                    filtered_raw_data[key] = value
-            else:
-                # Non-array type, keep as is
-                filtered_raw_data[key] = value
-        
-        filtered_instance.raw_data = filtered_raw_data
-    
-    # Filter 'field' attribute if present
-    if hasattr(instance, 'field') and instance.field is not None and hasattr(instance.field, 'shape'):
-        if len(instance.field.shape) > 1:
-            filtered_instance.field = instance.field[time_mask, ...]
-        else:
-            filtered_instance.field = instance.field[time_mask]
+        return copy.deepcopy(instance)
     
-    return filtered_instance
+    lo, hi = _time_window(np.asarray(instance.datetime_array), start_time, end_time)
+    return _slice_instance(instance, slice(lo, hi))
 
 def _identify_data_segments(instance, time_filter=None):
     """
@@ -475,7 +525,8 @@ def save_data_snapshot(filename: Optional[str] = None,
                        trange_list: Optional[List[List[str]]] = None, 
                        compression: str = "none", 
                        time_range: Optional[List[str]] = None, 
-                       auto_split: bool = True) -> Optional[str]:
+                       auto_split: bool = True,
+                       format: str = "pickle") -> Optional[str]:
     """
     Save data class instances to a pickle file with optional time filtering and data population.
     Places file in 'data_snapshots/' directory.
@@ -503,6 +554,12 @@ def save_data_snapshot(filename: Optional[str] = None,
     auto_split : bool, optional
         Whether to automatically detect and split data segments at significant time gaps.
         Default is True.
+    format : str, optional
+        "pickle" (default) writes the classic .pkl snapshot. "container" writes a chunked
+        .pbsnap container (see snapshot_container.py): each array is compressed in
+        independent row-chunks with the fastest installed codec, segments are recorded in
+        the manifest instead of being split into separate instances, and loads can select
+        classes/time windows or memory-map the arrays (compression="none").
 
     Returns
     -------
@@ -511,6 +568,11 @@ def save_data_snapshot(filename: Optional[str] = None,
     """
     pm = print_manager
 
+    use_container = str(format).lower() in ("container", "pbsnap")
+    if use_container:
+        # The container records gap segments in its manifest; instances are saved unsplit
+        auto_split = False
+
     # --- Informative Print about what will be processed ---
     if classes and trange_list:
         pm.status(f"[SNAPSHOT SAVE] Attempting to populate and save data for {len(classes)} class type(s) across {len(trange_list)} time range(s).")
@@ -728,8 +790,8 @@ def save_data_snapshot(filename: Optional[str] = None,
     time_filter_for_snapshot = None
     if time_range is not None:
         try:
-            filter_start = dateutil_parse(time_range[0]) 
-            filter_end = dateutil_parse(time_range[1])
+            filter_start = parse(time_range[0]) 
+            filter_end = parse(time_range[1])
             time_filter_for_snapshot = (filter_start, filter_end)
             pm.status(f"[SNAPSHOT SAVE] Applying final filter to time range: {filter_start} to {filter_end}")
         except Exception as e:
@@ -855,7 +917,7 @@ def save_data_snapshot(filename: Optional[str] = None,
 
         # Strip known extensions from _name_to_use_for_file to get a clean base.
         # Handles .pkl, .pkl.gz, .pkl.bz2, .pkl.xz
-        for ext_to_strip in [".pkl.gz", ".pkl.bz2", ".pkl.xz", ".pkl"]:
+        for ext_to_strip in [".pkl.gz", ".pkl.bz2", ".pkl.xz", ".pkl", CONTAINER_EXTENSION]:
             if _name_to_use_for_file.lower().endswith(ext_to_strip):
                 _name_to_use_for_file = _name_to_use_for_file[:-len(ext_to_strip)]
                 break
@@ -863,10 +925,20 @@ def save_data_snapshot(filename: Optional[str] = None,
         # _name_to_use_for_file is now the clean base name.
         # _dir_to_save_in is the directory (e.g., "data_snapshots")
 
+        if use_container:
+            final_filepath = os.path.join(_dir_to_save_in, _name_to_use_for_file + CONTAINER_EXTENSION)
+            codec_name, codec_level = resolve_compression(compression)
+            try:
+                write_snapshot_container(final_filepath, processed_snapshot, codec=codec_name, level=codec_level)
+                pm.status(f"[SNAPSHOT SAVE] Successfully wrote snapshot container to {final_filepath}")
+            except Exception as e_container:
+                pm.error(f"[SNAPSHOT SAVE] Error writing snapshot container: {e_container}")
+                return False
+
         # Add compression extension (this part of logic was mostly fine)
         compression_ext_map = {"gzip": ".pkl.gz", "bz2": ".pkl.bz2", "lzma": ".pkl.xz", "none": ".pkl"}
         selected_compression_format = compression.lower()
-        if selected_compression_format not in ["low", "medium", "high"] and selected_compression_format not in compression_ext_map:
+        if not use_container and selected_compression_format not in ["low", "medium", "high"] and selected_compression_format not in compression_ext_map:
             pm.warning(f"[SNAPSHOT SAVE] Unknown compression format '{compression}'. Using no compression.")
             selected_compression_format = "none"
 
@@ -880,7 +952,8 @@ def save_data_snapshot(filename: Optional[str] = None,
         
         _final_filename_ext_to_add = compression_ext_map.get(actual_compression_format, ".pkl")
         
-        final_filepath = os.path.join(_dir_to_save_in, _name_to_use_for_file + _final_filename_ext_to_add)
+        if not use_container:
+            final_filepath = os.path.join(_dir_to_save_in, _name_to_use_for_file + _final_filename_ext_to_add)
         # Example: path = "data_snapshots", name = "my_snap", ext = ".pkl.gz" -> "data_snapshots/my_snap.pkl.gz"
         # Example: path = "data_snapshots", name from input "data_snapshots/test_advanced_snapshot_mag_rtn_4sa" (after stripping), ext = ".pkl"
         #          _dir_to_save_in becomes "data_snapshots"
@@ -888,7 +961,9 @@ def save_data_snapshot(filename: Optional[str] = None,
         #          final_filepath = "data_snapshots/test_advanced_snapshot_mag_rtn_4sa.pkl" - CORRECT!
 
         try:
-            if actual_compression_format == "gzip":
+            if use_container:
+                pass  # already written above
+            elif actual_compression_format == "gzip":
                 import gzip
                 with gzip.open(final_filepath, 'wb', compresslevel=compress_level if compress_level else 5) as f:
                     pickle.dump(processed_snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -945,7 +1020,7 @@ def save_data_snapshot(filename: Optional[str] = None,
         pm.error("⚠️ SNAPSHOT CREATION FAILED or nothing to save (check logs above for specific errors).") # Unified failure message
         return False # Return False if final_filepath is None
 
-def load_data_snapshot(filename, classes=None, merge_segments=True):
+def load_data_snapshot(filename, classes=None, merge_segments=True, mmap=False, time_range=None):
     print("DEBUG_LOAD_SNAPSHOT: Entered function load_data_snapshot") # DBG
     pm = print_manager
     # --- Adjust filename to check data_snapshots/ directory ---
@@ -966,6 +1041,9 @@ def load_data_snapshot(filename, classes=None, merge_segments=True):
              return False
     # --- End path adjustment ---
 
+    if is_snapshot_container(filepath):
+        return _load_container_snapshot(filepath, classes, mmap=mmap, time_range=time_range)
+
     print_manager.data_snapshot(f"Starting load from {filepath}")
     try:
         # Auto-detect compression format based on file extension
@@ -1064,6 +1142,9 @@ def load_data_snapshot(filename, classes=None, merge_segments=True):
         else:
             pm.data_snapshot("No 'classes' filter provided. Loading all data from snapshot.")
 
+        if time_range is not None and data_snapshot:
+            data_snapshot = _filter_snapshot_to_time_range(data_snapshot, time_range)
+
         # --- Process and load segments ---
         segment_groups = {}
         regular_classes_keys = [] 
@@ -1168,7 +1249,13 @@ def load_data_snapshot(filename, classes=None, merge_segments=True):
             else:
                 pm.data_snapshot(f"  {class_key} has no restore_from_snapshot. Stashing directly.")
                 data_cubby.stash(instance_from_snapshot, class_name=class_key) # Stash the loaded one directly
-            # ... (logic to update restored_ranges for regular_classes - simplified here) ...
+            regular_dt = getattr(instance_from_snapshot, 'datetime_array', None)
+            if regular_dt is not None and len(regular_dt) > 0:
+                min_dt = pd.Timestamp(regular_dt[0]).to_pydatetime(warn=False)
+                max_dt = pd.Timestamp(regular_dt[-1]).to_pydatetime(warn=False)
+                min_dt = min_dt.replace(tzinfo=timezone.utc) if min_dt.tzinfo is None else min_dt.astimezone(timezone.utc)
+                max_dt = max_dt.replace(tzinfo=timezone.utc) if max_dt.tzinfo is None else max_dt.astimezone(timezone.utc)
+                restored_ranges[class_key.lower()] = (min_dt, max_dt)
 
         # Now process segment groups if merge_segments is True
         if merge_segments and segment_groups:
@@ -1382,7 +1469,12 @@ def load_data_snapshot(filename, classes=None, merge_segments=True):
             for class_key, (start_time, end_time) in restored_ranges.items():
                 # Update tracker using the determined start/end times
                 global_tracker._update_range((start_time, end_time), class_key, global_tracker.calculated_ranges)
-                
+                # get_data checks the tracker by data_type (e.g. 'mag_RTN'), not the lowercase cubby key
+                restored_instance = data_cubby.grab(class_key)
+                data_type_key = getattr(restored_instance, 'data_type', None)
+                if data_type_key and data_type_key != class_key:
+                    global_tracker._update_range((start_time, end_time), data_type_key, global_tracker.calculated_ranges)
+
                 # Print confirmation
                 trange_str_dbg = [start_time.strftime('%Y-%m-%d/%H:%M:%S.%f')[:-3],
                                   end_time.strftime('%Y-%m-%d/%H:%M:%S.%f')[:-3]]
@@ -1417,6 +1509,58 @@ def load_data_snapshot(filename, classes=None, merge_segments=True):
     print("DEBUG_LOAD_SNAPSHOT: Returning True - Successful completion") # DBG
     return True
 
+def _filter_snapshot_to_time_range(data_snapshot, time_range):
+    """
+    Clip every instance of an unpickled snapshot to time_range before it is restored.
+
+    Pickle snapshots are not indexed, so the whole file has already been read; this
+    only keeps the restore, segment merge and tracker registration to the window.
+    Segments outside the window are dropped without being sliced.
+    """
+    start, end = parse(time_range[0]), parse(time_range[1])
+    start64 = np.datetime64(start.replace(tzinfo=None), 'ns')
+    end64 = np.datetime64(end.replace(tzinfo=None), 'ns')
+
+    def _as_datetime64(value):
+        ts = pd.Timestamp(value)
+        return np.datetime64(ts.tz_convert(None) if ts.tzinfo is not None else ts, 'ns')
+    windowed = {}
+    for key, value in data_snapshot.items():
+        if key.endswith('_segments_meta'):
+            windowed[key] = value
+            continue
+        datetime_array = getattr(value, 'datetime_array', None)
+        if datetime_array is None or len(datetime_array) == 0:
+            continue
+        if _as_datetime64(datetime_array[-1]) < start64 or _as_datetime64(datetime_array[0]) > end64:
+            print_manager.data_snapshot(f"Skipping {key}: outside requested time_range")
+            continue
+        filtered = _create_filtered_instance(value, start, end)
+        if not _is_data_object_empty(filtered):
+            windowed[key] = filtered
+    print_manager.data_snapshot(f"Snapshot keys inside time_range {time_range}: {list(windowed.keys())}")
+    return windowed
+
+def _load_container_snapshot(filepath, classes=None, mmap=False, time_range=None):
+    """Restore a .pbsnap container written by save_data_snapshot(..., format="container")."""
+    if classes is not None and not isinstance(classes, list):
+        classes = [classes]
+    class_keys = None
+    if classes is not None:
+        # Accept data_type strings or class instances, like the pickle path
+        class_keys = [c if isinstance(c, str) else getattr(c, 'data_type', type(c).__name__) for c in classes]
+    try:
+        restored = load_snapshot_container(filepath, classes=class_keys, mmap=mmap, time_range=time_range)
+    except Exception as e:
+        print_manager.error(f"Error loading snapshot container {filepath}: {e}")
+        return False
+
+    if restored:
+        print_manager.status(f"🚀 Snapshot '{os.path.basename(filepath)}' loaded. Processed data for: {', '.join(restored)}. (Container{', mmap' if mmap else ''})\n")
+    else:
+        print_manager.status(f"🚀 Snapshot '{os.path.basename(filepath)}' loaded. (Container) - Note: No specific data ranges were processed/updated.\n")
+    return True
+
 def _ensure_tracker_time_ranges_during_load(base_class_name, instance, restored_ranges):
     """
     Ensure instance time range matches what's in the global tracker.
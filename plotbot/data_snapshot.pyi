@@ -11,7 +11,8 @@ def save_data_snapshot(
     classes: Optional[Union[ClassIdentifier, List[ClassIdentifier]]] = None,
     compression: str = "none",
     time_range: Optional[List[str]] = None, # List of parsable date strings
-    auto_split: bool = True
+    auto_split: bool = True,
+    format: str = "pickle"
 ) -> Optional[str]: # Returns the final filepath or None on failure
     """
     Save data class instances to a pickle file with optional compression.
@@ -24,10 +25,13 @@ def save_data_snapshot(
         Specific class object(s) to save. If None, saves all available classes
     compression : str, optional
         Compression level: "none", "low", "medium", "high", or specific format ("gzip", "bz2", "lzma")
+    format : str, optional
+        "pickle" (default) or "container" for a chunked, compressed, memory-mappable .pbsnap file
     """
     ...
 
-def load_data_snapshot(filename: str, classes: list = ...) -> bool:
+def load_data_snapshot(filename: str, classes: list = ..., merge_segments: bool = True, mmap: bool = False,
+                       time_range: Optional[List[str]] = None) -> bool:
     """
     Load data from a previously saved snapshot file (auto-detects compression)
     
@@ -37,5 +41,10 @@ def load_data_snapshot(filename: str, classes: list = ...) -> bool:
         Path to the pickle file to load
     classes : list, class object, or None
         Specific class object(s) to load. If None, loads all classes in the file
+    mmap : bool, optional
+        Memory-map arrays of uncompressed .pbsnap containers instead of reading them
+    time_range : list, optional
+        [start, end] window to restore. For .pbsnap containers only the overlapping
+        chunks are read from disk; pickle snapshots are clipped after unpickling
     """
     ... 
\ No newline at end of file
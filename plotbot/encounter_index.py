@@ -0,0 +1,286 @@
+# plotbot/encounter_index.py
+"""
+Parker Solar Probe encounter and perihelion lookup.
+
+The bundled encounter date ranges and perihelion times are turned once into
+sorted ``datetime64[ns]`` arrays. Looking up a time, or a whole array of
+times, is then a single ``np.searchsorted``:
+
+- ``encounter_numbers`` / ``encounter_labels``: which encounter each time is in;
+- ``nearest_perihelion``: the closest perihelion to each time;
+- ``time_since_perihelion``: signed offset from that perihelion.
+
+If the PSP positional NPZ (``support_data/trajectories/psp_positional_data.npz``,
+the file behind ``psp_orbit`` and multiplot's positional axes) is available,
+encounters without a tabulated perihelion get one from the minimum of
+``r_sun`` inside the encounter window.
+
+``get_encounter.get_encounter_number``, ``utils.get_encounter_number`` and
+``utils.get_perihelion_time`` are thin wrappers around the shared index from
+``get_encounter_index()``.
+"""
+
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .print_manager import print_manager
+
+# Encounter date ranges, inclusive (a liberal definition, so every date near an
+# encounter gets a label; see the note at the end of get_encounter.py)
+ENCOUNTERS = {
+    'E1': ('2018-10-31', '2019-02-13'),
+    'E2': ('2019-02-14', '2019-06-01'),
+    'E3': ('2019-06-02', '2019-10-16'),
+    'E4': ('2019-10-17', '2020-03-10'),
+    'E5': ('2020-03-11', '2020-06-07'),
+    'E6': ('2020-06-08', '2020-10-09'),
+    'E7': ('2020-10-10', '2021-03-13'),
+    'E8': ('2021-03-14', '2021-05-17'),
+    'E9': ('2021-05-18', '2021-10-10'),
+    'E10': ('2021-10-11', '2021-12-19'),
+    'E11': ('2021-12-20', '2022-04-25'),
+    'E12': ('2022-04-26', '2022-07-12'),
+    'E13': ('2022-07-13', '2022-11-09'),
+    'E14': ('2022-11-10', '2022-12-27'),
+    'E15': ('2022-12-28', '2023-05-11'),
+    'E16': ('2023-05-12', '2023-08-16'),
+    'E17': ('2023-08-17', '2023-11-22'),
+    'E18': ('2023-11-23', '2024-02-23'),
+    'E19': ('2024-02-24', '2024-04-29'),
+    'E20': ('2024-04-30', '2024-08-14'),
+    'E21': ('2024-08-15', '2024-10-27'),
+    'E22': ('2024-10-28', '2025-02-07'),
+    'E23': ('2025-02-08', '2025-05-05'),
+    'E24': ('2025-05-06', '2025-08-01'),
+    'E25': ('2025-08-02', '2025-10-28'),
+    'E26': ('2025-10-29', '2026-01-12')
+}
+
+# Perihelion times dictionary (Encounter Number: Perihelion Time String)
+# Source: Examples_Multiplot.ipynb (as of 2025-05-07 - User Provided)
+# Format: YYYY/MM/DD HH:MM:SS.ffffff
+PERIHELION_TIMES = {
+    1: '2018/11/06 03:27:00.000', # Enc 1
+    2: '2019/04/04 22:39:00.000', # Enc 2
+    3: '2019/09/01 17:50:00.000', # Enc 3
+    4: '2020/01/29 09:37:00.000', # Enc 4
+    5: '2020/06/07 08:23:00.000', # Enc 5
+    6: '2020/09/27 09:16:00.000', # Enc 6
+    7: '2021/01/17 17:40:00.000', # Enc 7
+    8: '2021/04/29 08:48:00.000', # Enc 8
+    9: '2021/08/09 19:11:00.000', # Enc 9
+    10: '2021/11/21 08:23:00.000', # Enc 10
+    11: '2022/02/25 15:38:00.000', # Enc 11
+    12: '2022/06/01 22:51:00.000', # Enc 12
+    13: '2022/09/06 06:04:00.000', # Enc 13
+    14: '2022/12/11 13:16:00.000', # Enc 14
+    15: '2023/03/17 20:30:00.000', # Enc 15
+    16: '2023/06/22 03:46:00.000', # Enc 16
+    17: '2023/09/27 23:28:00.000', # Enc 17
+    18: '2023/12/29 00:56:00.000', # Enc 18
+    19: '2024/03/30 02:21:00.000', # Enc 19
+    20: '2024/06/30 03:47:00.000', # Enc 20
+    21: '2024/09/30 05:15:00.000', # Enc 21
+    22: '2024/12/24 11:53:00.000', # Enc 22
+    23: '2025/03/22 22:42:00.000', # Enc 23
+}
+
+PERIHELION_TIME_FORMAT = '%Y/%m/%d %H:%M:%S.%f'
+UNKNOWN_ENCOUNTER = 'Unknown_Encounter'
+DEFAULT_ORBIT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'support_data', 'trajectories', 'psp_positional_data.npz')
+
+_ONE_DAY = np.timedelta64(1, 'D')
+
+
+def to_datetime64(times):
+    """
+    Convert a time or array of times to ``datetime64[ns]`` (naive UTC).
+
+    Accepts datetime64 values, datetimes (aware ones are converted to UTC)
+    and strings. Plotbot-style strings ('2023-09-28/06:00:00.000') and ISO
+    strings are converted directly; anything else goes through dateutil.
+
+    Returns
+    -------
+    numpy.datetime64 or numpy.ndarray
+        A scalar for scalar input, otherwise an array. Unparseable strings
+        become NaT.
+    """
+    if isinstance(times, np.ndarray) and np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[ns]', copy=False)
+    if isinstance(times, (str, datetime, np.datetime64)):
+        return _scalar_to_datetime64(times)
+    values = np.asarray(times)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]')
+    return np.array([_scalar_to_datetime64(t) for t in values.ravel()],
+                    dtype='datetime64[ns]').reshape(values.shape)
+
+
+def _scalar_to_datetime64(value):
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[ns]')
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, 'ns')
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return np.datetime64(text.replace('/', 'T', 1) if text[4:5] == '-' else text, 'ns')
+        except ValueError:
+            pass
+        from dateutil.parser import parse
+        try:
+            return _scalar_to_datetime64(parse(text))
+        except (ValueError, TypeError, OverflowError):
+            return np.datetime64('NaT', 'ns')
+    return np.datetime64(value, 'ns')
+
+
+class EncounterIndex:
+    """
+    Sorted encounter intervals and perihelion times for vectorized lookup.
+
+    Parameters
+    ----------
+    encounters : dict, optional
+        Encounter label -> ('YYYY-MM-DD', 'YYYY-MM-DD'), both days inclusive.
+        Defaults to ``ENCOUNTERS``.
+    perihelia : dict, optional
+        Encounter number -> perihelion time string in
+        ``PERIHELION_TIME_FORMAT``. Defaults to ``PERIHELION_TIMES``.
+    orbit_path : str, optional
+        Positional NPZ used to fill in perihelia missing from ``perihelia``.
+        Ignored if the file does not exist.
+    """
+
+    def __init__(self, encounters=None, perihelia=None, orbit_path=None):
+        encounters = ENCOUNTERS if encounters is None else encounters
+        perihelia = PERIHELION_TIMES if perihelia is None else perihelia
+
+        ordered = sorted(encounters.items(), key=lambda item: item[1][0])
+        self.labels = np.array([label for label, _ in ordered])
+        self.numbers = np.array([int(label.lstrip('Ee')) for label in self.labels])
+        self.starts = np.array([start for _, (start, _) in ordered], dtype='datetime64[D]').astype('datetime64[ns]')
+        # Inclusive end days become exclusive ends at the next midnight
+        self.ends = (np.array([end for _, (_, end) in ordered], dtype='datetime64[D]') + _ONE_DAY).astype('datetime64[ns]')
+        if np.any(self.starts[1:] < self.ends[:-1]):
+            raise ValueError("Encounter date ranges overlap")
+
+        found = {int(number): np.datetime64(datetime.strptime(text, PERIHELION_TIME_FORMAT), 'ns')
+                 for number, text in perihelia.items()}
+        if orbit_path is not None and os.path.exists(orbit_path):
+            found = {**self._perihelia_from_orbit(orbit_path, set(found)), **found}
+        order = sorted(found, key=found.get)
+        self.perihelion_numbers = np.array(order, dtype=np.int64)
+        self.perihelion_times = np.array([found[number] for number in order], dtype='datetime64[ns]')
+
+    def _perihelia_from_orbit(self, orbit_path, known):
+        """Perihelion times (min r_sun) for encounters fully covered by the orbit NPZ and not in ``known``."""
+        try:
+            with np.load(orbit_path) as data:
+                times = to_datetime64(data['times'])
+                r_sun = np.asarray(data['r_sun'], dtype=np.float64)
+        except Exception as e:
+            print_manager.warning(f"Could not read perihelia from {orbit_path}: {e}")
+            return {}
+        order = np.argsort(times, kind='stable')
+        times, r_sun = times[order], r_sun[order]
+        if len(times) == 0:
+            return {}
+        found = {}
+        lo = np.searchsorted(times, self.starts, side='left')
+        hi = np.searchsorted(times, self.ends, side='left')
+        for number, start, end, first, last in zip(self.numbers, self.starts, self.ends, lo, hi):
+            if int(number) in known or last <= first or times[0] > start or times[-1] < end - _ONE_DAY:
+                continue
+            found[int(number)] = times[first + np.nanargmin(r_sun[first:last])]
+        if found:
+            print_manager.debug(f"Perihelia from {os.path.basename(orbit_path)} for encounters {sorted(found)}")
+        return found
+
+    # --- Encounters ---
+    def _encounter_positions(self, times):
+        times = to_datetime64(times)
+        position = np.searchsorted(self.starts, times, side='right') - 1
+        clipped = np.clip(position, 0, len(self.starts) - 1)
+        inside = (position >= 0) & (times < self.ends[clipped])       # NaT compares False
+        return clipped, inside
+
+    def encounter_numbers(self, times):
+        """Encounter number of each time (0 outside every encounter)."""
+        position, inside = self._encounter_positions(times)
+        return np.where(inside, self.numbers[position], 0)
+
+    def encounter_labels(self, times, unknown=UNKNOWN_ENCOUNTER):
+        """Encounter label ('E1', 'E2', ...) of each time; ``unknown`` outside every encounter."""
+        position, inside = self._encounter_positions(times)
+        return np.where(inside, self.labels[position], unknown)
+
+    def encounter(self, time):
+        """Encounter label of one time, or None."""
+        position, inside = self._encounter_positions(time)
+        return str(self.labels[position]) if inside else None
+
+    def encounter_interval(self, label):
+        """(start, exclusive end) of an encounter as datetime64[ns], or None if unknown."""
+        matches = np.flatnonzero(self.labels == label)
+        if len(matches) == 0:
+            return None
+        return self.starts[matches[0]], self.ends[matches[0]]
+
+    # --- Perihelia ---
+    def _nearest_perihelion_positions(self, times):
+        times = to_datetime64(times)
+        right = np.clip(np.searchsorted(self.perihelion_times, times, side='left'), 1, len(self.perihelion_times) - 1)
+        left = right - 1
+        # Ties go to the earlier perihelion
+        take_right = (self.perihelion_times[right] - times) < (times - self.perihelion_times[left])
+        return np.where(take_right, right, left), times
+
+    def nearest_perihelion(self, times):
+        """Closest perihelion time (datetime64[ns]) to each time."""
+        position, times = self._nearest_perihelion_positions(times)
+        return np.where(np.isnat(times), np.datetime64('NaT', 'ns'), self.perihelion_times[position])
+
+    def nearest_perihelion_number(self, times):
+        """Encounter number of the closest perihelion to each time (0 for NaT)."""
+        position, times = self._nearest_perihelion_positions(times)
+        return np.where(np.isnat(times), 0, self.perihelion_numbers[position])
+
+    def time_since_perihelion(self, times):
+        """Signed offset (timedelta64[ns]) of each time from its closest perihelion."""
+        times = to_datetime64(times)
+        return times - self.nearest_perihelion(times)
+
+    def perihelion_time_string(self, time):
+        """Closest perihelion to one time in ``PERIHELION_TIME_FORMAT`` (millisecond precision), or None."""
+        nearest = self.nearest_perihelion(time)
+        if np.isnat(nearest):
+            return None
+        return format_perihelion_time(nearest)
+
+
+def format_perihelion_time(time):
+    """Format a datetime64 like the ``PERIHELION_TIMES`` entries ('2023/09/27 23:28:00.000')."""
+    text = np.datetime_as_string(np.datetime64(time, 'ms'), unit='ms')
+    return text.replace('-', '/').replace('T', ' ')
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_encounter_index():
+    """The shared ``EncounterIndex``, built on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EncounterIndex(orbit_path=DEFAULT_ORBIT_PATH)
+    return _index
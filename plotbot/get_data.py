@@ -33,6 +33,8 @@ from .data_import import import_data_function, DataObject
 from .data_classes.data_types import data_types, get_data_type_config
 from .config import config
 from .time_utils import TimeRangeTracker
+from .prefetch import ReadAheadPrefetcher
+from . import lazy_arrays
 
 # Add global step counter for dynamic numbering
 _global_step_counter = 0
@@ -54,7 +56,10 @@ def end_step(step_key: str, step_start: float, metadata: dict = None) -> None:
     print_manager.speed_test(f"✅ {step_key}: {duration_ms:.2f}ms{metadata_str}")
 
 # Import specific data classes as needed
-from . import mag_rtn_4sa, mag_rtn, mag_sc_4sa, mag_sc
+from .data_classes.psp_mag_rtn_4sa import mag_rtn_4sa
+from .data_classes.psp_mag_rtn import mag_rtn
+from .data_classes.psp_mag_sc_4sa import mag_sc_4sa
+from .data_classes.psp_mag_sc import mag_sc
 from .data_classes.psp_electron_classes import epad, epad_hr
 from .data_classes.psp_proton import proton
 from .data_classes.psp_proton_hr import proton_hr
@@ -83,6 +88,80 @@ def debug_object(obj, prefix=""):
     if hasattr(obj, 'var_name'):
         print_manager.variable_testing(f"{prefix}var_name: {obj.var_name}")
 
+def _download_and_import(trange: List[str], data_type: str):
+    """
+    Download (for remote sources, per config.data_server) and import one data
+    type for trange; returns the DataObject, or None if the import failed.
+    """
+    # Check if this is local support data (like NPZ files)
+    config_from_psp_data_types = get_data_type_config(data_type)  # Case-insensitive lookup
+    if config_from_psp_data_types and 'local_support_data' in config_from_psp_data_types.get('data_sources', []):
+        print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (local support data). Skipping download, proceeding to import_data_function.")
+    # For HAM, download_successful and server_mode are irrelevant as it's local.
+    # The import_data_function handles fetching it.
+    # Download logic only for non-HAM and non-support-data types
+    elif data_type != 'ham': 
+        print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (using original type {data_type}). Proceeding with download if applicable...")
+
+        # Step: Download data
+        download_step_key, download_step_start = next_step("Download data", data_type)
+
+        server_mode = plotbot.config.data_server.lower()
+        print_manager.dependency_management(f"Server mode for {data_type}: {server_mode}")
+        # download_successful = False # download_successful flag is not used later, can be removed
+
+        if server_mode == 'spdf':
+            print_manager.status(f"Attempting SPDF acquisition path for {data_type}...")
+            download_spdf_data(trange, data_type) # download_successful = download_spdf_data(trange, data_type)
+        elif server_mode == 'berkeley' or server_mode == 'berkley':
+            print_manager.status(f"Attempting Berkeley acquisition path for {data_type}...")
+            download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
+        elif server_mode == 'dynamic':
+            print_manager.status(f"Attempting SPDF acquisition path (dynamic mode) for {data_type}...")
+            dl_success_spdf = download_spdf_data(trange, data_type)
+            if not dl_success_spdf:
+                print_manager.status(f"SPDF acquisition path failed/incomplete for {data_type}, falling back to Berkeley...")
+                download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
+        else:
+            print_manager.warning(f"Invalid config.data_server mode: '{server_mode}'. Defaulting to Berkeley. Handle invalid mode.")
+            download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
+
+        end_step(download_step_key, download_step_start, {"server_mode": server_mode})
+    else: # This is for data_type == 'ham'
+        print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (HAM data). Proceeding to import_data_function.")
+
+    # --- Import/Update Data (Applies to HAM as well) --- 
+    # Step: Import/refresh data
+    import_step_key, import_step_start = next_step("Import/refresh data", data_type)
+
+    print_manager.dependency_management(f"{data_type} - Import/Refresh required") # Use data_type
+    start_time = timer.perf_counter()
+    if data_type == 'mag_RTN_4sa':
+        print_manager.speed_test(f'[TIMER_MAG_4] CDF download/import: {(timer.perf_counter())*1000:.2f}ms')
+    if data_type == 'psp_orbit_data':
+        print_manager.speed_test(f'[TIMER_ORBIT_4] NPZ file load: {(timer.perf_counter())*1000:.2f}ms')
+    data_obj = import_data_function(trange, data_type) # data_type will be 'ham' for HAM
+    end_time = timer.perf_counter()
+    duration_ms = (end_time - start_time) * 1000
+    print_manager.speed_test(f"[TIMER_IMPORT_DATA_FUNCTION] import_data_function ({data_type}): {duration_ms:.2f}ms")
+
+    end_step(import_step_key, import_step_start, {"duration_ms": duration_ms, "success": data_obj is not None})
+
+    return data_obj
+
+
+def _is_prefetchable(data_type: str) -> bool:
+    """True for data types get_data downloads and imports itself (not FITS, HAM, custom or local files)."""
+    if data_type in ('proton_fits', 'ham', 'custom_data_type'):
+        return False
+    dt_config = get_data_type_config(data_type) or {}
+    sources = dt_config.get('data_sources', [])
+    return bool(dt_config) and 'local_csv' not in sources and 'local_support_data' not in sources
+
+
+read_ahead = ReadAheadPrefetcher(_download_and_import, is_needed=global_tracker.is_calculation_needed)
+
+
 @timer_decorator("TIMER_GET_DATA_ENTRY")
 def get_data(trange: List[str], *variables, skip_refresh_check=False):
     """
@@ -446,59 +525,13 @@ def get_data(trange: List[str], *variables, skip_refresh_check=False):
         end_step(cache_step_key, cache_step_start, {"calculation_needed": calculation_needed})
 
         if calculation_needed:
-            # Check if this is local support data (like NPZ files)
-            config_from_psp_data_types = get_data_type_config(data_type)  # Case-insensitive lookup
-            if config_from_psp_data_types and 'local_support_data' in config_from_psp_data_types.get('data_sources', []):
-                print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (local support data). Skipping download, proceeding to import_data_function.")
-            # For HAM, download_successful and server_mode are irrelevant as it's local.
-            # The import_data_function handles fetching it.
-            # Download logic only for non-HAM and non-support-data types
-            elif data_type != 'ham': 
-                print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (using original type {data_type}). Proceeding with download if applicable...")
-                
-                # Step: Download data
-                download_step_key, download_step_start = next_step("Download data", data_type)
-                
-                server_mode = plotbot.config.data_server.lower()
-                print_manager.dependency_management(f"Server mode for {data_type}: {server_mode}")
-                # download_successful = False # download_successful flag is not used later, can be removed
-                
-                if server_mode == 'spdf':
-                    print_manager.status(f"Attempting SPDF acquisition path for {data_type}...")
-                    download_spdf_data(trange, data_type) # download_successful = download_spdf_data(trange, data_type)
-                elif server_mode == 'berkeley' or server_mode == 'berkley':
-                    print_manager.status(f"Attempting Berkeley acquisition path for {data_type}...")
-                    download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
-                elif server_mode == 'dynamic':
-                    print_manager.status(f"Attempting SPDF acquisition path (dynamic mode) for {data_type}...")
-                    dl_success_spdf = download_spdf_data(trange, data_type)
-                    if not dl_success_spdf:
-                        print_manager.status(f"SPDF acquisition path failed/incomplete for {data_type}, falling back to Berkeley...")
-                        download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
-                else:
-                    print_manager.warning(f"Invalid config.data_server mode: '{server_mode}'. Defaulting to Berkeley. Handle invalid mode.")
-                    download_berkeley_data(trange, data_type) # download_successful = download_berkeley_data(trange, data_type)
-                
-                end_step(download_step_key, download_step_start, {"server_mode": server_mode})
-            else: # This is for data_type == 'ham'
-                print_manager.dependency_management(f"Tracker indicates calculation needed for {data_type} (HAM data). Proceeding to import_data_function.")
-
-            # --- Import/Update Data (Applies to HAM as well) --- 
-            # Step: Import/refresh data
-            import_step_key, import_step_start = next_step("Import/refresh data", data_type)
-            
-            print_manager.dependency_management(f"{data_type} - Import/Refresh required") # Use data_type
-            start_time = timer.perf_counter()
-            if data_type == 'mag_RTN_4sa':
-                print_manager.speed_test(f'[TIMER_MAG_4] CDF download/import: {(timer.perf_counter())*1000:.2f}ms')
-            if data_type == 'psp_orbit_data':
-                print_manager.speed_test(f'[TIMER_ORBIT_4] NPZ file load: {(timer.perf_counter())*1000:.2f}ms')
-            data_obj = import_data_function(trange, data_type) # data_type will be 'ham' for HAM
-            end_time = timer.perf_counter()
-            duration_ms = (end_time - start_time) * 1000
-            print_manager.speed_test(f"[TIMER_IMPORT_DATA_FUNCTION] import_data_function ({data_type}): {duration_ms:.2f}ms")
-            
-            end_step(import_step_key, import_step_start, {"duration_ms": duration_ms, "success": data_obj is not None})
+            # A read-ahead prefetch (config.prefetch) may already have imported this range
+            data_obj = read_ahead.take(trange, data_type)
+            if data_obj is not None:
+                print_manager.status(f"📦 Using prefetched {data_type} data for {trange[0]} to {trange[1]}")
+            else:
+                with read_ahead.fetch_lock:
+                    data_obj = _download_and_import(trange, data_type)
 
             if data_obj is None:
                 print_manager.warning(f"Import returned no data for {data_type}, skipping update.")
@@ -548,6 +581,7 @@ def get_data(trange: List[str], *variables, skip_refresh_check=False):
         else: # Calculation NOT needed
              # Use canonical key in status message
             print_manager.status(f"📤 Using existing {data_type} data, calculation/import not needed.")
+            lazy_arrays.select_window(class_instance, trange)  # dask backend: compute this window on access
             # HAM-specific debugging (commented out - too verbose)
             # if data_type == 'ham':
             #     print_manager.ham_debugging(f"SKIPPED IMPORT: trange={trange}, tracker says not needed. State={global_tracker.calculated_ranges.get('ham', 'EMPTY')}")
@@ -562,6 +596,12 @@ def get_data(trange: List[str], *variables, skip_refresh_check=False):
     final_step_key, final_step_start = next_step("Finalize get_data")
     
     # print_manager.status("✅ Complete")
+
+    # Predict the next window of a sequential workflow and start fetching it
+    if config.prefetch:
+        prefetchable = [dt for dt in required_data_types if _is_prefetchable(dt)]
+        if prefetchable:
+            read_ahead.observe(trange, prefetchable, config.prefetch_memory_mb)
     
     end_step(final_step_key, final_step_start, {"total_data_types": len(required_data_types)})
     
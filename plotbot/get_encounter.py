@@ -1,62 +1,25 @@
-from dateutil.parser import parse
+import numpy as np
+
+from .encounter_index import UNKNOWN_ENCOUNTER, get_encounter_index, to_datetime64
 
 def get_encounter_number(start_date):
     """
     Determine the encounter number based on the provided start date.
 
+    The encounter ranges live in encounter_index.ENCOUNTERS; the lookup is a
+    binary search of the shared EncounterIndex.
+
     Parameters:
-    start_date (str): Start date in any standard format
+    start_date (str, datetime or numpy.datetime64): Start date in any standard format
 
     Returns:
-    str: Encounter number (e.g., 'E1', 'E2')
+    str: Encounter number (e.g., 'E1', 'E2'), or 'Unknown_Encounter'
     """
-    # Convert input date to datetime object first
-    if isinstance(start_date, str):
-        # Use dateutil.parser to handle a wide variety of date formats
-        try:
-            date_obj = parse(start_date)
-        except (ValueError, TypeError):
-            print(f"Warning: Could not parse date {start_date}")
-            return "Unknown_Encounter"
-    else:
-        date_obj = start_date
-    
-    # Convert to YYYY-MM-DD format for comparison
-    formatted_date = date_obj.strftime('%Y-%m-%d')
-    
-    encounters = { #expanded encounter list
-        'E1': ('2018-10-31', '2019-02-13'),
-        'E2': ('2019-02-14', '2019-06-01'),
-        'E3': ('2019-06-02', '2019-10-16'),
-        'E4': ('2019-10-17', '2020-03-10'),
-        'E5': ('2020-03-11', '2020-06-07'),
-        'E6': ('2020-06-08', '2020-10-09'),
-        'E7': ('2020-10-10', '2021-03-13'),
-        'E8': ('2021-03-14', '2021-05-17'),
-        'E9': ('2021-05-18', '2021-10-10'),
-        'E10': ('2021-10-11', '2021-12-19'),
-        'E11': ('2021-12-20', '2022-04-25'),
-        'E12': ('2022-04-26', '2022-07-12'),
-        'E13': ('2022-07-13', '2022-11-09'),
-        'E14': ('2022-11-10', '2022-12-27'),
-        'E15': ('2022-12-28', '2023-05-11'),
-        'E16': ('2023-05-12', '2023-08-16'),
-        'E17': ('2023-08-17', '2023-11-22'),
-        'E18': ('2023-11-23', '2024-02-23'),
-        'E19': ('2024-02-24', '2024-04-29'),
-        'E20': ('2024-04-30', '2024-08-14'),
-        'E21': ('2024-08-15', '2024-10-27'),
-        'E22': ('2024-10-28', '2025-02-07'),
-        'E23': ('2025-02-08', '2025-05-05'),
-        'E24': ('2025-05-06', '2025-08-01'),
-        'E25': ('2025-08-02', '2025-10-28'),
-        'E26': ('2025-10-29', '2026-01-12')
-    }
- 
-    for encounter, (enc_start, enc_stop) in encounters.items():
-        if enc_start <= formatted_date <= enc_stop:
-            return encounter
-    return "Unknown_Encounter"
+    date = to_datetime64(start_date)
+    if np.isnat(date):
+        print(f"Warning: Could not parse date {start_date}")
+        return UNKNOWN_ENCOUNTER
+    return get_encounter_index().encounter(date) or UNKNOWN_ENCOUNTER
 
 #Note: we're taking a liberal definition of encounter here for the sake of making
 #sure that all multiplots have informative titles. It's more helpful to know we're
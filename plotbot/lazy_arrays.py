@@ -0,0 +1,249 @@
+# plotbot/lazy_arrays.py
+"""
+Opt-in out-of-core array backend built on dask.
+
+With ``config.array_backend = 'dask'`` the CDF reader in ``import_data_function``
+returns ``DataObject``s whose data are dask arrays with one chunk per source
+file: nothing beyond the epoch variable is read until something computes them.
+Data classes that declare ``supports_lazy_arrays = True`` keep their raw_data
+(and the derived quantities built from it: bmag, pmag, b_phi, ...) as dask
+graphs. Their plot_managers are deferred (see data_classes/_derived.py) and
+built on first access from the records of the requested time range only,
+computed in one pass on the local scheduler from ``config.dask_scheduler``;
+a later request for another range re-defers them (``select_window``), and
+merges concatenate the graphs (``merge_arrays``). Every other class receives
+numpy arrays of the requested range, computed at the data_cubby boundary.
+
+dask is imported on first use only, so the default numpy backend never pays
+for it. If dask isn't installed the backend falls back to numpy with a warning.
+"""
+
+import numpy as np
+
+from .print_manager import print_manager
+
+_dask_modules = None
+_warned_missing = False
+
+
+def _dask():
+    """Import dask on first use; returns (dask, dask.array) or None when it isn't installed."""
+    global _dask_modules
+    if _dask_modules is None:
+        try:
+            import dask
+            import dask.array as da
+            _dask_modules = (dask, da)
+        except ImportError:
+            _dask_modules = False
+    return _dask_modules or None
+
+
+def dask_enabled():
+    """True when the dask backend is selected in config and dask can be imported."""
+    global _warned_missing
+    from .config import config
+    if getattr(config, 'array_backend', 'numpy') != 'dask':
+        return False
+    if _dask() is None:
+        if not _warned_missing:
+            print_manager.warning("config.array_backend is 'dask' but dask is not installed - using numpy arrays")
+            _warned_missing = True
+        return False
+    return True
+
+
+def is_lazy(array):
+    """True for dask arrays (anything carrying a task graph)."""
+    return hasattr(array, 'dask') and hasattr(array, 'chunks')
+
+
+def holds_lazy(value):
+    """True for a lazy array, or a list, tuple or dict holding one (a raw_data dict, its 'all' entry)."""
+    if isinstance(value, dict):
+        return any(holds_lazy(item) for item in dict.values(value))
+    if isinstance(value, (list, tuple)):
+        return any(holds_lazy(item) for item in value)
+    return is_lazy(value)
+
+
+def read_cdf_records(file_path, var_name, start, stop, fill_value=None):
+    """
+    Read records [start, stop) of one float CDF variable, with FILLVAL replaced by NaN.
+
+    This is the task behind every lazy chunk; it opens the file itself so the
+    chunk can run on any worker of the threaded or multiprocessing scheduler.
+    """
+    import cdflib
+    with cdflib.CDF(file_path) as cdf_file:
+        values = np.asarray(cdf_file.varget(var_name, startrec=start, endrec=stop - 1))
+    if fill_value is not None and np.issubdtype(values.dtype, np.floating):
+        values[values == fill_value] = np.nan
+    return values
+
+
+def lazy_cdf_records(file_path, var_name, start, stop, template, fill_value=None):
+    """
+    A dask array for records [start, stop) of one CDF variable, read on compute.
+
+    ``template`` is one record already read from the file (for the trailing
+    shape and dtype). Only variables whose dtype doesn't depend on their
+    values belong here: an integer variable with a FILLVAL becomes float only
+    when fills are present, so the importer reads those eagerly.
+    """
+    dask, da = _dask()
+    template = np.asarray(template)
+    task = dask.delayed(read_cdf_records, pure=True)(file_path, var_name, start, stop, fill_value)
+    return da.from_delayed(task, shape=(stop - start,) + template.shape[1:], dtype=template.dtype)
+
+
+def concatenate(chunks):
+    """Concatenate per-file chunks along time, lazily if any chunk is lazy."""
+    if any(is_lazy(chunk) for chunk in chunks):
+        return _dask()[1].concatenate(chunks, axis=0)
+    return np.concatenate(chunks)
+
+
+def materialize(*arrays):
+    """
+    Compute any lazy arrays in one pass on the configured scheduler.
+
+    Arrays that share chunks (a field and everything derived from it) are read
+    once. numpy arrays and None pass through untouched; the return value always
+    matches the arguments one to one.
+    """
+    lazy_positions = [i for i, array in enumerate(arrays) if is_lazy(array)]
+    if not lazy_positions:
+        return arrays
+    from .config import config
+    dask, _ = _dask()
+    computed = dask.compute(*(arrays[i] for i in lazy_positions),
+                            scheduler=getattr(config, 'dask_scheduler', 'threads'))
+    results = list(arrays)
+    for i, value in zip(lazy_positions, computed):
+        results[i] = value
+    return tuple(results)
+
+
+def materialize_data_object(data_object):
+    """Return ``data_object`` with every lazy entry of ``.data`` computed (one pass)."""
+    if data_object is None or not isinstance(getattr(data_object, 'data', None), dict):
+        return data_object
+    keys = [key for key, value in data_object.data.items() if is_lazy(value)]
+    if not keys:
+        return data_object
+    values = materialize(*(data_object.data[key] for key in keys))
+    data = dict(data_object.data)
+    data.update(zip(keys, values))
+    return data_object._replace(data=data)
+
+
+def window_slice(times, trange):
+    """
+    The slice of the sorted ``times`` inside ``trange`` (both ends included).
+
+    ``times`` is a TT2000 int64 axis (DataObject.times) or a datetime64 one
+    (a class's datetime_array).
+    """
+    from .time_utils import str_to_datetime
+    times = np.asarray(times)
+    start, end = (str_to_datetime(t) if isinstance(t, str) else t for t in trange)
+    if times.dtype.kind == 'M':
+        start, end = (np.datetime64(t.replace(tzinfo=None), 'ns') for t in (start, end))
+    else:
+        import cdflib
+        start, end = (cdflib.cdfepoch.compute_tt2000(
+            [t.year, t.month, t.day, t.hour, t.minute, t.second, int(t.microsecond / 1000)])
+            for t in (start, end))
+    lo = int(np.searchsorted(times, start, side='left'))
+    hi = int(np.searchsorted(times, end, side='right'))
+    return slice(lo, max(lo, hi))
+
+
+def compute_window(array, times, trange):
+    """
+    Compute only the records of ``array`` whose ``times`` fall in ``trange``.
+
+    ``times`` must be sorted, as every DataObject's are. Only the chunks (files)
+    overlapping the window are read.
+    """
+    return materialize(array[window_slice(times, trange)])[0]
+
+
+def window_data_object(data_object, trange):
+    """``data_object`` cut to ``trange``, with the lazy entries of the window computed in one pass."""
+    window = window_slice(data_object.times, trange)
+    n_records = len(data_object.times)
+    data = {key: value[window] if getattr(value, 'shape', ())[:1] == (n_records,) else value
+            for key, value in data_object.data.items()}
+    return materialize_data_object(data_object._replace(times=np.asarray(data_object.times)[window], data=data))
+
+
+def prepare_for(instance, data_object, trange=None):
+    """
+    Hand ``data_object`` to a data class.
+
+    Classes with ``supports_lazy_arrays`` get it as is. Every other class gets
+    numpy arrays: just the records in ``trange`` when it's given, so a lazy
+    import wider than the request is never read in full.
+    """
+    if getattr(type(instance), 'supports_lazy_arrays', False):
+        return data_object
+    if trange is None or not holds_lazy(getattr(data_object, 'data', None)):
+        return materialize_data_object(data_object)
+    return window_data_object(data_object, trange)
+
+
+def select_window(instance, trange):
+    """
+    Point a class holding lazy raw_data at ``trange``.
+
+    Its plot_managers hold the records of one time range; they are deferred
+    again, so the next access computes the window of ``trange`` instead.
+    """
+    if instance is None or not holds_lazy(instance.__dict__.get('raw_data')):
+        return
+    if instance.__dict__.get('_current_operation_trange') == trange:
+        return
+    object.__setattr__(instance, '_current_operation_trange', trange)
+    instance.set_plot_config()
+
+
+def merge_arrays(existing_times, existing_raw_data, new_times, new_raw_data):
+    """
+    Merge raw_data holding lazy arrays without computing them (see UltimateMergeEngine).
+
+    The merge order comes from the times, which are in memory; every variable
+    is concatenated and, unless the new records simply go after the existing
+    ones, reordered lazily. On equal times the new data win. Returns
+    ``(merged_times, merged_raw_data)``, or ``(None, None)`` without new data.
+    """
+    if new_times is None or len(new_times) == 0:
+        return None, None
+    if existing_times is None or len(existing_times) == 0:
+        return new_times, new_raw_data
+    _, da = _dask()
+    n_existing = len(existing_times)
+    if new_times.dtype != existing_times.dtype:
+        new_times = new_times.astype(existing_times.dtype)
+
+    kept = np.flatnonzero(~np.isin(existing_times, new_times))
+    times = np.concatenate([existing_times, new_times])
+    rows = np.concatenate([kept, np.arange(n_existing, len(times))])
+    rows = rows[np.argsort(times[rows], kind='stable')]
+    in_order = len(rows) == len(times) and bool(np.all(rows[1:] > rows[:-1]))
+
+    merged_data = {}
+    for key in dict.fromkeys([*existing_raw_data.keys(), *new_raw_data.keys()]):
+        existing, new = existing_raw_data.get(key), new_raw_data.get(key)
+        if key == 'all' or (existing is None and new is None):
+            continue
+        if (existing is None or new is None or getattr(existing, 'shape', ())[:1] != (n_existing,)
+                or getattr(new, 'shape', ())[:1] != (len(new_times),)):
+            merged_data[key] = new if new is not None else existing     # not one row per time
+            continue
+        merged = da.concatenate([da.asarray(existing), da.asarray(new)])
+        merged_data[key] = merged if in_order else merged[rows]
+    if all(key in merged_data for key in ['br', 'bt', 'bn']):
+        merged_data['all'] = [merged_data['br'], merged_data['bt'], merged_data['bn']]
+    return times[rows], merged_data
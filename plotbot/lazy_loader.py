@@ -7,13 +7,20 @@ plotbot startup times by deferring expensive imports until they're needed.
 Key features:
 - LazyFunction: Defers function imports until first call
 - LazyModule: Defers module imports until first access
-- LazyDataClass: Defers data class instantiation until first access
+- LazyObject: Defers any module attribute (a class, an options object, a
+  singleton) until first use
+- LazyDataClass: Defers a data class's module (and its instance's registration
+  with data_cubby) until first access
 - Transparent API: All lazy objects behave exactly like their non-lazy counterparts
+
+Every proxy takes an optional ``on_load`` callback, called once with the loaded
+object; plotbot/__init__.py uses it to replace the proxy in the package
+namespace, so ``plotbot.<name>`` is the real object from then on.
 """
 
 import importlib
 import functools
-from typing import Any, Dict, Optional, Callable, Union
+from typing import Any, Dict, Optional, Callable, Tuple, Union
 import threading
 from pathlib import Path
 
@@ -27,13 +34,20 @@ class LazyFunction:
         plotbot(trange, var, axis)  # Function imported and called
     """
     
-    def __init__(self, module_path: str, function_name: str, alias: Optional[str] = None):
+    def __init__(self, module_path: str, function_name: str, alias: Optional[str] = None,
+                 on_load: Optional[Callable[[Any], None]] = None):
         self.module_path = module_path
         self.function_name = function_name
         self.alias = alias or function_name
         self._function = None
-        self._lock = threading.Lock()
+        self._on_load = on_load
+        self._lock = threading.RLock()
         self._loaded = False
+
+    def _import_target(self):
+        """Import the module and return the wrapped attribute."""
+        module = importlib.import_module(self.module_path)
+        return getattr(module, self.function_name)
         
     def _load_function(self):
         """Load the function if not already loaded."""
@@ -45,11 +59,7 @@ class LazyFunction:
                 return self._function
                 
             try:
-                # Import the module
-                module = importlib.import_module(self.module_path)
-                
-                # Get the function
-                self._function = getattr(module, self.function_name)
+                self._function = self._import_target()
                 self._loaded = True
                 
                 # Optional: Print lazy loading info
@@ -57,10 +67,12 @@ class LazyFunction:
                 if hasattr(timer, 'enabled') and timer.enabled:
                     print(f"🔄 Lazy loaded: {self.alias} from {self.module_path}")
                 
-                return self._function
-                
             except Exception as e:
                 raise ImportError(f"Failed to lazy load {self.alias} from {self.module_path}.{self.function_name}: {e}")
+
+            if self._on_load is not None:
+                self._on_load(self._function)
+            return self._function
     
     def __call__(self, *args, **kwargs):
         """Call the function, loading it first if necessary."""
@@ -86,11 +98,13 @@ class LazyModule:
         plt.figure()  # Module imported and used
     """
     
-    def __init__(self, module_path: str, alias: Optional[str] = None):
+    def __init__(self, module_path: str, alias: Optional[str] = None,
+                 on_load: Optional[Callable[[Any], None]] = None):
         self.module_path = module_path
         self.alias = alias or module_path.split('.')[-1]
         self._module = None
-        self._lock = threading.Lock()
+        self._on_load = on_load
+        self._lock = threading.RLock()
         self._loaded = False
         
     def _load_module(self):
@@ -111,10 +125,12 @@ class LazyModule:
                 if hasattr(timer, 'enabled') and timer.enabled:
                     print(f"🔄 Lazy loaded module: {self.alias}")
                 
-                return self._module
-                
             except Exception as e:
                 raise ImportError(f"Failed to lazy load module {self.module_path}: {e}")
+
+            if self._on_load is not None:
+                self._on_load(self._module)
+            return self._module
     
     def __getattr__(self, name):
         """Forward attribute access to the loaded module."""
@@ -126,26 +142,102 @@ class LazyModule:
         module = self._load_module()
         return module(*args, **kwargs)
     
+    def __dir__(self):
+        return dir(self._load_module())
+    
     def __repr__(self):
         status = "loaded" if self._loaded else "not loaded"
         return f"LazyModule({self.alias}, {status})"
 
+class LazyObject(LazyFunction):
+    """
+    A proxy for any module attribute: a class, an options object, a singleton.
+
+    Besides calls and attribute reads (LazyFunction), it forwards attribute
+    assignment, item access, ``dir()``, ``len()``/iteration and, when the
+    target is a class, ``isinstance``/``issubclass`` checks and subclassing.
+    ``factory`` replaces the import when the object has to be built.
+
+    Usage:
+        plot_manager = LazyObject('plotbot.plot_manager', 'plot_manager')
+        isinstance(pb.mag_rtn.br, plot_manager)  # plot_manager imported here
+    """
+
+    def __init__(self, module_path: str, attribute: str, alias: Optional[str] = None,
+                 on_load: Optional[Callable[[Any], None]] = None,
+                 factory: Optional[Callable[[], Any]] = None):
+        super().__init__(module_path, attribute, alias, on_load)
+        self._factory = factory
+
+    def _import_target(self):
+        if self._factory is not None:
+            return self._factory()
+        return super()._import_target()
+
+    def __setattr__(self, name, value):
+        if name.startswith('_') or name in ('module_path', 'function_name', 'alias'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._load_function(), name, value)
+
+    def __dir__(self):
+        return dir(self._load_function())
+
+    def __getitem__(self, key):
+        return self._load_function()[key]
+
+    def __setitem__(self, key, value):
+        self._load_function()[key] = value
+
+    def __len__(self):
+        return len(self._load_function())
+
+    def __iter__(self):
+        return iter(self._load_function())
+
+    def __contains__(self, item):
+        return item in self._load_function()
+
+    def __instancecheck__(self, instance):
+        return isinstance(instance, self._load_function())
+
+    def __subclasscheck__(self, subclass):
+        return issubclass(subclass, self._load_function())
+
+    def __mro_entries__(self, bases):
+        return (self._load_function(),)
+
+    def __repr__(self):
+        if self._loaded:
+            return repr(self._function)
+        return f"LazyObject({self.alias}, not loaded)"
+
 class LazyDataClass:
     """
-    A proxy that defers data class instantiation until first access.
-    
+    A proxy that defers a data class until first access.
+
+    Plotbot data classes create their global instance at the bottom of their
+    module (``mag_rtn = mag_rtn_class(None)``). On first access the proxy
+    imports that module, takes the instance from it (so the proxy, the module
+    and data_cubby all share one object) and stashes it in data_cubby under
+    ``cubby_keys``. ``isinstance`` checks see the real class.
+
     Usage:
-        mag_rtn_4sa = LazyDataClass('plotbot.data_classes.psp_mag_rtn_4sa', 'mag_rtn_4sa_class')
-        # Class not instantiated yet
-        mag_rtn_4sa.br  # Class instantiated and accessed
+        mag_rtn_4sa = LazyDataClass('plotbot.data_classes.psp_mag_rtn_4sa', 'mag_rtn_4sa_class',
+                                    cubby_keys=('mag_rtn_4sa',))
+        # Module not imported yet
+        mag_rtn_4sa.br  # Module imported, instance stashed and accessed
     """
     
-    def __init__(self, module_path: str, class_name: str, instance_name: Optional[str] = None):
+    def __init__(self, module_path: str, class_name: str, instance_name: Optional[str] = None,
+                 cubby_keys: Tuple[str, ...] = (), on_load: Optional[Callable[[Any], None]] = None):
         self.module_path = module_path
         self.class_name = class_name
         self.instance_name = instance_name or class_name.replace('_class', '')
+        self.cubby_keys = tuple(cubby_keys)
         self._instance = None
-        self._lock = threading.Lock()
+        self._on_load = on_load
+        self._lock = threading.RLock()
         self._loaded = False
         
     def _load_instance(self):
@@ -158,14 +250,14 @@ class LazyDataClass:
                 return self._instance
                 
             try:
-                # Import the module
                 module = importlib.import_module(self.module_path)
-                
-                # Get the class
                 class_type = getattr(module, self.class_name)
                 
-                # Instantiate with None (plotbot pattern)
-                self._instance = class_type(None)
+                # Use the module's own instance; instantiate with None (plotbot pattern) if it has none
+                instance = getattr(module, self.instance_name, None)
+                if not isinstance(instance, class_type):
+                    instance = class_type(None)
+                self._instance = instance
                 self._loaded = True
                 
                 # Optional: Print lazy loading info
@@ -173,10 +265,17 @@ class LazyDataClass:
                 if hasattr(timer, 'enabled') and timer.enabled:
                     print(f"🔄 Lazy loaded data class: {self.instance_name}")
                 
-                return self._instance
-                
             except Exception as e:
                 raise ImportError(f"Failed to lazy load {self.instance_name} from {self.module_path}.{self.class_name}: {e}")
+
+            if self.cubby_keys:
+                from .data_cubby import data_cubby
+                for key in self.cubby_keys:
+                    if data_cubby.cubby.get(key) is not self._instance:
+                        data_cubby.stash(self._instance, class_name=key)
+            if self._on_load is not None:
+                self._on_load(self._instance)
+            return self._instance
     
     def __getattr__(self, name):
         """Forward attribute access to the loaded instance."""
@@ -186,20 +285,32 @@ class LazyDataClass:
     def __setattr__(self, name, value):
         """Forward attribute setting to the loaded instance."""
         # Allow setting of internal attributes
-        if name.startswith('_') or name in ['module_path', 'class_name', 'instance_name']:
+        if name.startswith('_') or name in ['module_path', 'class_name', 'instance_name', 'cubby_keys']:
             object.__setattr__(self, name, value)
         else:
             instance = self._load_instance()
             setattr(instance, name, value)
     
+    @property
+    def __class__(self):
+        """The loaded instance's class, so ``isinstance(proxy, mag_rtn_class)`` holds."""
+        return type(self._load_instance())
+    
+    def __dir__(self):
+        return dir(self._load_instance())
+    
+    def __reduce_ex__(self, protocol):
+        return self._load_instance().__reduce_ex__(protocol)
+    
     def __call__(self, *args, **kwargs):
         """Allow the instance to be called if it's callable."""
         instance = self._load_instance()
         return instance(*args, **kwargs)
     
     def __repr__(self):
-        status = "loaded" if self._loaded else "not loaded"
-        return f"LazyDataClass({self.instance_name}, {status})"
+        if self._loaded:
+            return repr(self._instance)
+        return f"LazyDataClass({self.instance_name}, not loaded)"
 
 class LazyImportGroup:
     """
@@ -251,9 +362,10 @@ def create_lazy_module(module_path: str, alias: Optional[str] = None) -> LazyMod
     """Convenience function to create a LazyModule."""
     return LazyModule(module_path, alias)
 
-def create_lazy_data_class(module_path: str, class_name: str, instance_name: Optional[str] = None) -> LazyDataClass:
+def create_lazy_data_class(module_path: str, class_name: str, instance_name: Optional[str] = None,
+                           cubby_keys: Tuple[str, ...] = ()) -> LazyDataClass:
     """Convenience function to create a LazyDataClass."""
-    return LazyDataClass(module_path, class_name, instance_name)
+    return LazyDataClass(module_path, class_name, instance_name, cubby_keys)
 
 # Registry for tracking all lazy objects (useful for debugging)
 _lazy_registry: Dict[str, Union[LazyFunction, LazyModule, LazyDataClass]] = {}
@@ -262,6 +374,40 @@ def register_lazy_object(name: str, obj: Union[LazyFunction, LazyModule, LazyDat
     """Register a lazy object for debugging purposes."""
     _lazy_registry[name] = obj
 
+# data_cubby key -> loader, for lookups of instances nobody has touched yet
+_cubby_loaders: Dict[str, Callable[[], Any]] = {}
+
+def register_cubby_loader(key: str, loader: Callable[[], Any]):
+    """Have data_cubby call ``loader`` (which stashes the object) when ``key`` is missing."""
+    _cubby_loaders[key.lower()] = loader
+
+def register_data_class(proxy: LazyDataClass):
+    """Make ``proxy`` loadable by data_cubby under each of its cubby keys."""
+    register_lazy_object(proxy.instance_name, proxy)
+    for key in proxy.cubby_keys:
+        register_cubby_loader(key, proxy._load_instance)
+
+def load_data_class(key: str):
+    """
+    Load the object registered under data_cubby key ``key`` (stashing it in data_cubby).
+
+    Returns the object, or None if nothing lazy is registered under that key.
+    """
+    loader = _cubby_loaders.get(key.lower()) if isinstance(key, str) else None
+    if loader is None:
+        return None
+    return loader()
+
+def unwrap(obj):
+    """The object behind a lazy proxy (loading it); anything else is returned as is."""
+    if type(obj) is LazyDataClass:
+        return obj._load_instance()
+    if isinstance(obj, LazyFunction):
+        return obj._load_function()
+    if isinstance(obj, LazyModule):
+        return obj._load_module()
+    return obj
+
 def get_lazy_status() -> Dict[str, bool]:
     """Get the loading status of all registered lazy objects."""
     return {name: obj._loaded for name, obj in _lazy_registry.items()}
@@ -15,6 +15,10 @@ from .ploptions import ploptions
 from .get_data import get_data
 # Import the XAxisPositionalDataMapper helper
 from .x_axis_positional_data_helpers import XAxisPositionalDataMapper
+from .positional_binning import BinSpec, binned_statistic, wrap_angle, wrapped_bin_geometry
+from .positional_binning import COORDINATES as BINNABLE_COORDINATES
+from .spectrogram_render import draw_spectrogram, axes_pixel_width
+from .spectral_pyramid import pyramid_window
 # Import str_to_datetime from time_utils
 from .time_utils import str_to_datetime
 # Import perihelion helper
@@ -24,7 +28,9 @@ from .utils import get_perihelion_time
 import matplotlib.colors as colors
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import weakref
 import os
 from PIL import Image   
 import matplotlib.pyplot as mpl_plt
@@ -85,7 +91,28 @@ def debug_variable_time_ranges(var, trange, label=""):
         print_manager.custom_debug(f"[DEBUG {label}] Invalid trange format: {trange}")
 
 
-def compute_monotonic_degrees_mask(degrees_array, tolerance_factor=1.0):
+# Monotonic masks by (encounter, tolerance, time base identity, window); panels sharing a time base share a mask
+_monotonic_mask_cache = OrderedDict()
+MONOTONIC_MASK_CACHE_SIZE = 32
+
+
+def _first_reversal(abs_degrees, tolerance_factor):
+    """
+    Offset of the first sample that falls below ``tolerance_factor`` times the
+    running max of the samples before it (len(abs_degrees) if none does).
+
+    Same test as a running-max loop: NaNs count as a reversal, and a NaN
+    starting value makes the next sample one.
+    """
+    if len(abs_degrees) < 2:
+        return len(abs_degrees)
+    running_max = np.maximum.accumulate(abs_degrees[:-1])
+    reversed_ = ~(abs_degrees[1:] >= running_max * tolerance_factor)
+    first = np.argmax(reversed_)
+    return first + 1 if reversed_[first] else len(abs_degrees)
+
+
+def compute_monotonic_degrees_mask(degrees_array, tolerance_factor=1.0, encounter=None, time_base=None, window=None):
     """
     Compute a mask for the "monotonic" portion of degrees_from_perihelion data.
 
@@ -95,54 +122,71 @@ def compute_monotonic_degrees_mask(degrees_array, tolerance_factor=1.0):
 
     This function finds the portion where |degrees| is monotonically increasing from
     the perihelion crossing - the single pass through perihelion without curl-back.
+    Each side of perihelion is one ``np.maximum.accumulate``: the first sample below
+    ``tolerance_factor`` times the running max before it starts the clipped region.
 
     Args:
         degrees_array: Array of degrees from perihelion values (can be negative/positive)
         tolerance_factor: Tolerance for fluctuations (default 1.0 = strict, no tolerance).
                          0.99 = 1% tolerance, 0.95 = 5% tolerance, etc.
+        encounter: Optional encounter label (e.g. 'E10').
+        time_base: Optional datetime array the degrees were computed from. Given with an
+                   encounter, the mask is cached per (encounter, tolerance, time_base, window)
+                   and reused by later panels on the same time base. The array is matched by
+                   identity, so a re-import or merge that replaces it computes a new mask.
+        window: The (start, end) trange of time_base the degrees cover.
 
     Returns:
-        Boolean mask where True = keep this data point (monotonic region)
+        Boolean mask where True = keep this data point (monotonic region).
+        Cached masks are read-only.
     """
-    if len(degrees_array) < 2:
-        return np.ones(len(degrees_array), dtype=bool)
+    degrees_array = np.asarray(degrees_array)
+    n = len(degrees_array)
+    if n < 2:
+        return np.ones(n, dtype=bool)
+
+    key = ref = None
+    if encounter is not None and time_base is not None:
+        try:
+            ref = weakref.ref(time_base)   # checked on a hit so a reused id never matches
+        except TypeError:
+            pass
+    if ref is not None:
+        window = tuple(window) if window is not None else None
+        key = (encounter, tolerance_factor, id(time_base), window, n)
+        entry = _monotonic_mask_cache.get(key)
+        if entry is not None and entry[0]() is time_base:
+            _monotonic_mask_cache.move_to_end(key)
+            print_manager.debug(f"  Monotonic mask: reusing cached mask for {encounter}")
+            return entry[1]
 
     abs_degrees = np.abs(degrees_array)
-    n = len(abs_degrees)
 
     # Find the index closest to perihelion (minimum |degrees|)
     perihelion_idx = np.argmin(abs_degrees)
 
-    # Initialize mask - everything starts as valid
     mask = np.ones(n, dtype=bool)
 
-    # Forward from perihelion: find where |degrees| stops increasing
-    running_max = abs_degrees[perihelion_idx]
-    for j in range(perihelion_idx + 1, n):
-        if abs_degrees[j] >= running_max * tolerance_factor:
-            # Still increasing (or within tolerance) - update running max
-            running_max = max(running_max, abs_degrees[j])
-        else:
-            # |degrees| has started decreasing significantly - clip from here onward
-            mask[j:] = False
-            print_manager.debug(f"  Monotonic clip: Forward reversal at index {j}, |degrees|={abs_degrees[j]:.2f} < running_max={running_max:.2f}")
-            break
-
-    # Backward from perihelion: find where |degrees| stops increasing (going back in time)
-    running_max = abs_degrees[perihelion_idx]
-    for j in range(perihelion_idx - 1, -1, -1):
-        if abs_degrees[j] >= running_max * tolerance_factor:
-            # Still increasing (or within tolerance) - update running max
-            running_max = max(running_max, abs_degrees[j])
-        else:
-            # |degrees| has started decreasing - clip from here backward
-            mask[:j + 1] = False
-            print_manager.debug(f"  Monotonic clip: Backward reversal at index {j}, |degrees|={abs_degrees[j]:.2f} < running_max={running_max:.2f}")
-            break
+    # Forward from perihelion: clip from the first sample where |degrees| drops below the running max
+    forward = perihelion_idx + _first_reversal(abs_degrees[perihelion_idx:], tolerance_factor)
+    if forward < n:
+        mask[forward:] = False
+        print_manager.debug(f"  Monotonic clip: Forward reversal at index {forward}, |degrees|={abs_degrees[forward]:.2f}")
+
+    # Backward from perihelion (going back in time): the same test on the reversed half
+    backward = perihelion_idx - _first_reversal(abs_degrees[perihelion_idx::-1], tolerance_factor)
+    if backward >= 0:
+        mask[:backward + 1] = False
+        print_manager.debug(f"  Monotonic clip: Backward reversal at index {backward}, |degrees|={abs_degrees[backward]:.2f}")
 
     kept_count = np.sum(mask)
     print_manager.debug(f"  Monotonic mask: keeping {kept_count}/{n} points ({100*kept_count/n:.1f}%)")
 
+    if key is not None:
+        mask.flags.writeable = False
+        _monotonic_mask_cache[key] = (ref, mask)
+        if len(_monotonic_mask_cache) > MONOTONIC_MASK_CACHE_SIZE:
+            _monotonic_mask_cache.popitem(last=False)
     return mask
 
 
@@ -1207,7 +1251,7 @@ def multiplot(plot_list, **kwargs):
                                             # 5. Apply monotonic clipping if option is enabled
                                             if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
                                                 print_manager.debug(f"Panel {i+1}: Applying monotonic clipping to degrees data")
-                                                monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0))
+                                                monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0), encounter=enc_num, time_base=raw_datetime_array, window=trange)
                                                 relative_degrees_wrapped = relative_degrees_wrapped[monotonic_mask]
                                                 data_slice_filtered_lon = data_slice_filtered_lon[monotonic_mask]
                                                 print_manager.debug(f"  After clipping: {len(relative_degrees_wrapped)} points")
@@ -1454,7 +1498,7 @@ def multiplot(plot_list, **kwargs):
                                             # 5. Apply monotonic clipping if option is enabled
                                             if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
                                                 print_manager.debug(f"Panel {i+1}: Applying monotonic clipping to degrees data (Scatter)")
-                                                monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0))
+                                                monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0), encounter=enc_num, time_base=raw_datetime_array, window=trange)
                                                 relative_degrees_wrapped = relative_degrees_wrapped[monotonic_mask]
                                                 data_slice_filtered_lon = data_slice_filtered_lon[monotonic_mask]
 
@@ -1558,9 +1602,14 @@ def multiplot(plot_list, **kwargs):
                         print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: SPECTRAL PLOT TYPE DETECTED")
                         print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: Variable: {var.class_name}.{var.subclass_name}")
                         print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: Indices available: {len(indices)}")
-                        raw_datetime_array = var.plot_config.datetime_array if hasattr(var, 'plot_options') else var.datetime_array
-                        datetime_clipped = raw_datetime_array[indices]
-                        data_clipped = np.array(var.all_data)[indices] # Use improved data handling
+                        # Zoomed-out panels draw from a time-decimated level if the variable keeps a pyramid
+                        decimated = pyramid_window(var, trange[0], trange[1], axes_pixel_width(axs[i]))
+                        if decimated is not None:
+                            datetime_clipped, data_clipped, _ = decimated
+                        else:
+                            raw_datetime_array = var.plot_config.datetime_array if hasattr(var, 'plot_options') else var.datetime_array
+                            datetime_clipped = raw_datetime_array[indices]
+                            data_clipped = np.array(var.all_data)[indices] # Use improved data handling
                         print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: data_clipped shape: {data_clipped.shape}")
                         # Handle additional_data for spectral plots (energy/frequency channels)
                         print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: Checking additional_data...")
@@ -1651,7 +1700,7 @@ def multiplot(plot_list, **kwargs):
                                         # 4. Apply monotonic clipping if option is enabled
                                         if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
                                             print_manager.debug(f"Panel {i+1}: Applying monotonic clipping to degrees data (Spectral)")
-                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0))
+                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0), encounter=enc_num, time_base=raw_datetime_array if decimated is None else None, window=trange)
                                             relative_degrees = relative_degrees[monotonic_mask]
                                             data_slice_filtered_lon = data_slice_filtered_lon[monotonic_mask, :]
 
@@ -1724,9 +1773,10 @@ def multiplot(plot_list, **kwargs):
                                 print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: norm: {norm}")
                                 print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: colormap: {getattr(var, 'colormap', 'None')}")
                                 try:
-                                    im = axs[i].pcolormesh(x_data, y_spectral_axis, data_slice.T, # Transpose needed for pcolormesh
-                                                                norm=norm, cmap=var.colormap, shading='auto')
-                                    print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: ✅ pcolormesh created successfully!")
+                                    # Raster (image) fast path for rectilinear grids; pcolormesh otherwise
+                                    im = draw_spectrogram(axs[i], x_data, y_spectral_axis, data_slice,
+                                                          norm=norm, cmap=var.colormap, y_scale=var.y_scale)
+                                    print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: ✅ {type(im).__name__} created successfully!")
                                 except Exception as pcolor_e:
                                     print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: ❌ pcolormesh failed: {str(pcolor_e)}")
                                     print_manager.test(f"[TEST SPECTRAL] Panel {i+1}: ❌ Exception type: {type(pcolor_e)}")
@@ -1839,7 +1889,7 @@ def multiplot(plot_list, **kwargs):
                                         # 5. Apply monotonic clipping if option is enabled
                                         if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
                                             print_manager.debug(f"Panel {i+1}: Applying monotonic clipping to degrees data (Default)")
-                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0))
+                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0), encounter=enc_num, time_base=raw_datetime_array, window=trange)
                                             relative_degrees_wrapped = relative_degrees_wrapped[monotonic_mask]
                                             data_slice_filtered_lon = data_slice_filtered_lon[monotonic_mask]
 
@@ -2005,7 +2055,7 @@ def multiplot(plot_list, **kwargs):
                                         # 5. Apply monotonic clipping if option is enabled
                                         if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
                                             print_manager.debug(f"Panel {i+1}: Applying monotonic clipping to HAM degrees data")
-                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0))
+                                            monotonic_mask = compute_monotonic_degrees_mask(relative_degrees_wrapped, getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0), encounter=enc_num, time_base=ham_var.datetime_array, window=trange)
                                             relative_degrees_wrapped = relative_degrees_wrapped[monotonic_mask]
                                             data_slice_filtered = data_slice_filtered[monotonic_mask]
 
@@ -2208,25 +2258,15 @@ def multiplot(plot_list, **kwargs):
                                 # Cap ham_frac at 1.0 for visualization (raw data preserved in JSON)
                                 ham_frac = np.clip(ham_frac, 0, 1)
 
-                                # Calculate bin centers (handle wrap-around)
-                                bar_centers_abs = np.zeros(len(start_lons))
-                                for bi in range(len(start_lons)):
-                                    if abs(end_lons[bi] - start_lons[bi]) > 180:
-                                        if start_lons[bi] > end_lons[bi]:
-                                            bar_centers_abs[bi] = (start_lons[bi] + end_lons[bi] + 360) / 2
-                                        else:
-                                            bar_centers_abs[bi] = (start_lons[bi] + end_lons[bi] - 360) / 2
-                                    else:
-                                        bar_centers_abs[bi] = (start_lons[bi] + end_lons[bi]) / 2
+                                # Bin centers and widths (bins may cross the 0°/360° wrap)
+                                bar_centers_abs, bar_widths = wrapped_bin_geometry(start_lons, end_lons)
 
-                                # Convert to degrees from perihelion
-                                degrees_from_peri = bar_centers_abs - perihelion_lon
-                                # Wrap to [-180, 180]
-                                degrees_from_peri = (degrees_from_peri + 180) % 360 - 180
+                                # Convert to degrees from perihelion, wrapped to [-180, 180)
+                                degrees_from_peri = wrap_angle(bar_centers_abs - perihelion_lon)
 
                                 # Also convert bin edges to degrees from perihelion (for edge-aware clipping)
-                                start_degrees = (start_lons - perihelion_lon + 180) % 360 - 180
-                                end_degrees = (end_lons - perihelion_lon + 180) % 360 - 180
+                                start_degrees = wrap_angle(start_lons - perihelion_lon)
+                                end_degrees = wrap_angle(end_lons - perihelion_lon)
 
                                 # Apply clipping if option is enabled
                                 # Simple and elegant: keep bins where end_degrees > start_degrees
@@ -2241,22 +2281,9 @@ def multiplot(plot_list, **kwargs):
                                     # Apply mask
                                     degrees_from_peri = degrees_from_peri[keep]
                                     ham_frac = ham_frac[keep]
-                                    start_lons = start_lons[keep]
-                                    end_lons = end_lons[keep]
+                                    bar_widths = bar_widths[keep]
 
                                     print_manager.ham_debugging(f"HAM bins: kept {np.sum(keep)}/{total_before} (removed {total_before - np.sum(keep)} curl-back bins)")
-
-                                # Calculate bar widths (handle wrap-around)
-                                if len(end_lons) > 0:
-                                    raw_widths = end_lons - start_lons
-                                    bar_widths = np.zeros_like(raw_widths)
-                                    for bi in range(len(raw_widths)):
-                                        w = raw_widths[bi]
-                                        if w > 180:
-                                            w = w - 360
-                                        elif w < -180:
-                                            w = w + 360
-                                        bar_widths[bi] = abs(w)
                                 # Use actual bin widths - no artificial minimum
 
                                 # Create twinx axis for the overlay
@@ -2300,6 +2327,54 @@ def multiplot(plot_list, **kwargs):
                 print_manager.error(f"Panel {i+1}: Error plotting HAM binned overlay: {e}")
         # === END HAM BINNED DEGREES OVERLAY ===
 
+        # === ON-THE-FLY BINNED OVERLAY ===
+        # Bins options.binned_overlay_var by this panel's positional coordinate (positional_binning.py)
+        if (options.binned_overlay_var is not None and using_positional_axis and positional_mapper is not None
+                and data_type in BINNABLE_COORDINATES
+                and (data_type != 'degrees_from_perihelion' or current_panel_use_degrees)):
+            try:
+                from .time_utils import TimeRangeTracker
+                overlay_var = options.binned_overlay_var
+                TimeRangeTracker.set_current_trange(trange)
+                get_data(trange, overlay_var)
+                overlay_instance = data_cubby.grab(getattr(overlay_var, 'class_name', None))
+                if overlay_instance is not None and hasattr(overlay_instance, 'get_subclass'):
+                    overlay_var = overlay_instance.get_subclass(overlay_var.subclass_name) or overlay_var
+
+                clip_tolerance = None
+                if getattr(options, 'degrees_from_perihelion_clip_at_reversal', False):
+                    clip_tolerance = getattr(options, 'degrees_from_perihelion_clip_tolerance', 1.0)
+                spec = BinSpec(data_type, options.binned_overlay_bin_width,
+                               statistic=options.binned_overlay_statistic,
+                               threshold=options.binned_overlay_threshold)
+                binned = binned_statistic(overlay_var, positional_mapper, spec, encounter=enc_num, trange=trange,
+                                          perihelion_time=perihelion_time_str, clip_tolerance=clip_tolerance)
+
+                if binned is not None and np.any(binned.counts > 0):
+                    filled = binned.counts > 0
+                    bar_values = binned.values[filled]
+                    ax2_binned = axs[i].twinx()
+                    ax2_binned.bar(binned.centers[filled], bar_values, width=binned.widths[filled],
+                                   alpha=options.ham_binned_degrees_overlay_opacity,
+                                   edgecolor='black', linewidth=0.5,
+                                   color=options.ham_binned_degrees_color,
+                                   label=f"{getattr(overlay_var, 'legend_label', None) or 'Binned'} ({spec.statistic})")
+                    if options.ham_binned_y_limit:
+                        ax2_binned.set_ylim(options.ham_binned_y_limit)
+                    else:
+                        max_val = np.nanmax(bar_values)
+                        ax2_binned.set_ylim(min(0, np.nanmin(bar_values) * 1.1), max_val * 1.1 if max_val > 0 else 1)
+                    for spine in ax2_binned.spines.values():
+                        spine.set_visible(False)
+                    axis_style_color = panel_color if panel_color else 'black'
+                    ax2_binned.tick_params(axis='y', colors=axis_style_color, which='both', labelsize=options.y_tick_label_font_size)
+                    print_manager.debug(f"Panel {i+1}: Plotted {np.sum(filled)} binned {spec.statistic} bars by {data_type} for {enc_num}")
+                else:
+                    print_manager.debug(f"Panel {i+1}: No samples to bin for the binned overlay")
+            except Exception as e:
+                print_manager.error(f"Panel {i+1}: Error plotting binned overlay: {e}")
+        # === END ON-THE-FLY BINNED OVERLAY ===
+
         if axis_options.y_limit:
             # Determine the y_scale
             current_y_scale = None
@@ -387,6 +387,10 @@ class MultiplotOptions:
         self.ham_opacity = 1.0  # New: Opacity for HAM data (default 1.0)
         self.r_hand_single_color = None  # New: Single color for right axis in rainbow mode (hex color string)
         self.show_right_axis_label = True  # Show/hide the right y-axis label (e.g., n_ham)
+        self.binned_overlay_var = None  # Variable binned by position on the fly (see positional_binning.py)
+        self.binned_overlay_statistic = 'fraction_above'
+        self.binned_overlay_threshold = 0.0
+        self.binned_overlay_bin_width = 1.0
         
         # New color mode options
         self.color_mode = 'default'  # Options: 'default', 'rainbow', 'single'
@@ -1070,6 +1074,51 @@ class MultiplotOptions:
     def ham_binned_degrees_overlay_opacity(self, value: float):
         self.__dict__['ham_binned_degrees_overlay_opacity'] = value
     # --- END HAM BINNED DEGREES OVERLAY PROPERTIES ---
+
+    # --- ON-THE-FLY BINNED OVERLAY PROPERTIES ---
+    @property
+    def binned_overlay_var(self):
+        """Variable (plot_manager) to bin by position and overlay as bars in positional modes. None disables."""
+        return self.__dict__.get('binned_overlay_var', None)
+
+    @binned_overlay_var.setter
+    def binned_overlay_var(self, value):
+        self.__dict__['binned_overlay_var'] = value
+
+    @property
+    def binned_overlay_statistic(self) -> str:
+        """Per-bin statistic for the binned overlay: 'mean', 'median', 'fraction_above' or 'count'."""
+        return self.__dict__.get('binned_overlay_statistic', 'fraction_above')
+
+    @binned_overlay_statistic.setter
+    def binned_overlay_statistic(self, value: str):
+        from .positional_binning import STATISTICS
+        if value not in STATISTICS:
+            print_manager.warning(f"Invalid binned_overlay_statistic: {value}. Choose from {list(STATISTICS)}.")
+            return
+        self.__dict__['binned_overlay_statistic'] = value
+
+    @property
+    def binned_overlay_threshold(self) -> float:
+        """Threshold for the 'fraction_above' statistic (e.g. 0 gives the fraction of intervals with HAM)."""
+        return self.__dict__.get('binned_overlay_threshold', 0.0)
+
+    @binned_overlay_threshold.setter
+    def binned_overlay_threshold(self, value: float):
+        self.__dict__['binned_overlay_threshold'] = value
+
+    @property
+    def binned_overlay_bin_width(self) -> float:
+        """Bin width for the binned overlay, in the x-axis units (degrees or R_sun)."""
+        return self.__dict__.get('binned_overlay_bin_width', 1.0)
+
+    @binned_overlay_bin_width.setter
+    def binned_overlay_bin_width(self, value: float):
+        if value is None or not value > 0:
+            print_manager.warning(f"Invalid binned_overlay_bin_width: {value}. Must be positive.")
+            return
+        self.__dict__['binned_overlay_bin_width'] = value
+    # --- END ON-THE-FLY BINNED OVERLAY PROPERTIES ---
     # --- END HAM DATA PROPERTIES ---
 
     # Keep these for backward compatibility (but they're deprecated now)
@@ -92,6 +92,10 @@ class MultiplotOptions:
     hamify: bool
     ham_var: Any  # Will be a plot_manager object
     show_right_axis_label: bool  # Show/hide the right y-axis label (e.g., n_ham)
+    binned_overlay_var: Any  # plot_manager binned by position on the fly
+    binned_overlay_statistic: str  # 'mean', 'median', 'fraction_above' or 'count'
+    binned_overlay_threshold: float
+    binned_overlay_bin_width: float
     color_mode: str
     single_color: Optional[str]
     save_output: bool
@@ -35,6 +35,7 @@ class plot_config:
                  additional_data=None,
                  colorbar_label=None,
                  requested_trange=None,
+                 spectral_pyramid=None,
                  # Add common font size attributes explicitly
                  title_fontsize=12,
                  y_label_size=10,
@@ -67,6 +68,7 @@ class plot_config:
         self.additional_data = additional_data
         self.colorbar_label = colorbar_label
         self.requested_trange = requested_trange
+        self.spectral_pyramid = spectral_pyramid  # None, 'mean' or 'max': keep time-decimated levels (spectral_pyramid.py)
         # Set the explicit font sizes
         self.title_fontsize = title_fontsize
         self.y_label_size = y_label_size
@@ -99,6 +101,17 @@ class plot_config:
         # Safer setter implementation that avoids truth value comparisons
         self._datetime_array = value
 
+    def copy(self):
+        """Return a shallow copy that shares array attributes with this config.
+
+        Assigning an attribute on the copy rebinds it there only (copy-on-write),
+        so derived plot_managers can override metadata without touching the
+        source, and without duplicating datetime_array or time.
+        """
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
 print('initialized plot_config')
 
 def retrieve_plot_config_snapshot(state_dict):
@@ -26,6 +26,7 @@ class plot_config:
     colorbar_limits: Optional[Tuple[float, float]]
     additional_data: Any
     colorbar_label: Optional[str]
+    spectral_pyramid: Optional[str]  # None, 'mean' or 'max'
     title_font_size: int | float # Corrected name
     y_axis_label_font_size: int | float # Corrected name
     x_axis_label_font_size: int | float # Corrected name
@@ -67,6 +68,7 @@ class plot_config:
     def y_tick_label_size(self, value: int | float) -> None: ...
 
     def __init__(self, **kwargs) -> None: ...
+    def copy(self) -> 'plot_config': ...
     def reset(self) -> None: ...
     def save_state(self) -> None: ...
     def restore_state(self) -> None: ...
@@ -17,6 +17,28 @@ def _get_plt():
 from .plot_config import plot_config
 from .print_manager import print_manager
 from .data_classes.custom_variables import custom_variable  # UPDATED PATH
+from .data_classes.custom_expression import record_operation
+
+def _shared_time_base(values):
+    """Return a read-only view of a time array so derived plot_managers can share it.
+
+    The view keeps the source buffer alive through numpy's own reference
+    counting; nothing is copied. Non-array values (None, lists) pass through.
+    """
+    if isinstance(values, np.ndarray) and values.flags.writeable:
+        values = values.view(np.ndarray)
+        values.flags.writeable = False
+    return values
+
+
+def _derive_plot_config(source_config, datetime_array, time=None):
+    """Copy-on-write plot_config for a derived plot_manager, sharing its time base."""
+    new_config = source_config.copy()
+    new_config.datetime_array = _shared_time_base(datetime_array)
+    new_config.time = _shared_time_base(time)
+    new_config.__dict__.pop('_pyramid', None)       # describes the source's data, not the derived one
+    return new_config
+
 
 class plot_manager(np.ndarray):
     
@@ -25,7 +47,7 @@ class plot_manager(np.ndarray):
         'y_label', 'legend_label', 'color', 'y_scale', 'y_limit', 'line_width',
         'line_style', 'colormap', 'colorbar_scale', 'colorbar_limits',
         'additional_data', 'colorbar_label', 'is_derived', 'source_var', 'operation',
-        'requested_trange',
+        'requested_trange', 'spectral_pyramid',
 
         # Add missing attributes
         'marker', 'marker_size', 'alpha', 'marker_style' #, 'zorder', 'legend_label_override'
@@ -128,26 +150,26 @@ class plot_manager(np.ndarray):
                     source_pms.append(i)
             
             if len(source_pms) > 0:
-                # Create new plot_manager with result, copying plot_config from first source
-                from .plot_config import plot_config
-                new_plot_config = plot_config(**source_pms[0].plot_config.__dict__)
+                # New plot_manager shares the first source's metadata and (clipped) time base
+                src = source_pms[0]
+                src_datetime = src.datetime_array  # clipped to match src.data used above
+                src_time = src.__dict__.get('_clipped_time')
+                if src_time is None and src_datetime is src.plot_config.datetime_array:
+                    src_time = src.plot_config.time
+                new_plot_config = _derive_plot_config(src.plot_config, src_datetime, src_time)
                 result_pm = plot_manager(results[0], plot_config=new_plot_config)
                 
                 # 🎯 KEY: Store which ufunc was used AND ALL source variable(s)
                 # This is critical for binary ufuncs like arctan2(br, bn) - we need BOTH sources!
                 object.__setattr__(result_pm, 'operation', ufunc.__name__)  # e.g., 'absolute', 'sqrt', 'arctan2'
                 object.__setattr__(result_pm, 'source_var', source_pms)  # ✅ FIX: Capture ALL sources
+                if not kwargs:
+                    record_operation(result_pm, ufunc.__name__, inputs)  # for fused custom variables
                 
                 print_manager.custom_debug(f"🎯 [UFUNC_CAPTURE] Captured ufunc: {ufunc.__name__}")
                 for idx, src in enumerate(source_pms):
                     print_manager.custom_debug(f"🎯 [UFUNC_CAPTURE] Source {idx+1}: {src.plot_config.class_name}.{src.plot_config.subclass_name}")
                 
-                # Copy datetime_array from first source
-                if hasattr(source_pms[0], 'datetime_array'):
-                    src_datetime = getattr(source_pms[0], 'datetime_array', None)
-                    if src_datetime is not None:
-                        result_pm.plot_config.datetime_array = src_datetime.copy() if hasattr(src_datetime, 'copy') else src_datetime
-                
                 return result_pm if ufunc.nout == 1 else tuple([result_pm])
         
         # Fallback to numpy behavior
@@ -177,24 +199,18 @@ class plot_manager(np.ndarray):
         else:
             self._plot_state = dict(self._plot_state)
         # Always ensure plot_config exists
-        # 🐛 BUG FIX: COPY plot_config instead of sharing reference!
+        # 🐛 BUG FIX: Don't share the plot_config object itself!
         # When np.abs() or other operations create new arrays, they were sharing
-        # the same plot_config object, causing metadata changes to affect both!
+        # the same plot_config object, causing metadata changes to affect both.
+        # A copy-on-write config keeps metadata separate while the time base
+        # arrays stay shared (read-only), so views never copy datetime_array.
         obj_plot_config = getattr(obj, 'plot_config', None)
         if obj_plot_config is None:
             from .plot_config import plot_config
             self.plot_config = plot_config()
         else:
-            # Create a COPY of the plot_config
-            from .plot_config import plot_config
-            self.plot_config = plot_config(**obj_plot_config.__dict__)
-            
-            # 🐛 BUG FIX: Also copy datetime_array from source object's DIRECT attribute!
-            # numpy ufuncs create new arrays where plot_config might not have datetime_array yet
-            if hasattr(obj, 'datetime_array'):
-                src_datetime = getattr(obj, 'datetime_array', None)
-                if src_datetime is not None:
-                    self.plot_config.datetime_array = src_datetime.copy() if hasattr(src_datetime, 'copy') else src_datetime
+            src_datetime, src_time = self._inherited_time_base(obj)
+            self.plot_config = _derive_plot_config(obj_plot_config, src_datetime, src_time)
         
         # 🐛 BUG FIX: Copy source_var for dependency tracking!
         # Numpy ufuncs bypass _perform_operation(), so we need to copy source_var here
@@ -208,6 +224,64 @@ class plot_manager(np.ndarray):
         if not hasattr(self, '_original_options'):
             self._original_options = getattr(obj, '_original_options', None)
 
+    def rebind(self, values):
+        """Return a plot_manager over ``values`` sharing this one's plot_config and plot state.
+
+        Used when a merge grows the arrays behind a data class: the caller
+        updates the shared plot_config's time base, and styling set on the old
+        plot_manager needs no save/restore.
+        """
+        new = np.asarray(values).view(plot_manager)
+        new.plot_config = self.plot_config
+        new._plot_state = self._plot_state
+        new._original_options = self._original_options
+        return new
+
+    def _inherited_time_base(self, obj):
+        """Pick the source time base whose length matches this new array.
+
+        The full time base wins when lengths agree (views, copies, astype);
+        otherwise the source's cached clipped arrays are used. The
+        datetime_array property is not called here so deriving a view never
+        triggers a re-clip of the source.
+        """
+        obj_config = obj.plot_config
+        full_datetime = obj_config.datetime_array
+        n_rows = self.shape[0] if self.ndim > 0 else None
+        if full_datetime is None or n_rows is None or len(full_datetime) == n_rows:
+            return full_datetime, obj_config.time
+        clipped_datetime = getattr(obj, '__dict__', {}).get('_clipped_datetime_array')
+        if clipped_datetime is not None:
+            return clipped_datetime, obj.__dict__.get('_clipped_time')
+        return full_datetime, obj_config.time
+
+    def __getitem__(self, key):
+        result = super().__getitem__(key)
+        if not isinstance(result, plot_manager) or self.ndim == 0:
+            return result
+        # Slice the time base alongside the data: a basic slice gives a view of
+        # the shared time base, an index array selects just the matching times.
+        row_key = key[0] if isinstance(key, tuple) and len(key) > 0 else key
+        if isinstance(row_key, np.ndarray):
+            if row_key.ndim != 1:
+                return result
+        elif not isinstance(row_key, (slice, list)):
+            return result
+        config = self.plot_config
+        datetime_base = config.datetime_array
+        if not isinstance(datetime_base, np.ndarray) or len(datetime_base) != self.shape[0]:
+            return result
+        try:
+            result.plot_config.datetime_array = _shared_time_base(datetime_base[row_key])
+            time_base = config.time
+            if isinstance(time_base, np.ndarray) and len(time_base) == self.shape[0]:
+                result.plot_config.time = _shared_time_base(time_base[row_key])
+            else:
+                result.plot_config.time = None
+        except (IndexError, TypeError, ValueError):
+            pass
+        return result
+
     def __bool__(self):
         # A plot_manager instance is considered "True" if its underlying
         # NumPy array representation has at least one element.
@@ -344,6 +418,37 @@ class plot_manager(np.ndarray):
             time_indices = np.where(time_mask)[0]
             return datetime_array[time_indices, ...]  # Preserve all other dimensions
 
+    def _sorted_window_slice(self, datetime_array, original_trange):
+        """Return the slice of a sorted datetime64 time base inside original_trange.
+
+        Binary search makes the clip cost O(log n) plus the size of the window,
+        instead of a mask over everything loaded. Returns None when the time base
+        isn't a time-ordered datetime64 array, so callers fall back to the mask.
+        Sortedness is checked once per time base array and cached.
+        """
+        from dateutil.parser import parse
+
+        if not isinstance(datetime_array, np.ndarray) or datetime_array.dtype.kind != 'M':
+            return None
+        times = datetime_array[:, 0] if datetime_array.ndim == 2 else datetime_array
+        if times.ndim != 1:
+            return None
+
+        cached = self.__dict__.get('_sorted_time_base')
+        if cached is not None and cached[0] is datetime_array:
+            is_sorted = cached[1]
+        else:
+            is_sorted = bool(len(times) < 2 or np.all(times[1:] >= times[:-1]))
+            self._sorted_time_base = (datetime_array, is_sorted)
+        if not is_sorted:
+            return None
+
+        start_time = np.datetime64(parse(original_trange[0]).replace(tzinfo=None), 'ns')
+        end_time = np.datetime64(parse(original_trange[1]).replace(tzinfo=None), 'ns')
+        start = int(np.searchsorted(times, start_time, side='left'))
+        stop = int(np.searchsorted(times, end_time, side='right'))
+        return slice(start, max(start, stop))
+
     def _clip_datetime_array_with_indices(self, datetime_array, original_trange):
         """Helper method to clip datetime array and return indices for clipping other arrays"""
         from dateutil.parser import parse
@@ -355,6 +460,10 @@ class plot_manager(np.ndarray):
         if datetime_array is None:
             return None, None
 
+        window = self._sorted_window_slice(datetime_array, original_trange)
+        if window is not None:
+            return datetime_array[window], np.arange(window.start, window.stop, dtype=np.int64)
+
         # Parse time range strings to UTC-aware datetimes
         start_time = parse(original_trange[0]).replace(tzinfo=timezone.utc)
         end_time = parse(original_trange[1]).replace(tzinfo=timezone.utc)
@@ -404,6 +513,10 @@ class plot_manager(np.ndarray):
             print_manager.custom_debug("⚠️ No datetime array available, returning full data")
             return data_array
 
+        window = self._sorted_window_slice(datetime_array, original_trange)
+        if window is not None and len(datetime_array) == len(data_array):
+            return data_array[window]
+
         # Parse time range strings to UTC-aware datetimes
         start_time = parse(original_trange[0]).replace(tzinfo=timezone.utc)
         end_time = parse(original_trange[1]).replace(tzinfo=timezone.utc)
@@ -513,6 +626,7 @@ class plot_manager(np.ndarray):
                 self.plot_config._datetime_array = value
             else:
                 object.__setattr__(self.plot_config, 'datetime_array', value)
+            self.plot_config.__dict__.pop('_pyramid', None)    # spectral pyramid of the old time base
                 
             # Then update the _plot_state dictionary if needed
             if hasattr(self, '_plot_state'):
@@ -655,6 +769,15 @@ class plot_manager(np.ndarray):
         self._plot_state['additional_data'] = value
         self.plot_config.additional_data = value
         
+    @property
+    def spectral_pyramid(self):
+        return getattr(self.plot_config, 'spectral_pyramid', None)
+
+    @spectral_pyramid.setter
+    def spectral_pyramid(self, value):
+        self._plot_state['spectral_pyramid'] = value
+        self.plot_config.spectral_pyramid = value
+        
     @property
     def colorbar_label(self):
         if hasattr(self, '_colorbar_label'):
@@ -747,6 +870,13 @@ class plot_manager(np.ndarray):
                         print("Try 'linear' or 'log'.")
                         return
                         
+                elif name == 'spectral_pyramid':
+                    from .spectral_pyramid import REDUCERS
+                    if value is not None and value not in REDUCERS:
+                        print_manager.warning(f"'{value}' is not a spectral pyramid reducer, friend!")
+                        print(f"Try one of these: {', '.join(REDUCERS)} (or None to turn it off).")
+                        return
+
                 elif name == 'line_style':
                     valid_styles = ['-', '--', '-.', ':', 'None', ' ', '']
                     if value not in valid_styles:
@@ -1143,8 +1273,9 @@ class plot_manager(np.ndarray):
                 source_vars.append(self)
             
             try:
-                # Apply the unary operation to self's data
-                self_data = self.view(np.ndarray)
+                # Apply the unary operation to the (time-clipped) data so it
+                # lines up with self.datetime_array below
+                self_data = self.data
                 # The lambda in the method call handles applying just to first arg
                 result = operation_func(self_data, None)
                 
@@ -1152,14 +1283,13 @@ class plot_manager(np.ndarray):
                 var_name = f"{operation_name}_{getattr(self, 'subclass_name', 'var1')}"
                 
                 # Create result plot_manager
-                # 🐛 BUG FIX: COPY datetime_array instead of sharing reference!
-                datetime_arr_copy = self.datetime_array.copy() if hasattr(self, 'datetime_array') and self.datetime_array is not None else None
+                # Share a read-only view of the time base rather than copying it
                 result_plot_config = plot_config(
                     data_type="custom_data_type",
                     class_name="custom_variables", 
                     subclass_name=var_name,
                     plot_type="time_series",
-                    datetime_array=datetime_arr_copy
+                    datetime_array=_shared_time_base(self.datetime_array)
                 )
                 
                 # Create the result
@@ -1168,6 +1298,7 @@ class plot_manager(np.ndarray):
                 # Set metadata
                 object.__setattr__(result_var, 'operation', operation_name)
                 object.__setattr__(result_var, 'source_var', source_vars)
+                record_operation(result_var, operation_name, [self])
                 
                 # Return the result directly (don't auto-wrap)
                 return result_var
@@ -1183,6 +1314,7 @@ class plot_manager(np.ndarray):
         source_vars = []
         scalar_value = None
         dt_array = None
+        fusable = False  # True once the operation ran on real data (recorded for fused custom variables)
         
         # Initial source tracking for 'self'
         if hasattr(self, 'source_var') and self.source_var is not None:
@@ -1224,6 +1356,7 @@ class plot_manager(np.ndarray):
                             result = operation_func(other_aligned, self_aligned)
                         else:
                             result = operation_func(self_aligned, other_aligned)
+                        fusable = not reverse_op
 
                     # STATUS PRINT (Optional - Add back if needed)
                     # print_manager.variable_basic(f"📊 Operation complete: {self.class_name}.{self.subclass_name} {op_symbol} {other.class_name}.{other.subclass_name}")
@@ -1246,7 +1379,8 @@ class plot_manager(np.ndarray):
                     source_vars.append(self)
 
             try:
-                self_data = self.view(np.ndarray)
+                # Time-clipped view, consistent with self.datetime_array used for the result
+                self_data = self.data
                 # Perform the actual operation
                 if reverse_op: # Handle things like scalar / variable
                     # Special handling for division by zero if needed
@@ -1261,6 +1395,7 @@ class plot_manager(np.ndarray):
                         result = np.full_like(self_data, np.nan)
                     else:
                         result = operation_func(self_data, scalar_value)
+                fusable = True
 
                 # STATUS PRINT (Optional - Add back if needed)
                 # print_manager.variable_basic(f"📊 Operation complete: {self.class_name}.{self.subclass_name} {op_symbol} {scalar_value}")
@@ -1277,19 +1412,20 @@ class plot_manager(np.ndarray):
 
         # --- Create result plot_manager ---
         # Use placeholder options initially, custom_variable will refine
-        # 🐛 BUG FIX: COPY datetime_array AND time instead of sharing reference!
+        # Time base is shared as a read-only view: the result can't write through
+        # to the source, and nothing is copied.
         result_datetime_array = None
         if dt_array is not None:
-            result_datetime_array = dt_array.copy()
+            result_datetime_array = _shared_time_base(dt_array)
         elif hasattr(self, 'datetime_array') and self.datetime_array is not None:
-            result_datetime_array = self.datetime_array.copy()
+            result_datetime_array = _shared_time_base(self.datetime_array)
         
-        # 🐛 BUG FIX: Also copy .time property (TT2000 epoch times)
+        # 🐛 BUG FIX: Also carry the .time property (TT2000 epoch times)
         result_time = None
         if hasattr(self, 'plot_config') and hasattr(self.plot_config, 'time') and self.plot_config.time is not None:
-            result_time = self.plot_config.time.copy() if hasattr(self.plot_config.time, 'copy') else self.plot_config.time
+            result_time = _shared_time_base(self.plot_config.time)
         elif isinstance(other, plot_manager) and hasattr(other, 'plot_config') and hasattr(other.plot_config, 'time') and other.plot_config.time is not None:
-            result_time = other.plot_config.time.copy() if hasattr(other.plot_config.time, 'copy') else other.plot_config.time
+            result_time = _shared_time_base(other.plot_config.time)
         
         result_plot_config = plot_config(
             data_type="custom_data_type", # Let custom_variable set to custom_data_type
@@ -1316,6 +1452,11 @@ class plot_manager(np.ndarray):
         object.__setattr__(result_var, 'source_var', source_vars) # Set the tracked sources
         if scalar_value is not None:
             object.__setattr__(result_var, 'scalar_value', scalar_value)
+        if fusable:
+            # Scalar division maps zero denominators to NaN (see above)
+            fused_name = f"{operation_name}_nonzero" if scalar_value is not None and operation_name in ('div', 'floordiv') else operation_name
+            operands = [other, self] if reverse_op else [self, other]
+            record_operation(result_var, fused_name, operands)
         
         # 🐛 CRITICAL FIX: Copy requested_trange from source to result
         # This ensures .data property returns correctly clipped view!
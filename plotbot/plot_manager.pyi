@@ -39,6 +39,8 @@ class plot_manager(np.ndarray):
     def __array__(self, dtype: Optional[DTypeLike] = ...) -> 'plot_manager': ... # Returns plot_manager, not ndarray
     def __array_wrap__(self, out_arr: np.ndarray, context: Optional[Tuple[Any, ...]] = ...) -> Union[np.ndarray, 'plot_manager']: ...
     def __array_finalize__(self, obj: Optional[Any]) -> None: ...
+    def __getitem__(self, key: Any) -> Any: ... # Slices carry a view of the shared time base
+    def rebind(self, values: ArrayLike) -> 'plot_manager': ... # Shares plot_config and _plot_state
     def __setattr__(self, name: str, value: Any) -> None: ...
     def __getattr__(self, name: str) -> Any: ... # Returns plot_options attr or raises AttributeError
 
@@ -136,6 +138,10 @@ class plot_manager(np.ndarray):
     @additional_data.setter
     def additional_data(self, value: Optional[np.ndarray]) -> None: ...
     @property
+    def spectral_pyramid(self) -> Optional[str]: ...
+    @spectral_pyramid.setter
+    def spectral_pyramid(self, value: Optional[str]) -> None: ...
+    @property
     def colorbar_label(self) -> Optional[str]: ...
     @colorbar_label.setter
     def colorbar_label(self, value: Optional[str]) -> None: ...
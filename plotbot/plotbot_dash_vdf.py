@@ -13,6 +13,7 @@ import webbrowser
 import time
 from scipy.spatial import Delaunay
 from .print_manager import print_manager
+from .vdf_tile_cache import VDFTileCache, TilePrecomputer, VIZ_MODES, build_tiles, tile_planes, grid_triangles, clean_vdf
 
 # Numba optimization for C++ speed
 try:
@@ -62,15 +63,22 @@ except ImportError:
     print_manager.warning("Could not import VDF processing functions from tests")
     VDF_FUNCTIONS_AVAILABLE = False
 
-def create_vdf_dash_app(dat, available_times, available_indices, trange):
+def create_vdf_dash_app(dat, available_times, available_indices, trange, source_path=None, cache_dir=None):
     """
     Create a Dash app for interactive VDF plotting with time slider.
     
+    Slices are rendered into a persistent tile cache (vdf_tile_cache.py) by a
+    background thread that works outward from the slider position, so moving
+    the slider is mostly a cache read.
+    
     Args:
         dat: CDF data object (from cdflib.CDF)
         available_times: List of datetime objects for available times
         available_indices: List of indices corresponding to available times  
         trange: Original time range requested
+        source_path: Path of the CDF behind dat (keys the on-disk tile cache;
+                     defaults to dat.file). Without it tiles are cached in memory only.
+        cache_dir: Root of the tile cache (default plotbot/cache/vdf_tiles)
     
     Returns:
         dash.Dash: Configured Dash application for VDF plotting
@@ -108,29 +116,30 @@ def create_vdf_dash_app(dat, available_times, available_indices, trange):
         jaye_exact_theta_plane_processing_jit = jaye_exact_theta_plane_processing
         jaye_exact_phi_plane_processing_jit = jaye_exact_phi_plane_processing
     
-    # SMART CACHING: Only compute first slice + cache on-demand
-    vdf_data_cache = {}
-    print_manager.status("⚡ Pre-computing ONLY first time slice for instant startup...")
+    # TILE CACHE: slices are rendered once into float32 tiles on disk (persist across sessions)
+    if source_path is None:
+        source_path = getattr(dat, 'file', None)
+    tile_cache = VDFTileCache(source_path=None if source_path is None else str(source_path), cache_dir=cache_dir)
     
-    # Pre-compute just the first time slice for immediate display using fast processing
-    start_time = time.time()
-    print("🔍 DEBUG: About to call fast_vdf_processing...")
-    vdf_data, theta_data, phi_data = fast_vdf_processing(dat, available_indices[0])
-    print(f"🔍 DEBUG: VDF processing complete. Theta shape: {theta_data[2].shape}, Phi shape: {phi_data[2].shape}")  # type: ignore
-    
-    vdf_data_cache[0] = {
-        'vdf_data': vdf_data,
-        'theta': theta_data,
-        'phi': phi_data,
-        'time': available_times[0]
-    }
+    def compute_tiles(time_index):
+        vdf_data, theta_data, phi_data = fast_vdf_processing(dat, available_indices[time_index])
+        return build_tiles(vdf_data, theta_data, phi_data, VIZ_MODES)
     
+    precomputer = TilePrecomputer(tile_cache, n_times, compute_tiles, VIZ_MODES)
+    
+    # First slice (from the cache if an earlier session rendered it) for immediate display
+    start_time = time.time()
+    initial_tile = precomputer.get_or_compute(0, 'mesh3d')
     elapsed = time.time() - start_time
-    print_manager.status(f"✅ First VDF slice computed in {elapsed:.2f}s - ready for instant startup!")
-    print_manager.status("💡 Additional slices will be computed on-demand when you move the slider")
+    print_manager.status(f"✅ First VDF slice ready in {elapsed:.2f}s")
+    
+    # Render the remaining slices in the background, outward from the slider position
+    precomputer.start(focus=0)
+    app.vdf_tile_precomputer = precomputer
+    print_manager.status("💡 Remaining slices are being precomputed in the background")
     
     # Create initial VDF plot using first cached slice with new Mesh3d approach
-    initial_fig = create_vdf_plotly_figure_mesh3d(vdf_data_cache[0], 'mesh3d')
+    initial_fig = create_vdf_plotly_figure_mesh3d(tile_to_cached_data(initial_tile, available_times[0]), 'mesh3d')
     
     # Define app layout
     app.layout = html.Div([
@@ -347,35 +356,24 @@ def create_vdf_dash_app(dat, available_times, available_indices, trange):
             if time_index < 0 or time_index >= len(available_times):
                 time_index = 0
             
-            # Smart caching: compute on-demand if not cached
-            if time_index not in vdf_data_cache:
-                print_manager.status(f"⚡ Computing VDF for time slice {time_index}...")
-                start_time = time.time()
-                
-                try:
-                    vdf_data, theta_data, phi_data = fast_vdf_processing(dat, available_indices[time_index])
-                    
-                    vdf_data_cache[time_index] = {
-                        'vdf_data': vdf_data,
-                        'theta': theta_data,
-                        'phi': phi_data,
-                        'time': available_times[time_index]
-                    }
-                    
-                    elapsed = time.time() - start_time
-                    print_manager.status(f"✅ VDF slice {time_index} computed in {elapsed:.3f}s")
-                    
-                except Exception as e:
-                    error_msg = f"❌ Failed to compute VDF slice {time_index}: {e}"
-                    print_manager.error(error_msg)
-                    print(f"ERROR in VDF processing: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Use first cached slice as fallback
-                    time_index = 0
+            # Precompute outward from here next; read (or compute) this slice's tile
+            precomputer.focus(time_index)
+            start_time = time.time()
+            try:
+                tile = precomputer.get_or_compute(time_index, viz_mode)
+                print_manager.status(f"✅ VDF slice {time_index} ready in {time.time() - start_time:.3f}s")
+            except Exception as e:
+                error_msg = f"❌ Failed to compute VDF slice {time_index}: {e}"
+                print_manager.error(error_msg)
+                print(f"ERROR in VDF processing: {e}")
+                import traceback
+                traceback.print_exc()
+                # Use first slice as fallback
+                time_index = 0
+                tile = precomputer.get_or_compute(0, viz_mode)
             
             # Create updated figure using new Mesh3d approach
-            fig = create_vdf_plotly_figure_mesh3d(vdf_data_cache[time_index], viz_mode)
+            fig = create_vdf_plotly_figure_mesh3d(tile_to_cached_data(tile, available_times[time_index]), viz_mode)
             
             # Update time display
             current_time = available_times[time_index].strftime("%Y-%m-%d %H:%M:%S")
@@ -565,6 +563,25 @@ def fast_vdf_processing(dat, time_idx):
         print(f"VDF processing failed: {e}")
         raise
 
+def tile_to_cached_data(tile, selected_time):
+    """Figure input (the dict the create_vdf_plotly_figure_* functions take) from a cached tile."""
+    theta, phi = tile_planes(tile)
+    return {
+        'vdf_1d': (tile['vel_1d'], tile['vdf_1d']),
+        'theta': theta,
+        'phi': phi,
+        'theta_triangles': tile.get('theta_triangles'),
+        'phi_triangles': tile.get('phi_triangles'),
+        'time': selected_time
+    }
+
+def _collapsed_1d(cached_data):
+    """(velocity, VDF summed over both angles): precomputed in tiles, else from the raw VDF."""
+    if 'vdf_1d' in cached_data:
+        return cached_data['vdf_1d']
+    vdf_data = cached_data['vdf_data']
+    return vdf_data['vel'][0, :, 0], np.sum(vdf_data['vdf'], axis=(0, 2))
+
 def create_vdf_plotly_figure_cached(cached_data, viz_mode='interpolate'):
     """
     Create 3-panel Plotly VDF figure using pre-computed cached data.
@@ -581,7 +598,6 @@ def create_vdf_plotly_figure_cached(cached_data, viz_mode='interpolate'):
     from plotbot.data_classes.psp_span_vdf import psp_span_vdf
     
     # Extract cached data
-    vdf_data = cached_data['vdf_data']
     vx_theta, vz_theta, df_theta = cached_data['theta']
     vx_phi, vy_phi, df_phi = cached_data['phi']
     selected_time = cached_data['time']
@@ -597,8 +613,7 @@ def create_vdf_plotly_figure_cached(cached_data, viz_mode='interpolate'):
     )
     
     # 1. 1D Collapsed VDF (Left Panel) - EXACT same calculation as vdyes()
-    vdf_allAngles = np.sum(vdf_data['vdf'], axis=(0, 2))  # Sum over both phi and theta
-    vel_1d = vdf_data['vel'][0, :, 0]  # Velocity array
+    vel_1d, vdf_allAngles = _collapsed_1d(cached_data)  # Sum over both phi and theta
     
     fig.add_trace(
         go.Scatter(
@@ -819,7 +834,7 @@ def get_plotly_colormap(matplotlib_name):
     }
     return mapping.get(matplotlib_name, 'blues')
 
-def create_plotly_vdf_plot_mesh3d(vx, vy, vdf_data, colormap='cool', title_suffix=""):
+def create_plotly_vdf_plot_mesh3d(vx, vy, vdf_data, colormap='cool', title_suffix="", triangles=None):
     """
     Create VDF plot using Mesh3d - preserves ALL original data points with PROPER grid structure.
     Uses structured grid triangulation instead of destroying the natural VDF grid.
@@ -829,6 +844,7 @@ def create_plotly_vdf_plot_mesh3d(vx, vy, vdf_data, colormap='cool', title_suffi
         vdf_data: VDF values at each coordinate
         colormap: Colormap name
         title_suffix: Plot title suffix
+        triangles: Precomputed (n, 3) grid triangle indices (from a VDF tile); computed if None
     
     Returns:
         plotly trace for use in subplots
@@ -838,44 +854,21 @@ def create_plotly_vdf_plot_mesh3d(vx, vy, vdf_data, colormap='cool', title_suffi
     print(f"  Input shapes: vx={vx.shape}, vy={vy.shape}, vdf={vdf_data.shape}")
     
     # Clean data - remove invalid points
-    vdf_clean = vdf_data.copy()
-    vdf_clean[vdf_clean <= 0] = np.nan
-    vdf_clean[~np.isfinite(vdf_clean)] = np.nan
+    vdf_clean = clean_vdf(vdf_data)
     
     # Check if we have a regular grid structure
     if vx.ndim == 2 and vy.ndim == 2:
         print(f"  ✅ Regular grid detected: {vx.shape[0]}×{vx.shape[1]} points")
         
         # Use the NATURAL GRID STRUCTURE instead of destroying it with Delaunay
-        ny, nx = vx.shape
-        
-        # Create triangle indices for the regular grid (like matplotlib contourf does internally)
-        triangles = []
         x_flat = vx.ravel()
         y_flat = vy.ravel()
         vdf_flat = vdf_clean.ravel()
         
-        # Create triangulation based on grid structure (preserves smoothness)
-        for i in range(ny - 1):
-            for j in range(nx - 1):
-                # Each grid cell becomes 2 triangles
-                # Lower triangle
-                p1 = i * nx + j
-                p2 = i * nx + (j + 1)
-                p3 = (i + 1) * nx + j
-                
-                # Upper triangle  
-                p4 = i * nx + (j + 1)
-                p5 = (i + 1) * nx + (j + 1)
-                p6 = (i + 1) * nx + j
-                
-                # Only add triangles where all points have valid data
-                if (np.isfinite(vdf_flat[p1]) and np.isfinite(vdf_flat[p2]) and np.isfinite(vdf_flat[p3])):
-                    triangles.append([p1, p2, p3])
-                if (np.isfinite(vdf_flat[p4]) and np.isfinite(vdf_flat[p5]) and np.isfinite(vdf_flat[p6])):
-                    triangles.append([p4, p5, p6])
-        
-        triangles = np.array(triangles)
+        # Each grid cell becomes 2 triangles, kept where all corners have valid data
+        # (like matplotlib contourf does internally; preserves smoothness)
+        if triangles is None:
+            triangles = grid_triangles(np.isfinite(vdf_clean))
         print(f"  ✅ Created {len(triangles)} grid-structured triangles (preserves smoothness)")
         
         # Keep only valid points
@@ -952,7 +945,6 @@ def create_vdf_plotly_figure_mesh3d(cached_data, viz_mode='mesh3d'):
     from plotbot.data_classes.psp_span_vdf import psp_span_vdf
     
     # Extract cached data
-    vdf_data = cached_data['vdf_data']
     vx_theta, vz_theta, df_theta = cached_data['theta']
     vx_phi, vy_phi, df_phi = cached_data['phi']
     selected_time = cached_data['time']
@@ -976,8 +968,7 @@ def create_vdf_plotly_figure_mesh3d(cached_data, viz_mode='mesh3d'):
     )
     
     # 1. 1D Collapsed VDF (Left Panel) - Same as before
-    vdf_allAngles = np.sum(vdf_data['vdf'], axis=(0, 2))
-    vel_1d = vdf_data['vel'][0, :, 0]
+    vel_1d, vdf_allAngles = _collapsed_1d(cached_data)
     
     fig.add_trace(
         go.Scatter(
@@ -1002,7 +993,8 @@ def create_vdf_plotly_figure_mesh3d(cached_data, viz_mode='mesh3d'):
         theta_plot = create_plotly_vdf_plot_mesh3d(
             vx_theta, vz_theta, df_theta,
             colormap=psp_span_vdf.vdf_colormap,
-            title_suffix="θ-plane"
+            title_suffix="θ-plane",
+            triangles=cached_data.get('theta_triangles')
         )
         fig.add_trace(theta_plot, row=1, col=2)
         
@@ -1035,7 +1027,8 @@ def create_vdf_plotly_figure_mesh3d(cached_data, viz_mode='mesh3d'):
         phi_plot = create_plotly_vdf_plot_mesh3d(
             vx_phi, vy_phi, df_phi,
             colormap=psp_span_vdf.vdf_colormap,
-            title_suffix="φ-plane"
+            title_suffix="φ-plane",
+            triangles=cached_data.get('phi_triangles')
         )
         fig.add_trace(phi_plot, row=1, col=3)
         
@@ -145,7 +145,7 @@ def plotbot_interactive_vdf(trange, backend='auto', port=None, debug=None):
         print("🔍 DEBUG: About to create VDF Dash app...")
         print_manager.status("🎛️ Creating interactive VDF Dash application...")
         from .plotbot_dash_vdf import create_vdf_dash_app, run_vdf_dash_app
-        app = create_vdf_dash_app(dat, available_times, available_indices, trange)
+        app = create_vdf_dash_app(dat, available_times, available_indices, trange, source_path=VDfile[0])
         
         print("🔍 DEBUG: Dash app created, about to launch...")
         print_manager.status("🌐 Launching interactive VDF plot...")
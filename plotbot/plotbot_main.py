@@ -69,7 +69,10 @@ from .multiplot_options import plt, MultiplotOptions
 from .get_data import get_data  # Add get_data import
 
 from .data_classes.data_types import data_types
-from . import mag_rtn_4sa, mag_rtn, mag_sc_4sa, mag_sc
+from .data_classes.psp_mag_rtn_4sa import mag_rtn_4sa
+from .data_classes.psp_mag_rtn import mag_rtn
+from .data_classes.psp_mag_sc_4sa import mag_sc_4sa
+from .data_classes.psp_mag_sc import mag_sc
 from .data_classes.psp_electron_classes import epad, epad_hr
 from .data_classes.psp_proton import proton
 from .data_classes.psp_proton_hr import proton_hr
@@ -110,6 +113,8 @@ def plotbot(trange, *args):
     
     from collections import defaultdict
     import matplotlib.pyplot as mpl_plt
+    from .spectrogram_render import draw_spectrogram, axes_pixel_width
+    from .spectral_pyramid import pyramid_window
     # mpl_plt.rcParams['font.size'] = 8
     
     print_manager.status("🤖 Plotbot libraries loaded, proceeding...")
@@ -643,37 +648,38 @@ def plotbot(trange, *args):
                         print_manager.debug("empty_plot = True - No datetime array available (spectral)")
                         continue
 
-                    # Use raw datetime array for time clipping, not the property (which is now clipped)
-                    raw_datetime_array = var.plot_config.datetime_array if hasattr(var, 'plot_config') else var.datetime_array
-                    time_indices = time_clip(raw_datetime_array, trange[0], trange[1])  # Get time range indices
-                    if len(time_indices) == 0:
-                        empty_plot = True
-                        print_manager.debug("empty_plot = True - No valid time indices found (spectral)")
-                        continue
-                    
-                    # Use all_data property for internal plotting (performance optimization)
-                    data = var.all_data  # Get full unclipped data for internal processing
-                    
-                    # For spectral data, ensure indices are valid for the data array
-                    max_valid_index = data.shape[0] - 1
-                    if len(time_indices) > 0 and time_indices[-1] > max_valid_index:
-                        print_manager.debug(f"Adjusting time indices for spectral data: max index {time_indices[-1]} > data length {data.shape[0]}")
-                        time_indices = time_indices[time_indices <= max_valid_index]
+                    # Zoomed-out panels draw from a time-decimated level if the variable keeps a pyramid
+                    decimated = pyramid_window(var, trange[0], trange[1], axes_pixel_width(ax))
+                    if decimated is not None:
+                        datetime_clipped, data_clipped, additional_data_clipped = decimated
+                    else:
+                        # Use raw datetime array for time clipping, not the property (which is now clipped)
+                        raw_datetime_array = var.plot_config.datetime_array if hasattr(var, 'plot_config') else var.datetime_array
+                        time_indices = time_clip(raw_datetime_array, trange[0], trange[1])  # Get time range indices
                         if len(time_indices) == 0:
                             empty_plot = True
-                            print_manager.debug("empty_plot = True - No valid time indices after adjustment (spectral)")
+                            print_manager.debug("empty_plot = True - No valid time indices found (spectral)")
                             continue
                     
-                    data_clipped = data[time_indices]  # Slice data for time range
-                    if np.all(np.isnan(data_clipped)):  # Check for all NaN values
-                        empty_plot = True
-                        print_manager.debug("empty_plot = True - All data points in time window are NaN (spectral)")
-                        continue
-                        
-                    #====================================================================
-                    # Proceed with spectral plotting
-                    #====================================================================
-                    if not empty_plot:  # Create spectral plot only if we have valid data
+                        # Use all_data property for internal plotting (performance optimization)
+                        data = var.all_data  # Get full unclipped data for internal processing
+                    
+                        # For spectral data, ensure indices are valid for the data array
+                        max_valid_index = data.shape[0] - 1
+                        if len(time_indices) > 0 and time_indices[-1] > max_valid_index:
+                            print_manager.debug(f"Adjusting time indices for spectral data: max index {time_indices[-1]} > data length {data.shape[0]}")
+                            time_indices = time_indices[time_indices <= max_valid_index]
+                            if len(time_indices) == 0:
+                                empty_plot = True
+                                print_manager.debug("empty_plot = True - No valid time indices after adjustment (spectral)")
+                                continue
+                    
+                        data_clipped = data[time_indices]  # Slice data for time range
+                        if np.all(np.isnan(data_clipped)):  # Check for all NaN values
+                            empty_plot = True
+                            print_manager.debug("empty_plot = True - All data points in time window are NaN (spectral)")
+                            continue
+
                         # For datetime_clipped, also handle potential mismatched dimensions
                         # Use raw datetime array for clipping to match time_indices calculation
                         if raw_datetime_array.ndim == 2:
@@ -681,13 +687,17 @@ def plotbot(trange, *args):
                             datetime_clipped = raw_datetime_array[time_indices, :]
                         else:
                             datetime_clipped = raw_datetime_array[time_indices]
-                        
+                    
                         # Handle additional_data similarly
                         if hasattr(var, 'additional_data') and var.additional_data is not None:
                             additional_data_clipped = var.additional_data[time_indices] if len(var.additional_data) > max(time_indices) else var.additional_data
                         else:
                             additional_data_clipped = None
 
+                    #====================================================================
+                    # Proceed with spectral plotting
+                    #====================================================================
+                    if not empty_plot:  # Create spectral plot only if we have valid data
                         ax.set_ylabel(var.y_label)  # Set y-axis properties
                         ax.set_yscale(var.y_scale)
                         if var.y_limit:
@@ -701,27 +711,21 @@ def plotbot(trange, *args):
                         else:
                             norm = None
 
-                        # Create spectral plot
+                        # Create spectral plot (raster fast path, pcolormesh for irregular grids)
                         if additional_data_clipped is not None:
-                            im = ax.pcolormesh(  # Create 2D color plot
-                                datetime_clipped,
-                                additional_data_clipped,
-                                data_clipped,
-                                norm=norm,
-                                cmap=var.colormap if hasattr(var, 'colormap') else None,
-                                shading='auto'
-                            )
+                            y_values = additional_data_clipped
                         else:
                             # If no additional_data, create a simple y-axis based on data shape
                             y_values = np.arange(data_clipped.shape[1]) if data_clipped.ndim > 1 else np.arange(len(data_clipped))
-                            im = ax.pcolormesh(  # Create 2D color plot
-                                datetime_clipped,
-                                y_values,
-                                data_clipped,
-                                norm=norm,
-                                cmap=var.colormap if hasattr(var, 'colormap') else None,
-                                shading='auto'
-                            )
+                        im = draw_spectrogram(  # Create 2D color plot
+                            ax,
+                            datetime_clipped,
+                            y_values,
+                            data_clipped,
+                            norm=norm,
+                            cmap=var.colormap if hasattr(var, 'colormap') else None,
+                            y_scale=var.y_scale
+                        )
                         
                         # Add and configure colorbar
                         pos = ax.get_position()  # Get plot position
@@ -0,0 +1,351 @@
+# plotbot/positional_binning.py
+"""
+Binned statistics of a variable against PSP position.
+
+Samples are binned by Carrington longitude, Carrington latitude, radial
+distance or degrees from perihelion, and reduced per bin to a mean, median,
+fraction above a threshold, or count. Everything is vectorized: bin indices
+come from one division, sums and counts from ``np.bincount`` and medians
+from a stable sort by bin, so binning a million samples takes tens of
+milliseconds.
+
+Angular coordinates are periodic. Samples are wrapped into the spec's
+``[start, start + 360)`` before binning, so a bin range such as 350°-370°
+collects the samples on both sides of 0°; reported bin centers are wrapped
+back into the coordinate's usual range ([0, 360) for longitude, [-180, 180)
+for degrees from perihelion).
+
+``binned_statistic`` caches results per (variable, encounter, bin spec), so
+multiplot overlays are computed once per panel set instead of being read from
+an offline preprocessing step. A variable is identified by the arrays behind
+its data, which a re-import or merge replaces; data_cubby also drops a
+class's entries when it merges new data into it.
+"""
+
+import weakref
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+import numpy as np
+
+from .print_manager import print_manager
+
+# Lower bound and period of each periodic coordinate (None: not periodic)
+COORDINATES = {
+    'carrington_lon': (0.0, 360.0),
+    'carrington_lat': None,
+    'r_sun': None,
+    'degrees_from_perihelion': (-180.0, 360.0),
+}
+STATISTICS = ('mean', 'median', 'fraction_above', 'count')
+CACHE_SIZE = 64
+MEDIAN_SAMPLES_PER_LOOP_BIN = 256   # bins at least this full on average take the per-bin median path
+
+BinSpec = namedtuple('BinSpec', ['coordinate', 'width', 'start', 'stop', 'statistic', 'threshold'],
+                     defaults=(None, None, 'mean', None))
+BinSpec.__doc__ = """How to bin: coordinate, bin width, optional [start, stop] range, statistic and threshold."""
+
+BinnedStatistic = namedtuple('BinnedStatistic', ['edges', 'centers', 'widths', 'values', 'counts'])
+
+_cache = OrderedDict()
+
+
+def wrap_angle(angles, lower=-180.0, period=360.0):
+    """Wrap angles (degrees) into ``[lower, lower + period)``."""
+    return lower + np.mod(np.asarray(angles, dtype=np.float64) - lower, period)
+
+
+def wrapped_bin_geometry(start, end, period=360.0):
+    """
+    Centers and widths of angular bins given as (start, end) pairs.
+
+    A bin may cross the wrap (e.g. start 359°, end 1°); it then spans the
+    short way round, so its width is 2° and its center 360°.
+
+    Parameters
+    ----------
+    start, end : array_like
+        Bin start and end angles in degrees.
+    period : float
+        Period of the angle.
+
+    Returns
+    -------
+    centers, widths : numpy.ndarray
+    """
+    start = np.asarray(start, dtype=np.float64)
+    span = wrap_angle(np.asarray(end, dtype=np.float64) - start, -period / 2, period)
+    return start + span / 2, np.abs(span)
+
+
+def bin_edges(spec, coordinate_values=None):
+    """
+    Bin edges for ``spec``.
+
+    Missing ``start``/``stop`` default to one full turn for periodic
+    coordinates and to the range of ``coordinate_values`` (rounded out to
+    whole bins) otherwise. The last bin is narrower when the range is not a
+    whole number of bins.
+    """
+    if spec.width is None or not spec.width > 0:
+        raise ValueError(f"Bin width must be positive, got {spec.width}")
+    periodic = COORDINATES[spec.coordinate]
+    start, stop = spec.start, spec.stop
+    if periodic is not None:
+        start = periodic[0] if start is None else float(start)
+        stop = start + periodic[1] if stop is None else float(stop)
+        if stop - start > periodic[1]:
+            raise ValueError(f"A {spec.coordinate} bin range can span at most {periodic[1]}°, got [{start}, {stop}]")
+    elif start is None or stop is None:
+        finite = np.asarray(coordinate_values, dtype=np.float64) if coordinate_values is not None else np.empty(0)
+        finite = finite[np.isfinite(finite)]
+        if finite.size == 0:
+            raise ValueError(f"No finite {spec.coordinate} values to derive a bin range from")
+        if start is None:
+            start = np.floor(finite.min() / spec.width) * spec.width
+        if stop is None:
+            stop = max(np.ceil(finite.max() / spec.width) * spec.width, start + spec.width)
+    if not stop > start:
+        raise ValueError(f"Bin range must be increasing, got [{start}, {stop}]")
+    n_bins = int(np.ceil((stop - start) / spec.width - 1e-9))
+    edges = start + spec.width * np.arange(n_bins + 1, dtype=np.float64)
+    edges[-1] = stop
+    return edges
+
+
+def bin_statistic(values, coordinate_values, spec):
+    """
+    Reduce ``values`` per bin of ``coordinate_values``.
+
+    Parameters
+    ----------
+    values : array_like
+        1-D samples of the variable.
+    coordinate_values : array_like
+        The positional coordinate of each sample (same length). Angular
+        coordinates may be wrapped or unwrapped.
+    spec : BinSpec
+        Coordinate, bin width and range, statistic ('mean', 'median',
+        'fraction_above' or 'count') and, for 'fraction_above', the threshold
+        (default 0).
+
+    Returns
+    -------
+    BinnedStatistic
+        Edges, centers, widths, the statistic per bin (NaN for empty bins,
+        except counts) and the number of samples per bin.
+    """
+    if spec.coordinate not in COORDINATES:
+        raise ValueError(f"Unknown coordinate '{spec.coordinate}'. Choose from {list(COORDINATES)}")
+    if spec.statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{spec.statistic}'. Choose from {list(STATISTICS)}")
+    values = np.asarray(values, dtype=np.float64)
+    coords = np.asarray(coordinate_values, dtype=np.float64)
+    if values.ndim != 1 or values.shape != coords.shape:
+        raise ValueError(f"values and coordinate_values must be 1-D and the same length, "
+                         f"got {values.shape} and {coords.shape}")
+
+    edges = bin_edges(spec, coords)
+    start, n_bins = edges[0], len(edges) - 1
+    periodic = COORDINATES[spec.coordinate]
+    offsets = coords - start
+    if periodic is not None:
+        np.mod(offsets, periodic[1], out=offsets)
+
+    keep = (offsets >= 0) & (offsets <= edges[-1] - start)      # NaN coordinates compare False
+    if spec.statistic != 'count':
+        keep &= np.isfinite(values)
+    # Offsets are non-negative, so truncation is the floor
+    index = np.minimum((offsets[keep] / spec.width).astype(np.intp), n_bins - 1)
+    counts = np.bincount(index, minlength=n_bins)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if spec.statistic == 'count':
+            result = counts.astype(np.float64)
+        elif spec.statistic == 'mean':
+            result = np.bincount(index, weights=values[keep], minlength=n_bins) / counts
+        elif spec.statistic == 'fraction_above':
+            threshold = 0.0 if spec.threshold is None else spec.threshold
+            result = np.bincount(index, weights=values[keep] > threshold, minlength=n_bins) / counts
+        else:
+            result = _binned_median(index, values[keep], counts)
+
+    centers = (edges[:-1] + edges[1:]) / 2
+    if periodic is not None:
+        centers = wrap_angle(centers, *periodic)
+    return BinnedStatistic(edges, centers, np.diff(edges), result, counts)
+
+
+def _binned_median(index, values, counts):
+    """
+    Median per bin.
+
+    Samples are grouped by bin with a stable integer sort. With few, well
+    filled bins each group is then reduced with ``np.median`` (a partition,
+    O(n) overall); with many sparse bins the per-bin calls would dominate, so
+    the values are argsorted once instead and the middle of each run picked.
+    """
+    result = np.full(len(counts), np.nan)
+    filled = np.flatnonzero(counts)
+    if filled.size == 0:
+        return result
+    ends = np.cumsum(counts)
+    firsts = ends - counts
+    if filled.size * MEDIAN_SAMPLES_PER_LOOP_BIN <= len(values):
+        grouped = values[np.argsort(index, kind='stable')]
+        for b in filled:
+            result[b] = np.median(grouped[firsts[b]:ends[b]])
+        return result
+    by_value = np.argsort(values)
+    ordered = values[by_value[np.argsort(index[by_value], kind='stable')]]
+    first, n = firsts[filled], counts[filled]
+    result[filled] = (ordered[first + (n - 1) // 2] + ordered[first + n // 2]) / 2
+    return result
+
+
+def positional_coordinate(mapper, times, coordinate, perihelion_time=None):
+    """
+    Map ``times`` to ``coordinate`` with an ``XAxisPositionalDataMapper``.
+
+    For 'degrees_from_perihelion' the Carrington longitude at
+    ``perihelion_time`` (a datetime or a '%Y/%m/%d %H:%M:%S.%f' string, as
+    returned by ``utils.get_perihelion_time``) is subtracted and the result
+    wrapped into [-180, 180).
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The coordinate of each time (NaN outside the positional data), or
+        None if the mapping failed.
+    """
+    if coordinate != 'degrees_from_perihelion':
+        return mapper.map_to_position(times, coordinate)
+    if perihelion_time is None:
+        raise ValueError("degrees_from_perihelion needs a perihelion_time")
+    if isinstance(perihelion_time, str):
+        perihelion_time = datetime.strptime(perihelion_time, '%Y/%m/%d %H:%M:%S.%f')
+    longitudes = mapper.map_to_position(times, 'carrington_lon', unwrap_angles=True)
+    perihelion_lon = mapper.map_to_position(np.array([np.datetime64(perihelion_time)]), 'carrington_lon',
+                                            unwrap_angles=True)
+    if longitudes is None or perihelion_lon is None or len(perihelion_lon) == 0 or np.isnan(perihelion_lon[0]):
+        return None
+    return wrap_angle(longitudes - perihelion_lon[0])
+
+
+def _source_arrays(var):
+    """The arrays holding a variable's loaded data: its full time base and the root of its data buffer."""
+    times = getattr(getattr(var, 'plot_config', None), 'datetime_array', None)
+    if times is None:
+        times = var.datetime_array
+    data = var.view(np.ndarray) if isinstance(var, np.ndarray) else np.asarray(var.all_data)
+    while isinstance(data.base, np.ndarray):
+        data = data.base
+    return times, data
+
+
+def _variable_key(var):
+    """
+    Identify a variable's loaded data: its name plus the identity of the
+    arrays behind it (a re-import or merge replaces them).
+
+    Returns
+    -------
+    key : tuple
+    refs : tuple of weakref.ref or None
+        References to those arrays, checked on a cache hit so a reused id
+        never matches; None if they can't be referenced weakly.
+    """
+    arrays = _source_arrays(var)
+    try:
+        refs = tuple(weakref.ref(array) for array in arrays)
+    except TypeError:
+        refs = None
+    return (getattr(var, 'class_name', None), getattr(var, 'subclass_name', None)) + tuple(map(id, arrays)), refs
+
+
+def _cached(key, refs):
+    """Cached result for ``key`` if the arrays it was computed from are still the ones referenced."""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    cached_refs, result = entry
+    if any(cached() is None or cached() is not current() for cached, current in zip(cached_refs, refs)):
+        del _cache[key]                       # an id reused by new arrays
+        return None
+    _cache.move_to_end(key)
+    return result
+
+
+def binned_statistic(var, mapper, spec, encounter=None, trange=None, perihelion_time=None, clip_tolerance=None):
+    """
+    Bin a plot_manager variable by position, caching the result.
+
+    Parameters
+    ----------
+    var : plot_manager
+        The variable; its ``datetime_array`` and data are used.
+    mapper : XAxisPositionalDataMapper
+        Loaded positional data.
+    spec : BinSpec
+        What to bin by and how to reduce.
+    encounter : str, optional
+        Encounter label (e.g. 'E10'); part of the cache key.
+    trange : list of str, optional
+        Only samples inside this time range are binned.
+    perihelion_time : datetime or str, optional
+        Needed for 'degrees_from_perihelion'.
+    clip_tolerance : float, optional
+        For 'degrees_from_perihelion': keep only the monotonic pass through
+        perihelion (multiplot's ``degrees_from_perihelion_clip_at_reversal``)
+        with this tolerance in degrees.
+
+    Returns
+    -------
+    BinnedStatistic or None
+        None when the variable has no data in ``trange`` or the positional
+        mapping failed.
+    """
+    times = getattr(var, 'datetime_array', None)
+    if times is None or len(times) == 0:
+        return None
+    variable_key, refs = _variable_key(var)
+    key = (variable_key, len(times), times[0], times[-1], encounter, spec, tuple(trange) if trange is not None else None,
+           str(perihelion_time), getattr(mapper, 'data_path', id(mapper)), clip_tolerance)
+    cached = _cached(key, refs) if refs is not None else None
+    if cached is not None:
+        print_manager.debug(f"Binned {spec.statistic} of {getattr(var, 'subclass_name', 'variable')} "
+                            f"by {spec.coordinate} for {encounter}: cache hit")
+        return cached
+
+    values = var.all_data if hasattr(var, 'all_data') else np.asarray(var)
+    if trange is not None:
+        from .plotbot_helpers import time_clip
+        indices = time_clip(times, trange[0], trange[1])
+        times, values = times[indices], values[indices]
+    if len(times) == 0:
+        return None
+    coords = positional_coordinate(mapper, times, spec.coordinate, perihelion_time)
+    if coords is None:
+        return None
+    if clip_tolerance is not None and spec.coordinate == 'degrees_from_perihelion':
+        from .multiplot import compute_monotonic_degrees_mask
+        valid = ~np.isnan(coords)
+        coords, values = coords[valid], values[valid]
+        keep = compute_monotonic_degrees_mask(coords, clip_tolerance, encounter=encounter)
+        coords, values = coords[keep], values[keep]
+
+    result = bin_statistic(values, coords, spec)
+    if refs is not None:
+        _cache[key] = (refs, result)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_binning_cache(class_name=None):
+    """Forget the cached binned statistics of one data class (all of them if None)."""
+    if class_name is None:
+        _cache.clear()
+        return
+    for key in [key for key in _cache if key[0][0] == class_name]:
+        del _cache[key]
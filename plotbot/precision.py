@@ -0,0 +1,73 @@
+# plotbot/precision.py
+"""
+Storage precision policy for imported and derived arrays.
+
+The policy comes from ``config.precision``, overridden per data type by a
+``'precision'`` key in its ``data_types`` entry:
+
+- ``'native'`` (default): keep each CDF variable's own dtype; integer variables
+  holding FILLVALs become float64 so fills can be NaN.
+- ``'float32'``: store floating point data as float32 (float64 CDF variables
+  are narrowed; CDF_EPOCH-like variables are left alone). Integers keep their
+  dtype unless they hold fills, which become float32 when that's exact.
+  Derived quantities then come out float32 too, since numpy keeps float32
+  through arithmetic with Python scalars. Numerically sensitive steps (the
+  temperature tensor projection) use ``promoted`` and cast back.
+- ``'float64'``: store all floating point data as float64.
+
+For mag and moments float32 is plenty for plotting and audification and halves
+memory and bandwidth.
+"""
+
+import numpy as np
+
+from .print_manager import print_manager
+
+POLICIES = ('native', 'float32', 'float64')
+
+_FLOAT_TYPES = {'float32': np.dtype(np.float32), 'float64': np.dtype(np.float64)}
+
+
+def policy_for(data_type=None):
+    """Precision policy for ``data_type``: its data_types override, else ``config.precision``."""
+    from .config import config
+    policy = getattr(config, 'precision', 'native')
+    if data_type is not None:
+        from .data_classes.data_types import data_types
+        policy = data_types.get(data_type, {}).get('precision', policy)
+    if policy not in POLICIES:
+        print_manager.warning(f"Unknown precision policy '{policy}' (choose from {POLICIES}) - using 'native'")
+        return 'native'
+    return policy
+
+
+def fill_dtype(dtype, policy):
+    """Float dtype for an integer variable whose FILLVALs are replaced by NaN."""
+    if policy == 'float32' and np.dtype(dtype).itemsize <= 2:
+        return np.dtype(np.float32)     # every int8/int16 value is exact in float32
+    return np.dtype(np.float64)
+
+
+def for_storage(values, policy, is_epoch=False):
+    """
+    Cast floating point ``values`` to the policy's storage dtype.
+
+    Arrays already in that dtype (and everything under 'native', integer and
+    non-array values, and epoch variables) are returned as they are, uncopied.
+    Works on numpy and dask arrays alike.
+    """
+    target = _FLOAT_TYPES.get(policy)
+    dtype = getattr(values, 'dtype', None)
+    if target is None or is_epoch or dtype is None or not np.issubdtype(dtype, np.floating) or dtype == target:
+        return values
+    return values.astype(target)
+
+
+def promoted(*arrays):
+    """float64 copies (or the arrays themselves, if already float64) for sensitive arithmetic."""
+    return tuple(np.asarray(array, dtype=np.float64) for array in arrays)
+
+
+def result_dtype(*arrays):
+    """The float dtype to store a result computed from ``arrays`` in (float32 stays float32)."""
+    return np.result_type(*(np.asarray(array).dtype for array in arrays), np.float32)
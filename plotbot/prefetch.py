@@ -0,0 +1,253 @@
+# plotbot/prefetch.py
+"""
+Read-ahead prefetching for sequential ``get_data`` workflows.
+
+Notebooks, ``vdyes``, ``showdahodo``, the audifier and multiplot panels often
+step through time: a day at a time, encounter after encounter. With
+``config.prefetch = True``, get_data reports every time range it served
+(``ReadAheadPrefetcher.observe``). When the last two requests for the same
+data types have the same duration, the next window is predicted by repeating
+their stride, forwards or backwards, and a background thread downloads and
+imports it. The next get_data call for that window picks the imported data
+up with ``take`` (waiting for it if it's still in flight) and merges it into
+the cubby on the calling thread as usual, so the global instances are never
+touched from the background.
+
+A new prediction cancels the sequence's previous one (a change of direction
+or stride), and prefetched data is dropped if keeping it would exceed the
+memory budget.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+from dateutil.parser import parse
+
+from .print_manager import print_manager
+
+DURATION_TOLERANCE = 0.01    # relative duration mismatch still treated as the same window size
+HISTORY_LENGTH = 3
+
+
+def trange_window(trange):
+    """(start, end) numpy datetime64 of a get_data time range, as get_data parses it."""
+    return tuple(np.datetime64(parse(t).replace(tzinfo=None), 'ns') for t in trange)
+
+
+def window_trange(window):
+    """get_data time range strings (ms precision) for a window."""
+    return [np.datetime_as_string(t, unit='ms').replace('T', '/') for t in window]
+
+
+def predict_next(history):
+    """
+    Window following the last two of ``history``, or None.
+
+    The stride between their starts is repeated (negative when stepping
+    backwards); windows of different durations make no prediction.
+    """
+    if len(history) < 2:
+        return None
+    (start0, end0), (start1, end1) = history[-2], history[-1]
+    duration = end1 - start1
+    stride = start1 - start0
+    if stride == np.timedelta64(0) or abs((end0 - start0) - duration) > duration * DURATION_TOLERANCE:
+        return None
+    return start1 + stride, end1 + stride
+
+
+def data_nbytes(data_obj):
+    """Approximate memory of an imported DataObject (times plus data arrays)."""
+    total = getattr(getattr(data_obj, 'times', None), 'nbytes', 0)
+    data = getattr(data_obj, 'data', None)
+    if isinstance(data, dict):
+        total += sum(getattr(value, 'nbytes', 0) for value in data.values())
+    return int(total)
+
+
+class _Job:
+    """A predicted window being fetched for one sequence (a set of data types)."""
+
+    def __init__(self, sequence, window, data_types, budget=None):
+        self.sequence = sequence
+        self.window = window
+        self.remaining = list(data_types)
+        self.budget = budget
+        self.cancelled = False
+
+    def covers(self, data_type, window):
+        return (not self.cancelled and data_type in self.remaining
+                and self.window[0] <= window[0] and window[1] <= self.window[1])
+
+
+class ReadAheadPrefetcher:
+    """
+    Predicts the next get_data window and fetches it in the background.
+
+    Parameters
+    ----------
+    fetch : callable
+        ``fetch(trange, data_type) -> DataObject or None``: download and
+        import, as get_data would. Calls are serialized with ``fetch_lock``,
+        which get_data also holds while it downloads and imports, so the
+        same file is never written by two threads.
+    is_needed : callable, optional
+        ``is_needed(trange, data_type) -> bool``: False skips data types that
+        are already loaded for the predicted window.
+    """
+
+    def __init__(self, fetch, is_needed=None):
+        self.fetch = fetch
+        self.is_needed = is_needed
+        self.fetch_lock = threading.RLock()
+        self._history = {}      # sequence -> recent windows
+        self._jobs = deque()    # queued and running _Jobs
+        self._staged = {}       # (data_type, window) -> (sequence, DataObject)
+        self._staged_bytes = 0
+        self._bytes_per_second = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    # --- Scheduling ---
+    def observe(self, trange, data_types, memory_budget_mb=None):
+        """
+        Record a served request and schedule the predicted next window.
+
+        Returns
+        -------
+        tuple or None
+            The predicted (start, end) window, or None.
+        """
+        window = trange_window(trange)
+        sequence = tuple(sorted(set(data_types)))
+        history = self._history.setdefault(sequence, deque(maxlen=HISTORY_LENGTH))
+        if history and history[-1] == window:
+            return None                          # same window again (e.g. one get_data per panel variable)
+        history.append(window)
+        target = predict_next(history)
+        budget = None if memory_budget_mb is None else memory_budget_mb * 1024 ** 2
+
+        with self._condition:
+            self._cancel(sequence, keep=target)
+            if target is None:
+                return None
+            wanted = []
+            for data_type in sequence:
+                if (data_type, target) in self._staged or any(job.covers(data_type, target) for job in self._jobs):
+                    continue
+                if budget is not None and self._estimate(data_type, target) + self._staged_bytes > budget:
+                    print_manager.debug(f"Prefetch of {data_type} skipped: over the {memory_budget_mb} MB budget")
+                    continue
+                wanted.append(data_type)
+        if self.is_needed is not None:
+            wanted = [data_type for data_type in wanted if self.is_needed(window_trange(target), data_type)]
+        if not wanted:
+            return target
+
+        with self._condition:
+            self._jobs.append(_Job(sequence, target, wanted, budget))
+            self._condition.notify_all()
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name='plotbot-prefetch', daemon=True)
+                self._thread.start()
+        print_manager.status(f"🔮 Prefetching {', '.join(wanted)} for {' to '.join(window_trange(target))}")
+        return target
+
+    def _cancel(self, sequence, keep=None):
+        """Cancel ``sequence``'s jobs and drop its staged data, except for window ``keep`` (condition held)."""
+        for job in self._jobs:
+            if job.sequence == sequence and job.window != keep:
+                job.cancelled = True
+        for key, (owner, data_obj) in list(self._staged.items()):
+            if owner == sequence and key[1] != keep:
+                del self._staged[key]
+                self._staged_bytes -= data_nbytes(data_obj)
+        self._condition.notify_all()
+
+    def _estimate(self, data_type, window):
+        """Expected size of ``data_type`` over ``window`` from earlier prefetches (0 if unknown)."""
+        rate = self._bytes_per_second.get(data_type)
+        if rate is None:
+            return 0
+        return rate * (window[1] - window[0]) / np.timedelta64(1, 's')
+
+    def clear(self):
+        """Cancel all jobs and drop everything prefetched and the request history."""
+        with self._condition:
+            for job in self._jobs:
+                job.cancelled = True
+            self._staged.clear()
+            self._staged_bytes = 0
+            self._history.clear()
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until no job is queued or running (True) or ``timeout`` s passed (False)."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._jobs, timeout)
+
+    # --- Background thread ---
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._jobs and (self._jobs[0].cancelled or not self._jobs[0].remaining):
+                    self._jobs.popleft()
+                    self._condition.notify_all()
+                if not self._jobs:
+                    self._running = False
+                    return
+                job = self._jobs[0]
+                data_type = job.remaining[0]
+            self._fetch_one(job, data_type)
+
+    def _fetch_one(self, job, data_type):
+        trange = window_trange(job.window)
+        data_obj = None
+        try:
+            with self.fetch_lock:
+                if not job.cancelled:
+                    data_obj = self.fetch(trange, data_type)
+        except Exception as e:
+            print_manager.warning(f"Prefetch of {data_type} for {trange[0]} to {trange[1]} failed: {e}")
+        with self._condition:
+            if data_type in job.remaining:
+                job.remaining.remove(data_type)
+            if data_obj is not None and not job.cancelled:
+                size = data_nbytes(data_obj)
+                seconds = (job.window[1] - job.window[0]) / np.timedelta64(1, 's')
+                if seconds > 0:
+                    self._bytes_per_second[data_type] = size / seconds
+                if job.budget is not None and self._staged_bytes + size > job.budget:
+                    print_manager.debug(f"Prefetched {data_type} dropped: {size / 1024 ** 2:.1f} MB is over the budget")
+                else:
+                    self._staged[(data_type, job.window)] = (job.sequence, data_obj)
+                    self._staged_bytes += size
+            self._condition.notify_all()
+
+    # --- Hand-off to get_data ---
+    def take(self, trange, data_type):
+        """
+        Prefetched data covering ``trange`` for ``data_type``, waiting for it
+        if it is being fetched; None if nothing was prefetched for it.
+        """
+        window = trange_window(trange)
+        with self._condition:
+            while True:
+                for key, (sequence, data_obj) in self._staged.items():
+                    staged_type, staged_window = key
+                    if staged_type == data_type and staged_window[0] <= window[0] and window[1] <= staged_window[1]:
+                        del self._staged[key]
+                        self._staged_bytes -= data_nbytes(data_obj)
+                        return data_obj
+                if not any(job.covers(data_type, window) for job in self._jobs):
+                    return None
+                self._condition.wait()
+
+    @property
+    def staged(self):
+        """(data_type, window) keys of the prefetched data waiting to be used."""
+        with self._condition:
+            return list(self._staged)
@@ -4,6 +4,8 @@ import pickle
 from datetime import datetime
 from .data_cubby import data_cubby
 from .data_tracker import global_tracker
+from .snapshot_container import (CONTAINER_EXTENSION, is_snapshot_container, load_snapshot_container,
+                                 write_snapshot_container)
 
 def save_simple_snapshot(filename):
     populated_data = {}
@@ -19,6 +21,13 @@ def save_simple_snapshot(filename):
             # print(f"[save_simple_snapshot] Skipping '{key}' as it appears to have no data or an empty datetime_array.")
             pass
 
+    if filename.endswith(CONTAINER_EXTENSION):
+        # Chunked container: compressed per-array chunks, selective/mmap loads
+        write_snapshot_container(filename, populated_data)
+        print(f"✅ Snapshot saved. Included {len(populated_data)} data items from data_cubby.")
+        print(f"   Saved keys: {list(populated_data.keys())}")
+        return
+
     snapshot = {
         'data': populated_data,  # Only save items deemed to have data
         'tracker': global_tracker.calculated_ranges,
@@ -30,7 +39,13 @@ def save_simple_snapshot(filename):
     print(f"✅ Snapshot saved. Included {len(populated_data)} data items from data_cubby.")
     print(f"   Saved keys: {list(populated_data.keys())}")
 
-def load_simple_snapshot(filename):
+def load_simple_snapshot(filename, classes=None, mmap=False):
+    if is_snapshot_container(filename):
+        restored = load_snapshot_container(filename, classes=classes, mmap=mmap)
+        print(f"ℹ️  Loaded snapshot container. Restored keys: {list(restored)}")
+        print("✅ Snapshot loaded! Your variables should work immediately.")
+        return
+
     with open(filename, 'rb') as f:
         snapshot = pickle.load(f)
     
@@ -0,0 +1,751 @@
+# plotbot/snapshot_container.py
+"""
+Chunked, compressed snapshot container for Plotbot data classes (.pbsnap).
+
+Unlike the pickle snapshots, every array in a class (datetime_array, time,
+each raw_data entry, field, meshes, ...) is stored as its own run of
+row-chunks, compressed independently with the fastest available codec.
+A small JSON manifest at the end of the file describes every chunk, the
+time span of each row-chunk and the tracker ranges for each class, so a
+loader can:
+
+    * restore only some classes without touching the others,
+    * decode only the row-chunks that overlap a requested time window,
+    * memory-map uncompressed arrays instead of reading them.
+
+Class state is rebuilt by filling a fresh ``Class(None)`` instance and
+handing it to the global instance's ``restore_from_snapshot``, followed by
+``set_plot_config`` (plot managers are never serialized).
+
+File layout::
+
+    b'PBSNAP01' | uint64 manifest_offset | uint64 manifest_nbytes | chunks ... | manifest (JSON)
+
+Codecs (chosen with ``codec='auto'`` in this order): zstandard, blosc2,
+blosc, zlib; ``'none'`` stores raw bytes and enables memory mapping.
+Compression and decompression run chunk-parallel in a thread pool (all
+codecs release the GIL).
+"""
+
+import importlib
+import json
+import os
+import pickle
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .print_manager import print_manager
+from .plot_manager import plot_manager
+
+CONTAINER_EXTENSION = '.pbsnap'
+MAGIC = b'PBSNAP01'
+_HEADER = struct.Struct('<8sQQ')
+_ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+DEFAULT_CHUNK_BYTES = 2 * 1024 * 1024   # target uncompressed size of one row-chunk
+MAX_GAP_SECONDS = 3600.0                 # same cap as data_snapshot._identify_data_segments
+
+# Compression presets shared with save_data_snapshot's compression argument
+COMPRESSION_PRESETS = {
+    'none': ('none', 0),
+    'low': ('auto', 1),
+    'medium': ('auto', 3),
+    'high': ('auto', 9),
+}
+
+
+# ============================================================================
+# Codecs
+# ============================================================================
+class _Codec:
+    """Thin wrapper giving every backend the same compress/decompress signature."""
+
+    def __init__(self, name, level, compress, decompress):
+        self.name = name
+        self.level = level
+        self._compress = compress
+        self._decompress = decompress
+
+    def compress(self, buffer, itemsize):
+        return self._compress(buffer, itemsize)
+
+    def decompress(self, payload, raw_nbytes):
+        return self._decompress(payload, raw_nbytes)
+
+
+def _zstd_codec(level):
+    import zstandard
+    level = min(max(level, 1), 19)
+    return _Codec('zstd', level,
+                  lambda buf, itemsize: zstandard.ZstdCompressor(level=level).compress(buf),
+                  lambda payload, n: zstandard.ZstdDecompressor().decompress(payload, max_output_size=n))
+
+
+def _blosc2_codec(level):
+    import blosc2
+    level = min(max(level, 1), 9)
+    return _Codec('blosc2', level,
+                  lambda buf, itemsize: blosc2.compress(buf, typesize=itemsize, clevel=level,
+                                                        codec=blosc2.Codec.ZSTD),
+                  lambda payload, n: blosc2.decompress(payload))
+
+
+def _blosc_codec(level):
+    import blosc
+    level = min(max(level, 1), 9)
+    return _Codec('blosc', level,
+                  lambda buf, itemsize: blosc.compress(buf, typesize=itemsize, clevel=level, cname='zstd'),
+                  lambda payload, n: blosc.decompress(payload))
+
+
+def _zlib_codec(level):
+    level = min(max(level, 1), 9)
+    return _Codec('zlib', level,
+                  lambda buf, itemsize: zlib.compress(buf, level),
+                  lambda payload, n: zlib.decompress(payload, bufsize=max(n, 1)))
+
+
+def _none_codec(level=0):
+    return _Codec('none', 0, lambda buf, itemsize: bytes(buf), lambda payload, n: payload)
+
+
+_CODEC_FACTORIES = {
+    'zstd': _zstd_codec,
+    'blosc2': _blosc2_codec,
+    'blosc': _blosc_codec,
+    'zlib': _zlib_codec,
+    'none': _none_codec,
+}
+
+
+def available_codecs():
+    """Return the codec names usable in this environment, fastest first."""
+    names = []
+    for name in ('zstd', 'blosc2', 'blosc', 'zlib', 'none'):
+        try:
+            _CODEC_FACTORIES[name](1)
+            names.append(name)
+        except ImportError:
+            continue
+    return names
+
+
+def get_codec(name='auto', level=3):
+    """
+    Resolve a codec by name.
+
+    ``'auto'`` picks the first installed of zstd, blosc2, blosc, then falls
+    back to zlib. Requesting an uninstalled codec explicitly also falls back
+    to zlib with a warning.
+    """
+    name = (name or 'auto').lower()
+    if name == 'auto':
+        for candidate in ('zstd', 'blosc2', 'blosc'):
+            try:
+                return _CODEC_FACTORIES[candidate](level)
+            except ImportError:
+                continue
+        return _zlib_codec(level)
+    if name not in _CODEC_FACTORIES:
+        raise ValueError(f"Unknown snapshot codec '{name}'. Choose from {sorted(_CODEC_FACTORIES)} or 'auto'.")
+    try:
+        return _CODEC_FACTORIES[name](level)
+    except ImportError:
+        print_manager.warning(f"[SNAPSHOT] Codec '{name}' is not installed; falling back to zlib.")
+        return _zlib_codec(level)
+
+
+def resolve_compression(compression):
+    """Map save_data_snapshot-style compression names onto (codec_name, level)."""
+    compression = (compression or 'none').lower()
+    if compression in COMPRESSION_PRESETS:
+        return COMPRESSION_PRESETS[compression]
+    if compression in ('gzip', 'bz2', 'lzma'):
+        # Pickle-era formats: keep the intent (compressed) with a fast chunked codec
+        return ('auto', 3)
+    return (compression, 3)
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+def is_snapshot_container(filepath):
+    """True if ``filepath`` starts with the container magic bytes."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _to_ns(value):
+    """Convert a datetime-like (str, datetime, datetime64, Timestamp) to int64 UTC nanoseconds."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value)
+
+
+def _ns_to_iso(ns):
+    return pd.Timestamp(int(ns)).isoformat()
+
+
+def _datetime_index_ns(datetime_array):
+    """int64 nanoseconds for a datetime64 or object datetime array (no copy for datetime64[ns])."""
+    arr = np.asarray(datetime_array)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype('datetime64[ns]', copy=False).view(np.int64)
+    return pd.to_datetime(arr, utc=True).tz_localize(None).values.view(np.int64)
+
+
+def _segment_starts(time_ns, max_gap_seconds=MAX_GAP_SECONDS):
+    """
+    Row indices where a new data segment starts (vectorized version of the gap
+    rule used by data_snapshot._identify_data_segments: gap > min(10 x median cadence, 1 h)).
+    """
+    if len(time_ns) < 2:
+        return np.array([0], dtype=np.int64)
+    diffs = np.diff(time_ns)
+    median = np.median(diffs)
+    threshold = min(median * 10, max_gap_seconds * 1e9) if median > 0 else max_gap_seconds * 1e9
+    return np.concatenate(([0], np.flatnonzero(diffs > threshold) + 1)).astype(np.int64)
+
+
+def _row_partition(n_rows, segment_starts, rows_per_chunk):
+    """Split [0, n_rows) into chunks that never straddle a segment boundary."""
+    bounds = []
+    seg_edges = list(segment_starts) + [n_rows]
+    for seg_start, seg_stop in zip(seg_edges[:-1], seg_edges[1:]):
+        for r0 in range(seg_start, seg_stop, rows_per_chunk):
+            bounds.append((int(r0), int(min(r0 + rows_per_chunk, seg_stop))))
+    return bounds
+
+
+def _as_bytes(arr):
+    """Zero-copy byte view of a C-contiguous array (works for datetime64 too)."""
+    if arr.size == 0:
+        return b''
+    return memoryview(arr.reshape(-1).view(np.uint8))
+
+
+def _json_safe(value):
+    """Return ``value`` if it survives a JSON round trip, otherwise raise TypeError."""
+    json.dumps(value)
+    return value
+
+
+def _plain_array(value):
+    """View plot_manager (or other ndarray subclasses) as a plain ndarray without copying."""
+    if isinstance(value, np.ndarray) and type(value) is not np.ndarray:
+        return value.view(np.ndarray)
+    return value
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+def _collect_instance_state(instance):
+    """
+    Split an instance's __dict__ into arrays, JSON scalars and pickled leftovers.
+
+    Returns
+    -------
+    arrays : dict  path -> ndarray   ('attr/<name>', 'raw_data/<key>', 'raw_data/<key>/<i>')
+    layout : dict  raw_data key -> 'array' | 'list:<n>' | 'none' | 'object'
+    scalars : dict attribute -> JSON value
+    objects : dict attribute or 'raw_data/<key>' -> picklable object
+    plot_states : dict variable -> JSON-able plot state
+    """
+    arrays, layout, scalars, objects, plot_states = {}, {}, {}, {}, {}
+
+    for name, value in instance.__dict__.items():
+        if isinstance(value, plot_manager):
+            state = getattr(value, '_plot_state', None) or {}
+            safe_state = {}
+            for key, item in state.items():
+                try:
+                    safe_state[key] = _json_safe(item)
+                except TypeError:
+                    continue
+            if safe_state:
+                plot_states[name] = safe_state
+            continue
+
+        if name == 'raw_data' and isinstance(value, dict):
+            for key, item in value.items():
+                if item is None:
+                    layout[key] = 'none'
+                elif isinstance(item, np.ndarray) and item.dtype != object:
+                    layout[key] = 'array'
+                    arrays[f'raw_data/{key}'] = _plain_array(item)
+                elif isinstance(item, (list, tuple)) and item and all(
+                        isinstance(x, np.ndarray) and x.dtype != object for x in item):
+                    layout[key] = f'list:{len(item)}'
+                    for i, x in enumerate(item):
+                        arrays[f'raw_data/{key}/{i}'] = _plain_array(x)
+                else:
+                    layout[key] = 'object'
+                    objects[f'raw_data/{key}'] = item
+            continue
+
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            arrays[f'attr/{name}'] = _plain_array(value)
+            continue
+
+        try:
+            scalars[name] = _json_safe(value)
+        except TypeError:
+            objects[name] = value
+
+    return arrays, layout, scalars, objects, plot_states
+
+
+class _ContainerWriter:
+    """Appends aligned, compressed chunks to an open file and records their locations."""
+
+    def __init__(self, f, codec, threads):
+        self.f = f
+        self.codec = codec
+        self.threads = threads
+
+    def _align(self):
+        pos = self.f.tell()
+        pad = (-pos) % _ALIGNMENT
+        if pad:
+            self.f.write(b'\0' * pad)
+        return pos + pad
+
+    def write_blobs(self, blobs, itemsize, pool):
+        """
+        Compress (in parallel) and write blobs in order; return [[offset, stored, raw], ...].
+
+        Uncompressed blobs are written back to back from one aligned offset, so the
+        whole array (or any run of its chunks) can be memory-mapped as a single view.
+        """
+        locations = []
+        if self.codec.name == 'none':
+            offset = self._align()
+            for raw in blobs:
+                self.f.write(raw)
+                locations.append([offset, len(raw), len(raw)])
+                offset += len(raw)
+            return locations
+        payloads = list(pool.map(lambda b: self.codec.compress(b, itemsize), blobs))
+        for raw, payload in zip(blobs, payloads):
+            offset = self._align()
+            self.f.write(payload)
+            locations.append([offset, len(payload), len(raw)])
+        return locations
+
+
+def _tracker_ranges_for(data_type):
+    """Serialize the tracker's calculated/imported ranges for one data type as ISO strings."""
+    from .data_tracker import global_tracker
+    out = {}
+    for label, ranges in (('calculated', global_tracker.calculated_ranges),
+                          ('imported', global_tracker.imported_ranges)):
+        entries = []
+        for key in {data_type, data_type.lower()}:
+            for start, end in ranges.get(key, []):
+                entries.append([pd.Timestamp(start).isoformat(), pd.Timestamp(end).isoformat()])
+        if entries:
+            out[label] = sorted(set(map(tuple, entries)))
+    return out
+
+
+def write_snapshot_container(filepath, instances, codec='auto', level=3,
+                             chunk_bytes=DEFAULT_CHUNK_BYTES, threads=None):
+    """
+    Write data class instances to a chunked snapshot container.
+
+    Parameters
+    ----------
+    filepath : str
+        Output path (conventionally ending in '.pbsnap').
+    instances : dict
+        Mapping of snapshot key (usually the instance's data_type) -> data class instance.
+    codec : str
+        'auto', 'zstd', 'blosc2', 'blosc', 'zlib' or 'none' (uncompressed, mmap-able).
+    level : int
+        Compression level passed to the codec.
+    chunk_bytes : int
+        Target uncompressed bytes per row-chunk of the widest array.
+    threads : int, optional
+        Worker threads for compression (defaults to os.cpu_count()).
+
+    Returns
+    -------
+    dict
+        The manifest that was written.
+    """
+    codec_obj = get_codec(codec, level)
+    threads = threads or os.cpu_count() or 1
+    manifest = {
+        'format': 'plotbot-snapshot-container',
+        'version': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'codec': codec_obj.name,
+        'level': codec_obj.level,
+        'classes': {},
+    }
+
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f, ThreadPoolExecutor(max_workers=threads) as pool:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        writer = _ContainerWriter(f, codec_obj, threads)
+
+        for key, instance in instances.items():
+            datetime_array = getattr(instance, 'datetime_array', None)
+            if datetime_array is None or len(datetime_array) == 0:
+                print_manager.data_snapshot(f"Skipping '{key}' in container (no datetime_array)")
+                continue
+
+            arrays, layout, scalars, objects, plot_states = _collect_instance_state(instance)
+            n_rows = len(datetime_array)
+            time_ns = _datetime_index_ns(datetime_array)
+            if np.any(np.diff(time_ns) < 0):
+                print_manager.warning(f"[SNAPSHOT] '{key}' datetime_array is not sorted; time-window loads will read all chunks.")
+
+            record_aligned = {path: arr for path, arr in arrays.items()
+                              if arr.ndim >= 1 and arr.shape[0] == n_rows}
+            widest_row = max((arr[:1].nbytes for arr in record_aligned.values()), default=8)
+            rows_per_chunk = max(1024, int(chunk_bytes // max(widest_row, 1)))
+            starts = _segment_starts(time_ns)
+            partition = _row_partition(n_rows, starts, rows_per_chunk)
+
+            class_entry = {
+                'class_type': type(instance).__name__,
+                'module': type(instance).__module__,
+                'data_type': getattr(instance, 'data_type', key),
+                'class_name': getattr(instance, 'class_name', None),
+                'n_records': n_rows,
+                'time_range': [_ns_to_iso(time_ns.min()), _ns_to_iso(time_ns.max())],
+                'segments': [[int(r0), int(r1), _ns_to_iso(time_ns[r0]), _ns_to_iso(time_ns[r1 - 1])]
+                             for r0, r1 in zip(starts, list(starts[1:]) + [n_rows])],
+                'chunks': [[r0, r1, int(time_ns[r0:r1].min()), int(time_ns[r0:r1].max())]
+                           for r0, r1 in partition],
+                'raw_data_layout': layout,
+                'scalars': scalars,
+                'plot_states': plot_states,
+                'tracker': _tracker_ranges_for(getattr(instance, 'data_type', key)),
+                'arrays': {},
+            }
+
+            for path, arr in arrays.items():
+                arr = np.ascontiguousarray(arr)
+                aligned = path in record_aligned
+                if aligned:
+                    blobs = [_as_bytes(arr[r0:r1]) for r0, r1 in partition]
+                else:
+                    blobs = [_as_bytes(arr)]
+                class_entry['arrays'][path] = {
+                    'dtype': arr.dtype.str,
+                    'shape': list(arr.shape),
+                    'record_aligned': aligned,
+                    'chunks': writer.write_blobs(blobs, arr.dtype.itemsize, pool),
+                }
+
+            if objects:
+                blob = pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+                class_entry['objects'] = writer.write_blobs([blob], 1, pool)[0]
+
+            manifest['classes'][key] = class_entry
+            print_manager.data_snapshot(f"Wrote '{key}' ({n_rows} records, {len(partition)} chunks, {len(arrays)} arrays)")
+
+        manifest_bytes = json.dumps(manifest).encode('utf-8')
+        manifest_offset = writer._align()
+        f.write(manifest_bytes)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, manifest_offset, len(manifest_bytes)))
+
+    os.replace(tmp_path, filepath)
+    return manifest
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+def read_manifest(filepath):
+    """Read only the header and JSON manifest of a container."""
+    with open(filepath, 'rb') as f:
+        magic, offset, nbytes = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{filepath} is not a plotbot snapshot container")
+        f.seek(offset)
+        return json.loads(f.read(nbytes).decode('utf-8'))
+
+
+class _ContainerReader:
+    """Decodes selected chunks of a container, optionally memory-mapping uncompressed arrays."""
+
+    def __init__(self, filepath, manifest, threads=None, mmap=False):
+        self.filepath = filepath
+        self.manifest = manifest
+        self.codec = get_codec(manifest['codec'], manifest.get('level', 3)) if manifest['codec'] != 'none' else _none_codec()
+        self.threads = threads or os.cpu_count() or 1
+        self.mmap = mmap and manifest['codec'] == 'none'
+        self._f = open(filepath, 'rb')
+
+    def close(self):
+        self._f.close()
+
+    def _read(self, offset, nbytes):
+        self._f.seek(offset)
+        return self._f.read(nbytes)
+
+    def read_array(self, spec, chunk_indices, pool):
+        """Return the rows covered by ``chunk_indices`` (all chunks for non-record arrays)."""
+        dtype = np.dtype(spec['dtype'])
+        shape = tuple(spec['shape'])
+        chunks = spec['chunks']
+        if not spec['record_aligned']:
+            chunk_indices = range(len(chunks))
+        chunk_indices = list(chunk_indices)
+        if not chunk_indices:
+            return np.empty((0,) + shape[1:], dtype=dtype)
+
+        row_shape = tuple(shape[1:])
+
+        consecutive = chunk_indices[-1] - chunk_indices[0] + 1 == len(chunk_indices)
+        if self.mmap and consecutive:
+            # Uncompressed chunks of one array are stored back to back (see write_blobs),
+            # so a consecutive run of them maps as one view.
+            first = chunks[chunk_indices[0]]
+            total = sum(chunks[i][2] for i in chunk_indices)
+            if total == 0:
+                return np.empty(shape if not spec['record_aligned'] else (0,) + row_shape, dtype=dtype)
+            if not spec['record_aligned']:
+                return np.memmap(self.filepath, dtype=dtype, mode='c', offset=first[0], shape=shape)
+            row_nbytes = int(np.prod(row_shape, dtype=np.int64)) * dtype.itemsize
+            return np.memmap(self.filepath, dtype=dtype, mode='c', offset=first[0],
+                             shape=(total // row_nbytes,) + row_shape)
+
+        locations = [chunks[i] for i in chunk_indices]
+        raw_payloads = [self._read(offset, stored) for offset, stored, _ in locations]
+        if self.codec.name == 'none':
+            decoded = raw_payloads
+        else:
+            decoded = list(pool.map(lambda args: self.codec.decompress(*args),
+                                    [(p, loc[2]) for p, loc in zip(raw_payloads, locations)]))
+        if not spec['record_aligned']:
+            if not decoded[0]:
+                return np.empty(shape, dtype=dtype)
+            return np.frombuffer(decoded[0], dtype=dtype).reshape(shape).copy()
+        parts = [np.frombuffer(buf, dtype=dtype).reshape((-1,) + row_shape) for buf in decoded]
+        return np.concatenate(parts) if len(parts) > 1 else parts[0].copy()
+
+    def read_objects(self, location):
+        offset, stored, raw = location
+        return pickle.loads(self.codec.decompress(self._read(offset, stored), raw))
+
+
+def _select_chunks(entry, start_ns=None, end_ns=None):
+    """Indices of row-chunks whose time span overlaps [start_ns, end_ns]."""
+    chunks = entry['chunks']
+    if start_ns is None and end_ns is None:
+        return list(range(len(chunks)))
+    lo = np.iinfo(np.int64).min if start_ns is None else start_ns
+    hi = np.iinfo(np.int64).max if end_ns is None else end_ns
+    t0 = np.fromiter((c[2] for c in chunks), dtype=np.int64, count=len(chunks))
+    t1 = np.fromiter((c[3] for c in chunks), dtype=np.int64, count=len(chunks))
+    if np.all(t1[:-1] <= t0[1:]):
+        # Time-ordered chunks (the normal case): binary search the window edges
+        first = int(np.searchsorted(t1, lo, side='left'))
+        last = int(np.searchsorted(t0, hi, side='right'))
+        return list(range(first, last))
+    return np.flatnonzero((t1 >= lo) & (t0 <= hi)).tolist()
+
+
+def read_class_arrays(filepath, key, time_range=None, mmap=False, threads=None, manifest=None):
+    """
+    Decode one class from a container, optionally restricted to a time window.
+
+    Returns
+    -------
+    dict or None
+        {'entry': manifest entry, 'arrays': {path: ndarray}, 'objects': dict} with every
+        record-aligned array sliced to the rows inside ``time_range`` (inclusive),
+        or None if the class has no data in the window.
+    """
+    manifest = manifest or read_manifest(filepath)
+    entry = manifest['classes'][key]
+    start_ns = _to_ns(time_range[0]) if time_range else None
+    end_ns = _to_ns(time_range[1]) if time_range else None
+    chunk_indices = _select_chunks(entry, start_ns, end_ns)
+    if not chunk_indices:
+        return None
+
+    reader = _ContainerReader(filepath, manifest, threads=threads, mmap=mmap)
+    try:
+        with ThreadPoolExecutor(max_workers=reader.threads) as pool:
+            arrays = {path: reader.read_array(spec, chunk_indices, pool)
+                      for path, spec in entry['arrays'].items()}
+            objects = reader.read_objects(entry['objects']) if 'objects' in entry else {}
+    finally:
+        reader.close()
+
+    if time_range and 'attr/datetime_array' in arrays:
+        # Chunk selection is coarse; trim the decoded rows to the exact window
+        time_ns = _datetime_index_ns(arrays['attr/datetime_array'])
+        i0 = int(np.searchsorted(time_ns, start_ns, side='left'))
+        i1 = int(np.searchsorted(time_ns, end_ns, side='right'))
+        if i1 <= i0:
+            return None
+        for path, spec in entry['arrays'].items():
+            if spec['record_aligned']:
+                arrays[path] = arrays[path][i0:i1]
+    return {'entry': entry, 'arrays': arrays, 'objects': objects}
+
+
+def _resolve_class(entry, key):
+    from .data_cubby import data_cubby
+    target = data_cubby._get_class_type_from_string(key)
+    if target is None and entry.get('data_type'):
+        target = data_cubby._get_class_type_from_string(entry['data_type'])
+    if target is None:
+        try:
+            target = getattr(importlib.import_module(entry['module']), entry['class_type'])
+        except (ImportError, AttributeError):
+            target = None
+    return target
+
+
+def build_instance(decoded, target_class):
+    """Create ``target_class(None)`` and populate it with decoded arrays, scalars and objects."""
+    entry, arrays, objects = decoded['entry'], decoded['arrays'], decoded['objects']
+    instance = target_class(None)
+
+    raw_data = {}
+    for raw_key, kind in entry['raw_data_layout'].items():
+        if kind == 'none':
+            raw_data[raw_key] = None
+        elif kind == 'array':
+            raw_data[raw_key] = arrays[f'raw_data/{raw_key}']
+        elif kind.startswith('list:'):
+            raw_data[raw_key] = [arrays[f'raw_data/{raw_key}/{i}'] for i in range(int(kind.split(':')[1]))]
+        else:
+            raw_data[raw_key] = objects.get(f'raw_data/{raw_key}')
+    if entry['raw_data_layout']:
+        object.__setattr__(instance, 'raw_data', raw_data)
+
+    for path, arr in arrays.items():
+        if path.startswith('attr/'):
+            object.__setattr__(instance, path[len('attr/'):], arr)
+    for name, value in entry['scalars'].items():
+        object.__setattr__(instance, name, value)
+    for name, value in objects.items():
+        if not name.startswith('raw_data/'):
+            object.__setattr__(instance, name, value)
+    return instance
+
+
+def _apply_plot_states(instance, plot_states):
+    """Re-apply saved plot_config tweaks (colors, labels, ...) the same way update() does."""
+    for var_name, state in plot_states.items():
+        manager = getattr(instance, var_name, None)
+        if not isinstance(manager, plot_manager):
+            continue
+        if hasattr(manager, '_plot_state'):
+            manager._plot_state.update(state)
+        for attr, value in state.items():
+            if hasattr(manager.plot_config, attr):
+                try:
+                    setattr(manager.plot_config, attr, value)
+                except Exception:
+                    continue
+
+
+def _register_tracker(entry, loaded_range, time_range=None):
+    """Record what was restored in global_tracker (saved ranges clipped to the loaded window)."""
+    from .data_tracker import global_tracker
+    data_type = entry.get('data_type')
+    saved = entry.get('tracker', {}).get('calculated') or [loaded_range]
+    lo = _to_ns(time_range[0]) if time_range else None
+    hi = _to_ns(time_range[1]) if time_range else None
+    for start, end in saved:
+        s, e = _to_ns(start), _to_ns(end)
+        if lo is not None:
+            s, e = max(s, lo), min(e, hi)
+        if e < s:
+            continue
+        window = (pd.Timestamp(s).to_pydatetime(warn=False).replace(tzinfo=timezone.utc),
+                  pd.Timestamp(e).to_pydatetime(warn=False).replace(tzinfo=timezone.utc))
+        global_tracker._update_range(window, data_type, global_tracker.calculated_ranges)
+        global_tracker._update_range(window, data_type, global_tracker.imported_ranges)
+
+
+def load_snapshot_container(filepath, classes=None, time_range=None, mmap=False, threads=None):
+    """
+    Restore classes from a container into their global data_cubby instances.
+
+    Parameters
+    ----------
+    filepath : str
+        Container path.
+    classes : list of str, optional
+        Snapshot keys / data_type strings to restore (case-insensitive). All if None.
+    time_range : list, optional
+        [start, end]; only row-chunks overlapping the window are decoded.
+    mmap : bool
+        Memory-map arrays instead of reading them (uncompressed containers only).
+    threads : int, optional
+        Decompression threads (defaults to os.cpu_count()).
+
+    Returns
+    -------
+    dict
+        {snapshot key: (first datetime64, last datetime64)} for every restored class.
+    """
+    from .data_cubby import data_cubby
+
+    manifest = read_manifest(filepath)
+    wanted = None if classes is None else {c.lower() for c in classes}
+    restored = {}
+
+    for key, entry in manifest['classes'].items():
+        if wanted is not None and key.lower() not in wanted and str(entry.get('data_type', '')).lower() not in wanted:
+            continue
+        target_class = _resolve_class(entry, key)
+        if target_class is None:
+            print_manager.warning(f"[SNAPSHOT] Could not determine class type for '{key}'. Skipping.")
+            continue
+
+        decoded = read_class_arrays(filepath, key, time_range=time_range, mmap=mmap,
+                                    threads=threads, manifest=manifest)
+        if decoded is None:
+            print_manager.data_snapshot(f"'{key}' has no data in {time_range}; skipping")
+            continue
+
+        temp_instance = build_instance(decoded, target_class)
+        global_instance = data_cubby.grab(key)
+        if global_instance is None or not isinstance(global_instance, target_class):
+            global_instance = temp_instance
+            data_cubby.stash(global_instance, class_name=key)
+        elif hasattr(global_instance, 'restore_from_snapshot'):
+            global_instance.restore_from_snapshot(temp_instance)
+        else:
+            for attr, value in temp_instance.__dict__.items():
+                object.__setattr__(global_instance, attr, value)
+
+        if hasattr(global_instance, 'ensure_internal_consistency'):
+            try:
+                global_instance.ensure_internal_consistency()
+            except Exception as e:
+                print_manager.warning(f"[SNAPSHOT] ensure_internal_consistency failed for '{key}': {e}")
+        if hasattr(global_instance, 'set_plot_config'):
+            global_instance.set_plot_config()
+        _apply_plot_states(global_instance, entry.get('plot_states', {}))
+
+        dt = global_instance.datetime_array
+        loaded_range = (pd.Timestamp(dt[0]).isoformat(), pd.Timestamp(dt[-1]).isoformat())
+        _register_tracker(entry, loaded_range, time_range)
+        restored[key] = (dt[0], dt[-1])
+        print_manager.data_snapshot(f"Restored '{key}' ({len(dt)} records) from container")
+
+    return restored
@@ -0,0 +1,267 @@
+# plotbot/spectral_pyramid.py
+"""
+Multi-resolution (time-decimated) levels of spectrogram variables.
+
+A multi-day spectrogram has far more time columns than its panel has pixels.
+With ``var.spectral_pyramid = 'mean'`` (or ``'max'``) a spectral variable
+keeps a ``SpectralPyramid``: level k holds the data reduced over time bins of
+``2**k`` base cadences. Bins are aligned on absolute time (``t // width``), so
+when data_cubby merges new data into the variable only the bins the new time
+span touches are recomputed (``extend_pyramids``), whatever the merge order.
+
+Renderers call ``pyramid_window(var, start, stop, columns)``: it returns the
+coarsest level that still has at least ``columns`` (the panel's pixel width)
+bins in the window, or None when the full-resolution data is needed. Drawing
+cost then follows the panel width instead of the time range.
+
+The pyramid lives on the variable's plot_config, so it survives merges
+(plot_managers are rebound to the same config) and is saved with data
+snapshots. It is invalidated explicitly whenever the data behind that config
+is replaced: derived variables (slices, ufunc results) get a config without
+it, set_plot_config builds fresh configs on update(), and assigning a new
+datetime_array drops it (``drop_pyramid``).
+"""
+
+import numpy as np
+
+from .encounter_index import to_datetime64
+from .print_manager import print_manager
+
+REDUCERS = ('mean', 'max')
+MIN_LEVEL_COLUMNS = 64       # coarser levels than this (over the whole series) aren't kept
+MAX_LEVELS = 24
+
+
+def reduce_columns(times_ns, values, width, reducer='mean'):
+    """
+    Reduce rows over time bins of ``width`` ns.
+
+    Parameters
+    ----------
+    times_ns : numpy.ndarray of int64
+        Sorted sample times (ns since the epoch).
+    values : numpy.ndarray, shape (n, n_bins)
+    width : int
+        Bin width in ns; bin j covers ``[j * width, (j + 1) * width)``.
+    reducer : {'mean', 'max'}
+        NaN-ignoring mean or max; bins with no finite value are NaN.
+
+    Returns
+    -------
+    ids : numpy.ndarray of int64
+        Index of each non-empty bin.
+    reduced : numpy.ndarray of float64, shape (len(ids), n_bins)
+    """
+    if len(times_ns) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0,) + values.shape[1:])
+    ids = times_ns // width
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    values = np.asarray(values, dtype=np.float64)
+    if reducer == 'max':
+        with np.errstate(invalid='ignore'):
+            return ids[starts], np.fmax.reduceat(values, starts, axis=0)
+    finite = np.isfinite(values)
+    sums = np.add.reduceat(np.where(finite, values, 0.0), starts, axis=0)
+    counts = np.add.reduceat(finite, starts, axis=0, dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        reduced = sums / counts
+    reduced[counts == 0] = np.nan
+    return ids[starts], reduced
+
+
+class SpectralPyramid:
+    """
+    Time-decimated levels of one spectrogram.
+
+    Parameters
+    ----------
+    times : numpy.ndarray of datetime64
+        Sorted sample times.
+    values : numpy.ndarray, shape (n, n_bins)
+    reducer : {'mean', 'max'}
+    bins : numpy.ndarray, optional
+        The (time-independent) bin centers, carried along for renderers.
+    usable : bool
+        False when the variable's bins change with time: the levels are kept
+        (so the check isn't repeated) but not drawn from.
+    base_width : int, optional
+        Level 0 cadence in ns (default: the median sample spacing). Fixed for
+        the pyramid's lifetime so later updates keep the bin alignment.
+    """
+
+    def __init__(self, times, values, reducer='mean', bins=None, usable=True, base_width=None):
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown pyramid reducer '{reducer}' (choose from {', '.join(REDUCERS)})")
+        if base_width is None:
+            steps = np.diff(to_datetime64(times).view(np.int64))
+            steps = steps[steps > 0]
+            base_width = int(np.median(steps)) if len(steps) else 1
+        self.reducer = reducer
+        self.bins = bins
+        self.usable = usable
+        self.base_width = int(base_width)
+        self._levels = []       # level k (from 1): (bin ids, reduced values)
+        self.update(times, values)
+
+    @property
+    def n_levels(self):
+        return len(self._levels)
+
+    def width(self, level):
+        """Bin width of ``level`` in ns (level 0 is the full resolution)."""
+        return self.base_width << level
+
+    def update(self, times, values, start=None, stop=None):
+        """
+        Bring the levels up to date with the full arrays after rows in
+        ``[start, stop]`` were added or changed (the whole series if None).
+        """
+        times_ns = to_datetime64(times).view(np.int64)
+        values = np.asarray(values)
+        self.n_rows = len(values)
+        if len(times_ns) == 0:
+            self._levels = []
+            return self
+        start_ns = times_ns[0] if start is None else int(to_datetime64(start).view(np.int64))
+        stop_ns = times_ns[-1] if stop is None else int(to_datetime64(stop).view(np.int64))
+        span = times_ns[-1] - times_ns[0]
+
+        levels = []
+        for level in range(1, MAX_LEVELS + 1):
+            width = self.width(level)
+            if level > 1 and span // width < MIN_LEVEL_COLUMNS:
+                break
+            if level > len(self._levels) or start is None:
+                levels.append(reduce_columns(times_ns, values, width, self.reducer))
+                continue
+            # Recompute only the bins [start, stop] touches, from the rows they cover
+            first, last = start_ns // width, stop_ns // width
+            rows = slice(np.searchsorted(times_ns, first * width), np.searchsorted(times_ns, (last + 1) * width))
+            new_ids, new_values = reduce_columns(times_ns[rows], values[rows], width, self.reducer)
+            ids, reduced = self._levels[level - 1]
+            lo, hi = np.searchsorted(ids, first), np.searchsorted(ids, last, side='right')
+            levels.append((np.concatenate([ids[:lo], new_ids, ids[hi:]]),
+                           np.concatenate([reduced[:lo], new_values, reduced[hi:]])))
+        self._levels = levels
+        return self
+
+    def select(self, start, stop, columns):
+        """Coarsest level with at least ``columns`` bins in ``[start, stop]`` (0: none is fine enough)."""
+        start_ns, stop_ns = (int(to_datetime64(t).view(np.int64)) for t in (start, stop))
+        for level in range(self.n_levels, 0, -1):
+            ids = self._levels[level - 1][0]
+            width = self.width(level)
+            count = np.searchsorted(ids, stop_ns // width, side='right') - np.searchsorted(ids, start_ns // width)
+            if count >= columns:
+                return level
+        return 0
+
+    def window(self, level, start, stop):
+        """(bin center times, values) of ``level`` for the bins overlapping ``[start, stop]``."""
+        ids, reduced = self._levels[level - 1]
+        width = self.width(level)
+        start_ns, stop_ns = (int(to_datetime64(t).view(np.int64)) for t in (start, stop))
+        lo, hi = np.searchsorted(ids, start_ns // width), np.searchsorted(ids, stop_ns // width, side='right')
+        centers = ids[lo:hi] * width + width // 2
+        return centers.astype('datetime64[ns]'), reduced[lo:hi]
+
+
+def _time_axis(var):
+    """Full 1D time array of a spectral variable (first column of a time mesh)."""
+    times = var.plot_config.datetime_array
+    if times is None:
+        return None
+    times = np.asarray(times)
+    if times.ndim == 2:
+        times = times[:, 0]
+    return times if np.issubdtype(times.dtype, np.datetime64) else None
+
+
+def _constant_bins(additional_data, n_rows):
+    """(usable, bins): bin centers if they don't change with time."""
+    if additional_data is None:
+        return True, None
+    bins = np.asarray(additional_data)
+    if bins.ndim == 2 and bins.shape[0] == n_rows:
+        if not np.all(bins == bins[:1]):
+            return False, None
+        bins = bins[0]
+    return bins.ndim == 1, bins
+
+
+def spectral_pyramid(var):
+    """
+    The pyramid of a spectral variable, built on first use; None if the
+    variable has none (option off, not a spectrogram, or bins varying in time).
+    """
+    plot_config = getattr(var, 'plot_config', None)
+    reducer = getattr(plot_config, 'spectral_pyramid', None)
+    if reducer is None or getattr(plot_config, 'plot_type', None) != 'spectral':
+        return None
+    values = var.view(np.ndarray)
+    times = _time_axis(var)
+    if times is None or values.ndim != 2 or len(times) != len(values) or len(times) < 2:
+        return None
+
+    pyramid = plot_config.__dict__.get('_pyramid')
+    if pyramid is not None and pyramid.reducer == reducer and pyramid.n_rows == len(values):
+        return pyramid if pyramid.usable else None
+
+    usable, bins = _constant_bins(plot_config.additional_data, len(times))
+    pyramid = SpectralPyramid(times, values, reducer, bins=bins, usable=usable)
+    plot_config._pyramid = pyramid
+    print_manager.datacubby(f"Built {reducer} spectral pyramid for {plot_config.class_name}.{plot_config.subclass_name}: "
+                            f"{pyramid.n_levels} levels over {len(times)} columns")
+    return pyramid if usable else None
+
+
+def pyramid_window(var, start, stop, columns):
+    """
+    Decimated data for drawing ``var`` over ``[start, stop]`` on ``columns`` pixels.
+
+    Returns
+    -------
+    tuple or None
+        ``(times, values, bins)`` of the coarsest level with at least
+        ``columns`` bins in the window, or None to draw the full resolution.
+    """
+    pyramid = spectral_pyramid(var)
+    if pyramid is None:
+        return None
+    level = pyramid.select(start, stop, columns)
+    if level == 0:
+        return None
+    times, values = pyramid.window(level, start, stop)
+    print_manager.debug(f"Spectral pyramid level {level} ({len(times)} columns) for {var.class_name}.{var.subclass_name}")
+    return times, values, pyramid.bins
+
+
+def drop_pyramid(plot_config):
+    """Forget the pyramid of ``plot_config`` (its data was replaced); it is rebuilt on next use."""
+    plot_config.__dict__.pop('_pyramid', None)
+
+
+def extend_pyramids(instance, start, stop):
+    """
+    Update the pyramids of ``instance``'s plot_managers after data_cubby
+    merged rows in ``[start, stop]`` into them (pyramids not built yet are
+    left to be built on first use).
+    """
+    from .plot_manager import plot_manager
+
+    for name, manager in list(instance.__dict__.items()):
+        if not isinstance(manager, plot_manager):
+            continue
+        pyramid = manager.plot_config.__dict__.get('_pyramid')
+        if pyramid is None:
+            continue
+        times = _time_axis(manager)
+        values = manager.view(np.ndarray)
+        if times is None or values.ndim != 2 or len(times) != len(values):
+            drop_pyramid(manager.plot_config)
+            continue
+        if pyramid.usable and pyramid.bins is not None and np.ndim(manager.plot_config.additional_data) == 2:
+            first, last = np.searchsorted(times, to_datetime64(start)), np.searchsorted(times, to_datetime64(stop), side='right')
+            new_bins = np.asarray(manager.plot_config.additional_data)[first:last]
+            pyramid.usable = bool(np.all(new_bins == pyramid.bins))
+        pyramid.update(times, values, start, stop)
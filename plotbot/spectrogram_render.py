@@ -0,0 +1,184 @@
+# plotbot/spectrogram_render.py
+"""
+Raster drawing of spectral variables (EPAD, DFB spectra, SPAN energy, ...).
+
+``ax.pcolormesh`` draws one quad per (time, bin) cell, so a 50k-column
+spectrogram becomes millions of paths: slow to render and huge in vector
+output. Nearly every plotbot spectrogram is on a rectilinear grid (one time
+axis, one set of bins), which ``draw_spectrogram`` draws as an image instead:
+
+- linear axes: ``pcolorfast`` with the cell edges ``pcolormesh(shading='auto')``
+  would use, as an ``AxesImage`` when both axes are regular within
+  ``GRID_TOLERANCE`` and a ``PcolorImage`` otherwise;
+- non-linear axes (images can't follow a log scale): a rasterized
+  ``pcolormesh`` with the time columns resampled to at most
+  ``MAX_RASTER_COLUMNS``, each raster column showing the data column under
+  its center, which is what a mesh point-sampled at the target dpi shows.
+
+Grids whose bins change with time, non-monotonic or non-finite coordinates
+fall back to the plain ``pcolormesh`` call.
+"""
+
+import numpy as np
+
+from .print_manager import print_manager
+
+GRID_TOLERANCE = 0.01        # max step deviation (fraction of the median step) still drawn as a regular grid
+MAX_RASTER_COLUMNS = 4096    # wider than any plotbot axes at 300 dpi
+
+
+def regular_step(edges, tolerance=GRID_TOLERANCE):
+    """
+    Step of evenly spaced edges, or None.
+
+    Parameters
+    ----------
+    edges : numpy.ndarray
+        Strictly increasing float coordinates.
+    tolerance : float
+        Largest deviation of any step from the median step, as a fraction of it.
+
+    Returns
+    -------
+    float or None
+    """
+    steps = np.diff(edges)
+    if len(steps) == 0:
+        return None
+    median = np.median(steps)
+    if median <= 0 or np.max(np.abs(steps - median)) > tolerance * median:
+        return None
+    return (edges[-1] - edges[0]) / len(steps)
+
+
+def cell_edges(centers):
+    """Cell edges for cell centers, as ``pcolormesh(shading='auto')`` places them (midpoints, half steps at the ends)."""
+    centers = np.asarray(centers, dtype=float)
+    mid = 0.5 * (centers[1:] + centers[:-1])
+    return np.concatenate([[2 * centers[0] - mid[0]], mid, [2 * centers[-1] - mid[-1]]])
+
+
+def _rectilinear_axis(coords, n_cells, axis):
+    """1D coordinates of a (possibly 2D) grid axis, or None if they vary along the other axis."""
+    coords = np.asarray(coords)
+    if coords.ndim == 2:
+        reference = coords[:, :1] if axis == 0 else coords[:1, :]
+        if coords.shape[axis] not in (n_cells, n_cells + 1) or not np.all(coords == reference):
+            return None
+        coords = reference.ravel()
+    if coords.ndim != 1 or len(coords) not in (n_cells, n_cells + 1):
+        return None
+    return coords
+
+
+def _increasing_edges(coords, n_cells):
+    """(edges, reversed) for strictly monotonic coordinates, or None."""
+    coords = np.asarray(coords, dtype=float)
+    if len(coords) < 2 or not np.all(np.isfinite(coords)):
+        return None
+    steps = np.diff(coords)
+    if np.all(steps < 0):
+        coords, flipped = coords[::-1], True
+    elif np.all(steps > 0):
+        flipped = False
+    else:
+        return None
+    edges = coords if len(coords) == n_cells + 1 else cell_edges(coords)
+    return edges, flipped
+
+
+def raster_columns(x_edges, n_columns):
+    """
+    Data column under the center of each of ``n_columns`` equal raster columns.
+
+    Returns
+    -------
+    raster_edges : numpy.ndarray, shape (n_columns + 1,)
+    columns : numpy.ndarray of int, shape (n_columns,)
+    """
+    raster_edges = np.linspace(x_edges[0], x_edges[-1], n_columns + 1)
+    centers = 0.5 * (raster_edges[1:] + raster_edges[:-1])
+    columns = np.clip(np.searchsorted(x_edges, centers, side='right') - 1, 0, len(x_edges) - 2)
+    return raster_edges, columns
+
+
+def axes_pixel_width(ax):
+    """Width of ``ax`` in pixels at the figure's dpi (the time columns a panel can show)."""
+    return max(int(round(ax.get_window_extent().width)), 1)
+
+
+def draw_spectrogram(ax, times, bins, data, norm=None, cmap=None, y_scale=None,
+                     tolerance=GRID_TOLERANCE, max_columns=MAX_RASTER_COLUMNS):
+    """
+    Draw a spectral variable on ``ax``; returns the mappable (for the colorbar).
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+    times : array-like, shape (n_times,) or (n_times, n_bins)
+        Cell centers (or n_times + 1 edges) along x: datetimes or numbers.
+    bins : array-like, shape (n_bins,) or (n_times, n_bins)
+        Cell centers (or n_bins + 1 edges) along y.
+    data : array-like, shape (n_times, n_bins)
+    norm, cmap
+        Passed to the artist.
+    y_scale : str, optional
+        The y scale the panel will have (default: the axes' current scale).
+    tolerance : float
+        Step regularity tolerance for the single-image path.
+    max_columns : int
+        Raster width on non-linear axes.
+
+    Returns
+    -------
+    matplotlib.image.AxesImage, matplotlib.image.PcolorImage or matplotlib.collections.QuadMesh
+    """
+    data = np.ma.asarray(data) if np.ma.isMaskedArray(data) else np.asarray(data)
+    if data.ndim != 2:
+        return _draw_mesh(ax, times, bins, data, norm, cmap)
+    n_times, n_bins = data.shape
+
+    x = _rectilinear_axis(times, n_times, axis=0)
+    y = _rectilinear_axis(bins, n_bins, axis=1)
+    if x is None or y is None:
+        print_manager.debug("Spectrogram grid varies with time - drawing with pcolormesh")
+        return _draw_mesh(ax, times, bins, data, norm, cmap)
+
+    ax.xaxis.update_units(x)                  # dates get the date converter, as pcolormesh would
+    ax.yaxis.update_units(y)
+    x_grid = _increasing_edges(ax.convert_xunits(x), n_times)
+    y_grid = _increasing_edges(ax.convert_yunits(y), n_bins)
+    if x_grid is None or y_grid is None:
+        print_manager.debug("Spectrogram coordinates not monotonic - drawing with pcolormesh")
+        return _draw_mesh(ax, times, bins, data, norm, cmap)
+    (x_edges, x_flipped), (y_edges, y_flipped) = x_grid, y_grid
+
+    image = data.T                             # (n_bins, n_times): rows are y
+    if x_flipped:
+        image = image[:, ::-1]
+    if y_flipped:
+        image = image[::-1, :]
+
+    linear = ax.get_xscale() == 'linear' and (y_scale or ax.get_yscale()) == 'linear'
+    if linear:
+        x_step, y_step = regular_step(x_edges, tolerance), regular_step(y_edges, tolerance)
+        if x_step is not None and y_step is not None:
+            x_edges, y_edges = x_edges[[0, -1]], y_edges[[0, -1]]
+        return ax.pcolorfast(x_edges, y_edges, image, norm=norm, cmap=cmap)
+
+    if n_times > max_columns:
+        x_edges, columns = raster_columns(x_edges, max_columns)
+        image = image[:, columns]
+    return ax.pcolormesh(x_edges, y_edges, image, norm=norm, cmap=cmap, shading='flat', rasterized=True)
+
+
+def _draw_mesh(ax, times, bins, data, norm, cmap):
+    """The general pcolormesh call (time-major data)."""
+    times, bins = np.asarray(times), np.asarray(bins)
+    if times.ndim == 1 and bins.ndim == 1:
+        return ax.pcolormesh(times, bins, np.asarray(data).T, norm=norm, cmap=cmap, shading='auto')
+    if times.ndim == 1:
+        times = np.broadcast_to(times[:, None], np.shape(bins))
+    if bins.ndim == 1:
+        bins = np.broadcast_to(bins[None, :], np.shape(times))
+    return ax.pcolormesh(times, bins, data, norm=norm, cmap=cmap, shading='auto')
@@ -1,6 +1,7 @@
 #plotbot/time_utils.py
 from datetime import datetime
 from datetime import timedelta, time
+from contextlib import contextmanager
 from .print_manager import print_manager
 from dateutil.parser import parse
 
@@ -138,6 +139,24 @@ class TimeRangeTracker:
         cls._last_updated = None
         print_manager.debug("🕒 TimeRangeTracker: Cleared trange")
     
+    @classmethod
+    @contextmanager
+    def temporarily(cls, trange):
+        """
+        Make trange the current time range inside a with-block, then restore
+        whatever was stored before (quietly, without a status message).
+
+        Plot managers clip lazily to the current time range, so this narrows
+        every .data / .datetime_array access made inside the block.
+        """
+        previous = (cls._current_trange, cls._last_updated)
+        cls._current_trange = list(trange) if trange else None
+        cls._last_updated = datetime.now()
+        try:
+            yield
+        finally:
+            cls._current_trange, cls._last_updated = previous
+
     @classmethod
     def get_last_updated(cls):
         """Get when the time range was last updated."""
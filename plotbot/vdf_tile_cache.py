@@ -0,0 +1,345 @@
+# plotbot/vdf_tile_cache.py
+"""
+Precomputed VDF tiles for the Dash VDF explorer (plotbot_dash_vdf.py).
+
+A tile is everything the explorer draws for one time slice and viz mode, as
+compact arrays: the 1D collapsed VDF, the θ-plane and φ-plane grids (float32)
+and, for 'mesh3d', the triangle index buffers of both planes (int32). The
+1D VDF and the grids are the same for every mode, so they are stored once
+per slice (``<index>_shared.npz``) and only the mode-specific arrays per
+mode (``<index>_<mode>.npz``), under ``plotbot/cache/vdf_tiles/<source>/``,
+where ``<source>`` identifies the CDF by path, size and modification time, so
+they persist across sessions and are invalidated when the file changes.
+
+``TilePrecomputer`` fills the cache in a background thread, working outward
+from the slider position it is given (``focus``). The slider callback asks
+``get_or_compute``: a cached tile is a disk read (or a memory hit); a tile
+the background thread is working on is waited for instead of computed twice.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .print_manager import print_manager
+
+TILE_FORMAT_VERSION = 2
+VIZ_MODES = ('mesh3d', 'interpolate', 'scatter')
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'cache', 'vdf_tiles')
+MEMORY_SLICES = 32     # most recently used slices (shared arrays plus their mode tiles) kept in memory
+SHARED = 'shared'      # file part holding the arrays every mode of a slice draws
+SHARED_ARRAYS = ('vel_1d', 'vdf_1d', 'theta_vx', 'theta_vy', 'theta_df', 'phi_vx', 'phi_vy', 'phi_df')
+
+
+def grid_triangles(valid):
+    """
+    Triangle indices for a regular (ny, nx) grid.
+
+    Each cell becomes a lower (p, p+1, p+nx) and an upper (p+1, p+nx+1, p+nx)
+    triangle, kept only where all three corners are valid. Order is row by
+    row, lower before upper, as in a per-cell loop.
+
+    Parameters
+    ----------
+    valid : numpy.ndarray of bool, shape (ny, nx)
+
+    Returns
+    -------
+    numpy.ndarray of int32, shape (n_triangles, 3)
+    """
+    ny, nx = valid.shape
+    if ny < 2 or nx < 2:
+        return np.empty((0, 3), dtype=np.int32)
+    index = np.arange(ny * nx, dtype=np.int32).reshape(ny, nx)
+    corner, right, below, diagonal = index[:-1, :-1], index[:-1, 1:], index[1:, :-1], index[1:, 1:]
+    triangles = np.stack([np.stack([corner, right, below], axis=-1),
+                          np.stack([right, diagonal, below], axis=-1)], axis=2)
+    keep = np.stack([valid[:-1, :-1] & valid[:-1, 1:] & valid[1:, :-1],
+                     valid[:-1, 1:] & valid[1:, 1:] & valid[1:, :-1]], axis=2)
+    return triangles[keep]
+
+
+def clean_vdf(df):
+    """VDF values with non-positive and non-finite entries set to NaN (float32)."""
+    clean = np.array(df, dtype=np.float32)
+    clean[~(clean > 0) | ~np.isfinite(clean)] = np.nan
+    return clean
+
+
+def build_tiles(vdf_data, theta, phi, modes=VIZ_MODES):
+    """
+    Tiles for one processed time slice.
+
+    Parameters
+    ----------
+    vdf_data : dict
+        Output of the timeslice extraction ('vdf' and 'vel' arrays).
+    theta, phi : tuple
+        (vx, vz, df) and (vx, vy, df) plane grids.
+    modes : sequence of str
+        Viz modes to build tiles for.
+
+    Returns
+    -------
+    dict
+        viz mode -> tile (dict of arrays). The tiles share the arrays in
+        ``SHARED_ARRAYS``.
+    """
+    base = {
+        'vel_1d': np.asarray(vdf_data['vel'][0, :, 0], dtype=np.float32),
+        'vdf_1d': np.asarray(np.sum(vdf_data['vdf'], axis=(0, 2)), dtype=np.float32),
+    }
+    for plane, (vx, vy, df) in (('theta', theta), ('phi', phi)):
+        base[f'{plane}_vx'] = np.asarray(vx, dtype=np.float32)
+        base[f'{plane}_vy'] = np.asarray(vy, dtype=np.float32)
+        base[f'{plane}_df'] = np.asarray(df, dtype=np.float32)
+
+    tiles = {}
+    for mode in modes:
+        tile = dict(base)
+        if mode == 'mesh3d':
+            for plane in ('theta', 'phi'):
+                vx, df = base[f'{plane}_vx'], base[f'{plane}_df']
+                if vx.ndim == 2 and df.shape == vx.shape:
+                    tile[f'{plane}_triangles'] = grid_triangles(np.isfinite(clean_vdf(df)))
+        tiles[mode] = tile
+    return tiles
+
+
+def tile_planes(tile):
+    """(theta, phi) plane tuples of a tile, in the order the figure functions expect."""
+    return ((tile['theta_vx'], tile['theta_vy'], tile['theta_df']),
+            (tile['phi_vx'], tile['phi_vy'], tile['phi_df']))
+
+
+def _source_key(source_path):
+    stat = os.stat(source_path)
+    identity = f"{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}|v{TILE_FORMAT_VERSION}"
+    return hashlib.sha1(identity.encode()).hexdigest()[:16]
+
+
+class VDFTileCache:
+    """
+    Tiles of one VDF source file, on disk and in a small in-memory LRU.
+
+    Each slice's ``SHARED_ARRAYS`` are stored once and each mode's tile keeps
+    only its own arrays; ``get`` returns them combined.
+
+    Parameters
+    ----------
+    source_path : str, optional
+        The CDF the tiles come from. Without it (or if it can't be stat'ed)
+        tiles are kept in memory only.
+    cache_dir : str, optional
+        Root cache directory (default ``plotbot/cache/vdf_tiles``).
+    memory_slices : int, optional
+        Slices kept in memory, with every mode of them that was read.
+    """
+
+    def __init__(self, source_path=None, cache_dir=None, memory_slices=MEMORY_SLICES):
+        self.directory = None
+        if source_path is not None:
+            try:
+                self.directory = os.path.join(cache_dir or DEFAULT_CACHE_DIR, _source_key(source_path))
+                os.makedirs(self.directory, exist_ok=True)
+            except OSError as e:
+                print_manager.warning(f"VDF tile cache disabled for {source_path}: {e}")
+                self.directory = None
+        self._memory = OrderedDict()    # index -> {SHARED or mode: arrays}
+        self._memory_slices = memory_slices
+        self._lock = threading.Lock()
+
+    def _path(self, index, part):
+        return os.path.join(self.directory, f'{int(index):06d}_{part}.npz')
+
+    def _has(self, index, part):
+        with self._lock:
+            if part in self._memory.get(index, ()):
+                return True
+        return self.directory is not None and os.path.exists(self._path(index, part))
+
+    def __contains__(self, key):
+        index, mode = key
+        return self._has(int(index), mode) and self._has(int(index), SHARED)
+
+    def _load(self, index, part):
+        """The arrays of one part of a slice, from memory or disk, or None."""
+        with self._lock:
+            parts = self._memory.get(index)
+            if parts is not None and part in parts:
+                self._memory.move_to_end(index)
+                return parts[part]
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(index, part)) as stored:
+                arrays = {name: stored[name] for name in stored.files}
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(index, part, arrays)
+        return arrays
+
+    def get(self, index, mode):
+        """The cached tile, or None."""
+        index = int(index)
+        own = self._load(index, mode)
+        shared = self._load(index, SHARED) if own is not None else None
+        if shared is None:
+            return None
+        return {**shared, **own}
+
+    def put(self, index, mode, tile):
+        """Store a tile (written atomically, so readers never see a partial file)."""
+        index = int(index)
+        shared = {name: tile[name] for name in SHARED_ARRAYS if name in tile}
+        own = {name: array for name, array in tile.items() if name not in shared}
+        if not self._has(index, SHARED):
+            self._store(index, SHARED, shared)
+        self._store(index, mode, own)
+
+    def _store(self, index, part, arrays):
+        self._remember(index, part, arrays)
+        if self.directory is None:
+            return
+        path = self._path(index, part)
+        partial = f'{path}.{os.getpid()}.{threading.get_ident()}.partial.npz'
+        try:
+            np.savez(partial, **arrays)
+            os.replace(partial, path)
+        except OSError as e:
+            print_manager.warning(f"Could not write VDF tile {path}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+
+    def _remember(self, index, part, arrays):
+        with self._lock:
+            self._memory.setdefault(index, {})[part] = arrays
+            self._memory.move_to_end(index)
+            while len(self._memory) > self._memory_slices:
+                self._memory.popitem(last=False)
+
+
+class TilePrecomputer:
+    """
+    Background filling of a ``VDFTileCache``, outward from the slider position.
+
+    Parameters
+    ----------
+    cache : VDFTileCache
+    n_times : int
+        Number of time slices (slider positions).
+    compute : callable
+        ``compute(index) -> {mode: tile}`` for all of ``modes``. Calls are
+        serialized: the CDF reader behind it is shared and not assumed to be
+        thread-safe.
+    modes : sequence of str
+        Viz modes each slice is rendered for.
+    """
+
+    def __init__(self, cache, n_times, compute, modes=VIZ_MODES):
+        self.cache = cache
+        self.n_times = n_times
+        self.compute = compute
+        self.modes = tuple(modes)
+        self._focus = 0
+        self._done = set()
+        self._failed = set()
+        self._in_progress = set()
+        self._condition = threading.Condition()
+        self._compute_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+
+    # --- Scheduling ---
+    def focus(self, index):
+        """Make the background thread continue outward from ``index``."""
+        with self._condition:
+            self._focus = min(max(int(index), 0), self.n_times - 1)
+            self._condition.notify_all()
+
+    def _is_complete(self, index):
+        if index in self._done:
+            return True
+        if all((index, mode) in self.cache for mode in self.modes):
+            self._done.add(index)
+            return True
+        return False
+
+    def _next_index(self):
+        """Nearest slice to the focus that is neither cached nor being computed (ties: later first)."""
+        for distance in range(self.n_times):
+            for index in (self._focus + distance, self._focus - distance):
+                if (0 <= index < self.n_times and index not in self._in_progress
+                        and index not in self._failed and not self._is_complete(index)):
+                    return index
+        return None
+
+    def start(self, focus=0):
+        """Start the background thread (no-op if running)."""
+        self.focus(focus)
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='vdf-tile-precompute', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Stop after the slice being computed, if any."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                index = None if self._stopped else self._next_index()
+                if index is None:
+                    if self._stopped or len(self._done) + len(self._failed) >= self.n_times:
+                        return
+                    self._condition.wait()
+                    continue
+                self._in_progress.add(index)
+            self._compute_and_store(index)
+
+    # --- Tiles ---
+    def _compute_and_store(self, index):
+        """Compute one slice (caller has marked it in progress) and store its tiles."""
+        tiles = None
+        try:
+            with self._compute_lock:
+                tiles = self.compute(index)
+            for mode, tile in tiles.items():
+                self.cache.put(index, mode, tile)
+        except Exception as e:
+            print_manager.warning(f"VDF tile precompute failed for slice {index}: {e}")
+        with self._condition:
+            self._in_progress.discard(index)
+            (self._done if tiles is not None else self._failed).add(index)
+            self._condition.notify_all()
+        return tiles
+
+    def get_or_compute(self, index, mode):
+        """
+        The tile for ``index`` and ``mode``: from the cache, from the
+        background thread if it is computing this slice, or computed now.
+        """
+        tile = self.cache.get(index, mode)
+        if tile is not None:
+            return tile
+        with self._condition:
+            while index in self._in_progress:
+                self._condition.wait()
+            tile = self.cache.get(index, mode)
+            if tile is not None:
+                return tile
+            self._failed.discard(index)
+            self._in_progress.add(index)
+        tiles = self._compute_and_store(index)
+        if tiles is None or mode not in tiles:
+            raise RuntimeError(f"Could not compute VDF slice {index} ({mode})")
+        return tiles[mode]
@@ -390,3 +390,122 @@ def test_audify_uses_existing_encounter_dir(): # No monkeypatch needed
             shutil.rmtree(base_temp_dir)
         except Exception as e:
             print(f"Error cleaning up base temp dir {base_temp_dir}: {e}")
+
+def _stream_component(values, name):
+    """Minimal component for the streaming writer: an ndarray carrying a subclass_name."""
+    component = np.asarray(values).view(plot_manager)
+    component.subclass_name = name
+    return component
+
+def test_streaming_export_matches_in_memory_normalization():
+    """Chunked two-pass export gives the same samples as normalize_to_int16 + apply_fade."""
+    from plotbot.audifier import _ChunkedSource
+    audifier = Audifier()
+    rng = np.random.default_rng(3)
+    n = 10_000
+    left = np.cumsum(rng.normal(size=n))
+    right = np.sin(np.arange(n) / 50.0) * 7
+    # NaN runs that start before and end after chunk boundaries, plus NaN edges
+    left[:5] = np.nan
+    left[995:1010] = np.nan
+    left[2990:4020] = np.nan
+    left[-3:] = np.nan
+    indices = np.arange(100, n - 100)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for fade in (0, 700):
+            audifier.fade_samples = fade
+            audifier.chunk_samples = 1000
+            path = os.path.join(temp_dir, f'mono_{fade}.wav')
+            audifier._write_streaming_wav(path, [_ChunkedSource(_stream_component(left, 'br'), indices)])
+            _, streamed = wavfile.read(path)
+            expected = audifier.normalize_to_int16(left[indices])
+            if fade:
+                expected = audifier.apply_fade(expected)
+            np.testing.assert_array_equal(streamed, expected)
+
+            path = os.path.join(temp_dir, f'stereo_{fade}.wav')
+            sources = [_ChunkedSource(_stream_component(v, name), indices)
+                       for v, name in ((left, 'br'), (right, 'bt'))]
+            audifier._write_streaming_wav(path, sources)
+            _, streamed = wavfile.read(path)
+            expected = np.column_stack((audifier.normalize_to_int16(left[indices]),
+                                        audifier.normalize_to_int16(right[indices])))
+            if fade:
+                expected = audifier.apply_fade(expected)
+            np.testing.assert_array_equal(streamed, expected)
+
+        # Interleaved multichannel output
+        audifier.fade_samples = 0
+        path = os.path.join(temp_dir, 'three.wav')
+        sources = [_ChunkedSource(_stream_component(v, name), indices)
+                   for v, name in ((left, 'br'), (right, 'bt'), (-right, 'bn'))]
+        audifier._write_streaming_wav(path, sources)
+        _, streamed = wavfile.read(path)
+        assert streamed.shape == (len(indices), 3)
+        np.testing.assert_array_equal(streamed[:, 2], audifier.normalize_to_int16(-right[indices]))
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_streaming_export_percentile_normalization_clips_outliers():
+    from plotbot.audifier import _ChunkedSource
+    audifier = Audifier()
+    audifier.chunk_samples = 512
+    data = np.linspace(-1, 1, 5000)
+    data[2500] = 1000.0  # single spike
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, 'pct.wav')
+        audifier._write_streaming_wav(path, [_ChunkedSource(_stream_component(data, 'br'), np.arange(5000))],
+                                      norm_percentile=99.0)
+        _, streamed = wavfile.read(path)
+        assert streamed[2500] == 32767
+        # without clipping the spike would squash the ramp into a tiny range
+        assert streamed[:2400].min() == -32767
+        assert streamed[4900] > 30000
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_generate_markers_vectorized_grid():
+    """Markers are placed at start + k * interval and mapped to sample numbers by binary search."""
+    audifier = Audifier()
+    audifier.markers_per_hour = 4
+    audifier.quantize_markers = False
+    times = np.arange(np.datetime64('2023-09-28T06:00:00'), np.datetime64('2023-09-28T07:00:01'),
+                      np.timedelta64(1, 's')).astype('datetime64[ns]')
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = audifier.generate_markers(times, ['2023-09-28/06:00:00.000', '2023-09-28/07:00:00.000'], temp_dir)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        # 1 hour split into markers_per_hour intervals -> 5 markers, the last one on the final sample
+        assert [line.split('\t')[1] for line in lines] == ['0', '900', '1800', '2700', '3600']
+        assert lines[1].startswith('06:15:00 (2023-09-28)')
+
+        audifier.quantize_markers = True
+        audifier.markers_per_hour = 1
+        path = audifier.generate_markers(times[600:], ['2023-09-28/06:10:00.000', '2023-09-28/07:00:00.000'], temp_dir)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        # Grid anchored at midnight: only the 07:00 marker falls inside the range
+        assert lines == ['07:00:00 (2023-09-28)\t3000']
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_clip_slices_are_shared_per_time_base():
+    audifier = Audifier()
+    times_a = np.arange(np.datetime64('2023-09-28T00:00:00'), np.datetime64('2023-09-28T01:00:00'),
+                        np.timedelta64(1, 's')).astype('datetime64[ns]')
+    times_b = times_a[::10].copy()
+
+    class _Component:
+        def __init__(self, datetime_array):
+            self.datetime_array = datetime_array
+
+    a1, a2, b1 = _Component(times_a), _Component(times_a), _Component(times_b)
+    slices = audifier.clip_slices([a1, b1, a2], ['2023-09-28/00:10:00.000', '2023-09-28/00:20:00.000'])
+    assert slices[0] == slices[2] == slice(600, 1201)
+    assert slices[1] == slice(60, 121)
+    np.testing.assert_array_equal(audifier.clip_data_to_range([a1], ['2023-09-28/00:10:00.000', '2023-09-28/00:20:00.000']),
+                                  np.arange(600, 1201))
@@ -0,0 +1,107 @@
+"""
+Tests for the benchmarks/ performance suite infrastructure.
+
+Covers the regression comparison against a stored baseline and checks that the
+synthetic PSP CDF fixtures are readable by plotbot's own CDF import path, fully
+offline.
+
+To run:
+    python -m pytest tests/test_benchmark_harness.py -v
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.harness import BenchmarkCase, compare_to_baseline, run_case, save_baseline, load_baseline
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+
+def test_compare_flags_only_regressions_beyond_threshold_and_noise_floor():
+    baseline = {'results': {
+        'slow_now': {'seconds': 1.0, 'peak_mb': 100.0},
+        'noise_only': {'seconds': 0.001, 'peak_mb': 0.5},
+        'memory_growth': {'seconds': 1.0, 'peak_mb': 100.0},
+        'custom_threshold': {'seconds': 1.0, 'threshold': 1.0},
+    }}
+    results = {
+        'slow_now': {'seconds': 1.5, 'peak_mb': 100.0},
+        'noise_only': {'seconds': 0.004, 'peak_mb': 1.5},      # 4x but below the absolute floors
+        'memory_growth': {'seconds': 1.0, 'peak_mb': 180.0},
+        'custom_threshold': {'seconds': 1.8},                   # within its own 100% allowance
+        'new_case': {'seconds': 10.0},                          # no baseline entry -> never a regression
+        'broken': {'error': 'RuntimeError: boom'},
+    }
+
+    regressions = compare_to_baseline(results, baseline, threshold=0.25)
+    flagged = {(r['name'], r['metric']) for r in regressions}
+
+    assert flagged == {('slow_now', 'seconds'), ('memory_growth', 'peak_mb'), ('broken', 'error')}
+
+
+def test_run_case_reports_median_and_peak_memory():
+    calls = []
+
+    def setup(session):
+        calls.append('setup')
+
+    def allocate(session):
+        calls.append('run')
+        buf = np.ones(2_000_000)  # 16 MB
+        return {'checksum': float(buf[:10].sum())}
+
+    result = run_case(BenchmarkCase('alloc', allocate, repeats=3, setup=setup), session=None)
+
+    assert result['repeats'] == 3
+    assert result['seconds'] >= result['min_seconds'] > 0
+    assert result['peak_mb'] >= 15.0
+    assert result['checksum'] == 10.0
+    # setup runs before each timed run and before the memory run
+    assert calls == ['setup', 'run'] * 4
+
+
+def test_baseline_round_trip():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'baseline.json')
+        save_baseline(path, {'ok': {'seconds': 0.5}, 'bad': {'error': 'x'}}, params={'hours': 0.5})
+        baseline = load_baseline(path)
+        assert baseline['params'] == {'hours': 0.5}
+        assert list(baseline['results']) == ['ok']
+        assert load_baseline(os.path.join(tmp_dir, 'missing.json')) == {}
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_synthetic_fixtures_import_through_plotbot():
+    from plotbot import config
+    from plotbot.data_import import import_data_function
+
+    tmp_dir = tempfile.mkdtemp()
+    original_data_dir = config.data_dir
+    try:
+        written = generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.05,
+                                    products=['mag_RTN', 'spi_sf00_l3_mom'])
+        assert all(os.path.exists(p) for paths in written.values() for p in paths)
+
+        config.data_dir = tmp_dir
+        trange = ['2023-09-28/00:00:00.000', '2023-09-28/00:03:00.000']
+
+        mag = import_data_function(trange, 'mag_RTN')
+        assert mag is not None
+        field = mag.data['psp_fld_l2_mag_RTN']
+        assert field.shape[1] == 3
+        assert len(mag.times) == field.shape[0]
+        cadence_s = np.median(np.diff(mag.times)) / 1e9
+        assert cadence_s == pytest.approx(1 / 292.97, rel=1e-3)
+        assert np.isnan(field).any()  # FILLVAL samples come back as NaN
+
+        mom = import_data_function(trange, 'spi_sf00_l3_mom')
+        assert mom is not None
+        assert mom.data['EFLUX_VS_ENERGY'].shape[1] == 32
+    finally:
+        config.data_dir = original_data_dir
+        shutil.rmtree(tmp_dir)
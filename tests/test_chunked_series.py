@@ -0,0 +1,145 @@
+"""
+Tests for chunked time-series storage (plotbot/chunked_series.py) and its use
+by data_cubby merges.
+
+Inserting a chunk copies nothing; consolidation copies only the chunks added
+since the last one. Pipeline data come from the offline synthetic PSP CDFs in
+benchmarks/.
+
+To run:
+    python -m pytest tests/test_chunked_series.py -v
+"""
+
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot.chunked_series import ChunkedSeries
+
+
+def _chunk(first_second, n, bins=3):
+    times = (np.arange(first_second, first_second + n) * 10**9).astype('datetime64[ns]')
+    return times, {'x': np.arange(first_second, first_second + n, dtype=np.float32),
+                   'spectrum': np.repeat(np.arange(first_second, first_second + n)[:, None], bins, axis=1)}
+
+
+def test_appends_copy_only_the_new_chunk():
+    series = ChunkedSeries(*_chunk(0, 100))
+    series.insert(*_chunk(100, 100))
+    times, data = series.consolidate()
+    new_times, new_data = _chunk(200, 50)
+    assert series.insert(new_times, new_data)
+    assert series.consolidate()[1]['x'] is not data['x']
+
+    merged_times, merged = series.consolidate()
+    assert np.shares_memory(merged['x'], data['x'])          # fits the spare capacity: no reallocation
+    assert not np.shares_memory(merged['x'], new_data['x'])
+    np.testing.assert_array_equal(merged_times, _chunk(0, 250)[0])
+    np.testing.assert_array_equal(merged['spectrum'], _chunk(0, 250)[1]['spectrum'])
+    np.testing.assert_array_equal(data['x'], np.arange(200))   # earlier arrays unchanged
+    assert series.consolidate()[0] is merged_times
+
+
+def test_gaps_fill_and_earlier_arrays_are_never_rewritten():
+    series = ChunkedSeries(*_chunk(0, 10))
+    assert series.insert(*_chunk(50, 10))
+    first_times, first = series.consolidate()
+    assert series.insert(*_chunk(20, 10))     # between the two
+    assert series.insert(*_chunk(-30, 5))     # before everything
+    times, data = series.consolidate()
+
+    expected = np.concatenate([np.arange(-30, -25), np.arange(10), np.arange(20, 30), np.arange(50, 60)])
+    np.testing.assert_array_equal(data['x'], expected)
+    assert np.all(np.diff(times.astype(np.int64)) > 0)
+    np.testing.assert_array_equal(first['x'], np.concatenate([np.arange(10), np.arange(50, 60)]))
+    assert series.n_chunks == 4
+
+
+@pytest.mark.parametrize('first_second', [5, -5, 59], ids=['inside', 'touching_start', 'touching_end'])
+def test_overlapping_or_mismatched_chunks_are_refused(first_second):
+    series = ChunkedSeries(*_chunk(0, 10))
+    assert series.insert(*_chunk(50, 10))
+    times, data = series.consolidate()
+    assert not series.insert(*_chunk(first_second, 10))
+    assert not series.insert(*_chunk(20, 5, bins=4))
+    assert not series.insert(_chunk(20, 5)[0], {'x': _chunk(20, 5)[1]['x']})
+    assert series.consolidate()[0] is times and series.n_chunks == 2
+
+
+def test_lookup_and_windows_use_the_overlapping_chunks_only():
+    series = ChunkedSeries(*_chunk(0, 100))
+    for start in (100, 200, 300):
+        series.insert(*_chunk(start, 100))
+    second = lambda s: np.datetime64(s, 's').astype('datetime64[ns]')
+
+    assert series.locate(second(250)) == 2
+    assert series.locate(second(-1)) == -1
+
+    times, data = series.window(second(110), second(150))
+    assert np.shares_memory(data['x'], series._chunks[1][1]['x'])   # inside one chunk: a view
+    np.testing.assert_array_equal(data['x'], np.arange(110, 151))
+
+    times, data = series.window(second(150), second(250))
+    np.testing.assert_array_equal(data['spectrum'][:, 0], np.arange(150, 251))
+    assert len(series.window(second(1000), second(2000))[0]) == 0
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-10-03 00:00:00', hours=0.2, products=['mag_RTN'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        yield config
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+        _reset_mag_rtn()
+
+
+def _reset_mag_rtn():
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_tracker import global_tracker
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        ranges.pop('mag_rtn', None)
+        ranges.pop('mag_RTN', None)
+    instance = data_cubby.grab('mag_rtn')
+    type(instance).__init__(instance, None)
+
+
+def test_walking_forward_appends_chunks(fixture_dir):
+    import plotbot as pb
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn_class
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_import import import_data_function
+
+    _reset_mag_rtn()
+    steps = [f'2023-10-03/00:{minute:02d}:00.000' for minute in range(0, 12, 2)]
+    seen = []
+    for start, end in zip(steps, steps[1:]):
+        pb.get_data([start, end], pb.mag_rtn.br)
+        seen.append(pb.mag_rtn.raw_data['br'])
+
+    series = data_cubby.chunked_series.get(pb.mag_rtn)
+    assert series is not None and series.n_chunks == 5
+    reallocations = sum(not np.shares_memory(before, after) for before, after in zip(seen[1:], seen[2:]))
+    assert reallocations <= 2                                        # the rest went into spare capacity
+    assert pb.mag_rtn.br.view(np.ndarray).base is not None
+    assert pb.mag_rtn.time.base is not None                          # a view of datetime_array, not a copy
+
+    whole = mag_rtn_class(import_data_function([steps[0], steps[-1]], 'mag_RTN'))
+    np.testing.assert_array_equal(pb.mag_rtn.datetime_array, whole.datetime_array)
+    np.testing.assert_array_equal(pb.mag_rtn.raw_data['br'], whole.raw_data['br'])
+    np.testing.assert_array_equal(pb.mag_rtn.bmag.view(np.ndarray), whole.raw_data['bmag'])
+    assert pb.mag_rtn.raw_data['all'][0] is pb.mag_rtn.raw_data['br']
+
+    # the series' buffers are not pickled with the instance
+    assert len(pickle.dumps(pb.mag_rtn)) < 1.2 * len(pickle.dumps(whole))
@@ -0,0 +1,148 @@
+"""
+Tests for the columnar CSV cache (plotbot/csv_cache.py) and the CSV-backed
+branches of import_data_function that use it.
+
+The FITS test writes a synthetic sf00 CSV and compares the import with the
+pandas / row-by-row TT2000 path the loader used before the cache.
+
+To run:
+    python -m pytest tests/test_csv_cache.py -v
+"""
+
+import os
+
+import cdflib
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotbot import csv_cache
+from plotbot.csv_cache import TT2000_FILL, load_csv_columns, unix_to_tt2000
+
+FITS_COLUMNS = ['time', 'np1', 'np2', 'Tperp1', 'Tperp2', 'Trat1', 'Trat2', 'vdrift',
+                'B_inst_x', 'B_inst_y', 'B_inst_z', 'vp1_x', 'vp1_y', 'vp1_z', 'chi']
+
+
+def _row_by_row_tt2000(seconds):
+    """The conversion the CSV loaders did before the cache."""
+    stamps = pd.to_datetime(pd.Series(seconds), unit='s').to_numpy()
+    components = [[dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, int(dt.microsecond / 1000)]
+                  for dt in stamps.astype('datetime64[us]').tolist()]
+    return np.asarray(cdflib.cdfepoch.compute_tt2000(components), dtype=np.int64)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'cache'
+    monkeypatch.setattr(csv_cache, 'DEFAULT_CACHE_DIR', str(directory))
+    return directory
+
+
+def _write_fits_csv(path, day_start, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(day_start).timestamp()
+    frame = pd.DataFrame({name: rng.normal(size=n_rows) for name in FITS_COLUMNS[1:]})
+    frame.insert(0, 'time', start + np.sort(rng.uniform(0, 86400, n_rows)))
+    frame['B_SC_x'] = rng.normal(size=n_rows)          # unused columns are cached too
+    frame.to_csv(path, index=False)
+
+
+def test_tt2000_matches_the_row_by_row_conversion_across_a_leap_second():
+    leap = pd.Timestamp('2017-01-01').timestamp()
+    seconds = np.concatenate([leap + np.linspace(-5, 5, 41), [1.6e9 + 0.1234567, 1.7e9 + 0.9999]])
+    tt2000, valid = unix_to_tt2000(seconds)
+    assert valid.all()
+    np.testing.assert_array_equal(tt2000, _row_by_row_tt2000(seconds))
+
+    tt2000, valid = unix_to_tt2000(np.array([1.6e9, np.nan]))
+    assert list(valid) == [True, False]
+    assert tt2000[1] == TT2000_FILL
+
+
+def test_second_load_is_memory_mapped_and_edits_invalidate(tmp_path, cache_dir, monkeypatch):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'time': [1.6e9, 1.6e9 + 1, 1.6e9 + 2], 'x': [1.0, 2.0, 3.0], 'flag': ['a', 'b', 'c']}).to_csv(path, index=False)
+    first = load_csv_columns(str(path), time_column='time')
+
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: pytest.fail('cache hit expected'))
+    second = load_csv_columns(str(path), time_column='time')
+    assert isinstance(second['x'], np.memmap) and isinstance(second.tt2000, np.memmap)
+    np.testing.assert_array_equal(second.tt2000, first.tt2000)
+    assert list(second['flag']) == ['a', 'b', 'c']
+    assert second.window(first.tt2000[1], first.tt2000[2]) == slice(1, 3)
+    pd.testing.assert_frame_equal(second.to_frame(), read_csv(path))
+
+    monkeypatch.setattr(pd, 'read_csv', read_csv)
+    pd.DataFrame({'time': [1.6e9], 'x': [9.0], 'flag': ['z']}).to_csv(path, index=False)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert list(load_csv_columns(str(path), time_column='time')['x']) == [9.0]
+
+
+def test_incomplete_cache_directory_is_repaired(tmp_path, cache_dir, monkeypatch):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'time': [1.6e9, 1.6e9 + 1], 'x': [1.0, 2.0]}).to_csv(path, index=False)
+    load_csv_columns(str(path), time_column='time')
+    (entry,) = os.listdir(cache_dir)
+    os.remove(cache_dir / entry / 'columns.json')              # interrupted write
+
+    assert list(load_csv_columns(str(path), time_column='time')['x']) == [1.0, 2.0]
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: pytest.fail('cache hit expected'))
+    assert isinstance(load_csv_columns(str(path), time_column='time')['x'], np.memmap)
+
+
+def test_unwritable_cache_falls_back_to_memory(tmp_path, monkeypatch):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'x': [1, 2]}).to_csv(path, index=False)
+    blocker = tmp_path / 'not_a_dir'
+    blocker.write_text('')
+    monkeypatch.setattr(csv_cache, 'DEFAULT_CACHE_DIR', str(blocker / 'cache'))
+    columns = load_csv_columns(str(path))                # the cache root can't be created
+    assert list(columns['x']) == [1, 2]
+    assert not isinstance(columns['x'], np.memmap)
+    assert sorted(os.listdir(tmp_path)) == ['data.csv', 'not_a_dir']
+
+
+def test_fits_import_matches_the_pandas_path(tmp_path, cache_dir, monkeypatch):
+    from plotbot.data_classes.data_types import data_types
+    from plotbot.data_import import import_data_function
+
+    fits_dir = tmp_path / 'sf00'
+    fits_dir.mkdir()
+    paths = [fits_dir / 'spp_swp_spi_sf00_2024-09-30_v00.csv', fits_dir / 'spp_swp_spi_sf00_2024-10-01_v00.csv']
+    _write_fits_csv(paths[0], '2024-09-30', 3000, seed=1)
+    _write_fits_csv(paths[1], '2024-10-01', 2000, seed=2)
+    monkeypatch.setitem(data_types['sf00_fits'], 'local_path', str(fits_dir))
+
+    trange = ['2024-09-30/12:00:00', '2024-10-01/06:00:00']
+    first = import_data_function(trange, 'fits_calculated')
+    cached = import_data_function(trange, 'fits_calculated')
+
+    expected = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    expected_times = _row_by_row_tt2000(expected['time'].to_numpy())
+    order = np.argsort(expected_times)
+    for data_obj in (first, cached):
+        np.testing.assert_array_equal(data_obj.times, expected_times[order])
+        assert sorted(data_obj.data) == sorted(FITS_COLUMNS[1:])
+        for name in FITS_COLUMNS[1:]:
+            np.testing.assert_array_equal(data_obj.data[name], expected[name].to_numpy()[order])
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_fits_rows_without_a_time_are_dropped(tmp_path, cache_dir, monkeypatch):
+    from plotbot.data_classes.data_types import data_types
+    from plotbot.data_import import import_data_function
+
+    fits_dir = tmp_path / 'sf00'
+    fits_dir.mkdir()
+    path = fits_dir / 'spp_swp_spi_sf00_2024-09-30_v00.csv'
+    _write_fits_csv(path, '2024-09-30', 100)
+    frame = pd.read_csv(path)
+    frame.loc[[5, 50], 'time'] = np.nan
+    frame.to_csv(path, index=False)
+    monkeypatch.setitem(data_types['sf00_fits'], 'local_path', str(fits_dir))
+
+    data_obj = import_data_function(['2024-09-30/00:00:00', '2024-09-30/23:59:59'], 'fits_calculated')
+    kept = pd.read_csv(path).drop(index=[5, 50])
+    np.testing.assert_array_equal(data_obj.times, _row_by_row_tt2000(kept['time'].to_numpy()))
+    np.testing.assert_array_equal(data_obj.data['np1'], kept['np1'].to_numpy())
@@ -0,0 +1,155 @@
+"""
+Tests for fused custom variable expressions (plotbot/data_classes/custom_expression.py).
+
+plot_manager operations record an expression tree; custom variables compile it
+once and re-evaluate new tranges in a single pass. Data come from the offline
+synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_custom_expression.py -v
+"""
+
+import gc
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+FULL_TRANGE = ['2023-09-28/00:00:00.000', '2023-09-28/00:06:00.000']
+WINDOWS = [['2023-09-28/00:01:00.000', '2023-09-28/00:02:00.000'],
+           ['2023-09-28/00:04:00.000', '2023-09-28/00:05:30.000']]
+
+
+@pytest.fixture(scope='module')
+def loaded():
+    import plotbot as pb
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1,
+                          products=['mag_RTN', 'spi_sf00_l3_mom'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        pb.get_data(FULL_TRANGE, pb.mag_rtn.br, pb.mag_rtn.bt, pb.mag_rtn.bmag, pb.proton.anisotropy)
+        yield pb, pb.data_cubby.grab('custom_variables')
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+
+
+def _values(variable):
+    return np.asarray(variable.view(np.ndarray))
+
+
+def _evaluate(container, name, trange):
+    from plotbot.data_tracker import global_tracker
+    global_tracker.clear_calculation_cache('custom_data_type', name)
+    return container.evaluate(name, trange)
+
+
+def test_lambda_is_captured_and_reevaluated_fused(loaded):
+    pb, container = loaded
+    calls = []
+
+    def ratio_sq():
+        calls.append(1)
+        return (pb.mag_rtn.br / pb.mag_rtn.bmag) ** 2 + 1
+
+    pb.custom_variable('fused_ratio_sq', ratio_sq)
+
+    first = _evaluate(container, 'fused_ratio_sq', WINDOWS[0])
+    compiled = container.expressions['fused_ratio_sq']
+    assert compiled is not None
+    assert compiled.sources == ['mag_rtn.br', 'mag_rtn.bmag']
+    calls.clear()
+
+    for window in WINDOWS:
+        result = _evaluate(container, 'fused_ratio_sq', window)
+        times = np.asarray(pb.mag_rtn.br.plot_config.datetime_array)
+        start, end = (np.datetime64(t.replace('/', 'T')) for t in window)
+        mask = (times >= start) & (times <= end)
+        expected = (pb.mag_rtn.raw_data['br'][mask] / pb.mag_rtn.raw_data['bmag'][mask]) ** 2 + 1
+        np.testing.assert_array_equal(result.plot_config.datetime_array, times[mask])
+        np.testing.assert_allclose(_values(result), expected, rtol=1e-12)
+    np.testing.assert_array_equal(_values(first), _values(_evaluate(container, 'fused_ratio_sq', WINDOWS[0])))
+    assert not calls  # the lambda itself only ran for the first evaluation
+
+
+def test_mixed_cadence_direct_expression_matches_lambda(loaded):
+    pb, container = loaded
+    # defined right after loading, before any evaluation has clipped the sources
+    for source in (pb.proton.anisotropy, pb.mag_rtn.bmag):
+        source.requested_trange = FULL_TRANGE
+    pb.custom_variable('aniso_direct', (pb.proton.anisotropy / pb.mag_rtn.bmag) ** 2 + 1)
+    pb.custom_variable('aniso_lambda', lambda: (pb.proton.anisotropy / pb.mag_rtn.bmag) ** 2 + 1)
+    assert container.expressions['aniso_direct'] is not None
+
+    window = WINDOWS[1]
+    by_operators = _evaluate(container, 'aniso_lambda', window)   # first run: operator by operator
+    fused = _evaluate(container, 'aniso_direct', window)
+    assert len(fused) == len(pb.proton.anisotropy.data) or len(fused) == len(by_operators)
+    np.testing.assert_array_equal(fused.plot_config.datetime_array, by_operators.plot_config.datetime_array)
+    np.testing.assert_allclose(_values(fused), _values(by_operators), rtol=1e-12, equal_nan=True)
+
+
+def test_untracked_steps_keep_operator_evaluation(loaded):
+    pb, container = loaded
+    pb.custom_variable('not_fusable', lambda: np.clip(pb.mag_rtn.br, -1.0, 1.0) * 2)
+
+    for window in WINDOWS:
+        result = _evaluate(container, 'not_fusable', window)
+        assert result is not None and len(result) > 0
+    assert container.expressions['not_fusable'] is None
+
+
+def test_kernel_matches_numpy_evaluation(loaded, monkeypatch):
+    pb, container = loaded
+    from plotbot.data_classes import custom_expression
+
+    pb.custom_variable('kernel_check', lambda: 2 / np.sqrt(pb.mag_rtn.br ** 2 + pb.mag_rtn.bt ** 2) - pb.mag_rtn.bmag)
+    _evaluate(container, 'kernel_check', WINDOWS[0])
+    compiled = container.expressions['kernel_check']
+    assert compiled is not None
+
+    rng = np.random.default_rng(0)
+    arrays = [rng.normal(size=5000) for _ in compiled.sources]
+    arrays[0][:10] = 0.0
+    arrays[1][:10] = 0.0  # 2 / 0 maps to NaN like scalar division in plot_manager
+    expected = compiled.run(arrays)
+    assert np.isnan(expected[:10]).all()
+
+    monkeypatch.setattr(custom_expression, 'FUSED_KERNEL_MIN_SAMPLES', 0)
+    np.testing.assert_allclose(compiled.run(arrays), expected, rtol=1e-12, equal_nan=True)
+    assert ('numba', compiled.signature) in custom_expression._KERNEL_CACHE
+
+
+def test_redefining_a_variable_drops_its_compiled_expression(loaded):
+    pb, container = loaded
+    pb.custom_variable('redefined', lambda: pb.mag_rtn.br * 2)
+    _evaluate(container, 'redefined', WINDOWS[0])
+    assert container.expressions['redefined'] is not None
+
+    pb.custom_variable('redefined', lambda: pb.mag_rtn.br * 3)
+    assert 'redefined' not in container.expressions
+    result = _evaluate(container, 'redefined', WINDOWS[0])
+    times = np.asarray(pb.mag_rtn.br.plot_config.datetime_array)
+    start, end = (np.datetime64(t.replace('/', 'T')) for t in WINDOWS[0])
+    mask = (times >= start) & (times <= end)
+    np.testing.assert_allclose(_values(result), pb.mag_rtn.raw_data['br'][mask] * 3)
+
+
+def test_captured_trees_do_not_keep_sources_alive():
+    from plotbot.plot_manager import plot_manager
+    from plotbot.plot_config import plot_config
+
+    source = plot_manager(np.arange(10.0), plot_config=plot_config(class_name='mag_rtn', subclass_name='br'))
+    tree = (source * 2).__dict__['_expr']
+    assert tree.sources()[0].source() is source
+    del source
+    gc.collect()
+    assert tree.sources()[0].source() is None
@@ -0,0 +1,105 @@
+"""
+Tests for trange pushdown in CustomVariablesContainer.evaluate.
+
+Sources are clipped to the requested trange plus an interpolation margin
+before the expression runs, so the lambda only ever sees the window. Data
+come from the offline synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_custom_variable_pushdown.py -v
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+FULL_TRANGE = ['2023-09-28/00:00:00.000', '2023-09-28/00:06:00.000']
+WINDOW = ['2023-09-28/00:02:00.000', '2023-09-28/00:03:00.000']
+
+
+@pytest.fixture(scope='module')
+def loaded_mag_rtn():
+    import plotbot as pb
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1, products=['mag_RTN'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        pb.get_data(FULL_TRANGE, pb.mag_rtn.br, pb.mag_rtn.bmag)
+        yield pb
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+
+
+def test_lambda_sees_only_the_padded_window(loaded_mag_rtn):
+    pb = loaded_mag_rtn
+    seen_lengths = []
+
+    def ratio():
+        seen_lengths.append(len(pb.mag_rtn.br.data))
+        return pb.mag_rtn.br / pb.mag_rtn.bmag
+
+    pb.custom_variable('pushdown_ratio', ratio)
+    container = pb.data_cubby.grab('custom_variables')
+    seen_lengths.clear()
+    result = container.evaluate('pushdown_ratio', WINDOW)
+
+    times = np.asarray(pb.mag_rtn.br.plot_config.datetime_array)
+    in_window = (times >= np.datetime64('2023-09-28T00:02:00')) & (times <= np.datetime64('2023-09-28T00:03:00'))
+    expected = pb.mag_rtn.raw_data['br'][in_window] / pb.mag_rtn.raw_data['bmag'][in_window]
+
+    # the expression ran on the window plus margin, not on the 6 minutes loaded
+    margin = container.interpolation_margin
+    padded = ((times >= np.datetime64('2023-09-28T00:02:00') - np.timedelta64(margin))
+              & (times <= np.datetime64('2023-09-28T00:03:00') + np.timedelta64(margin)))
+    assert seen_lengths and seen_lengths[-1] == padded.sum() < len(times)
+
+    np.testing.assert_array_equal(result.plot_config.datetime_array, times[in_window])
+    np.testing.assert_allclose(np.asarray(result.view(np.ndarray)), expected)
+
+
+def test_evaluation_window_covers_coarse_source_cadence(loaded_mag_rtn):
+    pb = loaded_mag_rtn
+    from plotbot.plot_config import plot_config
+    from plotbot.plot_manager import plot_manager
+
+    container = pb.data_cubby.grab('custom_variables')
+    assert container._evaluation_window(WINDOW, []) == [
+        '2023-09-28/00:01:30.000000', '2023-09-28/00:03:30.000000']
+
+    coarse_times = np.datetime64('2023-09-28T00:00:00', 'ns') + np.arange(10) * np.timedelta64(60, 's')
+    coarse = plot_manager(np.zeros(10), plot_config=plot_config(datetime_array=coarse_times))
+    start, end = container._evaluation_window(WINDOW, [coarse])
+    assert start == '2023-09-28/00:00:00.000000'
+    assert end == '2023-09-28/00:05:00.000000'
+
+
+@pytest.mark.parametrize('trange', [WINDOW, ['2023-09-27/00:00:00', '2023-09-27/01:00:00'],
+                                    ['2023-09-28/00:00:00.5', '2023-09-28/00:00:02.5']])
+def test_sorted_clip_matches_mask_clip(trange):
+    from plotbot.plot_config import plot_config
+    from plotbot.plot_manager import plot_manager
+
+    times = np.datetime64('2023-09-28T00:00:00', 'ns') + np.arange(600) * np.timedelta64(500, 'ms')
+    var = plot_manager(np.arange(600.0), plot_config=plot_config(datetime_array=times))
+    start, end = (np.datetime64(t.replace('/', 'T')) for t in trange)
+    mask = (times >= start) & (times <= end)
+
+    clipped_times, indices = var._clip_datetime_array_with_indices(times, trange)
+    np.testing.assert_array_equal(clipped_times, times[mask])
+    np.testing.assert_array_equal(indices, np.flatnonzero(mask))
+    np.testing.assert_array_equal(var.clip_to_original_trange(np.asarray(var), trange), np.arange(600.0)[mask])
+
+    # unsorted time bases still clip by mask
+    shuffled = times[::-1].copy()
+    reversed_var = plot_manager(np.arange(600.0)[::-1].copy(), plot_config=plot_config(datetime_array=shuffled))
+    np.testing.assert_array_equal(np.sort(reversed_var._clip_datetime_array_with_indices(shuffled, trange)[0]),
+                                  times[mask])
@@ -0,0 +1,166 @@
+"""
+Tests for lazily computed derived variables (plotbot/data_classes/_derived.py).
+
+proton and mag_rtn_4sa store only their imported arrays; derived quantities are
+computed on first access and stay pending across data_cubby merges. Data come
+from the offline synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_derived_variables.py -v
+"""
+
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+FIRST = ['2023-09-28/00:00:00.000', '2023-09-28/00:03:00.000']
+SECOND = ['2023-09-28/00:03:00.000', '2023-09-28/00:06:00.000']
+
+
+def _forget_tracked_ranges():
+    """Drop the tracker's proton/mag_rtn_4sa ranges left by other test modules (update() skips tracked ranges)."""
+    from plotbot.data_tracker import global_tracker
+    prefixes = ('proton', 'spi_sf00_l3_mom', 'mag_rtn_4sa', 'mag_RTN_4sa')
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        for key in [key for key in ranges if key.startswith(prefixes)]:
+            del ranges[key]
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1,
+                          products=['mag_RTN_4sa', 'spi_sf00_l3_mom'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        _forget_tracked_ranges()
+        yield config
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+        _forget_tracked_ranges()
+
+
+def _proton(trange):
+    from plotbot.data_classes.psp_proton import proton_class
+    from plotbot.data_import import import_data_function
+    return proton_class(import_data_function(trange, 'spi_sf00_l3_mom'))
+
+
+def _eager_proton(instance):
+    """The formulas proton_class evaluated eagerly before derived variables were lazy."""
+    raw, mag_field, temp_tensor = instance.raw_data, instance.mag_field, instance.temp_tensor
+    b_mag = np.sqrt(np.sum(mag_field**2, axis=1))
+    t_par = []
+    t_perp = []
+    for i in range(len(mag_field)):
+        bx, by, bz = mag_field[i]
+        t_xx, t_yy, t_zz, t_xy, t_xz, t_yz = temp_tensor[i]
+        t_para = (bx**2 * t_xx + by**2 * t_yy + bz**2 * t_zz +
+                  2 * (bx*by*t_xy + bx*bz*t_xz + by*bz*t_yz)) / (bx**2 + by**2 + bz**2)
+        t_par.append(t_para)
+        t_perp.append((t_xx + t_yy + t_zz - t_para) / 2.0)
+    t_par, t_perp = np.array(t_par), np.array(t_perp)
+    density = raw['density']
+    v_sw = np.sqrt(raw['vr']**2 + raw['vt']**2 + raw['vn']**2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_alfven = np.where(density > 0, 21.8 * b_mag / np.sqrt(density), np.nan)
+    return {
+        't_par': t_par,
+        't_perp': t_perp,
+        'anisotropy': t_perp / t_par,
+        'bmag': b_mag,
+        'v_sw': v_sw,
+        'v_alfven': v_alfven,
+        'm_alfven': v_sw / v_alfven,
+        'beta_ppar': (4.03E-11 * density * t_par) / (1e-5 * b_mag)**2,
+        'pressure': 1.602E-4 * raw['temperature'] * density,
+    }
+
+
+def test_reading_one_variable_leaves_the_rest_pending(fixture_dir):
+    instance = _proton(FIRST)
+    assert instance.raw_data.pending() >= {'anisotropy', 'beta_ppar', 'm_alfven'}
+    assert 'anisotropy' in instance.raw_data.keys()
+
+    assert len(instance.density) == len(instance.datetime_array)
+    assert instance.raw_data.is_pending('anisotropy')
+
+    instance.m_alfven  # pulls in v_sw, v_alfven and bmag only
+    assert not instance.raw_data.is_pending('bmag')
+    assert instance.raw_data.is_pending('anisotropy')
+    assert instance.raw_data.is_pending('beta_ppar')
+
+
+def test_lazy_values_match_eager_formulas(fixture_dir):
+    instance = _proton(FIRST)
+    expected = _eager_proton(instance)
+    for name, values in expected.items():
+        manager = getattr(instance, name)
+        assert manager.plot_config.subclass_name == name
+        np.testing.assert_allclose(np.asarray(manager.view(np.ndarray)), values, rtol=1e-6, equal_nan=True)
+
+
+def test_mag_4sa_derived_components(fixture_dir):
+    from plotbot.data_classes.psp_mag_rtn_4sa import mag_rtn_4sa_class
+    from plotbot.data_import import import_data_function
+
+    instance = mag_rtn_4sa_class(import_data_function(FIRST, 'mag_RTN_4sa'))
+    assert instance.raw_data.pending() == {'bmag', 'pmag', 'b_phi'}
+    raw = instance.raw_data
+    bmag = np.sqrt(raw['br']**2 + raw['bt']**2 + raw['bn']**2)
+    np.testing.assert_allclose(np.asarray(instance.bmag.view(np.ndarray)), bmag)
+    np.testing.assert_allclose(raw['pmag'], bmag**2 / (2 * 4 * np.pi * 1e-7) * 1e-9, rtol=1e-6)
+    assert instance.raw_data.pending() == {'b_phi'}
+
+
+def test_merge_keeps_pending_entries_pending(fixture_dir):
+    from plotbot.data_cubby import data_cubby
+
+    first, second = _proton(FIRST), _proton(SECOND)
+    first.bmag  # computed on the existing side: derived for the new segment and appended
+    merged_times, merged = data_cubby._merge_arrays(first.datetime_array, first.raw_data,
+                                                    second.datetime_array, second.raw_data)
+    assert merged is not None
+    assert {'anisotropy', 'beta_pperp'} <= merged.pending()
+    assert not merged.is_pending('bmag')
+    assert not second.raw_data.is_pending('bmag')        # derived over the new segment only
+    assert second.raw_data.is_pending('anisotropy')
+    assert len(merged.inputs['mag_field']) == len(merged_times)
+
+    whole = _proton([FIRST[0], SECOND[1]])
+    _, unique = np.unique(whole.datetime_array, return_index=True)
+    for name in ('bmag', 'anisotropy', 'beta_pperp', 'density'):
+        np.testing.assert_allclose(merged[name], whole.raw_data[name][unique], rtol=1e-6, equal_nan=True)
+
+
+def test_pickling_materializes_every_entry(fixture_dir):
+    instance = _proton(FIRST)
+    restored = pickle.loads(pickle.dumps(instance.raw_data))
+    assert type(restored) is dict
+    assert set(restored) == set(instance.raw_data.keys())
+    assert not any(value is None or type(value).__name__ == '_Pending' for value in restored.values())
+    np.testing.assert_allclose(restored['t_par'], instance.raw_data['t_par'])
+
+
+def test_styling_survives_an_update_while_deferred(fixture_dir):
+    from plotbot.data_import import import_data_function
+
+    _forget_tracked_ranges()
+    instance = _proton(FIRST)
+    instance.anisotropy.color = 'red'
+    instance.update(import_data_function(SECOND, 'spi_sf00_l3_mom'))
+    assert instance.raw_data.is_pending('anisotropy')
+
+    instance.update(import_data_function(FIRST, 'spi_sf00_l3_mom'))
+    assert instance.anisotropy.color == 'red'
+    assert instance.anisotropy._plot_state['color'] == 'red'
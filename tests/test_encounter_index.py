@@ -0,0 +1,108 @@
+"""
+Tests for the encounter/perihelion index (plotbot/encounter_index.py) and the
+lookup functions built on it (get_encounter.get_encounter_number,
+utils.get_encounter_number, utils.get_perihelion_time).
+
+To run:
+    python -m pytest tests/test_encounter_index.py -v
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from plotbot.encounter_index import ENCOUNTERS, PERIHELION_TIMES, EncounterIndex, get_encounter_index
+
+
+def _scan_label(day):
+    """The linear scan the index replaced."""
+    for label, (start, stop) in ENCOUNTERS.items():
+        if start <= day <= stop:
+            return label
+    return 'Unknown_Encounter'
+
+
+def test_labels_of_an_array_match_a_linear_scan():
+    index = get_encounter_index()
+    times = np.arange(np.datetime64('2018-10-01T00:00', 'ns'), np.datetime64('2026-02-01T00:00', 'ns'),
+                      np.timedelta64(7, 'h'))
+    labels = index.encounter_labels(times)
+    expected = [_scan_label(str(t)[:10]) for t in times.astype('datetime64[D]')]
+    assert labels.tolist() == expected
+    numbers = index.encounter_numbers(times)
+    assert np.all((numbers == 0) == (labels == 'Unknown_Encounter'))
+    assert index.encounter_labels(np.array(['NaT'], dtype='datetime64[ns]')).tolist() == ['Unknown_Encounter']
+
+
+def test_end_days_are_inclusive():
+    index = get_encounter_index()
+    assert index.encounter('2023-11-22/23:59:59.999') == 'E17'
+    assert index.encounter('2023-11-23/00:00:00.000') == 'E18'
+    assert index.encounter('2026-01-13/00:00:00') is None
+    start, end = index.encounter_interval('E17')
+    assert start == np.datetime64('2023-08-17', 'ns') and end == np.datetime64('2023-11-23', 'ns')
+
+
+def test_nearest_perihelion_and_time_since():
+    index = get_encounter_index()
+    peri_17 = np.datetime64('2023-09-27T23:28', 'ns')
+    peri_18 = np.datetime64('2023-12-29T00:56', 'ns')
+    midpoint = peri_17 + (peri_18 - peri_17) // 2
+    times = np.array([peri_17 - np.timedelta64(1, 'D'), midpoint, midpoint + np.timedelta64(1, 'ns')])
+
+    np.testing.assert_array_equal(index.nearest_perihelion(times), [peri_17, peri_17, peri_18])   # ties go earlier
+    np.testing.assert_array_equal(index.nearest_perihelion_number(times), [17, 17, 18])
+    assert index.time_since_perihelion(times)[0] == -np.timedelta64(1, 'D')
+    assert index.perihelion_time_string('2023-10-01') == PERIHELION_TIMES[17]
+
+
+def test_wrappers_keep_their_return_conventions(capsys):
+    from plotbot.get_encounter import get_encounter_number as encounter_label
+    from plotbot.utils import get_encounter_number, get_perihelion_time
+
+    assert encounter_label('2023-09-28/06:00:00.000') == 'E17'
+    assert encounter_label(datetime(2023, 9, 28, 6)) == 'E17'
+    assert encounter_label(np.datetime64('2023-09-28T06:00')) == 'E17'
+    assert encounter_label('Sep 28 2023 6am') == 'E17'
+    assert encounter_label('2030-01-01') == 'Unknown_Encounter'
+    assert encounter_label('not a date') == 'Unknown_Encounter'
+
+    assert get_encounter_number('2023-09-28') == 'E17'
+    assert get_encounter_number('2030-01-01') is None
+    assert get_encounter_number('2023/09/28') is None
+    capsys.readouterr()
+
+    assert get_perihelion_time('2023-09-28/06:00:00.000') == '2023/09/27 23:28:00.000'
+    assert get_perihelion_time(datetime(2023, 9, 28, 6, tzinfo=timezone.utc)) == '2023/09/27 23:28:00.000'
+    assert get_perihelion_time('not a date') is None
+    assert get_perihelion_time(12345) is None
+
+
+def test_orbit_file_fills_in_missing_perihelia():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        times = np.arange(np.datetime64('2025-05-01', 'ns'), np.datetime64('2025-08-10', 'ns'),
+                          np.timedelta64(30, 'm'))
+        perihelion = np.datetime64('2025-06-19T01:30', 'ns')
+        hours = (times - perihelion) / np.timedelta64(1, 'h')
+        path = os.path.join(tmp_dir, 'psp_positional_data.npz')
+        np.savez(path, times=times, r_sun=9.86 + 1e-3 * hours ** 2,
+                 carrington_lon=np.zeros(len(times)), carrington_lat=np.zeros(len(times)))
+
+        index = EncounterIndex(orbit_path=path)
+
+        assert 24 in index.perihelion_numbers and 25 not in index.perihelion_numbers   # E25 not fully covered
+        assert index.perihelion_time_string('2025-06-20') == '2025/06/19 01:30:00.000'
+        assert index.nearest_perihelion(np.datetime64('2025-03-23', 'ns')) == np.datetime64('2025-03-22T22:42', 'ns')
+        assert EncounterIndex(orbit_path=os.path.join(tmp_dir, 'missing.npz')).perihelion_numbers.max() == 23
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_overlapping_ranges_are_refused():
+    with pytest.raises(ValueError):
+        EncounterIndex(encounters={'E1': ('2020-01-01', '2020-02-01'), 'E2': ('2020-02-01', '2020-03-01')})
@@ -0,0 +1,128 @@
+"""
+Tests for incremental merges in data_cubby.update_global_instance.
+
+Extending loaded data derives computed quantities for the new segment only and
+rebinds the existing plot_managers (same plot_config, same styling) instead of
+rebuilding them with set_plot_config(). Data come from the offline synthetic
+PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_incremental_merge.py -v
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+FIRST = ['2023-10-02/00:00:00.000', '2023-10-02/00:05:00.000']
+SECOND = ['2023-10-02/00:05:00.000', '2023-10-02/00:10:00.000']
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-10-02 00:00:00', hours=0.2,
+                          products=['mag_RTN', 'spi_sf00_l3_mom'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        yield config
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+        _reset(('mag_rtn', 'mag_RTN'), ('proton', 'spi_sf00_l3_mom'))
+
+
+def _reset(*data_types):
+    """Leave no 2023-10-02 data in the global instances for later test modules."""
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_tracker import global_tracker
+    for keys in data_types:
+        for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+            for key in keys:
+                ranges.pop(key, None)
+        instance = data_cubby.grab(keys[0])
+        type(instance).__init__(instance, None)
+
+
+def _in_window(times, trange):
+    start, end = (np.datetime64(t.replace('/', 'T')) for t in trange)
+    return (times >= start) & (times <= end)
+
+
+def test_merge_rebinds_plot_managers_and_keeps_styling(fixture_dir):
+    import plotbot as pb
+    from plotbot.data_import import import_data_function
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn_class
+
+    pb.get_data(FIRST, pb.mag_rtn.br)
+    pb.mag_rtn.br.color = 'purple'
+    br_config = pb.mag_rtn.br.plot_config
+    set_plot_config_calls = []
+    original = mag_rtn_class.set_plot_config
+    mag_rtn_class.set_plot_config = lambda self: (set_plot_config_calls.append(id(self)), original(self))[1]
+    try:
+        pb.get_data(SECOND, pb.mag_rtn.br)
+    finally:
+        mag_rtn_class.set_plot_config = original
+
+    assert id(pb.mag_rtn) not in set_plot_config_calls    # only the temporary instance was configured
+    assert pb.mag_rtn.br.plot_config is br_config
+    assert pb.mag_rtn.br.color == 'purple'
+    times = br_config.datetime_array
+    assert times is pb.mag_rtn.datetime_array
+    assert len(pb.mag_rtn.br.view(np.ndarray)) == len(times)
+
+    whole = mag_rtn_class(import_data_function([FIRST[0], SECOND[1]], 'mag_RTN'))
+    mask = _in_window(times, [FIRST[0], SECOND[1]])
+    whole_mask = _in_window(whole.datetime_array, [FIRST[0], SECOND[1]])
+    np.testing.assert_array_equal(times[mask], whole.datetime_array[whole_mask])
+    np.testing.assert_array_equal(pb.mag_rtn.br.view(np.ndarray)[mask], whole.raw_data['br'][whole_mask])
+    np.testing.assert_array_equal(pb.mag_rtn.bmag.view(np.ndarray)[mask], whole.raw_data['bmag'][whole_mask])
+
+
+def test_computed_derived_variables_extend_by_the_new_segment_only(fixture_dir, monkeypatch):
+    import plotbot as pb
+    from plotbot.data_classes import psp_proton
+
+    key = ('t_par', 't_perp', 'anisotropy')
+    lengths = []
+
+    def counting(raw_data):
+        lengths.append(len(raw_data.inputs['mag_field']))
+        return psp_proton._temperature_anisotropy(raw_data)
+
+    monkeypatch.setitem(psp_proton.proton_class.derived_variables, key, counting)
+    pb.get_data(FIRST, pb.proton.anisotropy)
+    pb.proton.anisotropy  # computed over the loaded data
+    loaded = len(pb.proton.datetime_array)
+    lengths.clear()
+
+    pb.get_data(SECOND, pb.proton.density)
+    added = len(pb.proton.datetime_array) - loaded
+    assert added > 0
+    assert not pb.proton.raw_data.is_pending('anisotropy')
+    assert lengths and max(lengths) < len(pb.proton.datetime_array)    # the new chunk, not the merged whole
+
+    expected = psp_proton._project_temperature(pb.proton.raw_data.inputs['mag_field'],
+                                               pb.proton.raw_data.inputs['temp_tensor'])[2]
+    np.testing.assert_allclose(pb.proton.anisotropy.view(np.ndarray), expected, rtol=1e-6, equal_nan=True)
+
+
+def test_spectral_time_mesh_follows_the_merge(fixture_dir):
+    import plotbot as pb
+
+    pb.get_data(FIRST, pb.proton.energy_flux)
+    pb.get_data(SECOND, pb.proton.energy_flux)
+    config = pb.proton.energy_flux.plot_config
+    mesh = config.datetime_array
+    assert mesh.shape == pb.proton.energy_flux.view(np.ndarray).shape
+    np.testing.assert_array_equal(mesh[:, 0], pb.proton.datetime_array)
+    assert config.additional_data is pb.proton.raw_data['ENERGY_VALS']
@@ -0,0 +1,215 @@
+"""
+Tests for the opt-in dask array backend (plotbot/lazy_arrays.py).
+
+The fixtures span two 6-hour mag_RTN files, so the lazy import has one chunk
+per file. Tests that need dask itself are skipped when it isn't installed; the
+rest check that the backend falls back to (and matches) the numpy path. Reads
+are counted by wrapping lazy_arrays.read_cdf_records, the task behind every
+lazy chunk.
+
+To run:
+    python -m pytest tests/test_lazy_arrays.py -v
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot import lazy_arrays
+
+TRANGE = ['2023-09-28/05:50:00.000', '2023-09-28/06:10:00.000']
+WINDOW = ['2023-09-28/06:01:00.000', '2023-09-28/06:02:00.000']
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server, config.array_backend)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 05:45:00', hours=0.5, products=['mag_RTN'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        yield config
+    finally:
+        config.data_dir, config.data_server, config.array_backend = original
+        shutil.rmtree(tmp_dir)
+
+
+def _import(config, backend, trange=TRANGE):
+    from plotbot.data_import import import_data_function
+    config.array_backend = backend
+    return import_data_function(trange, 'mag_RTN')
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """File names of the lazy chunks read, in order."""
+    names = []
+    read = lazy_arrays.read_cdf_records
+
+    def counting_read(file_path, *args):
+        names.append(os.path.basename(file_path))
+        return read(file_path, *args)
+
+    monkeypatch.setattr(lazy_arrays, 'read_cdf_records', counting_read)
+    return names
+
+
+def _reset_mag_rtn():
+    """Leave no 2023-09-28 mag_RTN data in the global instance for later tests."""
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_tracker import global_tracker
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        for key in ('mag_rtn', 'mag_RTN'):
+            ranges.pop(key, None)
+    instance = data_cubby.grab('mag_rtn')
+    type(instance).__init__(instance, None)
+
+
+def _in_window(datetimes, trange):
+    start, end = (np.datetime64(t.replace('/', 'T')) for t in trange)
+    return (datetimes >= start) & (datetimes <= end)
+
+
+def test_dask_backend_matches_numpy_backend(fixture_dir):
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn_class
+
+    eager = mag_rtn_class(_import(fixture_dir, 'numpy'))
+    lazy = mag_rtn_class(_import(fixture_dir, 'dask'))   # numpy fallback when dask is missing
+
+    np.testing.assert_array_equal(lazy.time, eager.time)
+    for key in ('br', 'bt', 'bn', 'bmag', 'pmag', 'b_phi'):
+        np.testing.assert_array_equal(lazy_arrays.materialize(lazy.raw_data[key])[0], eager.raw_data[key])
+        np.testing.assert_array_equal(getattr(lazy, key), getattr(eager, key))
+    np.testing.assert_array_equal(lazy.all, eager.all)
+
+
+def test_numpy_data_passes_through_unchanged():
+    from plotbot.data_import import DataObject
+
+    data_object = DataObject(times=np.arange(3), data={'x': np.ones(3), 'meta': None})
+    assert lazy_arrays.prepare_for(object(), data_object) is data_object
+    assert lazy_arrays.materialize(data_object.data['x'], None)[0] is data_object.data['x']
+
+
+def test_import_is_lazy_with_one_chunk_per_file(fixture_dir):
+    pytest.importorskip('dask')
+    data_object = _import(fixture_dir, 'dask')
+    field = data_object.data['psp_fld_l2_mag_RTN']
+
+    assert lazy_arrays.is_lazy(field)
+    assert len(field.chunks[0]) == 2
+    assert field.shape[0] == len(data_object.times)
+
+    eager = _import(fixture_dir, 'numpy').data['psp_fld_l2_mag_RTN']
+    np.testing.assert_array_equal(lazy_arrays.materialize(field)[0], eager)
+
+
+def test_compute_window_reads_only_the_window(fixture_dir):
+    pytest.importorskip('dask')
+    data_object = _import(fixture_dir, 'dask')
+    field = data_object.data['psp_fld_l2_mag_RTN']
+
+    window = lazy_arrays.compute_window(field, data_object.times, WINDOW)
+    eager = _import(fixture_dir, 'numpy')
+    times = eager.times
+    from plotbot.data_import import cdflib
+    start, end = (cdflib.cdfepoch.compute_tt2000([2023, 9, 28, 6, m, 0, 0]) for m in (1, 2))
+    mask = (times >= start) & (times <= end)
+    np.testing.assert_array_equal(window, eager.data['psp_fld_l2_mag_RTN'][mask])
+
+
+def test_non_lazy_classes_receive_numpy_arrays_of_the_request(fixture_dir, reads):
+    pytest.importorskip('dask')
+    data_object = _import(fixture_dir, 'dask')
+    eager = _import(fixture_dir, 'numpy')
+
+    class plain_class:
+        pass
+
+    prepared = lazy_arrays.prepare_for(plain_class(), data_object)
+    assert isinstance(prepared.data['psp_fld_l2_mag_RTN'], np.ndarray)
+    assert len(reads) == 2
+
+    del reads[:]
+    windowed = lazy_arrays.prepare_for(plain_class(), data_object, WINDOW)
+    assert reads == [reads[0]]                                  # the 06:00 file only
+    window = lazy_arrays.window_slice(eager.times, WINDOW)
+    np.testing.assert_array_equal(windowed.times, eager.times[window])
+    np.testing.assert_array_equal(windowed.data['psp_fld_l2_mag_RTN'], eager.data['psp_fld_l2_mag_RTN'][window])
+
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn_class
+    assert lazy_arrays.prepare_for(mag_rtn_class(None), data_object, WINDOW) is data_object
+
+
+def test_integer_fill_variables_match_the_numpy_dtype(fixture_dir, monkeypatch):
+    pytest.importorskip('dask')
+    from plotbot.data_classes.data_types import data_types
+    monkeypatch.setitem(data_types['mag_RTN'], 'data_vars', ['psp_fld_l2_mag_RTN', 'epoch_mag_RTN'])
+
+    eager = _import(fixture_dir, 'numpy').data['epoch_mag_RTN']    # int64 TT2000 with a FILLVAL, no fills
+    lazy = _import(fixture_dir, 'dask').data['epoch_mag_RTN']
+    assert eager.dtype == np.int64
+    assert lazy.dtype == eager.dtype
+    np.testing.assert_array_equal(lazy_arrays.materialize(lazy)[0], eager)
+
+
+def test_nothing_is_computed_before_clip_time(fixture_dir, reads):
+    pytest.importorskip('dask')
+    from plotbot import get_data
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn
+
+    _reset_mag_rtn()
+    fixture_dir.array_backend = 'dask'
+    try:
+        get_data(TRANGE, mag_rtn)
+        assert reads == []                                     # import and class update: epochs only
+        assert lazy_arrays.is_lazy(mag_rtn.raw_data['bmag'])
+
+        get_data(WINDOW, mag_rtn)                            # cached: points the class at the window
+        assert reads == []
+
+        bmag = mag_rtn.bmag                                    # built here, from the window only
+        bmag.requested_trange = WINDOW
+        assert len(reads) == 1 and reads[0].startswith('psp_fld_l2_mag_RTN_2023092806')
+
+        eager = _import(fixture_dir, 'numpy')
+        field = eager.data['psp_fld_l2_mag_RTN']
+        in_window = _in_window(np.array(mag_rtn.datetime_array), WINDOW)
+        np.testing.assert_allclose(bmag.data, np.sqrt((field[in_window] ** 2).sum(axis=1)), rtol=1e-6)
+        np.testing.assert_array_equal(bmag.datetime_array, mag_rtn.datetime_array[in_window])
+    finally:
+        _reset_mag_rtn()
+
+
+def test_lazy_merge_matches_the_numpy_merge(fixture_dir, reads):
+    pytest.importorskip('dask')
+    from plotbot import get_data
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn
+
+    first = [TRANGE[0], WINDOW[0]]
+    second = [WINDOW[0], TRANGE[1]]
+    merged = {}
+    for backend in ('numpy', 'dask'):
+        _reset_mag_rtn()
+        fixture_dir.array_backend = backend
+        try:
+            get_data(first, mag_rtn)
+            mag_rtn.br.color = 'purple'
+            get_data(second, mag_rtn)
+            get_data(TRANGE, mag_rtn)
+            merged[backend] = (np.array(mag_rtn.datetime_array), np.array(mag_rtn.bt), mag_rtn.bt.datetime_array,
+                               mag_rtn.br.color)
+        finally:
+            _reset_mag_rtn()
+
+    np.testing.assert_array_equal(merged['dask'][0], merged['numpy'][0])
+    np.testing.assert_array_equal(merged['dask'][1], merged['numpy'][1])
+    np.testing.assert_array_equal(merged['dask'][2], merged['numpy'][2])
+    assert merged['dask'][3] == merged['numpy'][3] == 'purple'
@@ -0,0 +1,119 @@
+"""
+Tests for UltimateMergeEngine (plotbot/data_cubby.py).
+
+The merged order is computed once and every variable is gathered through it;
+new data that fit into a gap of the existing times are spliced in. Results are
+checked against a plain numpy merge (stable sort, newer value wins on ties).
+
+To run:
+    python -m pytest tests/test_merge_engine.py -v
+"""
+
+import numpy as np
+import pytest
+
+from plotbot.data_cubby import UltimateMergeEngine
+
+
+def _times(seconds):
+    return np.asarray(seconds, dtype=np.int64).astype('datetime64[s]').astype('datetime64[ns]')
+
+
+def _reference_merge(existing_times, existing_data, new_times, new_data):
+    times = np.concatenate([existing_times, new_times])
+    order = np.argsort(times, kind='stable')
+    times = times[order]
+    keep = np.ones(len(times), dtype=bool)
+    keep[:-1] = times[1:] != times[:-1]     # the last of equal times is the new row
+    return times[keep], {key: np.concatenate([existing_data[key], new_data[key]])[order][keep]
+                         for key in existing_data}
+
+
+def _data(times, offset, rng):
+    n = len(times)
+    return {
+        'br': rng.normal(size=n).astype(np.float32) + offset,
+        'counts': np.arange(n) + offset,
+        'flag': rng.random(n) > 0.5,
+        'energy_flux': rng.normal(size=(n, 32)) + offset,
+        'vdf': rng.normal(size=(n, 4, 3)).astype(np.float32),
+        'label': np.array([f'{offset}-{i}' for i in range(n)], dtype=object),
+    }
+
+
+@pytest.mark.parametrize('engine', [UltimateMergeEngine(block_size=5),
+                                    UltimateMergeEngine(),
+                                    UltimateMergeEngine(block_size=3, use_parallel=False)],
+                         ids=['small_blocks', 'default', 'serial'])
+def test_matches_reference_merge(engine):
+    rng = np.random.default_rng(7)
+    for _ in range(30):
+        existing_times = _times(np.unique(rng.integers(0, 300, rng.integers(1, 120))))
+        new_times = _times(np.unique(rng.integers(0, 300, rng.integers(1, 120))))
+        existing, new = _data(existing_times, 0, rng), _data(new_times, 1000, rng)
+
+        times, merged = engine.merge_arrays(existing_times, existing, new_times, new)
+        expected_times, expected = _reference_merge(existing_times, existing, new_times, new)
+
+        np.testing.assert_array_equal(times, expected_times)
+        for key, values in expected.items():
+            assert merged[key].dtype == values.dtype, key
+            np.testing.assert_array_equal(merged[key], values)
+
+
+def test_new_rows_win_on_equal_times():
+    engine = UltimateMergeEngine()
+    times, merged = engine.merge_arrays(_times([0, 1, 2, 3]), {'x': np.array([0., 1., 2., 3.])},
+                                        _times([2, 3, 4]), {'x': np.array([20., 30., 40.])})
+    np.testing.assert_array_equal(times, _times([0, 1, 2, 3, 4]))
+    np.testing.assert_array_equal(merged['x'], [0., 1., 20., 30., 40.])
+
+
+@pytest.mark.parametrize('new_seconds, position', [([5, 6, 7], 2), ([-3, -2], 0), ([20, 21], 4)],
+                         ids=['inside_gap', 'before', 'after'])
+def test_new_range_in_a_gap_is_spliced(monkeypatch, new_seconds, position):
+    engine = UltimateMergeEngine()
+    monkeypatch.setattr(engine, '_merge_plan', lambda *args: pytest.fail('spliced merges need no order'))
+    existing_times, new_times = _times([0, 1, 10, 11]), _times(new_seconds)
+    rng = np.random.default_rng(0)
+    existing, new = _data(existing_times, 0, rng), _data(new_times, 1000, rng)
+
+    times, merged = engine.merge_arrays(existing_times, existing, new_times, new)
+    expected_times, expected = _reference_merge(existing_times, existing, new_times, new)
+
+    np.testing.assert_array_equal(times, expected_times)
+    for key, values in expected.items():
+        np.testing.assert_array_equal(merged[key], values)
+    np.testing.assert_array_equal(merged['energy_flux'][position:position + len(new_times)], new['energy_flux'])
+
+
+@pytest.mark.parametrize('existing_seconds', [[0, 1, 2, 3], [0, 1, 10, 11]], ids=['overlap', 'gap'])
+def test_variables_on_one_side_only_get_missing_rows(existing_seconds):
+    engine = UltimateMergeEngine()
+    existing_times, new_times = _times(existing_seconds), _times([2, 3, 4])
+    existing = {'x': np.arange(4.), 'old_only': np.arange(4), 'stamp': existing_times}
+    new = {'x': np.arange(3.), 'new_only': np.ones((3, 2), dtype=np.float32)}
+
+    times, merged = engine.merge_arrays(existing_times, existing, new_times, new)
+    from_new = np.isin(times, new_times)
+
+    assert merged['old_only'].dtype == np.float64           # integers widen so the new rows can be NaN
+    assert np.isnan(merged['old_only'][from_new]).all()
+    assert not np.isnan(merged['old_only'][~from_new]).any()
+    assert merged['new_only'].shape == (len(times), 2) and merged['new_only'].dtype == np.float32
+    assert np.isnan(merged['new_only'][~from_new]).all()
+    np.testing.assert_array_equal(merged['new_only'][from_new], 1)
+    assert np.isnat(merged['stamp'][from_new]).all()
+    np.testing.assert_array_equal(merged['stamp'][~from_new], times[~from_new])
+
+
+def test_br_bt_bn_rebuild_all():
+    engine = UltimateMergeEngine()
+    component = lambda n: np.arange(n, dtype=np.float32)
+    existing = {key: component(3) for key in ('br', 'bt', 'bn')}
+    existing['all'] = [existing['br'], existing['bt'], existing['bn']]
+    new = {key: component(3) for key in ('br', 'bt', 'bn')}
+
+    times, merged = engine.merge_arrays(_times([0, 1, 2]), existing, _times([1, 2, 3]), new)
+    assert len(times) == 4
+    assert all(a is b for a, b in zip(merged['all'], (merged['br'], merged['bt'], merged['bn'])))
@@ -0,0 +1,95 @@
+"""
+Tests for multiplot.compute_monotonic_degrees_mask (curl-back clipping of
+degrees-from-perihelion x-axes).
+
+The vectorized mask is checked against the running-max loop it replaced,
+including the tolerance and NaN semantics, and masks passed an encounter are
+cached for later panels on the same time base.
+
+To run:
+    python -m pytest tests/test_monotonic_degrees_mask.py -v
+"""
+
+import numpy as np
+import pytest
+
+from plotbot.multiplot import _monotonic_mask_cache, compute_monotonic_degrees_mask
+
+
+def _loop_mask(degrees, tolerance_factor):
+    """The original per-sample walk out from perihelion."""
+    abs_degrees = np.abs(degrees)
+    n = len(abs_degrees)
+    mask = np.ones(n, dtype=bool)
+    if n < 2:
+        return mask
+    perihelion_idx = np.argmin(abs_degrees)
+    running_max = abs_degrees[perihelion_idx]
+    for j in range(perihelion_idx + 1, n):
+        if abs_degrees[j] >= running_max * tolerance_factor:
+            running_max = max(running_max, abs_degrees[j])
+        else:
+            mask[j:] = False
+            break
+    running_max = abs_degrees[perihelion_idx]
+    for j in range(perihelion_idx - 1, -1, -1):
+        if abs_degrees[j] >= running_max * tolerance_factor:
+            running_max = max(running_max, abs_degrees[j])
+        else:
+            mask[:j + 1] = False
+            break
+    return mask
+
+
+@pytest.mark.parametrize('tolerance_factor', [1.0, 0.99, 0.9, 1.05])
+def test_matches_the_running_max_loop(tolerance_factor):
+    rng = np.random.default_rng(7)
+    for _ in range(500):
+        n = int(rng.integers(1, 80))
+        degrees = np.cumsum(rng.normal(size=n)) * 4
+        if rng.random() < 0.3:
+            degrees[rng.integers(0, n)] = np.nan
+        if rng.random() < 0.3:
+            degrees = np.round(degrees)          # ties with the running max
+        np.testing.assert_array_equal(compute_monotonic_degrees_mask(degrees, tolerance_factor),
+                                      _loop_mask(degrees, tolerance_factor), err_msg=str(degrees))
+
+
+def test_clips_curl_back_on_both_sides():
+    degrees = np.concatenate([np.linspace(-30, -35, 6), np.linspace(-40, 40, 81), np.linspace(39, 30, 10)])
+    mask = compute_monotonic_degrees_mask(degrees)
+    np.testing.assert_array_equal(np.flatnonzero(mask), np.arange(6, 87))
+
+
+def test_masks_are_cached_per_time_base_and_window():
+    degrees = np.concatenate([np.linspace(-90, 90, 100_000), np.linspace(89, 60, 1000)])
+    times = np.arange(len(degrees)).astype('datetime64[s]')
+    window = ['2023-09-28/00:00:00.000', '2023-09-29/00:00:00.000']
+    first = compute_monotonic_degrees_mask(degrees, 1.0, encounter='E21', time_base=times, window=window)
+
+    assert compute_monotonic_degrees_mask(degrees.copy(), 1.0, encounter='E21', time_base=times, window=window) is first
+    assert compute_monotonic_degrees_mask(degrees, 1.0, encounter='E21', time_base=times.copy(), window=window) is not first
+    assert compute_monotonic_degrees_mask(degrees, 1.0, encounter='E21', time_base=times, window=window[::-1]) is not first
+    assert compute_monotonic_degrees_mask(degrees, 0.5, encounter='E21', time_base=times, window=window) is not first
+    assert compute_monotonic_degrees_mask(degrees, 1.0, encounter='E22', time_base=times, window=window) is not first
+    assert compute_monotonic_degrees_mask(degrees, 1.0, encounter='E21') is not first
+    assert not first.flags.writeable
+    np.testing.assert_array_equal(first, _loop_mask(degrees, 1.0))
+
+
+def test_cached_mask_is_not_reused_for_a_replaced_time_base():
+    a = np.linspace(-50, 50, 1024)
+    b = a.copy()
+    b[801] = 1.0
+    uncached = compute_monotonic_degrees_mask(b)
+    assert uncached.sum() == 801
+
+    times = np.arange(len(a)).astype('datetime64[s]')
+    compute_monotonic_degrees_mask(a, 1.0, encounter='E10', time_base=times, window=None)
+    key = next(reversed(_monotonic_mask_cache))
+    del times
+    replacement = np.arange(len(a)).astype('datetime64[s]')
+    # as if the freed time base's id had been reused by the replacement
+    _monotonic_mask_cache[(*key[:2], id(replacement), *key[3:])] = _monotonic_mask_cache[key]
+    np.testing.assert_array_equal(
+        compute_monotonic_degrees_mask(b, 1.0, encounter='E10', time_base=replacement, window=None), uncached)
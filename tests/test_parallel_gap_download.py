@@ -0,0 +1,170 @@
+"""
+Tests for the per-date parallel download of missing SPDF dates
+(download_dates_parallel / _download_missing_dates in
+plotbot/data_download_pyspedas.py).
+
+A local HTTP server stands in for SPDF and serves synthetic SPAN-I moment
+CDFs from benchmarks/; a pyspedas-like download function fetches from it.
+
+To run:
+    python -m pytest tests/test_parallel_gap_download.py -v
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import cdflib
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot.config import config
+from plotbot.data_download_pyspedas import (
+    SmartCheckResult, _date_token_trange, download_dates_parallel, download_spdf_data,
+    smart_check_local_pyspedas_files
+)
+
+PRODUCT_DIR = 'psp/sweap/spi/l3/spi_sf00_l3_mom/2023'
+DAYS = ['20231001', '20231002', '20231003', '20231004', '20231005']
+
+
+class _StandIn(SimpleHTTPRequestHandler):
+    """SPDF stand-in: logs requests, tracks concurrency, fails some requests."""
+
+    def __init__(self, *args, server_state=None, **kwargs):
+        self.state = server_state
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        state = self.state
+        with state['lock']:
+            state['requests'].append(self.path)
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            failing = any(day in self.path and state['failures'].get(day, 0) > 0 for day in DAYS)
+            if failing:
+                day = next(day for day in DAYS if day in self.path)
+                state['failures'][day] -= 1
+        try:
+            time.sleep(0.2)
+            if failing:
+                self.send_error(503)
+            else:
+                super().do_GET()
+        finally:
+            with state['lock']:
+                state['active'] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def spdf():
+    """(base URL, server state, local data dir) with config.data_dir pointing at the local dir."""
+    server_root, local_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+    generate_fixtures(server_root, start='2023-10-01 00:00:00', hours=24 * len(DAYS), products=['spi_sf00_l3_mom'])
+    product_dir = os.path.join(server_root, PRODUCT_DIR)
+    for name in os.listdir(product_dir):                   # SPDF serves lower-case file names
+        os.rename(os.path.join(product_dir, name), os.path.join(product_dir, name.replace('_L3_', '_l3_')))
+
+    state = {'lock': threading.Lock(), 'requests': [], 'active': 0, 'peak': 0, 'failures': {}}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_StandIn, directory=server_root, server_state=state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    original = config.data_dir
+    config.data_dir = local_root
+    try:
+        yield f'http://127.0.0.1:{server.server_port}', state, local_root
+    finally:
+        config.data_dir = original
+        server.shutdown()
+        shutil.rmtree(server_root)
+        shutil.rmtree(local_root)
+
+
+def _pyspedas_like(base_url, local_root):
+    """Download the files of a trange's days from the stand-in, as pyspedas.psp.spi(downloadonly=True) would."""
+
+    def spi(trange, datatype, no_update, downloadonly, notplot, **kwargs):
+        day = trange[0][:10].replace('-', '')
+        with urllib.request.urlopen(f'{base_url}/{PRODUCT_DIR}/') as response:
+            names = sorted(set(re.findall(rf'href="([^"]*_{day}_v\d+\.cdf)"', response.read().decode())))
+        files = []
+        for name in names:
+            local_path = os.path.join(local_root, PRODUCT_DIR, name)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with urllib.request.urlopen(f'{base_url}/{PRODUCT_DIR}/{name}') as response, open(local_path, 'wb') as f:
+                f.write(response.read())
+            files.append(local_path)
+        return files
+
+    return spi
+
+
+def _place_local(base_url, local_root, day):
+    _pyspedas_like(base_url, local_root)([f'{day[:4]}-{day[4:6]}-{day[6:]}/00:00:00', ''], None, False, True, True)
+
+
+def test_date_tokens_become_single_day_or_block_ranges():
+    assert _date_token_trange('20231001') == ['2023-10-01/00:00:00', '2023-10-02/00:00:00']
+    assert _date_token_trange('202310013') == ['2023-10-01/18:00:00', '2023-10-02/00:00:00']
+
+
+def test_scattered_missing_dates_are_fetched_concurrently_with_retry(spdf):
+    base_url, state, local_root = spdf
+    _place_local(base_url, local_root, '20231002')
+    _place_local(base_url, local_root, '20231004')
+    state['requests'].clear()
+    state['failures']['20231003'] = 1                      # the first request for Oct 3 fails
+
+    trange = ['2023-10-01/00:00:00', '2023-10-05/23:59:59']
+    smart_result = smart_check_local_pyspedas_files('spi_sf00_l3_mom', trange)
+    assert isinstance(smart_result, SmartCheckResult)
+    assert smart_result.missing_dates == ['20231001', '20231003', '20231005']
+
+    mock_map = {'spi_sf00_l3_mom': {'pyspedas_datatype': 'spi_sf00_l3_mom',
+                                    'pyspedas_func': _pyspedas_like(base_url, local_root),
+                                    'kwargs': {'level': 'l3'}}}
+    with patch('plotbot.data_download_pyspedas._get_pyspedas_map', return_value=mock_map):
+        with patch.dict('sys.modules', {'pyspedas': MagicMock()}):
+            files = download_spdf_data(trange, 'spi_sf00_l3_mom')
+
+    assert sorted(re.search(r'_(\d{8})_', os.path.basename(f)).group(1) for f in files) == DAYS
+    requested_files = [path for path in state['requests'] if path.endswith('.cdf')]
+    assert not any('20231002' in path or '20231004' in path for path in requested_files)   # present days untouched
+    assert sum('20231003' in path for path in requested_files) == 2                          # one retry
+    assert state['peak'] > 1                                                                  # requests overlapped
+    for path in files:
+        assert len(cdflib.CDF(path).varget('Epoch')) > 0
+    assert isinstance(smart_check_local_pyspedas_files('spi_sf00_l3_mom', trange), list)
+
+
+def test_pool_is_bounded_and_reports_failed_dates():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def fetch(token):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        if token == 'bad':
+            raise IOError('server unavailable')
+        return [] if token == 'empty' else [f'{token}.cdf']
+
+    tokens = [f'2023100{i}' for i in range(1, 8)] + ['bad', 'empty']
+    files, failed = download_dates_parallel(tokens, fetch, label='test', max_workers=3, retries=1, backoff=0.01)
+
+    assert peak[0] == 3
+    assert files == [f'2023100{i}.cdf' for i in range(1, 8)]
+    assert failed == ['bad']
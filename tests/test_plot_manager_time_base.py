@@ -0,0 +1,82 @@
+"""
+Tests for the shared, read-only time base carried by derived plot_managers.
+
+Views, slices and ufunc results must point at the source's datetime_array
+instead of copying it, while plot_config overrides stay local to each result.
+
+To run:
+    python -m pytest tests/test_plot_manager_time_base.py -v
+"""
+
+import numpy as np
+import pytest
+
+from plotbot.plot_config import plot_config
+from plotbot.plot_manager import plot_manager
+from plotbot.time_utils import TimeRangeTracker
+
+
+@pytest.fixture
+def mag_variable():
+    n = 1000
+    times = np.datetime64('2023-09-28T00:00:00', 'ns') + np.arange(n) * np.timedelta64(1, 's')
+    config = plot_config(data_type='mag_RTN', class_name='mag_rtn', subclass_name='br',
+                         datetime_array=times, time=times.astype(np.int64), color='red')
+    saved_trange = TimeRangeTracker.get_current_trange()
+    TimeRangeTracker.clear_trange()
+    yield plot_manager(np.linspace(-1.0, 1.0, n), plot_config=config)
+    if saved_trange is not None:
+        TimeRangeTracker.set_current_trange(saved_trange)
+
+
+def test_ufunc_result_shares_time_base_without_copying(mag_variable):
+    source_times = mag_variable.plot_config.datetime_array
+
+    for result in (np.abs(mag_variable), mag_variable * 2, mag_variable.view(plot_manager)):
+        times = result.plot_config.datetime_array
+        assert np.shares_memory(times, source_times)
+        assert not times.flags.writeable
+        np.testing.assert_array_equal(times, source_times)
+
+    # the source keeps its own, writable time base
+    assert source_times.flags.writeable
+
+
+def test_plot_config_overrides_are_copy_on_write(mag_variable):
+    result = np.abs(mag_variable)
+    result.color = 'blue'
+    result.y_label = 'abs'
+
+    assert mag_variable.color == 'red'
+    assert mag_variable.plot_config.y_label is None
+    assert result.plot_config is not mag_variable.plot_config
+    assert result.plot_config.datetime_array is not None
+
+
+@pytest.mark.parametrize('key', [slice(10, 20), slice(None, None, 7), slice(-5, None)])
+def test_slice_is_a_view_of_the_time_base(mag_variable, key):
+    sliced = mag_variable[key]
+    source = mag_variable.plot_config
+
+    assert len(sliced.plot_config.datetime_array) == len(sliced)
+    assert np.shares_memory(sliced.plot_config.datetime_array, source.datetime_array)
+    np.testing.assert_array_equal(sliced.plot_config.datetime_array, source.datetime_array[key])
+    np.testing.assert_array_equal(sliced.plot_config.time, source.time[key])
+
+
+def test_index_arrays_select_matching_times(mag_variable):
+    mask = np.asarray(mag_variable) > 0.5
+    selected = mag_variable[mask]
+
+    np.testing.assert_array_equal(selected.plot_config.datetime_array,
+                                  mag_variable.plot_config.datetime_array[mask])
+    assert len(selected.datetime_array) == len(selected)
+
+
+def test_ufunc_on_clipped_variable_uses_clipped_time_base(mag_variable):
+    mag_variable.requested_trange = ['2023-09-28/00:01:00.000', '2023-09-28/00:02:00.000']
+    result = np.sqrt(np.abs(mag_variable))
+
+    assert len(result) == len(mag_variable.data) == 61
+    np.testing.assert_array_equal(result.plot_config.datetime_array, mag_variable.datetime_array)
+    assert len(result.plot_config.time) == 61
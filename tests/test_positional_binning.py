@@ -0,0 +1,168 @@
+"""
+Tests for position-binned statistics (plotbot/positional_binning.py) and the
+on-the-fly binned overlay in multiplot positional mode.
+
+Statistics are checked against a per-bin loop; positional data come from a
+small synthetic NPZ (same keys as the PSP positional file) whose longitude
+track crosses 0°.
+
+To run:
+    python -m pytest tests/test_positional_binning.py -v
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from plotbot.positional_binning import (BinSpec, bin_statistic, binned_statistic, clear_binning_cache,
+                                        wrapped_bin_geometry)
+
+START = np.datetime64('2023-09-27T00:00', 'ns')
+
+
+def _loop_statistic(values, coords, edges, statistic, threshold=0.0):
+    result = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        last = hi == edges[-1]
+        members = values[(coords >= lo) & ((coords <= hi) if last else (coords < hi))]
+        members = members[np.isfinite(members)]
+        if statistic == 'count':
+            result.append(len(members))
+        elif len(members) == 0:
+            result.append(np.nan)
+        elif statistic == 'mean':
+            result.append(members.mean())
+        elif statistic == 'median':
+            result.append(np.median(members))
+        else:
+            result.append(np.mean(members > threshold))
+    return np.array(result, dtype=float)
+
+
+@pytest.mark.parametrize('statistic', ['mean', 'median', 'fraction_above', 'count'])
+@pytest.mark.parametrize('width', [0.7, 0.01], ids=['full_bins', 'sparse_bins'])
+def test_statistics_match_a_per_bin_loop(statistic, width):
+    rng = np.random.default_rng(1)
+    coords = rng.uniform(5.0, 25.0, 5000)
+    values = rng.normal(size=5000)
+    values[::97] = np.nan
+    spec = BinSpec('r_sun', width, start=5.0, stop=25.0, statistic=statistic, threshold=0.5)
+
+    binned = bin_statistic(values, coords, spec)
+
+    expected = _loop_statistic(values if statistic != 'count' else np.nan_to_num(values), coords,
+                               binned.edges, statistic, threshold=0.5)
+    np.testing.assert_allclose(binned.values, expected, equal_nan=True)
+    assert binned.edges[0] == 5.0 and binned.edges[-1] == 25.0
+    np.testing.assert_allclose(binned.widths.sum(), 20.0)
+
+
+def test_longitude_bins_collect_both_sides_of_the_wrap():
+    coords = np.array([355.5, 359.5, 0.5, 4.5, 720.5, -0.5, 180.0])
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 100.0])
+
+    binned = bin_statistic(values, coords, BinSpec('carrington_lon', 5.0, start=355.0, stop=365.0))
+
+    np.testing.assert_array_equal(binned.counts, [3, 3])             # 180° is outside the range
+    np.testing.assert_allclose(binned.values, [(1 + 2 + 6) / 3, (3 + 4 + 5) / 3])
+    np.testing.assert_allclose(binned.centers, [357.5, 2.5])        # reported in [0, 360)
+
+    full_turn = bin_statistic(values, coords, BinSpec('carrington_lon', 90.0, statistic='count'))
+    assert full_turn.counts.sum() == len(values)
+
+
+def test_degrees_from_perihelion_wraps_into_plus_minus_180():
+    binned = bin_statistic(np.ones(4), np.array([-179.0, 179.0, 181.0, 540.0]),
+                           BinSpec('degrees_from_perihelion', 10.0, statistic='count'))
+    assert binned.edges[0] == -180.0 and binned.edges[-1] == 180.0
+    np.testing.assert_array_equal(binned.counts[[0, -1]], [3, 1])      # 181° and 540° wrap to -179° and -180°
+
+
+def test_invalid_specs_are_refused():
+    with pytest.raises(ValueError):
+        bin_statistic(np.ones(3), np.ones(3), BinSpec('carrington_lon', 1.0, statistic='mode'))
+    with pytest.raises(ValueError):
+        bin_statistic(np.ones(3), np.ones(3), BinSpec('longitude', 1.0))
+    with pytest.raises(ValueError):
+        bin_statistic(np.ones(3), np.ones(3), BinSpec('carrington_lon', 1.0, start=0.0, stop=400.0))
+    with pytest.raises(ValueError):
+        bin_statistic(np.ones(3), np.ones(2), BinSpec('r_sun', 1.0))
+
+
+def test_wrapped_bin_geometry_matches_the_shortest_arc():
+    centers, widths = wrapped_bin_geometry([10.0, 359.0, 1.0, 100.0], [12.0, 1.0, 359.0, 99.0])
+    np.testing.assert_allclose(widths, [2.0, 2.0, 2.0, 1.0])
+    np.testing.assert_allclose(np.mod(centers, 360), [11.0, 0.0, 0.0, 99.5])
+
+
+class _Variable:
+    class_name = 'synthetic'
+    subclass_name = 'x'
+
+    def __init__(self, times, values):
+        self.datetime_array = times
+        self.all_data = values
+
+
+@pytest.fixture(scope='module')
+def mapper():
+    from plotbot.x_axis_positional_data_helpers import XAxisPositionalDataMapper
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        times = START + np.arange(0, 48 * 60, dtype=np.int64) * np.timedelta64(60, 's')
+        longitudes = np.mod(np.linspace(300.0, 420.0, len(times), endpoint=False), 360.0)  # 2.5°/hour through 0°
+        path = os.path.join(tmp_dir, 'positional.npz')
+        np.savez(path, times=times, r_sun=np.linspace(20.0, 10.0, len(times)),
+                 carrington_lon=longitudes, carrington_lat=np.zeros(len(times)))
+        yield XAxisPositionalDataMapper(path)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_replaced_data_is_never_served_from_the_cache(mapper):
+    from plotbot.plot_config import plot_config
+    from plotbot.plot_manager import plot_manager
+
+    clear_binning_cache()
+    times = START + np.arange(0, 24 * 3600, 10, dtype=np.int64) * np.timedelta64(1, 's')
+    spec = BinSpec('carrington_lon', 2.5, start=300.0, stop=360.0)
+
+    def variable(values):
+        return plot_manager(values, plot_config=plot_config(datetime_array=times, class_name='synthetic',
+                                                            subclass_name='x'))
+
+    first = binned_statistic(variable(np.zeros(len(times))), mapper, spec, encounter='E17')
+    reimported = variable(np.ones(len(times)))                   # same name, length and end times
+    assert np.nanmax(binned_statistic(reimported, mapper, spec, encounter='E17').values) == 1.0
+    assert np.nanmax(first.values) == 0.0
+
+    cached = binned_statistic(reimported, mapper, spec, encounter='E17')
+    assert binned_statistic(reimported, mapper, spec, encounter='E17') is cached
+    clear_binning_cache('other_class')
+    assert binned_statistic(reimported, mapper, spec, encounter='E17') is cached
+    clear_binning_cache('synthetic')                             # what data_cubby does on merge
+    assert binned_statistic(reimported, mapper, spec, encounter='E17') is not cached
+
+
+def test_variables_are_binned_by_mapped_position_and_cached(mapper):
+    clear_binning_cache()
+    times = START + np.arange(0, 48 * 3600, 10, dtype=np.int64) * np.timedelta64(1, 's')
+    var = _Variable(times, (np.arange(len(times)) % 2).astype(float))
+    trange = ['2023-09-27/20:00:00.000', '2023-09-28/03:59:50.000']   # crosses 0° at 24:00
+    spec = BinSpec('carrington_lon', 2.5, start=340.0, stop=380.0, statistic='fraction_above')
+
+    binned = binned_statistic(var, mapper, spec, encounter='E17', trange=trange)
+
+    filled = binned.counts > 0
+    assert filled.sum() == 8                                         # 8 hours at 2.5°/hour
+    np.testing.assert_allclose(binned.values[filled], 0.5, atol=0.01)
+    assert binned_statistic(var, mapper, spec, encounter='E17', trange=trange) is binned
+    assert binned_statistic(var, mapper, spec._replace(statistic='count'), encounter='E17', trange=trange) is not binned
+
+    degrees = binned_statistic(var, mapper, BinSpec('degrees_from_perihelion', 2.5, start=-10.0, stop=10.0),
+                               trange=trange, perihelion_time='2023/09/28 00:00:00.000')
+    np.testing.assert_array_equal(degrees.counts > 0, [True] * 8)
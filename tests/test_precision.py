@@ -0,0 +1,125 @@
+"""
+Tests for the storage precision policy (plotbot/precision.py).
+
+config.precision (or a data type's 'precision' key) controls the dtype CDF data
+are stored in; derived quantities follow. Data come from the offline synthetic
+PSP CDFs in benchmarks/ (mag_RTN is float32 with sparse FILLVALs, the SPAN-I
+moments are float64).
+
+To run:
+    python -m pytest tests/test_precision.py -v
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot import precision
+
+TRANGE = ['2023-09-28/00:00:00.000', '2023-09-28/00:05:00.000']
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server, config.precision)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1,
+                          products=['mag_RTN', 'spi_sf00_l3_mom'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        yield config
+    finally:
+        config.data_dir, config.data_server, config.precision = original
+        shutil.rmtree(tmp_dir)
+
+
+def _proton(config, policy):
+    from plotbot.data_classes.psp_proton import proton_class
+    from plotbot.data_import import import_data_function
+    config.precision = policy
+    return proton_class(import_data_function(TRANGE, 'spi_sf00_l3_mom'))
+
+
+def test_native_policy_keeps_cdf_dtypes(fixture_dir):
+    from plotbot.data_import import import_data_function
+    fixture_dir.precision = 'native'
+    assert import_data_function(TRANGE, 'mag_RTN').data['psp_fld_l2_mag_RTN'].dtype == np.float32
+    assert _proton(fixture_dir, 'native').raw_data['density'].dtype == np.float64
+
+
+def test_float32_policy_stores_imported_and_derived_arrays_as_float32(fixture_dir):
+    wide = _proton(fixture_dir, 'native')
+    narrow = _proton(fixture_dir, 'float32')
+
+    for key in ('density', 'vr', 'energy_flux', 'bmag', 'v_alfven', 'beta_ppar', 'pressure', 't_par', 'anisotropy'):
+        assert narrow.raw_data[key].dtype == np.float32, key
+        np.testing.assert_allclose(narrow.raw_data[key], wide.raw_data[key], rtol=2e-5, equal_nan=True)
+    assert narrow.raw_data['density'].nbytes * 2 == wide.raw_data['density'].nbytes
+
+
+def test_fill_values_stay_nan_when_widened(fixture_dir):
+    from plotbot.data_import import import_data_function
+    fixture_dir.precision = 'native'
+    native = import_data_function(TRANGE, 'mag_RTN').data['psp_fld_l2_mag_RTN']
+    fixture_dir.precision = 'float64'
+    wide = import_data_function(TRANGE, 'mag_RTN').data['psp_fld_l2_mag_RTN']
+
+    assert wide.dtype == np.float64
+    assert np.isnan(native).any()
+    np.testing.assert_array_equal(np.isnan(wide), np.isnan(native))
+
+
+def test_per_data_type_override(fixture_dir, monkeypatch):
+    from plotbot.data_classes.data_types import data_types
+    from plotbot.data_import import import_data_function
+
+    monkeypatch.setitem(data_types['spi_sf00_l3_mom'], 'precision', 'float32')
+    assert _proton(fixture_dir, 'native').raw_data['density'].dtype == np.float32
+    fixture_dir.precision = 'float64'
+    assert import_data_function(TRANGE, 'mag_RTN').data['psp_fld_l2_mag_RTN'].dtype == np.float64
+    assert precision.policy_for('spi_sf00_l3_mom') == 'float32'
+
+
+def test_sensitive_projection_is_computed_in_float64():
+    from plotbot.data_classes.psp_proton import _project_temperature
+
+    rng = np.random.default_rng(1)
+    field = rng.normal(size=(1000, 3)) * 5
+    tensor = np.abs(rng.normal(size=(1000, 6))) * 1e3 + 1e5   # large trace, small anisotropy
+    tensor[:, 3:] = rng.normal(size=(1000, 3))
+    field, tensor = field.astype(np.float32), tensor.astype(np.float32)
+    exact = _project_temperature(field.astype(np.float64), tensor.astype(np.float64))
+    narrow = _project_temperature(field, tensor)
+
+    assert all(values.dtype == np.float32 for values in narrow)
+    # rounded once at the end: within half a float32 ulp (float32 arithmetic is off by several)
+    np.testing.assert_allclose(narrow[1], exact[1], rtol=np.finfo(np.float32).eps / 2)
+
+
+def test_fill_dtypes_and_storage_casts():
+    assert precision.fill_dtype(np.int16, 'float32') == np.float32
+    assert precision.fill_dtype(np.int32, 'float32') == np.float64   # not exact in float32
+    assert precision.fill_dtype(np.int16, 'native') == np.float64
+
+    values = np.arange(4, dtype=np.float64)
+    assert precision.for_storage(values, 'native') is values
+    assert precision.for_storage(values, 'float32').dtype == np.float32
+    assert precision.for_storage(values, 'float32', is_epoch=True) is values
+    assert precision.for_storage(np.arange(4), 'float32').dtype == np.arange(4).dtype
+
+
+def test_merge_keeps_float32_storage():
+    from plotbot.data_cubby import data_cubby
+
+    times = np.arange(0, 10, dtype='datetime64[s]').astype('datetime64[ns]')
+    existing = {'x': np.arange(6, dtype=np.float32)}
+    new = {'x': np.arange(4, 10, dtype=np.float32)}
+    merged_times, merged = data_cubby._merge_arrays(times[:6], existing, times[4:], new)
+    assert merged['x'].dtype == np.float32
+    np.testing.assert_array_equal(merged['x'], np.arange(10, dtype=np.float32))
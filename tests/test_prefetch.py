@@ -0,0 +1,166 @@
+"""
+Tests for the read-ahead prefetcher behind config.prefetch (plotbot/prefetch.py).
+
+Scheduling is tested with a stand-in fetch function; the get_data test steps
+through mag_RTN from the offline synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_prefetch.py -v
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot.data_import import DataObject
+from plotbot.prefetch import ReadAheadPrefetcher, predict_next, trange_window, window_trange
+
+
+def _hour(h, hours=1):
+    return [f'2023-10-02/{h:02d}:00:00.000', f'2023-10-02/{h + hours:02d}:00:00.000']
+
+
+class _Fetch:
+    """Records calls; optionally blocks until released."""
+
+    def __init__(self, n_bytes=8000, block=False):
+        self.calls = []
+        self.n_bytes = n_bytes
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, trange, data_type):
+        self.calls.append((tuple(trange), data_type))
+        self.release.wait(10)
+        return DataObject(times=np.zeros(self.n_bytes // 8), data={'x': np.zeros(0)})
+
+
+def test_prediction_repeats_stride_and_direction():
+    forward = [trange_window(_hour(1)), trange_window(_hour(2))]
+    assert window_trange(predict_next(forward)) == _hour(3)
+    assert window_trange(predict_next(forward[::-1])) == _hour(0)
+    assert window_trange(predict_next([trange_window(_hour(0)), trange_window(_hour(6))])) == _hour(12)
+    assert predict_next([trange_window(_hour(1)), trange_window(_hour(2, hours=2))]) is None
+    assert predict_next(forward[:1]) is None
+
+
+def test_next_window_is_fetched_in_the_background_and_handed_over():
+    fetch = _Fetch()
+    prefetcher = ReadAheadPrefetcher(fetch)
+
+    assert prefetcher.observe(_hour(1), ['mag_RTN', 'spi_sf00_l3_mom']) is None
+    prefetcher.observe(_hour(1), ['mag_RTN', 'spi_sf00_l3_mom'])                # repeated request: ignored
+    prefetcher.observe(_hour(2), ['spi_sf00_l3_mom', 'mag_RTN'])
+    assert prefetcher.wait(10)
+
+    assert sorted(fetch.calls) == [(tuple(_hour(3)), 'mag_RTN'), (tuple(_hour(3)), 'spi_sf00_l3_mom')]
+    half_hour = ['2023-10-02/03:00:00.000', '2023-10-02/03:30:00.000']
+    assert prefetcher.take(half_hour, 'mag_RTN') is not None                    # contained windows are served
+    assert prefetcher.take(_hour(3), 'mag_RTN') is None                         # handed over once
+    assert prefetcher.take(_hour(4), 'spi_sf00_l3_mom') is None
+    assert prefetcher.staged == [('spi_sf00_l3_mom', trange_window(_hour(3)))]
+
+
+def test_take_waits_for_an_in_flight_window():
+    fetch = _Fetch(block=True)
+    prefetcher = ReadAheadPrefetcher(fetch)
+    prefetcher.observe(_hour(1), ['mag_RTN'])
+    prefetcher.observe(_hour(2), ['mag_RTN'])
+
+    threading.Timer(0.2, fetch.release.set).start()
+    assert prefetcher.take(_hour(3), 'mag_RTN') is not None
+
+
+def test_direction_change_cancels_and_drops_the_old_prediction():
+    fetch = _Fetch(block=True)
+    prefetcher = ReadAheadPrefetcher(fetch)
+    prefetcher.observe(_hour(4), ['mag_RTN'])
+    prefetcher.observe(_hour(5), ['mag_RTN'])            # predicts hour 6, fetch blocks
+    for _ in range(100):
+        if fetch.calls:
+            break
+        time.sleep(0.05)
+    prefetcher.observe(_hour(3), ['mag_RTN'])            # stepping back: predicts hour 1
+
+    fetch.release.set()
+    assert prefetcher.wait(10)
+    assert [call[0] for call in fetch.calls] == [tuple(_hour(6)), tuple(_hour(1))]
+    assert prefetcher.take(_hour(6), 'mag_RTN') is None  # fetched after the cancel: discarded
+    assert prefetcher.take(_hour(1), 'mag_RTN') is not None
+
+
+def test_memory_budget_drops_and_then_skips_windows():
+    fetch = _Fetch(n_bytes=4 * 1024 ** 2)
+    prefetcher = ReadAheadPrefetcher(fetch)
+    prefetcher.observe(_hour(1), ['mag_RTN'], memory_budget_mb=1)
+    prefetcher.observe(_hour(2), ['mag_RTN'], memory_budget_mb=1)
+    assert prefetcher.wait(10)
+    assert prefetcher.staged == []
+
+    prefetcher.observe(_hour(3), ['mag_RTN'], memory_budget_mb=1)             # size now known: not fetched
+    assert prefetcher.wait(10)
+    assert len(fetch.calls) == 1
+
+
+def test_is_needed_skips_loaded_data_types():
+    fetch = _Fetch()
+    prefetcher = ReadAheadPrefetcher(fetch, is_needed=lambda trange, data_type: data_type != 'mag_RTN')
+    prefetcher.observe(_hour(1), ['mag_RTN', 'spi_sf00_l3_mom'])
+    prefetcher.observe(_hour(2), ['mag_RTN', 'spi_sf00_l3_mom'])
+    assert prefetcher.wait(10)
+    assert [call[1] for call in fetch.calls] == ['spi_sf00_l3_mom']
+
+
+@pytest.fixture
+def prefetch_config():
+    from plotbot import config
+    from plotbot.get_data import read_ahead
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server, config.prefetch)
+    try:
+        generate_fixtures(tmp_dir, start='2023-10-02 00:00:00', hours=4, products=['mag_RTN'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        config.prefetch = True
+        yield read_ahead
+    finally:
+        config.data_dir, config.data_server, config.prefetch = original
+        read_ahead.wait(30)
+        read_ahead.clear()
+        shutil.rmtree(tmp_dir)
+        _reset()
+
+
+def _reset():
+    """Leave no 2023-10-02 mag_RTN data in the global instance."""
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_tracker import global_tracker
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        for key in ('mag_rtn', 'mag_RTN'):
+            ranges.pop(key, None)
+    instance = data_cubby.grab('mag_rtn')
+    type(instance).__init__(instance, None)
+
+
+def test_get_data_steps_through_prefetched_windows(prefetch_config):
+    from plotbot import get_data
+    from plotbot.data_classes.psp_mag_rtn import mag_rtn
+
+    read_ahead = prefetch_config
+    get_data(_hour(0), mag_rtn.br)
+    get_data(_hour(1), mag_rtn.br)
+    assert read_ahead.wait(60)
+    assert read_ahead.staged == [('mag_RTN', trange_window(_hour(2)))]
+
+    get_data(_hour(2), mag_rtn.br)                       # merged from the prefetch, next hour requested
+    times = np.asarray(mag_rtn.br.plot_config.datetime_array)
+    assert times[0] < np.datetime64('2023-10-02T00:01') and times[-1] > np.datetime64('2023-10-02T02:59')
+    assert read_ahead.wait(60)
+    assert read_ahead.staged == [('mag_RTN', trange_window(_hour(3)))]
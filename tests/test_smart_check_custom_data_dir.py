@@ -442,7 +442,7 @@ def test_download_spdf_second_call_uses_cache(setup_test_environment):
         with patch.dict('sys.modules', {'pyspedas': mock_pyspedas_module}):
             # FIRST CALL: should download missing Oct 1-2
             result1 = download_spdf_data(trange, 'spi_sf00_l3_mom')
-            assert pyspedas_call_count == 1, "First call should trigger one pyspedas download"
+            assert pyspedas_call_count == 2, "First call should trigger one pyspedas download per missing date"
             assert len(result1) >= 5, f"First call should return 5 files, got {len(result1)}"
 
             # SECOND CALL: same range — all files now exist locally
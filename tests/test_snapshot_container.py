@@ -0,0 +1,137 @@
+"""
+Tests for the chunked .pbsnap snapshot container (plotbot/snapshot_container.py).
+
+Data come from the offline synthetic PSP CDFs in benchmarks/, loaded through the
+normal get_data pipeline, so the round trip covers real data class instances.
+
+To run:
+    python -m pytest tests/test_snapshot_container.py -v
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+TRANGE = ['2023-09-28/00:00:00.000', '2023-09-28/00:06:00.000']
+
+
+@pytest.fixture(scope='module')
+def loaded_mag_rtn():
+    import plotbot as pb
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1, products=['mag_RTN'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        pb.get_data(TRANGE, pb.mag_rtn.br)
+        yield pb, tmp_dir
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+
+
+def _reset_mag_rtn(pb):
+    from plotbot.data_tracker import global_tracker
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        ranges.pop('mag_RTN', None)
+        ranges.pop('mag_rtn', None)
+    pb.mag_rtn.__init__(None)
+
+
+def _snapshot_of(instance):
+    return {
+        'datetime_array': np.array(instance.datetime_array),
+        'br': np.array(instance.raw_data['br']),
+        'bmag': np.array(instance.raw_data['bmag']),
+        'field': np.array(instance.field),
+    }
+
+
+@pytest.mark.parametrize('compression', ['none', 'medium'])
+def test_container_round_trip_restores_class_state(loaded_mag_rtn, compression):
+    pb, tmp_dir = loaded_mag_rtn
+    from plotbot.snapshot_container import read_manifest
+
+    expected = _snapshot_of(pb.mag_rtn)
+    path = os.path.join(tmp_dir, f'round_trip_{compression}.pbsnap')
+    assert pb.data_snapshot.save_data_snapshot(path, classes=[pb.mag_rtn], compression=compression,
+                                               format='container')
+
+    manifest = read_manifest(path)
+    entry = manifest['classes']['mag_RTN']
+    assert entry['n_records'] == len(expected['datetime_array'])
+    assert entry['arrays']['raw_data/br']['record_aligned']
+
+    _reset_mag_rtn(pb)
+    assert pb.data_snapshot.load_data_snapshot(path, classes=['mag_RTN'], mmap=(compression == 'none'))
+
+    restored = _snapshot_of(pb.mag_rtn)
+    for key, values in expected.items():
+        np.testing.assert_array_equal(restored[key], values)
+    # plot managers are rebuilt on top of the restored arrays
+    np.testing.assert_array_equal(np.asarray(pb.mag_rtn.br), expected['br'])
+
+
+def test_container_time_window_decodes_only_overlapping_rows(loaded_mag_rtn):
+    pb, tmp_dir = loaded_mag_rtn
+    from plotbot.data_tracker import global_tracker
+    from plotbot.snapshot_container import read_class_arrays, write_snapshot_container
+
+    expected = _snapshot_of(pb.mag_rtn)
+    path = os.path.join(tmp_dir, 'windowed.pbsnap')
+    # small chunks so a window spans only some of them
+    write_snapshot_container(path, {'mag_RTN': pb.mag_rtn}, codec='zlib', chunk_bytes=64 * 1024)
+
+    window = ['2023-09-28 00:02:00', '2023-09-28 00:03:00']
+    decoded = read_class_arrays(path, 'mag_RTN', time_range=window)
+    times = decoded['arrays']['attr/datetime_array']
+    mask = ((expected['datetime_array'] >= np.datetime64('2023-09-28T00:02:00'))
+            & (expected['datetime_array'] <= np.datetime64('2023-09-28T00:03:00')))
+    np.testing.assert_array_equal(times, expected['datetime_array'][mask])
+    np.testing.assert_array_equal(decoded['arrays']['raw_data/br'], expected['br'][mask])
+
+    _reset_mag_rtn(pb)
+    from plotbot.snapshot_container import load_snapshot_container
+    restored = load_snapshot_container(path, classes=['mag_RTN'], time_range=window)
+    assert list(restored) == ['mag_RTN']
+    assert len(pb.mag_rtn.datetime_array) == mask.sum()
+    assert not global_tracker.is_calculation_needed(['2023-09-28/00:02:10.000', '2023-09-28/00:02:50.000'], 'mag_RTN')
+
+
+@pytest.mark.parametrize('format', ['container', 'pickle'])
+def test_load_data_snapshot_time_range_restores_only_the_window(loaded_mag_rtn, format):
+    pb, tmp_dir = loaded_mag_rtn
+    from plotbot.data_tracker import global_tracker
+    from plotbot.snapshot_container import _select_chunks, _to_ns, read_manifest
+
+    # get_data may have been replaced by a windowed load in an earlier test
+    _reset_mag_rtn(pb)
+    pb.get_data(TRANGE, pb.mag_rtn.br)
+    expected = _snapshot_of(pb.mag_rtn)
+    extension = '.pbsnap' if format == 'container' else '.pkl'
+    path = os.path.join(tmp_dir, f'windowed_api{extension}')
+    assert pb.data_snapshot.save_data_snapshot(path, classes=[pb.mag_rtn], format=format, auto_split=False)
+
+    window = ['2023-09-28/00:04:00.000', '2023-09-28/00:04:30.000']
+    if format == 'container':
+        entry = read_manifest(path)['classes']['mag_RTN']
+        selected = _select_chunks(entry, _to_ns('2023-09-28 00:04:00'), _to_ns('2023-09-28 00:04:30'))
+        assert 0 < len(selected) <= len(entry['chunks'])
+
+    _reset_mag_rtn(pb)
+    assert pb.data_snapshot.load_data_snapshot(path, classes=['mag_RTN'], time_range=window)
+
+    mask = ((expected['datetime_array'] >= np.datetime64('2023-09-28T00:04:00'))
+            & (expected['datetime_array'] <= np.datetime64('2023-09-28T00:04:30')))
+    np.testing.assert_array_equal(pb.mag_rtn.datetime_array, expected['datetime_array'][mask])
+    np.testing.assert_array_equal(pb.mag_rtn.raw_data['br'], expected['br'][mask])
+    assert not global_tracker.is_calculation_needed(['2023-09-28/00:04:05.000', '2023-09-28/00:04:25.000'], 'mag_RTN')
+    assert global_tracker.is_calculation_needed(['2023-09-28/00:00:00.000', '2023-09-28/00:01:00.000'], 'mag_RTN')
@@ -0,0 +1,151 @@
+"""
+Tests for time-filtered snapshot instances (data_snapshot._create_filtered_instance).
+
+The kept rows are found by binary search and taken as views of the original
+instance: nothing outside the window is copied, the original is unchanged,
+and derived entries still pending stay pending. Data come from the offline
+synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_snapshot_filtering.py -v
+"""
+
+import pickle
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+
+TRANGE = ['2023-09-28/00:00:00.000', '2023-09-28/00:05:00.000']
+WINDOW = (datetime(2023, 9, 28, 0, 1), datetime(2023, 9, 28, 0, 2))
+
+
+@pytest.fixture(scope='module')
+def loaded():
+    import plotbot as pb
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-09-28 00:00:00', hours=0.1,
+                          products=['mag_RTN_4sa', 'spi_sf00_l3_mom'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        pb.get_data(TRANGE, pb.mag_rtn_4sa.br, pb.proton.density)
+        yield pb
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+
+
+def _window_mask(instance):
+    start, end = (np.datetime64(t, 'ns') for t in WINDOW)
+    return (instance.datetime_array >= start) & (instance.datetime_array <= end)
+
+
+def _full_length_arrays(obj, n_rows, seen=None):
+    """Shapes of arrays (anywhere under ``obj``) that still have the original row count."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return []
+    seen.add(id(obj))
+    found = []
+    if isinstance(obj, np.ndarray):
+        if obj.ndim and n_rows in obj.shape:
+            found.append(obj.shape)
+        children = getattr(obj, '__dict__', {}).values()
+    elif isinstance(obj, dict):
+        children = dict.values(obj)
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    else:
+        children = getattr(obj, '__dict__', {}).values()
+    for child in children:
+        found += _full_length_arrays(child, n_rows, seen)
+    return found
+
+
+@pytest.mark.parametrize('name', ['mag_rtn_4sa', 'proton'])
+def test_filtered_instance_is_a_view_of_the_window(loaded, name):
+    from plotbot.data_snapshot import _create_filtered_instance
+
+    instance = getattr(loaded, name)
+    pending = instance.raw_data.pending()
+    mask = _window_mask(instance)
+    filtered = _create_filtered_instance(instance, *WINDOW)
+
+    assert type(filtered) is type(instance)
+    np.testing.assert_array_equal(filtered.datetime_array, instance.datetime_array[mask])
+    assert np.shares_memory(filtered.datetime_array, instance.datetime_array)
+    assert filtered.raw_data.pending() == pending                  # nothing computed while filtering
+    assert instance.raw_data.pending() == pending
+    for key in dict.keys(filtered.raw_data):
+        value, full = filtered.raw_data[key], instance.raw_data[key]
+        if isinstance(value, list):
+            for component, full_component in zip(value, full):
+                np.testing.assert_array_equal(component, full_component[mask])
+        elif isinstance(value, np.ndarray) and value.ndim:
+            np.testing.assert_array_equal(value, full[mask], err_msg=key)
+    assert _full_length_arrays(filtered, len(instance.datetime_array)) == []
+    assert len(instance.datetime_array) == len(mask)               # the original is untouched
+
+
+def test_plot_managers_follow_the_window(loaded):
+    from plotbot.data_snapshot import _create_filtered_instance
+
+    instance = loaded.mag_rtn_4sa
+    filtered = _create_filtered_instance(instance, *WINDOW)
+    rows = _window_mask(instance).sum()
+
+    assert filtered.br.shape == (rows,) and filtered.all.shape == (3, rows)
+    assert len(filtered.br.plot_config.datetime_array) == rows
+    filtered.br.color = 'purple'
+    assert instance.br.color != 'purple'
+    np.testing.assert_allclose(filtered.bmag, np.sqrt(filtered.br ** 2 + filtered.bt ** 2 + filtered.bn ** 2),
+                               rtol=1e-6)
+
+
+def test_clipped_variable_is_filtered_without_its_caches(loaded):
+    from plotbot.data_snapshot import _create_filtered_instance
+
+    instance = loaded.proton
+    instance.anisotropy.requested_trange = TRANGE     # fills the clip and time base caches
+    assert instance.anisotropy.__dict__.get('_sorted_time_base') is not None
+    filtered = _create_filtered_instance(instance, *WINDOW)
+
+    assert _full_length_arrays(filtered, len(instance.datetime_array)) == []
+    assert len(filtered.anisotropy) == _window_mask(instance).sum()
+
+
+def test_pickled_window_is_smaller(loaded):
+    from plotbot.data_snapshot import _create_filtered_instance
+
+    instance = loaded.proton
+    small = _create_filtered_instance(instance, WINDOW[0], WINDOW[0] + timedelta(seconds=20))
+    large = _create_filtered_instance(instance, *WINDOW)
+    assert len(pickle.dumps(small)) < len(pickle.dumps(large)) < len(pickle.dumps(instance))
+
+
+class _DatetimeObjects:
+    def __init__(self, times):
+        self.datetime_array = np.array(times, dtype=object)
+        self.raw_data = {'x': np.arange(len(times), dtype=float), 'label': 'kept'}
+
+
+@pytest.mark.parametrize('tz', [None, timezone.utc], ids=['naive', 'aware'])
+def test_datetime_object_arrays_are_bisected(tz):
+    from plotbot.data_snapshot import _create_filtered_instance
+
+    times = [datetime(2024, 1, 1, tzinfo=tz) + timedelta(minutes=i) for i in range(10)]
+    instance = _DatetimeObjects(times)
+    filtered = _create_filtered_instance(instance, datetime(2024, 1, 1, 0, 2), datetime(2024, 1, 1, 0, 5))
+
+    assert list(filtered.datetime_array) == times[2:6]
+    np.testing.assert_array_equal(filtered.raw_data['x'], [2., 3., 4., 5.])
+    assert filtered.raw_data['label'] == 'kept'
+    assert len(_create_filtered_instance(instance, datetime(2025, 1, 1), datetime(2025, 1, 2)).datetime_array) == 0
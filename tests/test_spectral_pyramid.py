@@ -0,0 +1,210 @@
+"""
+Tests for the time-decimated spectrogram levels (plotbot/spectral_pyramid.py)
+that plotbot() and multiplot() draw long spectral ranges from.
+
+Incremental updates are checked against full rebuilds; the merge test loads
+EPAD strahl from the offline synthetic PSP CDFs in benchmarks/.
+
+To run:
+    python -m pytest tests/test_spectral_pyramid.py -v
+"""
+
+import shutil
+import tempfile
+import warnings
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_cdfs import generate_fixtures
+from plotbot.plot_config import plot_config
+from plotbot.plot_manager import plot_manager
+from plotbot.spectral_pyramid import SpectralPyramid, pyramid_window, reduce_columns, spectral_pyramid
+
+START = np.datetime64('2023-09-28T00:00', 'ns')
+CADENCE = 874_000_000       # ns
+
+
+def _series(n, n_bins=12, seed=0, offset=0):
+    rng = np.random.default_rng(seed)
+    times = START + ((np.arange(n) + offset) * CADENCE + rng.integers(0, 1000, n)).astype('timedelta64[ns]')
+    values = rng.lognormal(size=(n, n_bins))
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return times, values
+
+
+def _assert_same_levels(pyramid, reference):
+    assert pyramid.n_levels == reference.n_levels
+    for (ids, values), (ref_ids, ref_values) in zip(pyramid._levels, reference._levels):
+        np.testing.assert_array_equal(ids, ref_ids)
+        np.testing.assert_allclose(values, ref_values, equal_nan=True)
+
+
+@pytest.mark.parametrize('reducer', ['mean', 'max'])
+def test_reduce_columns_matches_a_bin_loop(reducer):
+    times, values = _series(1000)
+    times_ns = times.view(np.int64)
+    values[10:14] = np.nan                              # a bin with no finite value at all
+    width = 4 * CADENCE
+
+    ids, reduced = reduce_columns(times_ns, values, width, reducer)
+
+    expected_ids = np.unique(times_ns // width)
+    np.testing.assert_array_equal(ids, expected_ids)
+    for i, bin_id in enumerate(expected_ids):
+        rows = values[times_ns // width == bin_id]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)         # all-NaN bins
+            expected = np.nanmean(rows, axis=0) if reducer == 'mean' else np.nanmax(rows, axis=0)
+        np.testing.assert_allclose(reduced[i], expected, equal_nan=True)
+
+
+@pytest.mark.parametrize('order', ['append', 'prepend', 'fill_gap'])
+def test_incremental_update_equals_a_rebuild(order):
+    times, values = _series(20000)
+    split = {'append': (slice(0, 12000), slice(12000, None)),
+             'prepend': (slice(8000, None), slice(0, 8000)),
+             'fill_gap': (np.r_[0:5000, 9000:20000], slice(5000, 9000))}[order]
+    loaded, added = split
+
+    pyramid = SpectralPyramid(times[loaded], values[loaded], 'max')
+    pyramid.update(times, values, times[added][0], times[added][-1])
+
+    _assert_same_levels(pyramid, SpectralPyramid(times, values, 'max', base_width=pyramid.base_width))
+
+
+def test_select_picks_the_coarsest_level_with_enough_columns():
+    times, values = _series(50000)
+    pyramid = SpectralPyramid(times, values)
+
+    start, stop = times[1000], times[41000]                    # 40000 samples
+    level = pyramid.select(start, stop, 1200)
+    window_times, window_values = pyramid.window(level, start, stop)
+
+    assert level == 5                                          # 40000 / 32 = 1250 columns >= 1200 > 625
+    assert 1200 <= len(window_times) <= 1252
+    assert window_values.shape == (len(window_times), 12)
+    half = np.timedelta64(pyramid.width(level) // 2, 'ns')
+    assert window_times[0] - half <= start and window_times[-1] + half >= stop
+    assert pyramid.select(start, stop, 60000) == 0             # wider than the data: full resolution
+
+
+def test_pyramid_is_built_on_demand_and_follows_the_data():
+    times, values = _series(20000)
+    bins = np.linspace(0, 180, 12)
+    var = plot_manager(values, plot_config=plot_config(datetime_array=times, additional_data=bins,
+                                                       plot_type='spectral', class_name='epad',
+                                                       subclass_name='strahl'))
+    assert spectral_pyramid(var) is None                       # option off
+
+    var.spectral_pyramid = 'mean'
+    pyramid = spectral_pyramid(var)
+    assert pyramid is not None and spectral_pyramid(var) is pyramid
+
+    decimated_times, decimated_values, decimated_bins = pyramid_window(var, times[0], times[-1], 500)
+    assert 500 <= len(decimated_times) < 1000
+    assert decimated_values.shape == (len(decimated_times), 12)
+    np.testing.assert_array_equal(decimated_bins, bins)
+
+    var.spectral_pyramid = 'max'
+    assert spectral_pyramid(var).reducer == 'max'
+
+    var.plot_config.additional_data = bins[None, :] + np.arange(20000)[:, None]
+    var.plot_config._pyramid = None
+    assert spectral_pyramid(var) is None                       # bins change with time
+
+
+def test_derived_variables_build_their_own_pyramid():
+    times, values = _series(20000)
+    var = plot_manager(values, plot_config=plot_config(datetime_array=times, plot_type='spectral',
+                                                       class_name='epad', subclass_name='strahl'))
+    var.spectral_pyramid = 'max'
+    pyramid = spectral_pyramid(var)
+
+    derived = var[:]                                           # same shape and end times
+    assert '_pyramid' not in derived.plot_config.__dict__
+    derived_pyramid = spectral_pyramid(derived)
+    assert derived_pyramid is not None and derived_pyramid is not pyramid
+
+
+
+def test_invalid_reducer_is_refused():
+    times, values = _series(100)
+    var = plot_manager(values, plot_config=plot_config(datetime_array=times, plot_type='spectral'))
+    var.spectral_pyramid = 'median'
+    assert var.spectral_pyramid is None
+    with pytest.raises(ValueError):
+        SpectralPyramid(times, values, 'median')
+
+
+FIRST = ['2023-10-02/00:00:00.000', '2023-10-02/03:00:00.000']
+SECOND = ['2023-10-02/03:00:00.000', '2023-10-02/06:00:00.000']
+
+
+@pytest.fixture(scope='module')
+def fixture_dir():
+    from plotbot import config
+
+    tmp_dir = tempfile.mkdtemp()
+    original = (config.data_dir, config.data_server)
+    try:
+        generate_fixtures(tmp_dir, start='2023-10-02 00:00:00', hours=6, products=['spe_sf0_pad'])
+        config.data_dir = tmp_dir
+        config.data_server = 'berkeley'
+        yield config
+    finally:
+        config.data_dir, config.data_server = original
+        shutil.rmtree(tmp_dir)
+        _reset()
+
+
+def _reset():
+    """Leave no 2023-10-02 EPAD data (or pyramid option) in the global instance."""
+    from plotbot.data_cubby import data_cubby
+    from plotbot.data_tracker import global_tracker
+    for ranges in (global_tracker.calculated_ranges, global_tracker.imported_ranges):
+        for key in ('epad', 'spe_sf0_pad'):
+            ranges.pop(key, None)
+    instance = data_cubby.grab('epad')
+    type(instance).__init__(instance, None)
+
+
+def test_merged_data_updates_the_pyramid_in_place(fixture_dir):
+    from plotbot import get_data
+    from plotbot.data_classes.psp_electron_classes import epad
+
+    get_data(FIRST, epad.strahl)
+    epad.strahl.spectral_pyramid = 'mean'
+    pyramid = spectral_pyramid(epad.strahl)
+    assert pyramid is not None
+
+    get_data(SECOND, epad.strahl)
+    strahl = epad.strahl
+    times = np.asarray(strahl.plot_config.datetime_array)[:, 0]
+    assert times[-1] > np.datetime64(SECOND[0].replace('/', 'T'))
+
+    assert strahl.plot_config._pyramid is pyramid               # updated, not rebuilt
+    _assert_same_levels(pyramid, SpectralPyramid(times, strahl.view(np.ndarray), base_width=pyramid.base_width))
+    assert spectral_pyramid(strahl) is pyramid
+
+
+def test_update_with_replaced_data_rebuilds_the_pyramid(fixture_dir):
+    from plotbot import get_data
+    from plotbot.data_classes.psp_electron_classes import epad
+    from plotbot.data_import import import_data_function
+
+    get_data(FIRST, epad.strahl)
+    epad.strahl.spectral_pyramid = 'max'
+    pyramid = spectral_pyramid(epad.strahl)
+
+    data_obj = import_data_function(FIRST, 'spe_sf0_pad')
+    eflux = np.array(data_obj.data['EFLUX_VS_PA_E'])
+    eflux[len(eflux) // 3 + 1] *= 1000                          # same shape and end times, one row changed
+    data_obj.data['EFLUX_VS_PA_E'] = eflux
+    epad.update(data_obj)
+
+    strahl = epad.strahl
+    rebuilt = spectral_pyramid(strahl)
+    assert rebuilt is not None and rebuilt is not pyramid
+    times = np.asarray(strahl.plot_config.datetime_array)[:, 0]
+    _assert_same_levels(rebuilt, SpectralPyramid(times, strahl.view(np.ndarray), 'max', base_width=rebuilt.base_width))
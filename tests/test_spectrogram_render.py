@@ -0,0 +1,99 @@
+"""
+Tests for the raster spectrogram path (plotbot/spectrogram_render.py) used by
+plotbot() and multiplot() for spectral variables.
+
+Renders are compared pixel by pixel against the pcolormesh call they replace.
+
+To run:
+    python -m pytest tests/test_spectrogram_render.py -v
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.colors as colors
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.collections import QuadMesh
+from matplotlib.image import AxesImage, PcolorImage
+
+from plotbot.spectrogram_render import cell_edges, draw_spectrogram, raster_columns, regular_step
+
+START = np.datetime64('2023-09-28T00:00', 'ns')
+
+
+def _spectrogram(n_times, bins, jitter=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(n_times) * 874e6 + rng.normal(0, jitter * 874e6, n_times)
+    times = START + offsets.astype('int64').astype('timedelta64[ns]')
+    data = np.exp(np.sin(np.arange(n_times) / n_times * 20)[:, None] + np.cos(np.arange(len(bins)) / 5)[None, :])
+    data[rng.random(data.shape) < 0.01] = np.nan
+    return times, bins, data
+
+
+def _render(times, bins, data, fast, y_scale='linear'):
+    fig, ax = plt.subplots(figsize=(6, 3), dpi=100)
+    ax.set_yscale(y_scale)
+    if fast:
+        artist = draw_spectrogram(ax, times, bins, data, norm=colors.LogNorm(vmin=0.1, vmax=10))
+    else:
+        artist = ax.pcolormesh(times, bins, data.T, norm=colors.LogNorm(vmin=0.1, vmax=10), shading='auto')
+    fig.canvas.draw()
+    pixels = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(int)
+    formatter = ax.xaxis.get_major_formatter()
+    plt.close(fig)
+    return pixels, artist, formatter
+
+
+@pytest.mark.parametrize('n_times, bins, y_scale, jitter, expected', [
+    (400, np.linspace(0, 180, 12), 'linear', 0.0, AxesImage),          # EPAD-like pitch angles
+    (400, np.linspace(0, 180, 12), 'linear', 0.002, AxesImage),        # cadence jitter within tolerance
+    (400, np.geomspace(10, 1e4, 32), 'linear', 0.0, PcolorImage),      # non-uniform bins
+    (400, np.geomspace(10, 1e4, 32)[::-1], 'log', 0.0, QuadMesh),      # descending energies, log axis
+    (9000, np.geomspace(10, 1e4, 32), 'log', 0.0, QuadMesh),           # resampled to the raster width
+])
+def test_renders_like_pcolormesh(n_times, bins, y_scale, jitter, expected):
+    times, bins, data = _spectrogram(n_times, bins, jitter)
+
+    reference, _, _ = _render(times, bins, data, fast=False, y_scale=y_scale)
+    pixels, artist, formatter = _render(times, bins, data, fast=True, y_scale=y_scale)
+
+    assert type(artist) is expected
+    assert isinstance(formatter, (mdates.AutoDateFormatter, mdates.ConciseDateFormatter))
+    assert np.mean(np.abs(pixels - reference).max(axis=-1) > 10) < 0.01
+
+
+def test_gaps_stay_in_place():
+    times, bins, data = _spectrogram(400, np.linspace(0, 180, 12))
+    times[200:] += np.timedelta64(10, 'm')
+
+    reference, _, _ = _render(times, bins, data, fast=False)
+    pixels, artist, _ = _render(times, bins, data, fast=True)
+
+    assert type(artist) is PcolorImage
+    assert np.mean(np.abs(pixels - reference).max(axis=-1) > 10) < 0.01
+
+
+def test_time_varying_bins_fall_back_to_pcolormesh():
+    times, bins, data = _spectrogram(50, np.linspace(0, 180, 12))
+    times_2d = np.repeat(times[:, None], 12, axis=1)
+    bins_2d = bins[None, :] + np.arange(50)[:, None]
+
+    fig, ax = plt.subplots()
+    assert type(draw_spectrogram(ax, times_2d, bins_2d, data)) is QuadMesh
+    assert type(draw_spectrogram(ax, times_2d, np.repeat(bins[None, :], 50, axis=0), data)) is AxesImage
+    shuffled = times.copy()
+    shuffled[[3, 4]] = shuffled[[4, 3]]
+    assert type(draw_spectrogram(ax, shuffled, bins, data)) is QuadMesh
+    plt.close(fig)
+
+
+def test_grid_helpers():
+    np.testing.assert_allclose(cell_edges([0.0, 1.0, 3.0]), [-0.5, 0.5, 2.0, 4.0])
+    assert regular_step(np.array([0.0, 1.0, 2.005, 3.0])) == 1.0
+    assert regular_step(np.array([0.0, 1.0, 2.5, 3.0])) is None
+
+    raster_edges, columns = raster_columns(np.array([0.0, 1.0, 2.0, 10.0]), 5)
+    np.testing.assert_allclose(raster_edges, [0, 2, 4, 6, 8, 10])
+    np.testing.assert_array_equal(columns, [1, 2, 2, 2, 2])
@@ -0,0 +1,85 @@
+"""
+Tests for plotbot's startup cost (plotbot/__init__.py, plotbot/lazy_loader.py).
+
+`import plotbot` only creates proxies for the data classes and plotting
+functions; their modules (and pandas, scipy, matplotlib, numba, cdflib, ...)
+load on first use. Each check runs in a fresh interpreter.
+
+To run:
+    python -m pytest tests/test_startup_budget.py -v
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_SECONDS = 0.5
+HEAVY_MODULES = ('pandas', 'scipy', 'matplotlib', 'numba', 'cdflib', 'requests',
+                 'pyspedas', 'dash', 'plotly', 'ipywidgets')
+
+
+def _run(script):
+    """Run ``script`` in a fresh interpreter; it prints one JSON line last."""
+    env = dict(os.environ, MPLBACKEND='Agg')
+    proc = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stderr[-3000:]
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+_IMPORT_SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import plotbot
+from plotbot import *
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def test_import_stays_within_budget():
+    _run(_IMPORT_SCRIPT)                   # compile bytecode first, so only the import is timed
+    result = min((_run(_IMPORT_SCRIPT) for _ in range(2)), key=lambda r: r['seconds'])
+    assert result['heavy'] == []
+    assert result['seconds'] < BUDGET_SECONDS, f"import plotbot took {result['seconds']:.3f}s"
+
+
+def test_first_use_loads_and_registers_the_instance():
+    result = _run("""
+import json, sys
+import plotbot as pb
+from plotbot import mag_rtn, multiplot, plot_manager
+before = 'plotbot.data_classes.psp_mag_rtn' in sys.modules
+br = mag_rtn.br                       # through a from-imported proxy
+from plotbot.data_classes.psp_mag_rtn import mag_rtn_class
+from plotbot.data_cubby import data_cubby
+from plotbot.data_classes import psp_mag_rtn
+print(json.dumps({
+    'loaded_early': before,
+    'shared': pb.mag_rtn is psp_mag_rtn.mag_rtn is data_cubby.grab('mag_rtn'),
+    'isinstance': isinstance(mag_rtn, mag_rtn_class) and isinstance(br, plot_manager),
+    'class_export': pb.mag_rtn_class is mag_rtn_class,
+    'multiplot_is_function': callable(multiplot) and callable(pb.multiplot) and not isinstance(pb.multiplot, type(sys)),
+}))
+""")
+    assert not result.pop('loaded_early')
+    assert all(result.values()), result
+
+
+def test_data_cubby_loads_instances_nobody_has_touched():
+    result = _run("""
+import json
+import plotbot as pb
+from plotbot.data_cubby import data_cubby
+dfb = data_cubby.grab('dfb_ac_spec_dv34hg')
+print(json.dumps({
+    'dfb': dfb is pb.psp_dfb is data_cubby.grab('psp_dfb') is data_cubby.grab('dfb_dc_spec_dv12hg'),
+    'alias': data_cubby._get_class_type_from_string('spi_sf00_l3_mom') is type(pb.proton),
+    'custom_variables': data_cubby.grab('custom_variables') is pb.custom_variables,
+    'unknown': data_cubby.grab('no_such_class') is None,
+}))
+""")
+    assert all(result.values()), result
@@ -0,0 +1,141 @@
+"""
+Tests for the precomputed VDF tile cache behind the Dash VDF explorer
+(plotbot/vdf_tile_cache.py).
+
+Slices come from a stand-in compute function, so no CDF or Dash is needed.
+
+To run:
+    python -m pytest tests/test_vdf_tile_cache.py -v
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from plotbot.vdf_tile_cache import TilePrecomputer, VDFTileCache, build_tiles, clean_vdf, grid_triangles
+
+
+def _loop_triangles(df):
+    """The per-cell loop grid_triangles replaced."""
+    ny, nx = df.shape
+    flat = df.ravel()
+    triangles = []
+    for i in range(ny - 1):
+        for j in range(nx - 1):
+            lower = [i * nx + j, i * nx + j + 1, (i + 1) * nx + j]
+            upper = [i * nx + j + 1, (i + 1) * nx + j + 1, (i + 1) * nx + j]
+            for triangle in (lower, upper):
+                if np.all(np.isfinite(flat[triangle])):
+                    triangles.append(triangle)
+    return np.array(triangles).reshape(-1, 3)
+
+
+def _slice(index, shape=(12, 9)):
+    rng = np.random.default_rng(index)
+    vx, vy = np.meshgrid(np.linspace(-500, 500, shape[1]), np.linspace(-500, 500, shape[0]))
+    df = rng.lognormal(size=shape)
+    df[rng.random(shape) < 0.2] = 0.0
+    vdf_data = {'vdf': rng.random((8, 32, 8)), 'vel': np.tile(np.linspace(100, 900, 32)[None, :, None], (8, 1, 8))}
+    return vdf_data, (vx, vy, df), (vx, vy, df[::-1])
+
+
+@pytest.fixture
+def cache_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+@pytest.fixture
+def source(cache_dir):
+    path = os.path.join(cache_dir, 'psp_swp_spi_sf00_fake.cdf')
+    with open(path, 'wb') as f:
+        f.write(b'cdf')
+    return path
+
+
+def test_grid_triangles_match_the_cell_loop():
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        df = clean_vdf(np.where(rng.random((15, 11)) < 0.3, 0.0, rng.random((15, 11))))
+        np.testing.assert_array_equal(grid_triangles(np.isfinite(df)), _loop_triangles(df))
+    assert grid_triangles(np.ones((1, 5), dtype=bool)).shape == (0, 3)
+
+
+def test_tiles_persist_as_float32_and_are_invalidated_with_the_source(cache_dir, source):
+    tiles = build_tiles(*_slice(3))
+    VDFTileCache(source, cache_dir).put(3, 'mesh3d', tiles['mesh3d'])
+
+    stored = VDFTileCache(source, cache_dir).get(3, 'mesh3d')        # a new session reads it from disk
+    assert stored['theta_df'].dtype == np.float32 and stored['theta_triangles'].dtype == np.int32
+    for name, array in tiles['mesh3d'].items():
+        np.testing.assert_array_equal(stored[name], array)
+    assert 'theta_triangles' not in tiles['scatter']
+
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert (3, 'mesh3d') not in VDFTileCache(source, cache_dir)
+    assert VDFTileCache(None).get(3, 'mesh3d') is None
+
+
+def test_shared_arrays_are_stored_once_per_slice(cache_dir, source):
+    tiles = build_tiles(*_slice(5))
+    cache = VDFTileCache(source, cache_dir)
+    for mode, tile in tiles.items():
+        cache.put(5, mode, tile)
+
+    files = sorted(os.listdir(cache.directory))
+    assert files == ['000005_interpolate.npz', '000005_mesh3d.npz', '000005_scatter.npz', '000005_shared.npz']
+    with np.load(os.path.join(cache.directory, '000005_mesh3d.npz')) as stored:
+        assert sorted(stored.files) == ['phi_triangles', 'theta_triangles']
+
+    reopened = VDFTileCache(source, cache_dir)
+    mesh3d, scatter = reopened.get(5, 'mesh3d'), reopened.get(5, 'scatter')
+    assert mesh3d['theta_df'] is scatter['theta_df']                  # one copy of the grids in memory
+    for mode, tile in tiles.items():
+        stored = reopened.get(5, mode)
+        assert sorted(stored) == sorted(tile)
+        for name, array in tile.items():
+            np.testing.assert_array_equal(stored[name], array)
+
+
+def test_background_fill_works_outward_from_the_focus(cache_dir, source):
+    order = []
+    precomputer = TilePrecomputer(VDFTileCache(source, cache_dir), 9,
+                                  lambda i: order.append(i) or build_tiles(*_slice(i)))
+    precomputer.start(focus=4)
+    precomputer._thread.join(10)                                      # exits once every slice is cached
+
+    assert order == [4, 5, 3, 6, 2, 7, 1, 8, 0]
+    resumed = TilePrecomputer(VDFTileCache(source, cache_dir), 9, lambda i: pytest.fail('recomputed'))
+    assert resumed._next_index() is None                              # everything is on disk already
+
+
+def test_a_slice_is_computed_once_under_concurrent_requests(cache_dir):
+    calls = []
+
+    def compute(index):
+        calls.append(index)
+        time.sleep(0.05)
+        return build_tiles(*_slice(index))
+
+    precomputer = TilePrecomputer(VDFTileCache(None), 50, compute).start(focus=10)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(precomputer.get_or_compute(10, 'mesh3d')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    precomputer.stop()
+
+    assert calls.count(10) == 1
+    assert len(results) == 4
+    for result in results:
+        np.testing.assert_array_equal(result['theta_triangles'], results[0]['theta_triangles'])
+    assert len(calls) == len(set(calls))